@@ -11,6 +11,8 @@ Usage:
     python automation_scheduler.py --config scheduler_config.json --start-from 5  # Start from 5th config file
     python automation_scheduler.py --config scheduler_config.json --time 14:30:00  # Start at 2:30 PM today
     python automation_scheduler.py --config scheduler_config.json --date 2024-12-25 --time 09:00:00  # Start at specific date and time
+    python automation_scheduler.py --configs a.json b.json c.json --concurrency 4 --site-interval 30  # Run up to 4 configs at once
+    python automation_scheduler.py --config scheduler_config.json --metrics-port 9464  # Prometheus metrics on localhost:9464
 
 Features:
 - Sequential execution of multiple automation configurations
@@ -22,6 +24,9 @@ Features:
 - Start from specific config file index (convenient for resuming interrupted runs)
 - Schedule automation to start at specific time (HH:mm:ss)
 - Schedule automation to start on specific date (YYYY-MM-dd)
+- Concurrent in-process execution (--concurrency N) with per-config concurrency
+  limits and per-site rate limits instead of global waits
+- Local Prometheus metrics endpoint (--metrics-port N)
 """
 
 import sys
@@ -35,8 +40,9 @@ import signal
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
 from enum import Enum
+from urllib.parse import urlparse
 
 # Add src directory to path for importing automation modules
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -45,6 +51,7 @@ try:
     from core.engine import WebAutomationEngine, AutomationSequenceBuilder
     from core.controller import AutomationController, AutomationState, ControlSignal
     from core.keyboard_handler import create_keyboard_handler
+    from core.browser_manager import BrowserConfig, BrowserPoolConfig, get_browser_pool, close_browser_pools
 except ImportError:
     print("Warning: Could not import automation modules. CLI-only mode activated.")
     WebAutomationEngine = None
@@ -53,6 +60,17 @@ except ImportError:
     AutomationState = None
     ControlSignal = None
     create_keyboard_handler = None
+    BrowserConfig = None
+    BrowserPoolConfig = None
+    get_browser_pool = None
+    close_browser_pools = None
+
+from utils.metrics_registry import get_registry, start_metrics_server
+
+SCHEDULER_RUNS = get_registry().counter(
+    "automaton_scheduler_runs_total", "Scheduled automation runs by result", ("result",))
+SCHEDULER_RUN_DURATION = get_registry().histogram(
+    "automaton_scheduler_run_duration_seconds", "Duration of scheduled automation runs")
 
 
 class AutomationResult(Enum):
@@ -82,6 +100,24 @@ class AutomationRun:
         self.tasks_created = tasks_created
         self.error_message = error_message
         self.total_duration = (self.end_time - self.start_time).total_seconds()
+        SCHEDULER_RUNS.labels(result=result.value).inc()
+        SCHEDULER_RUN_DURATION.observe(self.total_duration)
+
+
+@dataclass
+class AutomationOutcome:
+    """Structured result of an in-process automation run"""
+    config_file: str
+    result: AutomationResult
+    tasks_created: int = 0
+    message: str = ""
+    site: str = ""
+    duration: float = 0.0
+    engine_results: Dict[str, Any] = field(default_factory=dict)
+
+    def as_tuple(self) -> tuple:
+        """Legacy (result, tasks_created, message) form"""
+        return self.result, self.tasks_created, self.message
 
 
 @dataclass
@@ -97,6 +133,32 @@ class SchedulerConfig:
     verbose: bool = True
     scheduled_time: Optional[str] = None  # Time in HH:mm:ss format
     scheduled_date: Optional[str] = None  # Date in YYYY-MM-dd format
+    max_concurrency: int = 1  # Automations running at once (>1 runs in-process engines concurrently)
+    per_config_concurrency: int = 1  # Concurrent runs of the same config file
+    site_min_interval: int = 0  # Min seconds between run starts against the same site (concurrent mode)
+    use_browser_pool: bool = True  # Concurrent engines lease warm browsers from a shared pool
+
+
+class SiteRateLimiter:
+    """Spaces out run starts per site (URL host) instead of sleeping globally"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_start: Dict[str, float] = {}
+
+    async def wait_turn(self, site: str):
+        """Wait until a run against ``site`` may start, then record the start"""
+        if self.min_interval <= 0:
+            return
+        lock = self._locks.setdefault(site, asyncio.Lock())
+        async with lock:
+            last_start = self._last_start.get(site)
+            if last_start is not None:
+                delay = last_start + self.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._last_start[site] = time.monotonic()
 
 
 class AutomationScheduler:
@@ -112,6 +174,8 @@ class AutomationScheduler:
         self.is_paused = False
         self.should_stop = False
         self.current_automation_task: Optional[asyncio.Task] = None
+        self.active_automation_tasks: set = set()
+        self.outcomes: List[AutomationOutcome] = []
         
         # Enhanced keyboard handling
         self.keyboard_handler = create_keyboard_handler(advanced=True) if create_keyboard_handler else None
@@ -266,27 +330,39 @@ class AutomationScheduler:
 
     async def run_automation_direct(self, config_file: str, timeout: int) -> tuple[AutomationResult, int, str]:
         """Run automation using direct engine interface"""
+        outcome = await self.execute_automation_direct(config_file, timeout)
+        return outcome.as_tuple()
+
+    async def execute_automation_direct(self, config_file: str, timeout: int,
+                                        browser_pool=None) -> AutomationOutcome:
+        """Run automation in-process and return a structured outcome"""
+        outcome = AutomationOutcome(config_file=config_file, result=AutomationResult.ERROR)
+        start = time.monotonic()
         try:
             if WebAutomationEngine is None:
-                return AutomationResult.ERROR, 0, "Direct automation not available - missing dependencies"
+                outcome.message = "Direct automation not available - missing dependencies"
+                return outcome
 
             # Load configuration
             config_path = Path(config_file)
             if not config_path.exists():
-                return AutomationResult.ERROR, 0, f"Configuration file not found: {config_file}"
+                outcome.message = f"Configuration file not found: {config_file}"
+                return outcome
 
             with open(config_path, 'r') as f:
                 config_data = json.load(f)
+            outcome.site = self._site_for_config(config_data)
 
             # Build automation sequence
             if AutomationSequenceBuilder is None:
-                return AutomationResult.ERROR, 0, "Automation modules not available"
+                outcome.message = "Automation modules not available"
+                return outcome
             
             builder = AutomationSequenceBuilder.from_dict(config_data)
             automation_config = builder.build()
 
             # Run automation with controller
-            engine = WebAutomationEngine(automation_config, self.controller)
+            engine = WebAutomationEngine(automation_config, self.controller, browser_pool=browser_pool)
             
             # Run with timeout
             try:
@@ -296,11 +372,15 @@ class AutomationScheduler:
                 )
             except asyncio.TimeoutError:
                 await engine.cleanup()
-                return AutomationResult.TIMEOUT, 0, "Automation timed out"
+                outcome.result = AutomationResult.TIMEOUT
+                outcome.message = "Automation timed out"
+                return outcome
 
             # Extract results
+            outcome.engine_results = results
             success = results.get('success', False)
             tasks_created = self._extract_task_count_from_results(results)
+            outcome.tasks_created = tasks_created
             error_msg = None
 
             # Check for STOP_AUTOMATION failures (only if no tasks were created)
@@ -312,24 +392,34 @@ class AutomationScheduler:
                 for error in errors:
                     error_text = error.get('error', '').lower()
                     if ('stop_automation' in error_text or 'automation stopped' in error_text):
-                        # Only consider STOP_AUTOMATION a failure if no tasks were created
+                        # Only consider STOP_AUTOMATION a failure if no tasks created
                         if tasks_created == 0:
                             stop_automation_failure = True
                         break
 
             # Force failure if STOP_AUTOMATION was triggered with 0 tasks created
             if stop_automation_failure:
-                result = AutomationResult.FAILURE
-                message = "Automation failed - queue already full (0 tasks created)"
+                outcome.result = AutomationResult.FAILURE
+                outcome.message = "Automation failed - queue already full (0 tasks created)"
             else:
-                result = AutomationResult.SUCCESS if success else AutomationResult.FAILURE
-                message = "Automation completed successfully" if success else (error_msg or "Automation failed")
+                outcome.result = AutomationResult.SUCCESS if success else AutomationResult.FAILURE
+                outcome.message = "Automation completed successfully" if success else (error_msg or "Automation failed")
 
-            return result, tasks_created, message
+            return outcome
 
         except Exception as e:
             self.logger.error(f"Error running direct automation: {e}")
-            return AutomationResult.ERROR, 0, str(e)
+            outcome.result = AutomationResult.ERROR
+            outcome.message = str(e)
+            return outcome
+        finally:
+            outcome.duration = time.monotonic() - start
+
+    @staticmethod
+    def _site_for_config(config_data: Dict[str, Any]) -> str:
+        """Site key (URL host) used for per-site rate limiting"""
+        url = config_data.get('url', '') if isinstance(config_data, dict) else ''
+        return urlparse(url).netloc or url
 
     def _extract_task_count(self, output_text: str) -> int:
         """Extract task count from CLI output"""
@@ -518,6 +608,11 @@ class AutomationScheduler:
 
     async def run_scheduler(self):
         """Main scheduler execution loop with enhanced control"""
+        if self.config.max_concurrency > 1:
+            if WebAutomationEngine is not None:
+                return await self.run_scheduler_concurrent()
+            self.logger.warning("⚠️ Concurrent mode needs the automation modules - running sequentially via CLI")
+
         # Wait for scheduled time if specified
         await self._wait_for_scheduled_time()
         
@@ -588,6 +683,138 @@ class AutomationScheduler:
 
         self.generate_summary_report(total_duration)
 
+    async def run_scheduler_concurrent(self):
+        """Run configurations concurrently with in-process engines
+        
+        Up to ``max_concurrency`` engines run at once, each config is limited to
+        ``per_config_concurrency`` simultaneous runs and run starts against the
+        same site are spaced by ``site_min_interval`` seconds. Retries wait
+        ``failure_wait_time`` for that config only; there is no global wait
+        between configurations.
+        """
+        await self._wait_for_scheduled_time()
+        
+        self.logger.info("🎬 Starting Automation Scheduler (concurrent mode)")
+        self.logger.info(f"📋 Configurations to process: {len(self.config.config_files)}")
+        self.logger.info(f"⚡ Max concurrency: {self.config.max_concurrency}")
+        self.logger.info(f"🌐 Per-site start interval: {self.config.site_min_interval}s")
+        self.logger.info(f"🎯 Max retries per config: {self.config.max_retries}")
+        
+        if self.keyboard_handler:
+            self.keyboard_handler.start_monitoring()
+        if self.controller:
+            self.controller.start_automation()
+        
+        self._engine_slots = asyncio.Semaphore(self.config.max_concurrency)
+        self._config_slots: Dict[str, asyncio.Semaphore] = {}
+        self._site_limiter = SiteRateLimiter(self.config.site_min_interval)
+        self._browser_pools: Dict[str, Any] = {}
+        
+        start_time = datetime.now()
+        try:
+            config_tasks = [
+                asyncio.create_task(self.process_config_file_concurrent(config_file))
+                for config_file in self.config.config_files
+            ]
+            outcomes = await asyncio.gather(*config_tasks, return_exceptions=True)
+            successful_configs = sum(1 for outcome in outcomes if outcome is True)
+        finally:
+            if self.keyboard_handler:
+                self.keyboard_handler.stop_monitoring()
+            if self.config.use_browser_pool and close_browser_pools:
+                await close_browser_pools()
+        
+        total_duration = datetime.now() - start_time
+        
+        self.logger.info(f"\n{'='*80}")
+        if successful_configs == len(self.config.config_files):
+            self.logger.info("🎉 ALL jobs are done. The job summary:")
+        else:
+            self.logger.info(f"⚠️  Scheduler completed with {successful_configs}/{len(self.config.config_files)} successful configurations:")
+        
+        self.generate_summary_report(total_duration)
+
+    async def process_config_file_concurrent(self, config_file: str) -> bool:
+        """Retry loop for one config in concurrent mode"""
+        if not Path(config_file).exists():
+            self.logger.error(f"❌ Configuration file not found: {config_file}")
+            return False
+        
+        for attempt in range(1, self.config.max_retries + 1):
+            if self.should_stop:
+                break
+            await self._handle_pause_state(f"before processing {config_file} (attempt {attempt})")
+            
+            outcome = await self.run_single_automation_concurrent(config_file, attempt)
+            if outcome.result == AutomationResult.SUCCESS:
+                self.logger.info(f"🎉 Configuration completed successfully: {config_file}")
+                return True
+            
+            if attempt < self.config.max_retries:
+                self.logger.warning(f"🔄 Retrying {config_file} (attempt {attempt + 1}/{self.config.max_retries})")
+                await self.wait_with_countdown(self.config.failure_wait_time, f"before retry {attempt + 1} of {config_file}")
+            else:
+                self.logger.error(f"💀 Configuration failed after {self.config.max_retries} attempts: {config_file}")
+        
+        return False
+
+    async def run_single_automation_concurrent(self, config_file: str, attempt: int = 1) -> AutomationOutcome:
+        """Run one attempt under the engine, per-config and per-site limits"""
+        config_slot = self._config_slots.setdefault(
+            config_file, asyncio.Semaphore(max(1, self.config.per_config_concurrency))
+        )
+        site, browser_pool = self._site_and_pool_for(config_file)
+        
+        async with config_slot, self._engine_slots:
+            await self._site_limiter.wait_turn(site)
+            run = AutomationRun(config_file=config_file, start_time=datetime.now(), attempt_number=attempt)
+            self.logger.info(f"🚀 Starting automation: {config_file} (attempt {attempt}, site {site or 'unknown'})")
+            
+            task = asyncio.create_task(
+                self.execute_automation_direct(config_file, self.config.timeout_seconds, browser_pool=browser_pool)
+            )
+            self.active_automation_tasks.add(task)
+            try:
+                outcome = await task
+            except asyncio.CancelledError:
+                outcome = AutomationOutcome(config_file=config_file, result=AutomationResult.ERROR,
+                                            message="Stopped by scheduler", site=site)
+            except Exception as e:
+                outcome = AutomationOutcome(config_file=config_file, result=AutomationResult.ERROR,
+                                            message=str(e), site=site)
+            finally:
+                self.active_automation_tasks.discard(task)
+        
+        run.finish(outcome.result, outcome.tasks_created, outcome.message)
+        self.runs.append(run)
+        self.outcomes.append(outcome)
+        
+        if outcome.result == AutomationResult.SUCCESS:
+            self.logger.info(f"✅ SUCCESS: {config_file} - {outcome.tasks_created} tasks created")
+        else:
+            self.logger.warning(f"❌ {outcome.result.value.upper()}: {config_file} - {outcome.message}")
+        return outcome
+
+    def _site_and_pool_for(self, config_file: str) -> tuple:
+        """Site key and shared browser pool for a config file"""
+        try:
+            with open(config_file, 'r') as f:
+                config_data = json.load(f)
+        except Exception:
+            return "", None
+        site = self._site_for_config(config_data)
+        
+        browser_pool = None
+        if self.config.use_browser_pool and get_browser_pool:
+            browser_pool = get_browser_pool(
+                BrowserConfig(
+                    headless=config_data.get('headless', True),
+                    viewport=config_data.get('viewport'),
+                ),
+                BrowserPoolConfig(size=self.config.max_concurrency)
+            )
+        return site, browser_pool
+
     def generate_summary_report(self, total_duration: timedelta):
         """Generate comprehensive summary report"""
         self.logger.info(f"\n📊 AUTOMATION SCHEDULER SUMMARY")
@@ -730,9 +957,12 @@ class AutomationScheduler:
         else:
             self.logger.info("🛑 Graceful stop requested")
         
-        # Cancel current automation task
+        # Cancel current automation task(s)
         if self.current_automation_task and not self.current_automation_task.done():
             self.current_automation_task.cancel()
+        for task in list(self.active_automation_tasks):
+            if not task.done():
+                task.cancel()
         
         if self.controller:
             self.controller.stop_automation(emergency=emergency)
@@ -936,7 +1166,11 @@ def load_scheduler_config(config_file: str) -> SchedulerConfig:
             use_cli=config_data.get('use_cli', True),
             verbose=config_data.get('verbose', True),
             scheduled_time=config_data.get('scheduled_time', None),
-            scheduled_date=config_data.get('scheduled_date', None)
+            scheduled_date=config_data.get('scheduled_date', None),
+            max_concurrency=config_data.get('max_concurrency', 1),
+            per_config_concurrency=config_data.get('per_config_concurrency', 1),
+            site_min_interval=config_data.get('site_min_interval', 0),
+            use_browser_pool=config_data.get('use_browser_pool', True)
         )
     except Exception as e:
         raise ValueError(f"Failed to load scheduler configuration: {e}")
@@ -958,7 +1192,11 @@ def create_example_scheduler_config():
         "use_cli": True,           # Use CLI interface (recommended)
         "verbose": True,           # Detailed logging
         "scheduled_time": None,    # Optional: Time to start (HH:mm:ss)
-        "scheduled_date": None     # Optional: Date to start (YYYY-MM-dd)
+        "scheduled_date": None,    # Optional: Date to start (YYYY-MM-dd)
+        "max_concurrency": 1,      # >1 runs configs concurrently with in-process engines
+        "per_config_concurrency": 1,  # Concurrent runs of the same config file
+        "site_min_interval": 0,    # Min seconds between run starts against the same site
+        "use_browser_pool": True   # Reuse warm browsers across concurrent runs
     }
     
     config_file = Path("configs/scheduler_config.json")
@@ -987,6 +1225,10 @@ async def main():
     parser.add_argument('--start-from', type=int, metavar='INDEX', help='Start from specified config file index (1-indexed, e.g., --start-from 3 starts from the 3rd config)')
     parser.add_argument('--time', type=str, metavar='HH:MM:SS', help='Schedule start time (e.g., 14:30:00 for 2:30 PM). Defaults to current day if --date not specified')
     parser.add_argument('--date', type=str, metavar='YYYY-MM-DD', help='Schedule start date (e.g., 2024-12-25). Used with --time for specific datetime')
+    parser.add_argument('--concurrency', type=int, metavar='N', help='Run up to N configs at once with in-process engines')
+    parser.add_argument('--per-config-concurrency', type=int, metavar='N', help='Concurrent runs allowed for the same config file')
+    parser.add_argument('--site-interval', type=int, metavar='SECONDS', help='Min seconds between run starts against the same site (concurrent mode)')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT', help='Serve Prometheus metrics on localhost:PORT/metrics')
 
     args = parser.parse_args()
 
@@ -1025,6 +1267,14 @@ async def main():
         print("Use --help for usage information or --create-example for example configuration.")
         sys.exit(1)
     
+    # Concurrency overrides from command line
+    if args.concurrency is not None:
+        config.max_concurrency = max(1, args.concurrency)
+    if args.per_config_concurrency is not None:
+        config.per_config_concurrency = max(1, args.per_config_concurrency)
+    if args.site_interval is not None:
+        config.site_min_interval = max(0, args.site_interval)
+    
     # Validate scheduled time and date formats if provided
     if args.time:
         try:
@@ -1084,6 +1334,7 @@ async def main():
 
     # Create and run scheduler
     scheduler = AutomationScheduler(config)
+    metrics_server = start_metrics_server(args.metrics_port) if args.metrics_port else None
     
     try:
         await scheduler.run_scheduler()
@@ -1092,6 +1343,9 @@ async def main():
     except Exception as e:
         scheduler.logger.error(f"💥 Scheduler failed with error: {e}")
         raise
+    finally:
+        if metrics_server:
+            metrics_server.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Gallery Benchmark
+End-to-end benchmark of GenerationDownloadManager against the synthetic gallery.
+
+Serves the synthetic /generate fixture locally, drives the real
+``GenerationDownloadManager`` (generation container mode) with headless
+Chromium, and reports:
+
+- items/min (completed downloads per minute of wall time)
+- Playwright RPCs per item (protocol messages sent to the browser driver)
+- p50/p95 per phase (open download options, download, log, close, delete,
+  and each named page wait)
+- peak RSS of this process plus the browser processes
+
+Each run is saved as JSON under the output directory. When a baseline exists
+(``--baseline`` or ``<name>_baseline.json`` in the output directory) the run
+is compared against it and the script exits non-zero on regressions.
+
+    python scripts/benchmarks/gallery_benchmark.py --items 500 --max-downloads 100
+    python scripts/benchmarks/gallery_benchmark.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from gallery_fixture import GalleryFixture
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent / "results"
+
+# Manager methods timed as phases: method name -> phase name
+MANAGER_PHASES = {
+    '_attempt_download_from_current_position': 'item',
+    '_open_download_options': 'open_download_options',
+    '_click_and_track_download': 'download',
+    '_process_tracked_download': 'log',
+    '_close_gallery_view': 'close_gallery',
+    '_delete_duplicate_generation': 'delete',
+}
+
+# Relative change beyond which a metric counts as regressed
+DEFAULT_TOLERANCE = 0.15
+
+
+@dataclass
+class BenchmarkOptions:
+    """One benchmark run: fixture shape and manager settings"""
+    name: str = "gallery"
+    items: int = 200
+    max_downloads: int = 50
+    seed: int = 1
+    pipeline_workers: int = 1
+    api_latency_ms: int = 0
+    download_latency_ms: int = 0
+    download_bytes: int = 256 * 1024
+    headless: bool = True
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class PhaseTimer:
+    """Times manager phases by wrapping the instance's coroutine methods"""
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def instrument(self, manager, phases: Dict[str, str] = None):
+        for method_name, phase in (phases or MANAGER_PHASES).items():
+            method = getattr(manager, method_name, None)
+            if method is not None:
+                setattr(manager, method_name, self._timed(method, phase))
+
+        waits = getattr(manager, 'page_waits', None)
+        if waits is not None:
+            wait = waits.wait
+
+            @functools.wraps(wait)
+            async def timed_wait(page, name, *args, **kwargs):
+                return await self._timed(wait, f"wait:{name}")(page, name, *args, **kwargs)
+
+            waits.wait = timed_wait
+
+    def _timed(self, method, phase: str):
+        @functools.wraps(method)
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.durations[phase].append(time.perf_counter() - start)
+        return timed
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            phase: {
+                'count': len(values),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'total': sum(values),
+            }
+            for phase, values in sorted(self.durations.items())
+        }
+
+
+class RpcCounter:
+    """Counts protocol messages sent to the Playwright driver while active"""
+
+    def __init__(self):
+        self.by_method: Counter = Counter()
+        self.available = False
+        self._connection_class = None
+        self._original = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_method.values())
+
+    def __enter__(self) -> "RpcCounter":
+        try:
+            from playwright._impl._connection import Connection
+        except ImportError:
+            logger.warning("⚠️ Playwright internals unavailable - RPC counts will not be reported")
+            return self
+
+        original = Connection._send_message_to_server
+        counter = self.by_method
+
+        def counting_send(connection, obj, method, *args, **kwargs):
+            counter[method] += 1
+            return original(connection, obj, method, *args, **kwargs)
+
+        Connection._send_message_to_server = counting_send
+        self._connection_class = Connection
+        self._original = original
+        self.available = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._connection_class is not None:
+            self._connection_class._send_message_to_server = self._original
+            self._connection_class = None
+
+
+class RssSampler:
+    """Samples RSS of this process and its children (the browser) in the background"""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.peak_mb: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        try:
+            import psutil
+        except ImportError:
+            logger.warning("⚠️ psutil not available - peak RSS will not be reported")
+            return
+        self._task = asyncio.create_task(self._sample(psutil.Process()))
+
+    async def stop(self) -> Optional[float]:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        return self.peak_mb
+
+    async def _sample(self, process):
+        while True:
+            total = 0
+            for proc in [process] + process.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except Exception:
+                    continue
+            self.peak_mb = max(self.peak_mb or 0.0, total / 1024 / 1024)
+            await asyncio.sleep(self.interval)
+
+
+async def run_gallery_benchmark(options: BenchmarkOptions) -> Dict[str, Any]:
+    """Run the manager against a fresh fixture and return the report"""
+    from playwright.async_api import async_playwright
+    from utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+
+    fixture = GalleryFixture(items=options.items, seed=options.seed, api_latency_ms=options.api_latency_ms,
+                             download_latency_ms=options.download_latency_ms,
+                             download_bytes=options.download_bytes)
+
+    with fixture, tempfile.TemporaryDirectory(prefix="gallery_benchmark_") as workdir:
+        downloads_folder = Path(workdir) / "downloads"
+        config = GenerationDownloadConfig(
+            downloads_folder=str(downloads_folder),
+            logs_folder=str(Path(workdir) / "logs"),
+            max_downloads=options.max_downloads,
+            pipeline_workers=options.pipeline_workers,
+        )
+        results = {
+            'success': False,
+            'downloads_completed': 0,
+            'errors': [],
+            'scrolls_performed': 0,
+            'total_thumbnails_processed': 0,
+            'start_time': datetime.now().isoformat(),
+            'end_time': None
+        }
+
+        phases = PhaseTimer()
+        sampler = RssSampler()
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=options.headless)
+            try:
+                context = await browser.new_context(accept_downloads=True, viewport={'width': 1280, 'height': 900})
+                page = await context.new_page()
+                await page.goto(fixture.generate_url)
+
+                manager = GenerationDownloadManager(config)
+                phases.instrument(manager)
+                sampler.start()
+
+                with RpcCounter() as rpcs:
+                    start = time.monotonic()
+                    try:
+                        results = await manager.execute_generation_container_mode(page, results)
+                    finally:
+                        duration = time.monotonic() - start
+                        manager.flush_generation_log()
+                        manager.download_tracker.detach()
+                peak_rss_mb = await sampler.stop()
+            finally:
+                await browser.close()
+
+        files_saved = len([path for path in downloads_folder.rglob("*") if path.is_file()])
+
+    downloads = results.get('downloads_completed', 0)
+    return {
+        'name': options.name,
+        'timestamp': datetime.now().isoformat(),
+        'options': asdict(options),
+        'downloads_completed': downloads,
+        'files_saved': files_saved,
+        'containers_processed': results.get('total_thumbnails_processed', 0),
+        'errors': results.get('errors', []),
+        'duration_seconds': duration,
+        'items_per_minute': downloads / (duration / 60) if duration > 0 else 0.0,
+        'rpcs_total': rpcs.total if rpcs.available else None,
+        'rpcs_per_item': rpcs.total / max(downloads, 1) if rpcs.available else None,
+        'top_rpc_methods': dict(rpcs.by_method.most_common(10)),
+        'fixture_requests': dict(fixture.request_counts),
+        'phases': phases.summary(),
+        'peak_rss_mb': peak_rss_mb,
+    }
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Regressions of ``current`` against ``baseline`` beyond ``tolerance`` (relative)"""
+    regressions = []
+
+    def check(label, now, before, higher_is_better=False):
+        if now is None or not before:
+            return
+        change = (now - before) / before
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{label}: {before:.3f} -> {now:.3f} ({change:+.0%})")
+
+    check("items_per_minute", current.get('items_per_minute'), baseline.get('items_per_minute'), True)
+    check("rpcs_per_item", current.get('rpcs_per_item'), baseline.get('rpcs_per_item'))
+    check("peak_rss_mb", current.get('peak_rss_mb'), baseline.get('peak_rss_mb'))
+
+    for phase, stats in current.get('phases', {}).items():
+        before = baseline.get('phases', {}).get(phase)
+        if before:
+            check(f"{phase} p95", stats['p95'], before['p95'])
+
+    return regressions
+
+
+def save_report(report: Dict[str, Any], output_dir: Path) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = output_dir / f"{report['name']}_{stamp}.json"
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n📊 Gallery benchmark '{report['name']}'")
+    print(f"   ⬇️ Downloads: {report['downloads_completed']} ({report['files_saved']} files) "
+          f"in {report['duration_seconds']:.1f}s")
+    print(f"   ⚡ Items/min: {report['items_per_minute']:.1f}")
+    if report['rpcs_per_item'] is not None:
+        print(f"   🔌 RPCs/item: {report['rpcs_per_item']:.1f} ({report['rpcs_total']} total)")
+    if report['peak_rss_mb'] is not None:
+        print(f"   🧠 Peak RSS: {report['peak_rss_mb']:.0f} MB")
+    print("   ⏱️ Phases (p50 / p95 seconds):")
+    for phase, stats in report['phases'].items():
+        print(f"      {phase:<36} {stats['p50']:.3f} / {stats['p95']:.3f}  (n={stats['count']})")
+    for error in report['errors']:
+        print(f"   ❌ {error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark GenerationDownloadManager against a synthetic gallery")
+    parser.add_argument("--name", default="gallery", help="Report name (baseline file is <name>_baseline.json)")
+    parser.add_argument("--items", type=int, default=200, help="Generations in the fixture (up to 10k+)")
+    parser.add_argument("--max-downloads", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="Pipeline worker pages (pipeline_workers)")
+    parser.add_argument("--api-latency-ms", type=int, default=0)
+    parser.add_argument("--download-latency-ms", type=int, default=0)
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--baseline", type=Path, help="Report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--verbose", action="store_true", help="Show manager logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    options = BenchmarkOptions(name=args.name, items=args.items, max_downloads=args.max_downloads, seed=args.seed,
+                               pipeline_workers=args.workers, api_latency_ms=args.api_latency_ms,
+                               download_latency_ms=args.download_latency_ms, headless=not args.headed)
+    report = asyncio.run(run_gallery_benchmark(options))
+    print_report(report)
+    print(f"\n💾 Saved {save_report(report, args.output_dir)}")
+
+    baseline_path = args.baseline or args.output_dir / f"{args.name}_baseline.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"📌 Baseline stored at {baseline_path}")
+        return 0
+
+    if baseline_path.exists():
+        regressions = compare_reports(report, json.loads(baseline_path.read_text()), args.tolerance)
+        if regressions:
+            print(f"\n🚨 {len(regressions)} regression(s) against {baseline_path}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print(f"\n✅ No regressions against {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Synthetic Generation Gallery Fixture
+Local HTTP server that mimics the /generate page for benchmarking.
+
+The fixture renders generation containers the way the live site does
+(``<hash>__<index>`` ids, "Creation Time" spans, ellipsis prompts in
+``div.sc-eKQYOU.bdGRCs``, the Use-Rerun-Delete panel), appends more
+containers through infinite scroll, opens a gallery overlay with the download
+and close icons on click, and serves attachment downloads. Items are generated
+deterministically from a seed, so a 10k-item gallery costs no memory until it
+is scrolled, and runs against the same seed are comparable.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlparse
+
+NEWEST_CREATION_TIME = datetime(2025, 9, 3, 16, 15, 18)
+CREATION_TIME_FORMAT = "%d %b %Y %H:%M:%S"
+
+PROMPT_WORDS = [
+    "camera", "slowly", "pans", "across", "a", "misty", "forest", "scene", "at", "dawn", "while",
+    "golden", "light", "filters", "through", "tall", "pines", "the", "character", "turns", "toward",
+    "view", "and", "smiles", "wide", "shot", "reveals", "an", "ancient", "city", "below", "frame",
+    "focuses", "on", "rain", "soaked", "street", "neon", "reflections", "figure", "walks", "past",
+]
+
+# Fake MP4 header so saved files look like media to anything that sniffs them
+MEDIA_HEADER = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+
+
+@dataclass
+class FixtureItem:
+    """One generation in the synthetic gallery (position 0 is the newest)"""
+    hash_id: str
+    position: int
+    creation_time: str
+    prompt: str
+    status: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class GalleryFixture:
+    """Serves a synthetic /generate page from a background thread"""
+
+    def __init__(self, items: int = 200, seed: int = 1, initial_batch: int = 30, page_size: int = 20,
+                 queued: int = 2, failed_every: int = 0, api_latency_ms: int = 0,
+                 download_latency_ms: int = 0, download_bytes: int = 256 * 1024,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.items = items
+        self.seed = seed
+        self.initial_batch = initial_batch
+        self.page_size = page_size
+        self.queued = queued
+        self.failed_every = failed_every
+        self.api_latency_ms = api_latency_ms
+        self.download_latency_ms = download_latency_ms
+        self.download_bytes = download_bytes
+        self.host = host
+        self.port = port
+
+        self.deleted: Set[str] = set()
+        self.downloaded: Counter = Counter()
+        self.request_counts: Counter = Counter()
+        self._hash_positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # Item model
+
+    def item(self, position: int) -> FixtureItem:
+        """The generation at ``position``, derived from the seed"""
+        hash_id = hashlib.md5(f"{self.seed}-{position}".encode()).hexdigest()
+        self._hash_positions[hash_id] = position
+        rng = random.Random(f"{self.seed}-{position}")
+        prompt = " ".join(rng.choice(PROMPT_WORDS) for _ in range(rng.randint(18, 40)))
+        prompt = f"The {prompt}, cinematic lighting."
+        creation_time = (NEWEST_CREATION_TIME - timedelta(seconds=97 * position)).strftime(CREATION_TIME_FORMAT)
+        return FixtureItem(hash_id, position, creation_time, prompt, self._status(position))
+
+    def _status(self, position: int) -> Optional[str]:
+        if position < self.queued:
+            return "Queuing" if position % 2 == 0 else "Video is rendering"
+        if self.failed_every and (position + 1) % self.failed_every == 0:
+            return "Something went wrong"
+        return None
+
+    def visible_items(self, after: int = -1, limit: int = 20) -> List[FixtureItem]:
+        """Up to ``limit`` undeleted items after position ``after``"""
+        found = []
+        position = after + 1
+        while position < self.items and len(found) < limit:
+            item = self.item(position)
+            if item.hash_id not in self.deleted:
+                found.append(item)
+            position += 1
+        return found
+
+    @property
+    def downloadable_items(self) -> int:
+        return sum(1 for position in range(self.items) if self._status(position) is None)
+
+    # Server lifecycle
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.url}/generate"
+
+    def start(self) -> "GalleryFixture":
+        handler = type("GalleryRequestHandler", (_GalleryRequestHandler,), {"fixture": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="gallery-fixture", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "GalleryFixture":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # Request handling
+
+    def render_page(self) -> str:
+        config = {"pageSize": self.page_size}
+        initial = [item.to_dict() for item in self.visible_items(limit=self.initial_batch)]
+        return (PAGE_TEMPLATE
+                .replace("__CONFIG__", json.dumps(config))
+                .replace("__INITIAL_ITEMS__", json.dumps(initial)))
+
+    def api_generations(self, after: int, limit: int) -> Dict:
+        items = self.visible_items(after, limit)
+        last = items[-1].position if items else after
+        return {"items": [item.to_dict() for item in items], "has_more": bool(self.visible_items(last, 1))}
+
+    def delete(self, hash_id: str) -> bool:
+        with self._lock:
+            if hash_id not in self._hash_positions:
+                return False
+            self.deleted.add(hash_id)
+        return True
+
+    def media_bytes(self, hash_id: str) -> Optional[bytes]:
+        if hash_id not in self._hash_positions:
+            return None
+        with self._lock:
+            self.downloaded[hash_id] += 1
+        body = MEDIA_HEADER + hash_id.encode()
+        return body + b"\x00" * max(0, self.download_bytes - len(body))
+
+
+class _GalleryRequestHandler(BaseHTTPRequestHandler):
+    fixture: GalleryFixture = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path in ("/", "/generate"):
+            self._count("page")
+            self._send(200, self.fixture.render_page().encode(), "text/html; charset=utf-8")
+        elif url.path == "/api/generations":
+            self._count("api")
+            self._delay(self.fixture.api_latency_ms)
+            after = int(query.get("after", ["-1"])[0])
+            limit = int(query.get("limit", [str(self.fixture.page_size)])[0])
+            body = json.dumps(self.fixture.api_generations(after, limit)).encode()
+            self._send(200, body, "application/json")
+        elif url.path.startswith("/download/"):
+            self._count("download")
+            self._delay(self.fixture.download_latency_ms)
+            filename = url.path.rsplit("/", 1)[-1]
+            media = self.fixture.media_bytes(filename.split(".")[0])
+            if media is None:
+                self._send(404, b"not found", "text/plain")
+                return
+            self._send(200, media, "video/mp4", {"Content-Disposition": f'attachment; filename="{filename}"'})
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/api/delete":
+            self._count("delete")
+            hash_id = parse_qs(url.query).get("hash", [""])[0]
+            self._send(204 if self.fixture.delete(hash_id) else 404, b"", "text/plain")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _count(self, endpoint: str):
+        with self.fixture._lock:
+            self.fixture.request_counts[endpoint] += 1
+
+    def _delay(self, milliseconds: int):
+        if milliseconds:
+            time.sleep(milliseconds / 1000)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Generate</title>
+<style>
+  body { margin: 0; font-family: sans-serif; }
+  #generation-list { width: 900px; margin: 0 auto; }
+  div[id*="__"] { display: flex; height: 180px; margin: 12px 0; border: 1px solid #ddd; cursor: pointer; }
+  .sc-eKQYOU.bdGRCs { flex: 1; padding: 12px; overflow: hidden; }
+  .generation-body { flex: 1; display: flex; flex-direction: column; }
+  .right-container-operation { width: 180px; display: flex; align-items: flex-end; gap: 4px; padding: 8px; }
+  .right-container-operation button { height: 28px; }
+  #gallery { display: none; position: fixed; inset: 0; background: #fff; z-index: 10; padding: 24px; }
+  #gallery.open { display: block; }
+  .thumsItem { width: 120px; height: 68px; background: #333; position: relative; }
+  .download-menu { display: none; }
+  .download-menu.open { display: block; }
+  .download-option { display: block; padding: 6px; }
+  .ant-modal-confirm { position: fixed; top: 40%; left: 40%; z-index: 20; background: #fff; border: 1px solid #999; padding: 16px; }
+  svg { width: 20px; height: 20px; }
+</style>
+</head>
+<body>
+<div id="generation-list"></div>
+<div id="gallery"></div>
+<script>
+const config = __CONFIG__;
+const initialItems = __INITIAL_ITEMS__;
+const list = document.getElementById('generation-list');
+const gallery = document.getElementById('gallery');
+let nextIndex = 0;
+let lastPosition = -1;
+let loading = false;
+let exhausted = false;
+
+const esc = (text) => String(text).replace(/[&<>"]/g, (c) => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+const icon = (name) => `<svg viewBox="0 0 20 20"><use xlink:href="#icon-icon_tongyong_20px_${name}" href="#icon-icon_tongyong_20px_${name}"></use></svg>`;
+const metadata = (item) => `<div class="sc-eJlwcH gjlyBM"><span class="sc-cSMkSB hUjUPD">Creation Time</span>` +
+    `<span class="sc-cSMkSB hUjUPD">${esc(item.creation_time)}</span></div>`;
+
+function renderContainer(item) {
+    const el = document.createElement('div');
+    el.id = `${item.hash_id}__${nextIndex++}`;
+    const prefix = item.prompt.substring(0, 90);
+    const timeBlock = (item.status === 'Queuing' || item.status === 'Video is rendering') ? '' : metadata(item);
+    const status = item.status ? `<div class="generation-status">${esc(item.status)}</div>` : '';
+    el.innerHTML =
+        `<div class="generation-body">` +
+        `<div class="sc-eKQYOU bdGRCs"><span aria-describedby="prompt-tip-${item.position}">${esc(prefix)}</span>...</div>` +
+        `${status}${timeBlock}</div>` +
+        `<div class="sc-jVkSTN dfFQuI right-container-operation">` +
+        `<button class="op-button">Use</button><button class="op-button">Rerun</button>` +
+        `<div class="sc-jxKUFb bQvma-D"><button class="op-button" data-action="delete">${icon('shanchu')}</button></div></div>`;
+    el.addEventListener('click', (event) => {
+        if (event.target.closest('.right-container-operation')) return;
+        if (!item.status) openGallery(item);
+    });
+    el.querySelector('[data-action="delete"]').addEventListener('click', () => confirmDelete(el, item));
+    list.appendChild(el);
+    lastPosition = item.position;
+}
+
+function openGallery(item) {
+    gallery.innerHTML =
+        `<span class="sc-lokenD klijhb"><span role="img" class="anticon close-icon">${icon('guanbi')}</span></span>` +
+        `<div class="thumsInner"><div class="thumsItem thumsCou"><div class="thumsCou-mask"></div></div></div>` +
+        `<div class="sc-eYHxxX fmURBt">` +
+        `<span role="img" class="anticon operate-icon">${icon('zan')}</span>` +
+        `<span role="img" class="anticon operate-icon">${icon('fenxiang')}</span>` +
+        `<span role="img" class="anticon operate-icon download-trigger">${icon('xiazai')}</span></div>` +
+        `<div class="download-menu">` +
+        `<a class="download-option" href="/download/${item.hash_id}.mp4" download="${item.hash_id}.mp4"><span>Download without Watermark</span></a>` +
+        `<a class="download-option" href="/download/${item.hash_id}.mp4?watermark=1" download="${item.hash_id}.mp4"><span>Download with Watermark</span></a></div>` +
+        `<div class="metadata-panel"><span>Image to video</span>${metadata(item)}` +
+        `<span class="sc-fLPdud">Inspiration Mode</span><span>Off</span>` +
+        `<div class="sc-eKQYOU bdGRCs"><span aria-describedby="prompt-full-${item.position}">${esc(item.prompt)}</span></div></div>`;
+    gallery.querySelector('.close-icon').addEventListener('click', () => { gallery.className = ''; gallery.innerHTML = ''; });
+    gallery.querySelector('.download-trigger').addEventListener('click', () => {
+        gallery.querySelector('.download-menu').classList.add('open');
+    });
+    gallery.className = 'open';
+}
+
+function confirmDelete(el, item) {
+    const modal = document.createElement('div');
+    modal.className = 'ant-modal-confirm';
+    modal.innerHTML = `<span>Delete this generation?</span><button class="ant-btn">Cancel</button><button class="ant-btn">Confirm</button>`;
+    const [cancel, confirm] = modal.querySelectorAll('button');
+    cancel.addEventListener('click', () => modal.remove());
+    confirm.addEventListener('click', async () => {
+        modal.remove();
+        await fetch(`/api/delete?hash=${item.hash_id}`, {method: 'POST'});
+        el.remove();
+        maybeLoadMore();
+    });
+    document.body.appendChild(modal);
+}
+
+async function loadMore() {
+    if (loading || exhausted) return;
+    loading = true;
+    try {
+        const response = await fetch(`/api/generations?after=${lastPosition}&limit=${config.pageSize}`);
+        const data = await response.json();
+        data.items.forEach(renderContainer);
+        exhausted = !data.has_more;
+    } finally {
+        loading = false;
+    }
+    maybeLoadMore();
+}
+
+function maybeLoadMore() {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 600) loadMore();
+}
+
+window.addEventListener('scroll', maybeLoadMore, {passive: true});
+window.addEventListener('wheel', maybeLoadMore, {passive: true});
+initialItems.forEach(renderContainer);
+exhausted = initialItems.length === 0;
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic /generate gallery")
+    parser.add_argument("--items", type=int, default=10000, help="Generations in the gallery")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--api-latency-ms", type=int, default=0, help="Delay for each infinite-scroll request")
+    parser.add_argument("--download-latency-ms", type=int, default=0, help="Delay before each download starts")
+    args = parser.parse_args()
+
+    fixture = GalleryFixture(items=args.items, seed=args.seed, port=args.port,
+                             api_latency_ms=args.api_latency_ms, download_latency_ms=args.download_latency_ms)
+    with fixture:
+        print(f"🖼️ Serving {args.items} synthetic generations at {fixture.generate_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,18 +8,19 @@ __version__ = "1.0.0"
 __author__ = "Automaton Team"
 __description__ = "AI-Powered Web Automation Platform"
 
-from .core.engine import (
-    WebAutomationEngine,
-    AutomationSequenceBuilder,
-    AutomationConfig,
-    ActionType,
-    Action
-)
-
 __all__ = [
     "WebAutomationEngine",
     "AutomationSequenceBuilder", 
     "AutomationConfig",
     "ActionType",
     "Action"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # Importing any src.* module must not pull in the engine and Playwright;
+    # the engine is loaded the first time one of its exports is used
+    if name in __all__:
+        from .core import engine
+        return getattr(engine, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
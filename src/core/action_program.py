@@ -0,0 +1,230 @@
+"""Compiled action programs for web automation
+
+An ``AutomationConfig`` is compiled once into an immutable ``ActionProgram``:
+matching IF/ELIF/ELSE/IF_END and WHILE_BEGIN/WHILE_END indices are resolved
+into jump tables, block nesting is validated, and ``${variable}`` templates in
+selectors and values are pre-parsed. The engine then resolves control flow by
+index lookup instead of rescanning the action list.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from .action_types import Action, ActionType, AutomationConfig
+
+logger = logging.getLogger(__name__)
+
+VARIABLE_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+NO_JUMP = -1
+
+
+class ProgramCompileError(ValueError):
+    """Raised when an action list has invalid block nesting"""
+    pass
+
+
+@dataclass(frozen=True)
+class SubstitutionTemplate:
+    """A string split into literal text and ``${variable}`` references"""
+
+    parts: Tuple[Tuple[str, bool], ...]  # (text, is_variable)
+
+    @property
+    def has_variables(self) -> bool:
+        return any(is_variable for _, is_variable in self.parts)
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        """Substitute variables; unknown variables keep their ``${name}`` placeholder"""
+        if not self.has_variables:
+            return self.parts[0][0] if self.parts else ""
+        rendered = []
+        for text, is_variable in self.parts:
+            if is_variable:
+                rendered.append(str(variables[text]) if text in variables else "${" + text + "}")
+            else:
+                rendered.append(text)
+        return "".join(rendered)
+
+
+@lru_cache(maxsize=4096)
+def parse_template(text: str) -> SubstitutionTemplate:
+    """Parse a string into a SubstitutionTemplate (cached)"""
+    parts: List[Tuple[str, bool]] = []
+    position = 0
+    for match in VARIABLE_PATTERN.finditer(text):
+        if match.start() > position:
+            parts.append((text[position:match.start()], False))
+        parts.append((match.group(1), True))
+        position = match.end()
+    if position < len(text) or not parts:
+        parts.append((text[position:], False))
+    return SubstitutionTemplate(tuple(parts))
+
+
+def substitute(value: Any, variables: Dict[str, Any]) -> Any:
+    """Substitute variables in a string using the template cache; other values pass through"""
+    if not isinstance(value, str) or "${" not in value:
+        return value
+    return parse_template(value).render(variables)
+
+
+@dataclass(frozen=True)
+class ActionProgram:
+    """Immutable compiled form of an action list
+
+    Jump tables are indexed by action index and hold ``NO_JUMP`` where they do
+    not apply:
+
+    - ``next_branch``: IF_BEGIN/ELIF -> next ELIF, ELSE or IF_END of the same block
+    - ``block_end``: IF_BEGIN/ELIF/ELSE -> IF_END, WHILE_BEGIN -> WHILE_END
+    - ``block_start``: ELIF/ELSE/IF_END -> IF_BEGIN, WHILE_END -> WHILE_BEGIN
+    - ``enclosing_loop``: BREAK/CONTINUE -> innermost WHILE_BEGIN
+    """
+
+    actions: Tuple[Action, ...]
+    next_branch: Tuple[int, ...]
+    block_end: Tuple[int, ...]
+    block_start: Tuple[int, ...]
+    enclosing_loop: Tuple[int, ...]
+    conditions: Tuple[Optional[str], ...]
+    has_templates: Tuple[bool, ...]
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def bind(self, index: int, variables: Dict[str, Any]) -> Action:
+        """Action at ``index`` with variables substituted, leaving the compiled action untouched"""
+        action = self.actions[index]
+        if not self.has_templates[index]:
+            return action
+        return bind_action(action, variables)
+
+
+def bind_action(action: Action, variables: Dict[str, Any]) -> Action:
+    """Copy of an action with variables substituted in its selector and values"""
+    if not _uses_templates(action):
+        return action
+    value = action.value
+    if isinstance(value, str):
+        value = substitute(value, variables)
+    elif isinstance(value, dict):
+        value = {key: substitute(item, variables) for key, item in value.items()}
+    return replace(action, selector=substitute(action.selector, variables), value=value)
+
+
+def _uses_templates(action: Action) -> bool:
+    if isinstance(action.selector, str) and "${" in action.selector:
+        return True
+    if isinstance(action.value, str):
+        return "${" in action.value
+    if isinstance(action.value, dict):
+        return any(isinstance(item, str) and "${" in item for item in action.value.values())
+    return False
+
+
+def compile_actions(actions: List[Action]) -> ActionProgram:
+    """Compile an action list into an ActionProgram, validating block nesting"""
+    count = len(actions)
+    next_branch = [NO_JUMP] * count
+    block_end = [NO_JUMP] * count
+    block_start = [NO_JUMP] * count
+    enclosing_loop = [NO_JUMP] * count
+    conditions: List[Optional[str]] = [None] * count
+
+    # Each open block: [begin index, last branch index, saw ELSE, block action type]
+    stack: List[List[Any]] = []
+
+    for index, action in enumerate(actions):
+        kind = action.type
+
+        # Warm the template cache so substitution at run time is a lookup
+        for text in parse_template_sources(action):
+            if "${" in text:
+                parse_template(text)
+
+        if kind in (ActionType.IF_BEGIN, ActionType.ELIF, ActionType.WHILE_BEGIN):
+            value = action.value if isinstance(action.value, dict) else {}
+            conditions[index] = value.get("condition", "check_passed")
+
+        if kind == ActionType.IF_BEGIN:
+            stack.append([index, index, False, ActionType.IF_BEGIN])
+
+        elif kind in (ActionType.ELIF, ActionType.ELSE):
+            if not stack or stack[-1][3] != ActionType.IF_BEGIN:
+                raise ProgramCompileError(f"{kind.value.upper()} at action {index} without matching IF_BEGIN")
+            block = stack[-1]
+            if block[2]:
+                raise ProgramCompileError(f"{kind.value.upper()} at action {index} after ELSE")
+            next_branch[block[1]] = index
+            block_start[index] = block[0]
+            block[1] = index
+            block[2] = kind == ActionType.ELSE
+
+        elif kind == ActionType.IF_END:
+            if not stack or stack[-1][3] != ActionType.IF_BEGIN:
+                raise ProgramCompileError(f"IF_END at action {index} without matching IF_BEGIN")
+            begin, last_branch, _, _ = stack.pop()
+            next_branch[last_branch] = index
+            block_start[index] = begin
+            # Every branch of the block ends at this IF_END
+            branch = begin
+            while branch != index:
+                block_end[branch] = index
+                branch = next_branch[branch]
+
+        elif kind == ActionType.WHILE_BEGIN:
+            stack.append([index, index, False, ActionType.WHILE_BEGIN])
+
+        elif kind == ActionType.WHILE_END:
+            if not stack or stack[-1][3] != ActionType.WHILE_BEGIN:
+                raise ProgramCompileError(f"WHILE_END at action {index} without matching WHILE_BEGIN")
+            begin = stack.pop()[0]
+            block_end[begin] = index
+            block_start[index] = begin
+
+        elif kind in (ActionType.BREAK, ActionType.CONTINUE):
+            loop = next((block[0] for block in reversed(stack) if block[3] == ActionType.WHILE_BEGIN), None)
+            if loop is None:
+                raise ProgramCompileError(f"{kind.value.upper()} at action {index} outside of loop")
+            enclosing_loop[index] = loop
+
+    if stack:
+        begin, _, _, kind = stack[-1]
+        raise ProgramCompileError(f"{kind.value.upper()} at action {begin} is never closed")
+
+    return ActionProgram(
+        actions=tuple(actions),
+        next_branch=tuple(next_branch),
+        block_end=tuple(block_end),
+        block_start=tuple(block_start),
+        enclosing_loop=tuple(enclosing_loop),
+        conditions=tuple(conditions),
+        has_templates=tuple(_uses_templates(action) for action in actions),
+    )
+
+
+def parse_template_sources(action: Action) -> List[str]:
+    """Strings of an action that may hold ``${variable}`` references"""
+    sources = []
+    if isinstance(action.selector, str):
+        sources.append(action.selector)
+    if isinstance(action.value, str):
+        sources.append(action.value)
+    elif isinstance(action.value, dict):
+        sources.extend(item for item in action.value.values() if isinstance(item, str))
+    return sources
+
+
+def compile_config(config: AutomationConfig) -> ActionProgram:
+    """Compile an AutomationConfig, reusing the program while its action list is unchanged"""
+    cached = getattr(config, "_compiled_program", None)
+    if cached is not None and cached.actions == tuple(config.actions):
+        return cached
+    program = compile_actions(config.actions)
+    object.__setattr__(config, "_compiled_program", program)
+    logger.debug(f"Compiled {len(program)} actions for '{config.name}'")
+    return program
@@ -236,6 +236,9 @@ class AutomationConfig:
     headless: bool = True
     viewport: Optional[Dict[str, int]] = None
     keep_browser_open: bool = True
+    network_profile: str = "full"  # Request-blocking profile for the browser context
+    session_profile: Optional[str] = None  # Named profile carrying login state between runs
+    persistent_profile: bool = False       # Keep the profile as a user-data dir instead of a snapshot
     
     def __post_init__(self):
         """Validate configuration after initialization"""
@@ -265,6 +268,14 @@ class AutomationConfig:
         if self.keep_browser_open is not True:
             result["keep_browser_open"] = self.keep_browser_open
         
+        if self.network_profile != "full":
+            result["network_profile"] = self.network_profile
+        
+        if self.session_profile:
+            result["session_profile"] = self.session_profile
+            if self.persistent_profile:
+                result["persistent_profile"] = True
+        
         return result
     
     @classmethod
@@ -281,4 +292,7 @@ class AutomationConfig:
             headless=data.get("headless", True),
             viewport=data.get("viewport"),
             keep_browser_open=data.get("keep_browser_open", True),
+            network_profile=data.get("network_profile", "full"),
+            session_profile=data.get("session_profile"),
+            persistent_profile=data.get("persistent_profile", False),
         )
\ No newline at end of file
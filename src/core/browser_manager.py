@@ -3,11 +3,19 @@
 import asyncio
 import logging
 import os
-from typing import Dict, Optional, Any, List
+from typing import Awaitable, Callable, Dict, Optional, Any, List
 from dataclasses import dataclass
 
 from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
 
+try:
+    from ..utils.network_profiles import NETWORK_PROFILES, RequestBlocker, format_report, get_request_blocker
+    from ..utils.session_profiles import SessionProfile
+except ImportError:
+    # Fallback when src/ itself is on sys.path (CLI, scheduler)
+    from utils.network_profiles import NETWORK_PROFILES, RequestBlocker, format_report, get_request_blocker
+    from utils.session_profiles import SessionProfile
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +28,10 @@ class BrowserConfig:
     timeout: int = 30000
     keep_browser_open: bool = False
     browser_path: Optional[str] = None
+    network_profile: str = "full"  # Request-blocking profile for the whole context ("full", "scan", "download")
+    session_profile: Optional[str] = None  # Named profile whose login state is restored and saved
+    persistent_profile: bool = False       # Keep a user-data dir (shared disk cache) instead of a state snapshot
+    profiles_dir: Optional[str] = None     # Where session profiles live (default ~/.automaton/profiles)
     
     def __post_init__(self):
         """Validate browser config after initialization"""
@@ -31,25 +43,278 @@ class BrowserConfig:
         
         if self.timeout <= 0:
             raise ValueError("Timeout must be positive")
+        
+        if self.network_profile not in NETWORK_PROFILES:
+            raise ValueError(f"Unknown network profile '{self.network_profile}'")
+        
+        if self.session_profile is not None:
+            SessionProfile(self.session_profile, self.profiles_dir)
+
+
+@dataclass
+class BrowserPoolConfig:
+    """Configuration for a pool of warm browsers"""
+    size: int = 2                         # Browsers kept warm
+    max_uses: int = 20                    # Recycle a browser after this many leases
+    max_memory_mb: Optional[int] = 2048   # Recycle when browser processes exceed this (None = no limit)
+    health_check_timeout: float = 2.0     # Seconds allowed for the release health check
+    
+    def __post_init__(self):
+        """Validate pool config after initialization"""
+        if self.size <= 0:
+            raise ValueError("Pool size must be positive")
+        
+        if self.max_uses <= 0:
+            raise ValueError("max_uses must be positive")
+
+
+@dataclass
+class BrowserLease:
+    """A browser, context and page handed out by a BrowserPool"""
+    browser: Browser
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+
+
+class BrowserPool:
+    """Keeps warm browsers with pre-created contexts and hands out leases
+    
+    Leases are returned with ``release``: the page gets a health check and its
+    cookies, storage and open pages are reset before the lease goes back into
+    the pool. Browsers are recycled after ``max_uses`` leases, when the health
+    check fails or when browser memory exceeds ``max_memory_mb``.
+    """
+    
+    def __init__(self, config: BrowserConfig, pool_config: Optional[BrowserPoolConfig] = None):
+        self.config = config
+        self.pool_config = pool_config or BrowserPoolConfig()
+        self.playwright: Optional[Playwright] = None
+        self._idle: List[BrowserLease] = []
+        self._leased: List[BrowserLease] = []
+        self._lock = asyncio.Lock()
+        self._started = False
+    
+    async def start(self):
+        """Start Playwright and warm up ``size`` browsers"""
+        async with self._lock:
+            if self._started:
+                return
+            self.playwright = await async_playwright().start()
+            self._started = True
+            for _ in range(self.pool_config.size):
+                try:
+                    self._idle.append(await self._launch())
+                except Exception as e:
+                    logger.warning(f"Failed to warm up pooled browser: {str(e)}")
+            logger.info(f"Browser pool started with {len(self._idle)} warm browsers")
+    
+    async def acquire(self) -> BrowserLease:
+        """Lease a warm browser, launching one if none is idle"""
+        if not self._started:
+            await self.start()
+        
+        async with self._lock:
+            lease = self._idle.pop() if self._idle else None
+        if lease is None or not lease.browser.is_connected():
+            if lease is not None:
+                await self._dispose(lease)
+            lease = await self._launch()
+        
+        lease.uses += 1
+        self._leased.append(lease)
+        logger.debug(f"Leased pooled browser (use {lease.uses}/{self.pool_config.max_uses})")
+        return lease
+    
+    async def release(self, lease: BrowserLease,
+                      page_reset: Optional[Callable[[], Awaitable[Any]]] = None):
+        """Health-check and reset a lease, then return it to the pool or recycle it"""
+        if lease in self._leased:
+            self._leased.remove(lease)
+        
+        recycle_reason = None
+        if lease.uses >= self.pool_config.max_uses:
+            recycle_reason = f"reached {lease.uses} uses"
+        elif not await self._is_healthy(lease):
+            recycle_reason = "failed health check"
+        elif self._over_memory_limit():
+            recycle_reason = f"memory above {self.pool_config.max_memory_mb} MB"
+        else:
+            try:
+                if page_reset:
+                    await page_reset()
+                await self._reset_state(lease)
+            except Exception as e:
+                recycle_reason = f"state reset failed: {str(e)}"
+        
+        if recycle_reason:
+            logger.info(f"Recycling pooled browser: {recycle_reason}")
+            await self._dispose(lease)
+            if self._started and len(self._idle) + len(self._leased) < self.pool_config.size:
+                try:
+                    lease = await self._launch()
+                except Exception as e:
+                    logger.warning(f"Failed to replace recycled browser: {str(e)}")
+                    return
+            else:
+                return
+        
+        async with self._lock:
+            if self._started:
+                self._idle.append(lease)
+                return
+        await self._dispose(lease)
+    
+    async def close(self):
+        """Close every pooled browser and stop Playwright"""
+        async with self._lock:
+            leases = self._idle + self._leased
+            self._idle = []
+            self._leased = []
+            self._started = False
+        for lease in leases:
+            await self._dispose(lease)
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        logger.info("Browser pool closed")
+    
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+    
+    @property
+    def leased_count(self) -> int:
+        return len(self._leased)
+    
+    async def _launch(self) -> BrowserLease:
+        browser_options = {"headless": self.config.headless}
+        if self.config.browser_path:
+            browser_options["executable_path"] = self.config.browser_path
+        browser = await self.playwright.chromium.launch(**browser_options)
+        
+        context_options = {"viewport": self.config.viewport}
+        if self.config.user_agent:
+            context_options["user_agent"] = self.config.user_agent
+        context = await browser.new_context(**context_options)
+        
+        page = await context.new_page()
+        page.set_default_timeout(self.config.timeout)
+        return BrowserLease(browser=browser, context=context, page=page)
+    
+    async def _is_healthy(self, lease: BrowserLease) -> bool:
+        try:
+            if not lease.browser.is_connected() or lease.page.is_closed():
+                return False
+            await asyncio.wait_for(lease.page.evaluate("1 + 1"), timeout=self.pool_config.health_check_timeout)
+            return True
+        except Exception:
+            return False
+    
+    async def _reset_state(self, lease: BrowserLease):
+        """Clear cookies, storage and extra pages so the next lease starts clean"""
+        for page in list(lease.context.pages):
+            if page is not lease.page:
+                await page.close()
+        try:
+            await lease.page.evaluate("() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }")
+        except Exception as e:
+            logger.debug(f"Storage clearing failed: {str(e)}")
+        await lease.context.clear_cookies()
+        await lease.page.goto("about:blank")
+    
+    def _over_memory_limit(self) -> bool:
+        limit = self.pool_config.max_memory_mb
+        if not limit:
+            return False
+        try:
+            # Only pools with a memory limit need psutil; keep it off the startup path
+            import psutil
+        except ImportError:
+            return False
+        try:
+            total = 0
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / 1024 / 1024 > limit
+        except Exception:
+            return False
+    
+    async def _dispose(self, lease: BrowserLease):
+        try:
+            await lease.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser: {str(e)}")
+
+
+_browser_pools: Dict[tuple, BrowserPool] = {}
+
+
+def _pool_key(config: BrowserConfig) -> tuple:
+    viewport = config.viewport or {}
+    return (config.headless, viewport.get("width"), viewport.get("height"),
+            config.user_agent, config.timeout, config.browser_path)
+
+
+def get_browser_pool(config: BrowserConfig, pool_config: Optional[BrowserPoolConfig] = None) -> BrowserPool:
+    """Return the process-wide pool for a browser configuration, creating it on first use"""
+    key = _pool_key(config)
+    pool = _browser_pools.get(key)
+    if pool is None:
+        pool = BrowserPool(config, pool_config)
+        _browser_pools[key] = pool
+    return pool
+
+
+async def close_browser_pools():
+    """Close every process-wide browser pool"""
+    pools = list(_browser_pools.values())
+    _browser_pools.clear()
+    for pool in pools:
+        await pool.close()
+
 
 
 class BrowserManager:
     """Manages browser lifecycle and operations"""
     
-    def __init__(self, config: BrowserConfig):
-        """Initialize browser manager with configuration"""
+    def __init__(self, config: BrowserConfig, pool: Optional[BrowserPool] = None):
+        """Initialize browser manager with configuration
+        
+        With a ``pool``, ``initialize`` leases a warm browser instead of
+        launching one and ``close`` returns it to the pool.
+        """
         self.config = config
+        self.pool = pool
+        self.lease: Optional[BrowserLease] = None
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.request_blocker: Optional[RequestBlocker] = None
+        self.session_profile: Optional[SessionProfile] = None
+        if config.session_profile:
+            self.session_profile = SessionProfile(config.session_profile, config.profiles_dir,
+                                                  persistent=config.persistent_profile)
+        self.session_restored = False  # True when the context started with a saved login state
         self._is_initialized = False
     
+    @property
+    def pooled(self) -> bool:
+        """True when browsers are leased from a BrowserPool"""
+        return self.pool is not None
+    
     async def initialize(self) -> bool:
         """Initialize browser and context"""
         try:
             logger.info("Initializing browser manager")
             
+            if self.pool is not None:
+                return await self._initialize_from_pool()
+            
             # Start Playwright
             self.playwright = await async_playwright().start()
             
@@ -61,8 +326,6 @@ class BrowserManager:
             if self.config.browser_path:
                 browser_options["executable_path"] = self.config.browser_path
             
-            self.browser = await self.playwright.chromium.launch(**browser_options)
-            
             # Create browser context
             context_options = {
                 "viewport": self.config.viewport,
@@ -71,14 +334,28 @@ class BrowserManager:
             if self.config.user_agent:
                 context_options["user_agent"] = self.config.user_agent
             
-            self.context = await self.browser.new_context(**context_options)
-            
-            # Create page
-            self.page = await self.context.new_page()
+            if self.session_profile is not None and self.session_profile.persistent:
+                await self._launch_persistent_context(browser_options, context_options)
+            else:
+                self.browser = await self.playwright.chromium.launch(**browser_options)
+                
+                if self.session_profile is not None:
+                    state = self.session_profile.load_storage_state()
+                    if state is not None:
+                        context_options["storage_state"] = state
+                        self.session_restored = True
+                
+                self.context = await self.browser.new_context(**context_options)
+                
+                # Create page
+                self.page = await self.context.new_page()
             
             # Set default timeout
             self.page.set_default_timeout(self.config.timeout)
             
+            if self.config.network_profile != "full":
+                await self.set_network_profile(self.config.network_profile)
+            
             self._is_initialized = True
             logger.info("Browser manager initialized successfully")
             return True
@@ -88,9 +365,89 @@ class BrowserManager:
             await self.close()
             return False
     
+    async def _launch_persistent_context(self, browser_options: Dict[str, Any], context_options: Dict[str, Any]):
+        """Open the session profile's user-data dir; its cookies, storage and disk cache carry over"""
+        profile = self.session_profile
+        self.session_restored = profile.has_saved_session()
+        profile.prepare()
+        self.context = await self.playwright.chromium.launch_persistent_context(
+            str(profile.user_data_dir), args=profile.launch_args(), **browser_options, **context_options)
+        # Persistent contexts have no separate Browser object; close() closes the context
+        self.browser = self.context.browser
+        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        logger.info(f"Persistent session profile '{profile.name}' opened "
+                    f"({'saved session' if self.session_restored else 'new profile'})")
+    
+    async def _initialize_from_pool(self) -> bool:
+        """Lease a warm browser, context and page from the pool"""
+        if self.lease is None:
+            self.lease = await self.pool.acquire()
+        self.playwright = self.pool.playwright
+        self.browser = self.lease.browser
+        self.context = self.lease.context
+        self.page = self.lease.page
+        
+        if self.session_profile is not None:
+            await self._restore_pooled_session()
+        
+        if self.config.network_profile != "full":
+            await self.set_network_profile(self.config.network_profile)
+        
+        self._is_initialized = True
+        logger.info("Browser manager initialized from pool (warm browser reused)")
+        return True
+    
+    async def _restore_pooled_session(self):
+        """Add the profile's saved cookies to a leased context (its localStorage is not restored)"""
+        if self.session_profile.persistent:
+            logger.warning("Pooled browsers cannot open a persistent profile; using its state snapshot")
+        state = self.session_profile.load_storage_state()
+        if not state or not state.get("cookies"):
+            return
+        try:
+            await self.context.add_cookies(state["cookies"])
+            self.session_restored = True
+        except Exception as e:
+            logger.warning(f"Could not restore session profile '{self.session_profile.name}': {e}")
+    
+    async def save_session(self, reason: str = "") -> bool:
+        """Snapshot the context's login state into the session profile"""
+        if self.session_profile is None or self.context is None:
+            return False
+        return await self.session_profile.save(self.context, reason)
+    
+    async def release(self, page_reset: Optional[Callable[[], Awaitable[Any]]] = None):
+        """Return a pooled lease; ``page_reset`` runs before cookies and storage are cleared"""
+        if self.lease is None:
+            return
+        # Saved before the pool clears the lease's cookies and storage
+        await self.save_session("end of run")
+        self.session_restored = False
+        # The pooled context is reused by the next lease with its own profile
+        await self._detach_request_blocker()
+        lease = self.lease
+        self.lease = None
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self._is_initialized = False
+        await self.pool.release(lease, page_reset=page_reset)
+        logger.info("Browser lease returned to pool")
+    
     async def close(self):
         """Close browser and cleanup resources"""
+        if self.pool is not None:
+            if not self.config.keep_browser_open:
+                await self.release()
+            return
+        
         try:
+            if not self.config.keep_browser_open:
+                await self._detach_request_blocker()
+                await self.save_session("end of run")
+                self.session_restored = False
+            
             if self.page and not self.config.keep_browser_open:
                 await self.page.close()
                 self.page = None
@@ -113,6 +470,44 @@ class BrowserManager:
         except Exception as e:
             logger.error(f"Error closing browser manager: {str(e)}")
     
+    async def close_browser(self):
+        """Close the browser regardless of keep_browser_open"""
+        if self.pool is not None:
+            await self.release()
+            return
+        keep_browser_open = self.config.keep_browser_open
+        self.config.keep_browser_open = False
+        try:
+            await self.close()
+        finally:
+            self.config.keep_browser_open = keep_browser_open
+    
+    async def set_network_profile(self, name: str) -> Optional[str]:
+        """Switch the context's request-blocking profile; returns the previous one"""
+        if self.context is None:
+            return None
+        self.request_blocker = get_request_blocker(self.context)
+        return await self.request_blocker.set_profile(name)
+    
+    def network_report(self) -> Dict[str, Dict[str, Any]]:
+        """Blocked requests and estimated bytes saved per profile on this context"""
+        return self.request_blocker.report() if self.request_blocker else {}
+    
+    async def _detach_request_blocker(self):
+        if self.request_blocker is None:
+            return
+        report = self.network_report()
+        if any(stats["blocked_requests"] for stats in report.values()):
+            logger.info(format_report(report))
+        await self.request_blocker.detach()
+        self.request_blocker = None
+    
+    async def create_new_browser(self) -> bool:
+        """Close the current browser (if any) and initialize a fresh one"""
+        if self.is_initialized():
+            await self.close_browser()
+        return await self.initialize()
+    
     async def cleanup(self, close_browser: bool = True):
         """Cleanup browser resources - alias for close method"""
         try:
@@ -120,6 +515,7 @@ class BrowserManager:
                 await self.close()
             else:
                 # Just reset the initialization state but keep browser open
+                await self.save_session("end of run")
                 self._is_initialized = False
                 logger.info("Browser manager cleanup completed")
         except Exception as e:
@@ -127,9 +523,11 @@ class BrowserManager:
     
     def is_initialized(self) -> bool:
         """Check if browser manager is initialized"""
+        # A persistent session profile's context has no separate Browser object
+        persistent = self.session_profile is not None and self.session_profile.persistent and self.lease is None
         return self._is_initialized and all([
             self.playwright is not None,
-            self.browser is not None,
+            self.browser is not None or persistent,
             self.context is not None,
             self.page is not None
         ])
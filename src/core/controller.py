@@ -7,6 +7,7 @@ Centralized control for automation execution with RUN/PAUSE/STOP functionality
 import asyncio
 import json
 import logging
+import os
 from pathlib import Path
 from datetime import datetime
 from enum import Enum
@@ -49,8 +50,11 @@ class AutomationCheckpoint:
         checkpoint_dir.mkdir(parents=True, exist_ok=True)
         checkpoint_file = checkpoint_dir / f"{self.checkpoint_id}.json"
         
-        with open(checkpoint_file, 'w') as f:
-            json.dump(asdict(self), f, indent=2)
+        # Write beside the target and swap in, so a crash mid-write keeps the previous checkpoint
+        temporary = checkpoint_file.with_name(checkpoint_file.name + ".tmp")
+        with open(temporary, 'w') as f:
+            json.dump(asdict(self), f, indent=2, default=str)
+        os.replace(temporary, checkpoint_file)
         
         return checkpoint_file
 
@@ -202,9 +206,10 @@ class AutomationController:
 
     def save_checkpoint(self, config_name: str, action_index: int, 
                        variables: Dict[str, Any], execution_context: Dict[str, Any],
-                       browser_state: Optional[Dict[str, Any]] = None) -> str:
-        """Save execution checkpoint"""
-        checkpoint_id = f"{config_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                       browser_state: Optional[Dict[str, Any]] = None,
+                       checkpoint_id: Optional[str] = None) -> str:
+        """Save execution checkpoint (overwriting ``checkpoint_id`` when given)"""
+        checkpoint_id = checkpoint_id or f"{config_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         checkpoint = AutomationCheckpoint(
             config_name=config_name,
@@ -219,7 +224,7 @@ class AutomationController:
         checkpoint.to_file(self.checkpoint_dir)
         self.current_checkpoint = checkpoint
         
-        logger.info(f"Checkpoint saved: {checkpoint_id}")
+        logger.debug(f"Checkpoint saved: {checkpoint_id} (action {action_index})")
         return checkpoint_id
 
     def load_checkpoint(self, checkpoint_id: str) -> Optional[AutomationCheckpoint]:
@@ -239,6 +244,21 @@ class AutomationController:
             logger.error(f"Failed to load checkpoint {checkpoint_id}: {e}")
             return None
 
+    def delete_checkpoint(self, checkpoint_id: str) -> bool:
+        """Delete one checkpoint file"""
+        checkpoint_file = self.checkpoint_dir / f"{checkpoint_id}.json"
+        try:
+            checkpoint_file.unlink()
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Failed to delete checkpoint {checkpoint_id}: {e}")
+            return False
+        if self.current_checkpoint and self.current_checkpoint.checkpoint_id == checkpoint_id:
+            self.current_checkpoint = None
+        logger.debug(f"Deleted checkpoint: {checkpoint_id}")
+        return True
+
     def cleanup_checkpoints(self, config_name: Optional[str] = None):
         """Clean up checkpoint files"""
         pattern = f"{config_name}_*.json" if config_name else "*.json"
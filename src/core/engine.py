@@ -2,6 +2,7 @@
 # Core automation engine with modular action system
 
 import asyncio
+import hashlib
 import json
 import time
 from pathlib import Path
@@ -15,8 +16,10 @@ import os
 
 # Import new modular components
 from .action_types import ActionType, Action, AutomationConfig
-from .execution_context import ExecutionContext, BlockInfo
-from .browser_manager import BrowserManager, BrowserConfig
+from .execution_context import ExecutionContext, BlockInfo, BlockType
+from .action_program import ActionProgram, bind_action, compile_config, substitute
+from .browser_manager import BrowserManager, BrowserConfig, BrowserPool
+from .page_health import PageHealthMonitor
 
 # Configure logging first
 logging.basicConfig(level=logging.INFO)
@@ -28,13 +31,14 @@ try:
     CREDENTIAL_MANAGER_AVAILABLE = True
 except ImportError:
     try:
-        # Fallback for different import contexts
-        from src.utils.credential_manager import get_credential_manager, resolve_credential_path
+        # Fallback when src/ itself is on sys.path (CLI, scheduler); tried before
+        # the src package so its __init__ is not imported a second time
+        from utils.credential_manager import get_credential_manager, resolve_credential_path
         CREDENTIAL_MANAGER_AVAILABLE = True
     except ImportError:
         try:
             # Another fallback
-            from utils.credential_manager import get_credential_manager, resolve_credential_path
+            from src.utils.credential_manager import get_credential_manager, resolve_credential_path
             CREDENTIAL_MANAGER_AVAILABLE = True
         except ImportError:
             CREDENTIAL_MANAGER_AVAILABLE = False
@@ -49,14 +53,15 @@ except ImportError:
     PERFORMANCE_MONITORING_AVAILABLE = False
     logger.warning("Performance monitoring not available")
 
-# Import download manager
+# Import span tracing (Chrome trace timeline of actions and control flow)
 try:
-    from utils.download_manager import DownloadManager, DownloadConfig, create_download_manager
-
-    DOWNLOAD_MANAGER_AVAILABLE = True
+    from ..utils.span_tracer import get_tracer, trace_span
+    from ..utils.session_profiles import login_form_visible
+    from ..utils.selector_cache import SelectorStrategyCache, site_key
 except ImportError:
-    DOWNLOAD_MANAGER_AVAILABLE = False
-    logger.warning("Download manager not available")
+    from utils.span_tracer import get_tracer, trace_span
+    from utils.session_profiles import login_form_visible
+    from utils.selector_cache import SelectorStrategyCache, site_key
 
 
 class SecurityError(Exception):
@@ -94,7 +99,7 @@ except ImportError:
 class WebAutomationEngine(GenerationDownloadHandlers):
     """Core automation engine for web interactions"""
 
-    def __init__(self, config: AutomationConfig, controller=None):
+    def __init__(self, config: AutomationConfig, controller=None, browser_pool: Optional[BrowserPool] = None):
         # Initialize parent class
         super().__init__()
         
@@ -104,30 +109,67 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         )  # Default to keeping browser open
         self.variables = {}  # Store variables for dynamic substitution
         self.loop_stack = []  # Stack for nested loops
+        self.program: Optional[ActionProgram] = None  # Compiled actions, set by run_automation
         self.log_files = {}  # Cache for log file handles
         self._outputs = {}  # Store outputs for analysis
         
         # Control system integration
         self.controller = controller
         
+        # Checkpoints (saved through the controller): run state to resume from after a crash
+        self.config_file: Optional[str] = None  # recorded so `run --resume` can reload the config
+        self.checkpoint_id: Optional[str] = None
+        self.resume_checkpoint = None  # AutomationCheckpoint to continue from, see resume_from()
+        self.generation_progress: Optional[Dict[str, Any]] = None  # last generation download logged
+        self._run_state = None  # (ExecutionContext, results) of the running program
+        self._program_fingerprint: Optional[str] = None
+        self._last_checkpoint_time = 0.0
+        self._actions_since_checkpoint = 0
+        
         # Initialize browser manager
         browser_config = BrowserConfig(
             headless=config.headless,
             viewport=config.viewport,
-            keep_browser_open=self.keep_browser_open
+            keep_browser_open=self.keep_browser_open,
+            network_profile=getattr(config, "network_profile", "full"),
+            session_profile=getattr(config, "session_profile", None),
+            persistent_profile=getattr(config, "persistent_profile", False)
         )
-        self.browser_manager = BrowserManager(browser_config)
+        # With a browser pool, initialize() leases a warm browser instead of launching one
+        self.browser_manager = BrowserManager(browser_config, pool=browser_pool)
+        # Page liveness from crash/close/navigation events instead of per-action probes
+        self.page_health = PageHealthMonitor()
         
-        # Initialize download manager
-        self.download_manager = None
-        if DOWNLOAD_MANAGER_AVAILABLE:
-            self.download_manager = create_download_manager()
-            logger.info(f"Download manager initialized: {self.download_manager.config.base_download_path}")
+        # Which fallback strategy found each selector on this site, persisted across runs
+        self._selector_cache = None
+        
+        # Download manager (and aiofiles) load on the first DOWNLOAD_FILE action
+        self._download_manager = None
+        self._download_manager_loaded = False
         
         # Initialize generation downloads if available
         if GENERATION_DOWNLOAD_AVAILABLE:
             self.__init_generation_downloads__()
 
+    @property
+    def download_manager(self):
+        """Enhanced download manager, created on first use (None if unavailable)"""
+        if not self._download_manager_loaded:
+            self._download_manager_loaded = True
+            try:
+                from utils.download_manager import create_download_manager
+            except ImportError:
+                logger.warning("Download manager not available")
+            else:
+                self._download_manager = create_download_manager()
+                logger.info(f"Download manager initialized: {self._download_manager.config.base_download_path}")
+        return self._download_manager
+
+    @download_manager.setter
+    def download_manager(self, manager):
+        self._download_manager = manager
+        self._download_manager_loaded = True
+
     # Control Methods
     async def check_control_signals(self):
         """Check for control signals (pause/stop) if controller is available"""
@@ -155,17 +197,105 @@ class WebAutomationEngine(GenerationDownloadHandlers):
 
     def substitute_variables(self, value):
         """Replace variable placeholders in value strings with actual variable values"""
-        if not isinstance(value, str):
-            return value
-        
-        import re
-        # Replace ${variable_name} with actual values
-        def replace_var(match):
-            var_name = match.group(1)
-            return str(self.variables.get(var_name, match.group(0)))
+        # Templates are parsed once and cached; unknown variables keep their ${name} placeholder
+        return substitute(value, self.variables)
+
+    # Selector strategy cache location (None: $AUTOMATON_SELECTOR_CACHE_DIR or ~/.automaton/selector_cache)
+    selector_cache_dir: Optional[str] = None
+    cached_selector_timeout = 1000  # ms allowed for the remembered strategy before the full chain
+    
+    # Checkpoint Methods
+    checkpoint_every_actions = 25
+    checkpoint_every_seconds = 30.0
+    
+    def resume_from(self, checkpoint):
+        """Continue the next run_automation() from a saved checkpoint"""
+        self.resume_checkpoint = checkpoint
+        self.checkpoint_id = checkpoint.checkpoint_id
+    
+    @staticmethod
+    def program_fingerprint(config: AutomationConfig) -> str:
+        """Hash of the action list; a checkpoint only resumes the program it was taken from"""
+        actions = json.dumps([action.to_dict() for action in config.actions], sort_keys=True, default=str)
+        return hashlib.sha256(actions.encode("utf-8")).hexdigest()
+    
+    def _restore_from_checkpoint(self, results: Dict[str, Any]) -> ExecutionContext:
+        """Execution context, variables and completed outputs of the checkpoint being resumed"""
+        checkpoint = self.resume_checkpoint
+        saved = checkpoint.execution_context or {}
+        fingerprint = saved.get("program_fingerprint")
+        if fingerprint and fingerprint != self._program_fingerprint:
+            raise ValueError(f"Checkpoint {checkpoint.checkpoint_id} was taken from a different "
+                             f"version of '{checkpoint.config_name}'; actions have changed since")
+        context = ExecutionContext.from_dict(saved.get("context", {}))
+        context.instruction_pointer = checkpoint.action_index
+        self.variables.update(checkpoint.variables or {})
+        results["actions_completed"] = saved.get("actions_completed", 0)
+        results["outputs"].update(saved.get("outputs_summary", {}))
+        results["resumed_from"] = {"checkpoint_id": checkpoint.checkpoint_id,
+                                   "action_index": checkpoint.action_index,
+                                   "timestamp": checkpoint.timestamp}
+        self.generation_progress = saved.get("generation_progress")
+        self.resume_checkpoint = None
+        logger.info(f"⏩ Resuming '{checkpoint.config_name}' at action {checkpoint.action_index + 1} "
+                    f"from checkpoint {checkpoint.checkpoint_id}")
+        if self.generation_progress:
+            logger.info(f"⏩ Generation downloads continue after {self.generation_progress.get('creation_time')} "
+                        f"(container {self.generation_progress.get('hash_id')})")
+        return context
+    
+    def _checkpoint(self, force: bool = False) -> Optional[str]:
+        """Save the run state every checkpoint_every_actions actions or checkpoint_every_seconds
         
-        # Replace ${variable} patterns
-        return re.sub(r'\$\{([^}]+)\}', replace_var, value)
+        Cheap by design: instruction pointer, block stack and variables, plus
+        outputs cut down to a short summary; the page itself is not captured,
+        a resumed run starts from a freshly initialized one.
+        """
+        if not self.controller or self._run_state is None:
+            return None
+        now = time.monotonic()
+        if not force and self._actions_since_checkpoint < self.checkpoint_every_actions \
+                and now - self._last_checkpoint_time < self.checkpoint_every_seconds:
+            return None
+        context, results = self._run_state
+        saved_context = context.to_dict()
+        saved_context.pop("outputs", None)
+        try:
+            self.checkpoint_id = self.controller.save_checkpoint(
+                config_name=self.config.name,
+                action_index=context.instruction_pointer,
+                variables=dict(self.variables),
+                execution_context={
+                    "context": saved_context,
+                    "actions_completed": results["actions_completed"],
+                    "outputs_summary": {key: self._summarize_output(value)
+                                        for key, value in results["outputs"].items()},
+                    "generation_progress": self.generation_progress,
+                    "program_fingerprint": self._program_fingerprint,
+                    "config_file": self.config_file,
+                },
+                browser_state={"url": self.page.url if self.page else None},
+                checkpoint_id=self.checkpoint_id,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to save checkpoint: {e}")
+            return None
+        self._last_checkpoint_time = now
+        self._actions_since_checkpoint = 0
+        return self.checkpoint_id
+    
+    @staticmethod
+    def _summarize_output(value, limit: int = 200):
+        if isinstance(value, (bool, int, float)) or value is None:
+            return value
+        text = value if isinstance(value, str) else json.dumps(value, default=str)
+        return text if len(text) <= limit else text[:limit] + "…"
+    
+    def _on_generation_progress(self, progress: Dict[str, Any]):
+        """Generation download manager callback: a container's download was logged"""
+        self.generation_progress = progress
+        self._actions_since_checkpoint += 1
+        self._checkpoint()
 
     async def initialize(self):
         """Initialize browser and page using BrowserManager"""
@@ -176,6 +306,7 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         self.browser = self.browser_manager.browser
         self.page = self.browser_manager.page
         self.context = self.browser_manager.context
+        self.page_health.attach(self.page)
         logger.info("Browser manager initialized successfully")
 
     async def _create_new_browser(self):
@@ -185,6 +316,7 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         self.browser = self.browser_manager.browser
         self.page = self.browser_manager.page
         self.context = self.browser_manager.context
+        self.page_health.attach(self.page)
         logger.info("Browser instance created successfully")
 
     async def _reset_page_state(self):
@@ -233,68 +365,65 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         except Exception as e:
             logger.warning(f"⚠️ Page state reset failed: {e}, continuing anyway...")
 
-    async def _find_element_with_fallback(self, selector: str, timeout: int = 10000):
-        """Find element with fallback strategies for state-dependent selectors"""
-        logger.info(f"🔍 Finding element with fallback strategies: {selector}")
+    @property
+    def selector_cache(self):
+        """Per-site selector strategy cache, opened on first use"""
+        if self._selector_cache is None:
+            self._selector_cache = SelectorStrategyCache(site_key(self.config.url), self.selector_cache_dir)
+        return self._selector_cache
 
-        # Strategy 1: Try original selector first
-        try:
-            logger.info("Strategy 1: Trying original selector...")
-            element = await self.page.wait_for_selector(selector, timeout=3000, state="attached")
-            if element:
-                logger.info("✅ Original selector worked")
-                return element, selector
-        except Exception as e:
-            logger.debug(f"Original selector failed: {e}")
+    async def _find_element_with_fallback(self, selector: str, timeout: int = 10000):
+        """Find element with fallback strategies for state-dependent selectors
 
-        # Strategy 2: Handle state-dependent classes (e.g., ant-popover-open)
+        The strategy that found the selector last time on this site (see
+        selector_cache) is tried first with a short timeout, so a selector
+        that needs a fallback no longer waits out the ones before it. A cached
+        popover strategy clicks its trigger, which closes a popover that is
+        already open, so the selector as written is probed before replaying it.
+        """
+        logger.info(f"🔍 Finding element with fallback strategies: {selector}")
+        cache = self.selector_cache
+
+        known = cache.winner(selector)
+        if known and known.strategy == "popover":
+            found = await self._try_selector_strategy("original", selector, self.cached_selector_timeout)
+            if found:
+                logger.info("✅ Popover already open, cached trigger click skipped")
+                return found
+        if known:
+            logger.info(f"Cached strategy: trying {known.strategy} ({known.selector})...")
+            found = await self._try_selector_strategy(known.strategy, selector, self.cached_selector_timeout)
+            if found:
+                logger.info(f"✅ Cached {known.strategy} strategy worked")
+                return found
+            cache.record_miss(selector)
+
+        # Strategy 1: original selector; strategies 2-3 handle state-dependent classes (e.g. ant-popover-open)
+        strategies = ["original"]
         if "ant-popover-open" in selector:
-            logger.info("Strategy 2: Detected state-dependent selector, trying alternatives...")
-            # Remove state-dependent class and try parent element
-            base_selector = selector.replace(".ant-popover-open", "").replace(" > span", "")
-            try:
-                # First try without the state class
-                alt_selector = base_selector + " span"
-                logger.info(f"Trying alternative: {alt_selector}")
-                element = await self.page.wait_for_selector(
-                    alt_selector, timeout=2000, state="attached"
-                )
-                if element:
-                    logger.info("✅ Alternative selector worked")
-                    return element, alt_selector
-            except Exception as e:
-                logger.debug(f"Alternative selector failed: {e}")
-
-            # Try triggering the popover first, then use original selector
-            try:
-                logger.info("Strategy 3: Trying to trigger popover state...")
-                trigger_selector = base_selector.split(" > ")[0]  # Get the parent element
-                trigger_element = await self.page.wait_for_selector(trigger_selector, timeout=2000)
-                if trigger_element:
-                    # Click to trigger popover
-                    await trigger_element.click()
-                    await asyncio.sleep(0.5)  # Wait for popover to open
-                    # Now try original selector
-                    element = await self.page.wait_for_selector(
-                        selector, timeout=2000, state="attached"
-                    )
-                    if element:
-                        logger.info("✅ Popover trigger strategy worked")
-                        return element, selector
-            except Exception as e:
-                logger.debug(f"Popover trigger strategy failed: {e}")
+            logger.info("Detected state-dependent selector, alternatives enabled")
+            strategies += ["alternative", "popover"]
+        for strategy in strategies:
+            found = await self._try_selector_strategy(strategy, selector)
+            if found:
+                if strategy != "original":
+                    cache.record_success(selector, strategy, found[1])
+                elif known and known.strategy == "popover":
+                    # The cached trigger click opened it, only slower than the short timeout
+                    cache.record_success(selector, "popover", found[1])
+                else:
+                    cache.forget(selector)
+                return found
 
-        # Strategy 4: Try text-based selection as last resort
+        # Strategy 4: Try text-based selection as last resort (never cached: it matches any visible span)
         if "span" in selector:
             logger.info("Strategy 4: Trying text-based span selection...")
             try:
-                # Look for clickable spans
-                spans = await self.page.query_selector_all("span")
+                # Visibility is filtered by the selector engine in one round trip
+                spans = await self.page.query_selector_all("span:visible")
                 for span in spans:
                     try:
-                        is_visible = await span.is_visible()
-                        is_enabled = await span.is_enabled()
-                        if is_visible and is_enabled:
+                        if await span.is_enabled():
                             logger.info("✅ Found clickable span as fallback")
                             return span, "span[visible]"
                     except:
@@ -306,22 +435,80 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         logger.error(f"❌ All fallback strategies failed for selector: {selector}")
         raise Exception(f"Element not found with any strategy: {selector}")
 
+    async def _try_selector_strategy(self, strategy: str, selector: str, timeout: Optional[int] = None):
+        """(element, selector used) found by one fallback strategy, or None
+
+        ``timeout`` (ms) overrides the strategy's own wait.
+        """
+        base_selector = selector.replace(".ant-popover-open", "").replace(" > span", "")
+        try:
+            if strategy == "original":
+                logger.info("Strategy 1: Trying original selector...")
+                element = await self.page.wait_for_selector(selector, timeout=timeout or 3000, state="attached")
+                if element:
+                    logger.info("✅ Original selector worked")
+                    return element, selector
+            elif strategy == "alternative":
+                # Without the state class
+                alt_selector = base_selector + " span"
+                logger.info(f"Strategy 2: Trying alternative: {alt_selector}")
+                element = await self.page.wait_for_selector(alt_selector, timeout=timeout or 2000, state="attached")
+                if element:
+                    logger.info("✅ Alternative selector worked")
+                    return element, alt_selector
+            elif strategy == "popover":
+                logger.info("Strategy 3: Trying to trigger popover state...")
+                trigger_selector = base_selector.split(" > ")[0]  # Get the parent element
+                trigger_element = await self.page.wait_for_selector(trigger_selector, timeout=timeout or 2000)
+                if trigger_element:
+                    # Click to trigger popover
+                    await trigger_element.click()
+                    await asyncio.sleep(0.5)  # Wait for popover to open
+                    # Now try original selector
+                    element = await self.page.wait_for_selector(selector, timeout=timeout or 2000, state="attached")
+                    if element:
+                        logger.info("✅ Popover trigger strategy worked")
+                        return element, selector
+            else:
+                logger.debug(f"Unknown selector strategy: {strategy}")
+        except Exception as e:
+            logger.debug(f"{strategy} strategy failed for {selector}: {e}")
+        return None
+
     async def cleanup(self, close_browser=True):
         """Clean up browser resources using BrowserManager
         Args:
             close_browser: If False, keeps browser and page open after automation
         """
+        self.page_health.detach()
+        if self.browser_manager.pooled:
+            # Pooled browsers stay warm in the pool; reset the page before handing it back
+            await self.browser_manager.release(page_reset=self._reset_page_state)
+            self.browser = None
+            self.page = None
+            self.context = None
+            return
         await self.browser_manager.cleanup(close_browser=close_browser)
 
     async def close_browser(self):
         """Manually close the browser and clean up resources using BrowserManager"""
         logger.info("Manually closing browser...")
+        self.page_health.detach()
         await self.browser_manager.close_browser()
         # Clear references so next run creates new browser
         self.browser = None
         self.page = None
         self.context = None
 
+    async def _saved_session_valid(self, login_data: dict) -> bool:
+        """True when the context started from a saved session and the login form is not shown"""
+        if self.browser_manager.session_profile is None or not self.browser_manager.session_restored:
+            return False
+        form_visible = await login_form_visible(self.page, login_data)
+        if form_visible:
+            logger.info("Saved session expired - logging in again")
+        return form_visible is False
+
     def _resolve_credentials(self, login_data: dict) -> tuple:
         """
         Resolve credentials from secure storage or fallback to plaintext
@@ -454,65 +641,37 @@ class WebAutomationEngine(GenerationDownloadHandlers):
     async def execute_action(self, action: Action) -> Any:
         """Execute a single action"""
         logger.info(f"Executing action: {action.type.value} - {action.description or ''}")
-        logger.info(f"Action selector: {action.selector}")
-        logger.info(f"Action value: {action.value}")
-        logger.info(f"Action timeout: {action.timeout}")
+        logger.debug(f"Action selector: {action.selector}, value: {action.value}, timeout: {action.timeout}")
         try:
-            # Pre-action debugging information
-            logger.info(f"Current page URL: {self.page.url}")
-            try:
-                page_title = await asyncio.wait_for(self.page.title(), timeout=3.0)
-                logger.info(f"Page title: {page_title}")
-            except asyncio.TimeoutError:
-                logger.warning("Page title retrieval timed out")
-            except Exception as e:
-                logger.warning(f"Could not get page title: {e}")
-            # Check if page is still responsive
-            try:
-                await asyncio.wait_for(self.page.evaluate("1 + 1"), timeout=2.0)
-                logger.info("Page is responsive")
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.warning(f"Page responsiveness check failed: {e}")
-                # Try to recover with shorter timeout
-                try:
-                    logger.info("Attempting to refresh page state...")
-                    await asyncio.wait_for(
-                        self.page.wait_for_load_state("domcontentloaded", timeout=3000), timeout=5.0
-                    )
-                    logger.info("Page state refreshed")
-                except Exception as recovery_error:
-                    logger.warning(f"Page recovery failed: {recovery_error}, continuing anyway...")
-            # Track performance if monitoring is available
-            if PERFORMANCE_MONITORING_AVAILABLE:
-                async with track_performance(action.type.value, action.description):
+            # Cached liveness check; probes only after a navigation or a failed action
+            await self.page_health.ensure_ready(self.page)
+            with trace_span(action.type.value, "action", description=action.description or ""):
+                # Track performance if monitoring is available
+                if PERFORMANCE_MONITORING_AVAILABLE:
+                    async with track_performance(action.type.value, action.description):
+                        return await self._execute_single_action(action)
+                else:
                     return await self._execute_single_action(action)
-            else:
-                return await self._execute_single_action(action)
         except Exception as e:
+            self.page_health.mark_failed()
             logger.error(f"Error executing action {action.type.value}: {e}")
             raise
 
     async def _execute_single_action(self, action):
         """Execute a single action with performance tracking"""
         try:
-            # Apply variable substitution to action values
-            if hasattr(action, 'value') and action.value:
-                if isinstance(action.value, str):
-                    action.value = self.substitute_variables(action.value)
-                elif isinstance(action.value, dict):
-                    # Handle dict values like in CHECK_ELEMENT
-                    for key, value in action.value.items():
-                        if isinstance(value, str):
-                            action.value[key] = self.substitute_variables(value)
-            
-            if hasattr(action, 'selector') and action.selector:
-                action.selector = self.substitute_variables(action.selector)
+            # Apply variable substitution to a copy so the configured templates stay intact
+            action = bind_action(action, self.variables)
                 
             if action.type == ActionType.LOGIN:
                 # Handle login action with secure credential support
                 # Expected value format: {"credential_id": "id", "username_selector": "#username", "password_selector": "#password", "submit_selector": "#login-btn"}
                 # OR legacy: {"username": "user", "password": "pass", "username_selector": "#username", "password_selector": "#password", "submit_selector": "#login-btn"}
                 login_data = action.value
+                # A session restored from the profile makes the login form unnecessary
+                if await self._saved_session_valid(login_data):
+                    logger.info(f"🔓 Session profile '{self.browser_manager.session_profile.name}' still logged in - skipping LOGIN")
+                    return {"login_skipped": True, "session_profile": self.browser_manager.session_profile.name}
                 # Resolve credentials securely
                 username, password = self._resolve_credentials(login_data)
                 # Fill username field
@@ -527,6 +686,7 @@ class WebAutomationEngine(GenerationDownloadHandlers):
                 await self.page.click(login_data["submit_selector"], timeout=action.timeout)
                 # Wait for navigation or login completion
                 await self.page.wait_for_load_state("domcontentloaded", timeout=30000)
+                await self.browser_manager.save_session("after login")
             elif action.type == ActionType.EXPAND_DIALOG:
                 await self.page.click(action.selector, timeout=action.timeout)
                 await self.page.wait_for_load_state("domcontentloaded", timeout=30000)
@@ -1222,17 +1382,16 @@ class WebAutomationEngine(GenerationDownloadHandlers):
                     logger.warning("Element is disabled, but attempting click anyway...")
                 # Attempt to click the element
                 logger.info(f"Attempting to click element: {selector}")
+                navigations_before = self.page_health.navigation_count
                 await element.click(timeout=action.timeout, force=True)
                 logger.info("Click completed successfully")
 
-                # Wait for any page changes with smart waiting
-                async def check_page_ready():
+                # Only a click that navigated the main frame needs to wait for the load
+                if self.page_health.navigation_count != navigations_before:
                     try:
-                        return await self.page.evaluate("document.readyState === 'complete'")
-                    except:
-                        return False
-
-                await self._smart_wait(check_page_ready, 1000)  # Max 1s wait
+                        await self.page.wait_for_load_state("load", timeout=1000)  # Max 1s wait
+                    except Exception:
+                        pass
             else:
                 raise Exception(f"Element not found after all attempts: {selector}")
         except Exception as e:
@@ -1291,8 +1450,16 @@ class WebAutomationEngine(GenerationDownloadHandlers):
             logger.info("Browser initialization completed")
             await self.navigate_to_url()
             logger.info("Navigation completed")
+            # Compile once: block jumps and substitution templates are resolved up front
+            self.program = compile_config(self.config)
+            self._program_fingerprint = self.program_fingerprint(self.config)
             # Initialize execution context for block-based flow
-            context = ExecutionContext()
+            if self.resume_checkpoint:
+                context = self._restore_from_checkpoint(results)
+            else:
+                context = ExecutionContext()
+            self._run_state = (context, results)
+            self._last_checkpoint_time = time.monotonic()
             logger.info(f"Starting execution of {len(self.config.actions)} actions")
             while context.instruction_pointer < len(self.config.actions):
                 logger.info(
@@ -1310,26 +1477,7 @@ class WebAutomationEngine(GenerationDownloadHandlers):
                         f"Action {context.instruction_pointer + 1}/{len(self.config.actions)}"
                     )
                 
-                if context.break_flag or context.continue_flag:
-                    # Handle loop control
-                    if context.break_flag:
-                        context.instruction_pointer = self._find_loop_end(
-                            context.instruction_pointer
-                        )
-                        context.break_flag = False
-                    elif context.continue_flag:
-                        context.instruction_pointer = self._find_loop_start(
-                            context.instruction_pointer
-                        )
-                        context.continue_flag = False
-                    context.should_increment = False
-                    
-                # Check bounds after break/continue handling
-                if context.instruction_pointer >= len(self.config.actions):
-                    logger.info("Instruction pointer moved beyond actions array after break/continue - ending execution")
-                    break
-                    
-                action = self.config.actions[context.instruction_pointer]
+                action = self.program.actions[context.instruction_pointer]
                 logger.info(
                     f"Action type: {action.type.value}, Description: {action.description or 'No description'}"
                 )
@@ -1352,6 +1500,7 @@ class WebAutomationEngine(GenerationDownloadHandlers):
                         # Regular action execution
                         if self._should_execute_action(context):
                             logger.info(f"Executing regular action: {action.type.value}")
+                            action = self.program.bind(context.instruction_pointer, self.variables)
                             output = await self.execute_action(action)
                             logger.info(f"Action completed successfully: {action.type.value}")
                             logger.info(f"MAIN LOOP: execute_action returned: {output}")
@@ -1396,13 +1545,32 @@ class WebAutomationEngine(GenerationDownloadHandlers):
                     context.instruction_pointer += 1
                 else:
                     context.should_increment = True
+                self._actions_since_checkpoint += 1
+                self._checkpoint()
             results["success"] = results["actions_completed"] == results["total_actions"]
         except Exception as e:
             results["errors"].append({"error": str(e)})
             logger.error(f"Automation failed: {e}")
         finally:
+            # A finished run needs no checkpoint; anything else keeps one to resume from
+            if self._run_state is not None and self.controller:
+                if results["success"]:
+                    if self.checkpoint_id:
+                        self.controller.delete_checkpoint(self.checkpoint_id)
+                        self.checkpoint_id = None
+                elif self._checkpoint(force=True):
+                    results["checkpoint_id"] = self.checkpoint_id
+                    logger.info(f"💾 Resume with: run --resume {self.checkpoint_id}")
+            self._run_state = None
             # Keep browser open based on configuration (default: keep open)
             await self.cleanup(close_browser=not self.keep_browser_open)
+            # Save the span timeline when tracing was enabled for this run
+            tracer = get_tracer()
+            if tracer.enabled and tracer.output_path:
+                try:
+                    tracer.export()
+                except Exception as e:
+                    logger.warning(f"Failed to save trace: {e}")
             # Log performance summary if monitoring is available
             if PERFORMANCE_MONITORING_AVAILABLE:
                 try:
@@ -1419,430 +1587,110 @@ class WebAutomationEngine(GenerationDownloadHandlers):
                     logger.warning(f"Failed to generate performance summary: {e}")
         return results
 
-    async def _execute_block_based(self, context: "ExecutionContext", results: Dict[str, Any]):
-        """Execute actions using block-based control flow"""
-        while context.instruction_pointer < len(self.config.actions):
-            action = self.config.actions[context.instruction_pointer]
-            try:
-                # Log execution trace
-                results["execution_trace"].append(
-                    {
-                        "action_index": context.instruction_pointer,
-                        "action_type": action.type.value,
-                        "description": action.description,
-                        "block_stack": [b.type for b in context.block_stack],
-                    }
-                )
-                # Execute the action
-                result = await self._execute_action_with_context(action, context, results)
-                # Handle control flow based on action type
-                if not await self._handle_control_flow(action, result, context, results):
-                    break  # Break or return encountered
-                # Move to next action unless control flow changed it
-                if context.should_increment:
-                    context.instruction_pointer += 1
-                else:
-                    context.should_increment = True  # Reset for next iteration
-            except Exception as e:
-                await self._handle_execution_error(e, context, results)
-                if not context.continue_on_error:
-                    break
-                context.instruction_pointer += 1
-
-    async def _execute_action_with_context(
-        self, action: Action, context: "ExecutionContext", results: Dict[str, Any]
-    ) -> Any:
-        """Execute a single action within the execution context"""
-
-        # Handle block control actions
-        if action.type in [
-            ActionType.IF_BEGIN,
-            ActionType.ELIF,
-            ActionType.ELSE,
-            ActionType.IF_END,
-            ActionType.WHILE_BEGIN,
-            ActionType.WHILE_END,
-            ActionType.BREAK,
-            ActionType.CONTINUE,
-            ActionType.STOP_AUTOMATION,
-        ]:
-            return await self._execute_control_action(action, context, results)
-
-        # Execute regular actions
-        result = await self.execute_action(action)
-        results["actions_completed"] += 1
-        # Store outputs
-        if action.type in [
-            ActionType.CHECK_QUEUE,
-            ActionType.CHECK_ELEMENT,
-            ActionType.DOWNLOAD_FILE,
-        ]:
-            results["outputs"][f"action_{context.instruction_pointer}"] = result
-            if action.type == ActionType.CHECK_ELEMENT:
-                context.last_check_result = result
-                self._last_check_result = result
-        return result
-
-    async def _execute_control_action(
-        self, action: Action, context: "ExecutionContext", results: Dict[str, Any]
-    ) -> Any:
-        """Execute control flow actions (IF, WHILE, etc.)"""
-
-        if action.type == ActionType.IF_BEGIN:
-            return await self._handle_if_begin(action, context)
-        elif action.type == ActionType.ELIF:
-            return await self._handle_elif(action, context)
-        elif action.type == ActionType.ELSE:
-            return await self._handle_else(action, context)
-
-        elif action.type == ActionType.IF_END:
-            return await self._handle_if_end(action, context)
-
-        elif action.type == ActionType.WHILE_BEGIN:
-            return await self._handle_while_begin(action, context)
-
-        elif action.type == ActionType.WHILE_END:
-            return await self._handle_while_end(action, context)
-
-        elif action.type == ActionType.BREAK:
-            return await self._handle_break(action, context)
-
-        elif action.type == ActionType.CONTINUE:
-            return await self._handle_continue(action, context)
-        
-        elif action.type == ActionType.STOP_AUTOMATION:
-            return await self._handle_stop_automation(action, context)
-
-        return None
-
-    async def _handle_control_flow(
-        self, action: Action, result: Any, context: "ExecutionContext", results: Dict[str, Any]
-    ) -> bool:
-        """Handle control flow after action execution. Returns False if should break execution."""
-
-        # Handle legacy conditional actions
-        if action.type == ActionType.CONDITIONAL_WAIT and result:
-            if result.get("retry"):
-                retry_from = result.get("retry_from_action", 0)
-                logger.info(f"Conditional wait retry from action {retry_from}")
-                context.instruction_pointer = retry_from
-                context.should_increment = False
-        elif action.type == ActionType.SKIP_IF and result:
-            if result.get("skip"):
-                skip_count = result.get("skip_count", 1)
-                logger.info(f"Skipping next {skip_count} actions")
-                context.instruction_pointer += skip_count
-                context.should_increment = False
-        # Check for break/continue flags
-        if context.break_flag:
-            return False
-        return True
-
-    async def _handle_execution_error(
-        self, error: Exception, context: "ExecutionContext", results: Dict[str, Any]
-    ):
-        """Handle execution errors with context information"""
-
-        error_info = {
-            "action_index": context.instruction_pointer,
-            "action_type": self.config.actions[context.instruction_pointer].type.value,
-            "error": str(error),
-            "block_context": [b.type for b in context.block_stack],
-            "instruction_pointer": context.instruction_pointer,
-        }
-        results["errors"].append(error_info)
-        logger.error(f"Action {context.instruction_pointer} failed: {error}")
-
-    # Control Flow Handlers
-    async def _handle_if_begin(self, action: Action, context: ExecutionContext):
-        """Handle IF block start"""
-        condition_config = action.value if isinstance(action.value, dict) else {}
-        # Evaluate condition using last check result
-        condition_result = evaluate_condition(context.last_check_result, condition_config)
-        # Create and push block
-        block = context.push_block("if", context.instruction_pointer)
-        block.condition_result = condition_result
-        block.end_index = context.find_block_end(
-            self.config.actions, context.instruction_pointer, "if"
-        )
-        logger.info(f"IF condition: {condition_result}")
-        # If condition is false, skip to ELIF/ELSE/END
-        if not condition_result:
-            context.instruction_pointer = self._find_next_branch(context.instruction_pointer)
-            context.should_increment = False
-        return {"condition_result": condition_result}
-
-    async def _handle_elif(self, action: Action, context: ExecutionContext):
-        """Handle ELIF block"""
-        current_block = context.current_block()
-        if not current_block or current_block.type != "if":
-            raise ValueError("ELIF without matching IF")
-        # If previous IF/ELIF was executed, skip this ELIF
-        if current_block.has_executed:
-            context.instruction_pointer = self._find_next_branch(context.instruction_pointer)
-            context.should_increment = False
-            return {"skipped": True}
-        # Evaluate ELIF condition
-        condition_config = action.value if isinstance(action.value, dict) else {}
-        condition_result = evaluate_condition(context.last_check_result, condition_config)
-        logger.info(f"ELIF condition: {condition_result}")
-        if not condition_result:
-            # Skip to next ELIF/ELSE/END
-            context.instruction_pointer = self._find_next_branch(context.instruction_pointer)
-            context.should_increment = False
-        else:
-            # Mark block as executed
-            current_block.has_executed = True
-        return {"condition_result": condition_result}
-
-    async def _handle_else(self, action: Action, context: ExecutionContext):
-        """Handle ELSE block"""
-        current_block = context.current_block()
-        if not current_block or current_block.type != "if":
-            raise ValueError("ELSE without matching IF")
-        # If any previous IF/ELIF was executed, skip ELSE
-        if current_block.has_executed:
-            context.instruction_pointer = current_block.end_index
-            context.should_increment = False
-            return {"skipped": True}
-        # Mark block as executed (ELSE will run)
-        current_block.has_executed = True
-        logger.info("ELSE block executing")
-        return {"executing": True}
-
-    async def _handle_if_end(self, action: Action, context: ExecutionContext):
-        """Handle IF block end"""
-        block = context.pop_block()
-        if not block or block.type != "if":
-            raise ValueError("IF_END without matching IF")
-        logger.info(f"IF block completed")
-        return {"block_completed": True}
-
-    async def _handle_while_begin(self, action: Action, context: ExecutionContext):
-        """Handle WHILE loop start"""
-        condition_config = action.value if isinstance(action.value, dict) else {}
-        # Check if this is a new loop or iteration
-        current_block = context.current_block()
-        if (
-            not current_block
-            or current_block.type != "while"
-            or current_block.start_index != context.instruction_pointer
-        ):
-            # New WHILE loop
-            block = context.push_block("while", context.instruction_pointer)
-            block.end_index = context.find_block_end(
-                self.config.actions, context.instruction_pointer, "while"
-            )
-        else:
-            # Continuing existing loop
-            block = current_block
-            block.iteration_count += 1
-        # Evaluate condition
-        condition_result = evaluate_condition(context.last_check_result, condition_config)
-        block.condition_result = condition_result
-        logger.info(f"WHILE condition (iteration {block.iteration_count}): {condition_result}")
-        # If condition is false, exit loop
-        if not condition_result:
-            context.pop_block()  # Remove the while block
-            context.instruction_pointer = block.end_index
-            context.should_increment = False
-        return {"condition_result": condition_result, "iteration": block.iteration_count}
-
-    async def _handle_while_end(self, action: Action, context: ExecutionContext):
-        """Handle WHILE loop end"""
-        current_block = context.current_block()
-        if not current_block or current_block.type != "while":
-            raise ValueError("WHILE_END without matching WHILE")
-        # Jump back to WHILE condition
-        context.instruction_pointer = current_block.start_index
-        context.should_increment = False
-        logger.info(
-            f"WHILE loop iteration {current_block.iteration_count} completed, checking condition"
-        )
-        return {"loop_back": True}
-
-    async def _handle_break(self, action: Action, context: ExecutionContext):
-        """Handle BREAK statement"""
-        # Find the innermost loop
-        loop_block = None
-        for block in reversed(context.block_stack):
-            if block.type == "while":
-                loop_block = block
-                break
-        if not loop_block:
-            raise ValueError("BREAK outside of loop")
-        # Exit the loop
-        context.block_stack.remove(loop_block)
-        context.instruction_pointer = loop_block.end_index
-        context.should_increment = False
-        logger.info("BREAK: Exiting loop")
-        return {"break": True}
-    
-    async def _handle_stop_automation_v2(self, action: Action, context: ExecutionContext):
-        """Handle STOP_AUTOMATION action - immediately terminate automation as failed"""
-        reason = action.value.get('reason', 'Stop automation requested') if action.value else 'Stop automation requested'
-        log_file = action.value.get('log_file') if action.value else None
-        
-        logger.error(f"STOP_AUTOMATION: {reason}")
-        
-        # Log to specified file if provided
-        if log_file:
-            try:
-                # Create a temporary LOG_MESSAGE action and execute it
-                from datetime import datetime
-                import os
-                
-                # Ensure logs directory exists
-                log_dir = os.path.dirname(log_file) if os.path.dirname(log_file) else "."
-                if log_dir != "." and not os.path.exists(log_dir):
-                    os.makedirs(log_dir, exist_ok=True)
-                
-                message_data = {
-                    "timestamp": datetime.now().isoformat(),
-                    "level": "ERROR",
-                    "message": reason
-                }
-                
-                # Append to log file
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(f"{message_data['timestamp']} - {message_data['level']}: {message_data['message']}\n")
-                    
-                logger.info(f"Logged message to {log_file}: {reason}")
-            except Exception as e:
-                logger.warning(f"Failed to log to file {log_file}: {e}")
-        
-        # Set instruction pointer to end to exit main loop
-        context.instruction_pointer = len(self.config.actions)
-        context.should_increment = False
-        # Raise an exception to mark the automation as failed
-        raise RuntimeError(f"Automation stopped: {reason}")
-
-    async def _handle_continue(self, action: Action, context: ExecutionContext):
-        """Handle CONTINUE statement"""
-        # Find the innermost loop
-        loop_block = None
-        for block in reversed(context.block_stack):
-            if block.type == "while":
-                loop_block = block
-                break
-        if not loop_block:
-            raise ValueError("CONTINUE outside of loop")
-        # Jump to WHILE_END (which will jump back to condition)
-        context.instruction_pointer = loop_block.end_index - 1  # -1 because we'll increment
-        logger.info("CONTINUE: Jumping to next iteration")
-        return {"continue": True}
-
-    def _find_next_branch(self, current_index: int) -> int:
-        """Find the next ELIF, ELSE, or IF_END at the same nesting level"""
-        depth = 0
-        for i in range(current_index + 1, len(self.config.actions)):
-            action = self.config.actions[i]
-            if action.type == ActionType.IF_BEGIN:
-                depth += 1
-            elif action.type == ActionType.IF_END:
-                if depth == 0:
-                    return i
-                depth -= 1
-            elif action.type in [ActionType.ELIF, ActionType.ELSE] and depth == 0:
-                return i
-        return len(self.config.actions)  # If nothing found, go to end
-
     async def _handle_block_action(self, action, context):
         """Handle block control actions (IF, WHILE, etc.)"""
-        if action.type == ActionType.IF_BEGIN:
-            await self._handle_if_begin(action, context)
-        elif action.type == ActionType.ELIF:
-            await self._handle_elif(action, context)
+        with trace_span(action.type.value, "control_flow", index=context.instruction_pointer):
+            if action.type == ActionType.IF_BEGIN:
+                await self._handle_if_begin(action, context)
+            elif action.type == ActionType.ELIF:
+                await self._handle_elif(action, context)
+
+            elif action.type == ActionType.ELSE:
+                await self._handle_else(action, context)
 
-        elif action.type == ActionType.ELSE:
-            await self._handle_else(action, context)
+            elif action.type == ActionType.IF_END:
+                await self._handle_if_end(action, context)
 
-        elif action.type == ActionType.IF_END:
-            await self._handle_if_end(action, context)
+            elif action.type == ActionType.WHILE_BEGIN:
+                await self._handle_while_begin(action, context)
 
-        elif action.type == ActionType.WHILE_BEGIN:
-            await self._handle_while_begin(action, context)
+            elif action.type == ActionType.WHILE_END:
+                await self._handle_while_end(action, context)
 
-        elif action.type == ActionType.WHILE_END:
-            await self._handle_while_end(action, context)
+            elif action.type == ActionType.BREAK:
+                await self._handle_break(action, context)
 
-        elif action.type == ActionType.BREAK:
-            await self._handle_break(action, context)
+            elif action.type == ActionType.CONTINUE:
+                await self._handle_continue(action, context)
 
-        elif action.type == ActionType.CONTINUE:
-            await self._handle_continue(action, context)
-            
-        elif action.type == ActionType.STOP_AUTOMATION:
-            await self._handle_stop_automation(action, context)
+            elif action.type == ActionType.STOP_AUTOMATION:
+                await self._handle_stop_automation(action, context)
 
     async def _handle_if_begin(self, action, context):
         """Handle IF_BEGIN action"""
-        condition = action.value.get("condition", "check_passed")
+        index = context.instruction_pointer
+        condition = self.program.conditions[index]
         condition_met = self._evaluate_condition(condition, context)
         block_info = BlockInfo(
-            block_type="if",
-            start_index=context.instruction_pointer,
+            block_type=BlockType.IF,
+            start_index=index,
+            end_index=self.program.block_end[index],
             condition=condition,
             condition_met=condition_met,
+            has_executed=condition_met,
         )
         context.block_stack.append(block_info)
         if not condition_met:
             # Skip to ELIF, ELSE, or IF_END
-            context.instruction_pointer = self._find_next_branch(context.instruction_pointer)
+            context.instruction_pointer = self.program.next_branch[index]
             context.should_increment = False
 
     async def _handle_elif(self, action, context):
         """Handle ELIF action"""
-        if not context.block_stack or context.block_stack[-1].type != "if":
+        if not context.block_stack or context.block_stack[-1].block_type != BlockType.IF:
             raise ValueError("ELIF without matching IF_BEGIN")
+        index = context.instruction_pointer
         current_block = context.block_stack[-1]
-        if current_block.condition_met:
-            # Previous condition was true, skip to IF_END
-            context.instruction_pointer = self._find_if_end(context.instruction_pointer)
+        if current_block.has_executed:
+            # An earlier branch ran, skip to IF_END
+            context.instruction_pointer = self.program.block_end[index]
+            context.should_increment = False
+            return
+        condition_met = self._evaluate_condition(self.program.conditions[index], context)
+        current_block.condition_met = condition_met
+        current_block.has_executed = condition_met
+        if not condition_met:
+            # Skip to next ELIF, ELSE, or IF_END
+            context.instruction_pointer = self.program.next_branch[index]
             context.should_increment = False
-        else:
-            # Evaluate this ELIF condition
-            condition = action.value.get("condition", "check_passed")
-            condition_met = self._evaluate_condition(condition, context)
-            current_block.condition_met = condition_met
-            if not condition_met:
-                # Skip to next ELIF, ELSE, or IF_END
-                context.instruction_pointer = self._find_next_branch(context.instruction_pointer)
-                context.should_increment = False
 
     async def _handle_else(self, action, context):
         """Handle ELSE action"""
-        if not context.block_stack or context.block_stack[-1].type != "if":
+        if not context.block_stack or context.block_stack[-1].block_type != BlockType.IF:
             raise ValueError("ELSE without matching IF_BEGIN")
         current_block = context.block_stack[-1]
-        if current_block.condition_met:
-            # Previous condition was true, skip to IF_END
-            context.instruction_pointer = self._find_if_end(context.instruction_pointer)
+        if current_block.has_executed:
+            # An earlier branch ran, skip to IF_END
+            context.instruction_pointer = self.program.block_end[context.instruction_pointer]
             context.should_increment = False
+            return
+        # No earlier branch ran, so the ELSE body executes
+        current_block.condition_met = True
+        current_block.has_executed = True
 
     async def _handle_if_end(self, action, context):
         """Handle IF_END action"""
-        if not context.block_stack or context.block_stack[-1].type != "if":
+        if not context.block_stack or context.block_stack[-1].block_type != BlockType.IF:
             raise ValueError("IF_END without matching IF_BEGIN")
         context.block_stack.pop()
 
     async def _handle_while_begin(self, action, context):
         """Handle WHILE_BEGIN action"""
-        condition = action.value.get("condition", "check_passed")
+        index = context.instruction_pointer
         # For while loops, always enter on first iteration
-        # Condition will be evaluated at WHILE_END
+        # Condition will be evaluated at WHILE_END, which jumps back past this action
         block_info = BlockInfo(
-            block_type="while",
-            start_index=context.instruction_pointer,
-            condition=condition,
+            block_type=BlockType.WHILE,
+            start_index=index,
+            end_index=self.program.block_end[index],
+            condition=self.program.conditions[index],
             condition_met=True,  # Always enter first time
         )
         context.block_stack.append(block_info)
-        # Always continue into the loop body on first iteration
 
     async def _handle_while_end(self, action, context):
         """Handle WHILE_END action"""
-        if not context.block_stack or context.block_stack[-1].type != "while":
+        if not context.block_stack or context.block_stack[-1].block_type != BlockType.WHILE:
             raise ValueError("WHILE_END without matching WHILE_BEGIN")
         current_block = context.block_stack[-1]
         
@@ -1865,34 +1713,42 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         logger.info(f"WHILE_END: condition_met={condition_met}, iteration #{current_block.iteration_count}")
         
         if condition_met:
-            # Jump back to WHILE_BEGIN
-            logger.info(f"WHILE_END: Looping back to action {current_block.start_index} (iteration #{current_block.iteration_count})")
-            context.instruction_pointer = current_block.start_index
+            # Jump to the first body action; the loop block stays on the stack
+            logger.info(f"WHILE_END: Looping back to action {current_block.start_index + 1} (iteration #{current_block.iteration_count})")
+            context.instruction_pointer = current_block.start_index + 1
             context.should_increment = False
         else:
             # Exit loop
             logger.info(f"WHILE_END: Exiting loop after {current_block.iteration_count} iterations")
             context.block_stack.pop()
 
+    def _unwind_to_loop(self, context, loop_index):
+        """Pop blocks nested inside the loop starting at loop_index"""
+        while context.block_stack and not (
+            context.block_stack[-1].block_type == BlockType.WHILE
+            and context.block_stack[-1].start_index == loop_index
+        ):
+            context.block_stack.pop()
+        if not context.block_stack:
+            raise ValueError(f"Loop at action {loop_index} is not active")
+
     async def _handle_break(self, action, context):
         """Handle BREAK action"""
-        # Find the innermost loop to break from
-        for i in range(len(context.block_stack) - 1, -1, -1):
-            if context.block_stack[i].type == "while":
-                context.break_flag = True
-                context.should_increment = False
-                return
-        raise ValueError("BREAK used outside of loop")
+        loop_index = self.program.enclosing_loop[context.instruction_pointer]
+        self._unwind_to_loop(context, loop_index)
+        context.block_stack.pop()
+        logger.info(f"BREAK: Leaving loop at action {loop_index}")
+        context.instruction_pointer = self.program.block_end[loop_index] + 1
+        context.should_increment = False
 
     async def _handle_continue(self, action, context):
         """Handle CONTINUE action"""
-        # Find the innermost loop to continue
-        for i in range(len(context.block_stack) - 1, -1, -1):
-            if context.block_stack[i].type == "while":
-                context.continue_flag = True
-                context.should_increment = False
-                return
-        raise ValueError("CONTINUE used outside of loop")
+        loop_index = self.program.enclosing_loop[context.instruction_pointer]
+        self._unwind_to_loop(context, loop_index)
+        # Jump to WHILE_END so the loop condition decides the next iteration
+        logger.info(f"CONTINUE: Jumping to loop end of action {loop_index}")
+        context.instruction_pointer = self.program.block_end[loop_index]
+        context.should_increment = False
     
     async def _handle_stop_automation(self, action: Action, context: ExecutionContext):
         """Handle STOP_AUTOMATION action - immediately terminate automation as failed"""
@@ -1937,7 +1793,7 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         """Determine if the current action should be executed based on block context"""
         # If we're inside any IF blocks, check if all conditions are met
         for block in context.block_stack:
-            if block.type == "if" and not block.condition_met:
+            if block.block_type == BlockType.IF and not block.condition_met:
                 return False
         return True
 
@@ -1975,73 +1831,6 @@ class WebAutomationEngine(GenerationDownloadHandlers):
         logger.info(f"EVAL_CONDITION: Unknown condition '{condition}', returning False")
         return False
 
-    def _find_next_branch(self, start_index):
-        """Find the next ELIF, ELSE, or IF_END at the same nesting level"""
-        depth = 0
-        for i in range(start_index + 1, len(self.config.actions)):
-            action = self.config.actions[i]
-            if action.type == ActionType.IF_BEGIN:
-                depth += 1
-            elif action.type == ActionType.IF_END:
-                if depth == 0:
-                    return i
-                depth -= 1
-            elif action.type in [ActionType.ELIF, ActionType.ELSE] and depth == 0:
-                return i
-        return len(self.config.actions)
-
-    def _find_if_end(self, start_index):
-        """Find the matching IF_END"""
-        depth = 0
-        for i in range(start_index + 1, len(self.config.actions)):
-            action = self.config.actions[i]
-            if action.type == ActionType.IF_BEGIN:
-                depth += 1
-            elif action.type == ActionType.IF_END:
-                if depth == 0:
-                    return i
-                depth -= 1
-        return len(self.config.actions)
-
-    def _find_while_end(self, start_index):
-        """Find the matching WHILE_END"""
-        depth = 0
-        for i in range(start_index + 1, len(self.config.actions)):
-            action = self.config.actions[i]
-            if action.type == ActionType.WHILE_BEGIN:
-                depth += 1
-            elif action.type == ActionType.WHILE_END:
-                if depth == 0:
-                    return i
-                depth -= 1
-        return len(self.config.actions)
-
-    def _find_loop_end(self, start_index):
-        """Find the end of the current loop for BREAK"""
-        depth = 0
-        for i in range(start_index, len(self.config.actions)):
-            action = self.config.actions[i]
-            if action.type == ActionType.WHILE_BEGIN:
-                depth += 1
-            elif action.type == ActionType.WHILE_END:
-                depth -= 1
-                if depth == 0:
-                    return i + 1  # Move past the WHILE_END
-        return len(self.config.actions)
-
-    def _find_loop_start(self, start_index):
-        """Find the start of the current loop for CONTINUE"""
-        depth = 0
-        for i in range(start_index, -1, -1):
-            action = self.config.actions[i]
-            if action.type == ActionType.WHILE_END:
-                depth += 1
-            elif action.type == ActionType.WHILE_BEGIN:
-                if depth == 0:
-                    return i  # Return to the WHILE_BEGIN
-                depth -= 1
-        return 0  # Fallback to beginning
-    
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename to prevent path traversal attacks"""
         if not filename:
@@ -2151,8 +1940,13 @@ class AutomationSequenceBuilder:
         password_selector: str,
         submit_selector: str,
         description: str = None,
+        session_check_selector: str = None,
     ):
-        """Add login action with username and password"""
+        """Add login action with username and password
+        
+        ``session_check_selector`` names an element only shown when logged in;
+        with a session profile, the login is skipped while it is visible.
+        """
         login_data = {
             "username": username,
             "password": password,
@@ -2160,6 +1954,8 @@ class AutomationSequenceBuilder:
             "password_selector": password_selector,
             "submit_selector": submit_selector,
         }
+        if session_check_selector:
+            login_data["session_check_selector"] = session_check_selector
         self.config.actions.append(
             Action(type=ActionType.LOGIN, value=login_data, description=description)
         )
@@ -2492,6 +2288,12 @@ class AutomationSequenceBuilder:
         self.config.viewport = {"width": width, "height": height}
         return self
 
+    def set_session_profile(self, name: str, persistent: bool = False):
+        """Restore and save login state in the named session profile"""
+        self.config.session_profile = name
+        self.config.persistent_profile = persistent
+        return self
+
     def build(self) -> AutomationConfig:
         return self.config
 
@@ -2502,6 +2304,9 @@ class AutomationSequenceBuilder:
             "url": self.config.url,
             "headless": self.config.headless,
             "viewport": self.config.viewport,
+            "network_profile": self.config.network_profile,
+            "session_profile": self.config.session_profile,
+            "persistent_profile": self.config.persistent_profile,
             "actions": [
                 {
                     "type": action.type.value,
@@ -2527,6 +2332,9 @@ class AutomationSequenceBuilder:
             headless=data.get("headless", True),
             viewport=data.get("viewport"),
             actions=[],
+            network_profile=data.get("network_profile", "full"),
+            session_profile=data.get("session_profile"),
+            persistent_profile=data.get("persistent_profile", False),
         )
         for action_data in data["actions"]:
             config.actions.append(
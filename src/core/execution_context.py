@@ -34,6 +34,11 @@ class BlockInfo:
         if self.start_index < 0:
             raise ValueError("Start index must be non-negative")
     
+    @property
+    def type(self) -> str:
+        """Block type name ("if" or "while")"""
+        return self.block_type.value
+    
     def reset(self):
         """Reset block state for new execution"""
         self.condition_met = False
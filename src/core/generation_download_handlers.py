@@ -7,7 +7,6 @@ Handlers for generation download automation actions in the WebAutomationEngine.
 import asyncio
 import logging
 from typing import Any, Dict, Optional
-from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +22,22 @@ class GenerationDownloadHandlers:
     async def _handle_start_generation_downloads(self, action) -> Dict[str, Any]:
         """Handle START_GENERATION_DOWNLOADS action"""
         try:
-            from src.utils.generation_download_manager import GenerationDownloadManager, GenerationDownloadConfig, DuplicateMode
+            try:
+                from ..utils.generation_download_manager import GenerationDownloadManager, GenerationDownloadConfig, DuplicateMode
+            except ImportError:
+                from utils.generation_download_manager import GenerationDownloadManager, GenerationDownloadConfig, DuplicateMode
             
             # Parse configuration from action value
             config_data = action.value if action.value else {}
             
+            # A resumed run continues after the last container its checkpoint recorded
+            resume_progress = getattr(self, 'generation_progress', None)
+            if resume_progress and not config_data.get('start_from') and resume_progress.get('creation_time'):
+                config_data = dict(config_data, start_from=resume_progress['creation_time'])
+                logger.info(f"⏩ Resuming generation downloads from {resume_progress['creation_time']} "
+                            f"(container {resume_progress.get('hash_id')})")
+            self.generation_progress = None
+            
             # Handle duplicate_mode string to enum conversion
             duplicate_mode_str = config_data.get('duplicate_mode', 'finish').lower()
             if duplicate_mode_str == 'skip':
@@ -97,11 +107,20 @@ class GenerationDownloadHandlers:
                 creation_time_comparison=config_data.get('creation_time_comparison', True),
                 
                 # START_FROM PARAMETER (CRITICAL FIX: was missing!)
-                start_from=config_data.get('start_from')  # None by default, set if provided
+                start_from=config_data.get('start_from'),  # None by default, set if provided
+                
+                # Request blocking while scanning vs. downloading (None = no blocking)
+                scan_network_profile=config_data.get('scan_network_profile', 'scan'),
+                download_network_profile=config_data.get('download_network_profile', 'download'),
+                
+                # Fetch media straight from its DOM URL instead of clicking the download button
+                direct_fetch_enabled=config_data.get('direct_fetch_enabled', False),
+                direct_fetch_concurrency=config_data.get('direct_fetch_concurrency', 3)
             )
             
             # Initialize the generation download manager
             self._generation_download_manager = GenerationDownloadManager(config)
+            self._generation_download_manager.checkpoint_callback = getattr(self, '_on_generation_progress', None)
             self._generation_downloads_active = True
             
             logger.info("Generation download manager initialized")
@@ -110,35 +129,10 @@ class GenerationDownloadHandlers:
             logger.info(f"Downloads folder: {config.downloads_folder}")
             logger.info(f"Logs folder: {config.logs_folder}")
             
-            # Configure browser downloads to go to our directory
-            try:
-                # Set up proper download path in browser context
-                context = self.page.context
-                
-                # FIXED: Set up download event handler instead of route
-                async def handle_download(download):
-                    """Handle downloads and save to configured directory"""
-                    try:
-                        # Get the suggested filename
-                        suggested_name = download.suggested_filename
-                        download_path = Path(config.downloads_folder) / suggested_name
-                        
-                        # Ensure directory exists
-                        download_path.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Save to configured location
-                        await download.save_as(str(download_path))
-                        logger.debug(f"Download saved to: {download_path}")
-                        
-                    except Exception as e:
-                        logger.warning(f"Download handler error: {e}")
-                
-                # Register download event handler
-                context.on("download", handle_download)
-                logger.debug(f"Browser download handler configured for: {config.downloads_folder}")
-                
-            except Exception as e:
-                logger.warning(f"Could not configure browser download handler: {e}")
+            # Route browser downloads through the manager's download tracker so each
+            # Download is saved once and resolves the generation that triggered it
+            if self._generation_download_manager.download_tracker.attach(self.page.context):
+                logger.debug(f"Browser download tracker configured for: {config.downloads_folder}")
             
             # Start the download automation with NEW 25-Step Algorithm v2.0
             logger.info(f"🚀 Starting NEW 25-Step Generation Download Algorithm v2.0")
@@ -149,6 +143,7 @@ class GenerationDownloadHandlers:
             
             # Mark as inactive when complete
             self._generation_downloads_active = False
+            self.generation_progress = None
             
             return {
                 'success': results['success'],
@@ -156,12 +151,14 @@ class GenerationDownloadHandlers:
                 'errors': results['errors'],
                 'start_time': results['start_time'],
                 'end_time': results['end_time'],
+                'network_profiles': self._generation_download_manager.network_report(),
                 'manager_status': self._generation_download_manager.get_status()
             }
             
         except Exception as e:
             logger.error(f"Error in start_generation_downloads: {e}")
             self._generation_downloads_active = False
+            self.generation_progress = None
             return {
                 'success': False,
                 'error': str(e),
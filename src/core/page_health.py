@@ -0,0 +1,130 @@
+"""Event-driven page health monitoring for web automation
+
+``PageHealthMonitor`` listens to the Playwright page ``crash``, ``close`` and
+``framenavigated`` events and keeps a cached view of page liveness. Actions
+check the cached flags and only pay for a responsiveness probe after the main
+frame navigated or an action failed, instead of probing before every action.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PageClosedError(RuntimeError):
+    """Raised when an action targets a page that crashed or was closed"""
+    pass
+
+
+class PageHealthMonitor:
+    """Tracks liveness of one page from its lifecycle events"""
+
+    def __init__(self, probe_timeout: float = 2.0, recovery_timeout_ms: int = 3000):
+        self.probe_timeout = probe_timeout
+        self.recovery_timeout_ms = recovery_timeout_ms
+        self.page: Optional[Any] = None
+        self.crashed = False
+        self.closed = False
+        self.needs_probe = True
+        self.navigation_count = 0
+        self.probes_run = 0
+        self.probes_skipped = 0
+
+    def attach(self, page) -> bool:
+        """Start listening to a page's lifecycle events (replaces any previous page)"""
+        if page is self.page:
+            return False
+        self.detach()
+        if page is None:
+            return False
+        try:
+            page.on("crash", self._on_crash)
+            page.on("close", self._on_close)
+            page.on("framenavigated", self._on_frame_navigated)
+        except Exception as e:
+            logger.warning(f"Could not attach page health monitor: {e}")
+            return False
+        self.page = page
+        self.crashed = False
+        self.closed = False
+        self.needs_probe = True
+        logger.debug("🩺 Page health monitor attached")
+        return True
+
+    def detach(self):
+        """Stop listening to the current page"""
+        if self.page is None:
+            return
+        for event, handler in (("crash", self._on_crash),
+                               ("close", self._on_close),
+                               ("framenavigated", self._on_frame_navigated)):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+        self.page = None
+
+    @property
+    def alive(self) -> bool:
+        return self.page is not None and not (self.crashed or self.closed)
+
+    def mark_failed(self):
+        """Request a probe before the next action, e.g. after an action error"""
+        self.needs_probe = True
+
+    async def ensure_ready(self, page=None) -> bool:
+        """Verify the page before an action; cheap unless a probe is pending
+
+        Returns True when the page is known good or the probe (with its
+        load-state recovery) succeeded. Raises PageClosedError for a page that
+        crashed or was closed.
+        """
+        page = page or self.page
+        if page is not self.page:
+            self.attach(page)
+        if self.crashed or self.closed:
+            state = "crashed" if self.crashed else "closed"
+            raise PageClosedError(f"Page {state}, cannot execute action")
+        if not self.needs_probe:
+            self.probes_skipped += 1
+            return True
+
+        self.probes_run += 1
+        try:
+            await asyncio.wait_for(page.evaluate("1 + 1"), timeout=self.probe_timeout)
+            self.needs_probe = False
+            logger.debug("Page is responsive")
+            return True
+        except (asyncio.TimeoutError, Exception) as e:
+            logger.warning(f"Page responsiveness check failed: {e}")
+
+        # Try to recover with shorter timeout
+        try:
+            logger.info("Attempting to refresh page state...")
+            await asyncio.wait_for(
+                page.wait_for_load_state("domcontentloaded", timeout=self.recovery_timeout_ms),
+                timeout=self.recovery_timeout_ms / 1000 + 2.0
+            )
+            self.needs_probe = False
+            logger.info("Page state refreshed")
+            return True
+        except Exception as recovery_error:
+            logger.warning(f"Page recovery failed: {recovery_error}, continuing anyway...")
+            return False
+
+    def _on_crash(self, *args):
+        self.crashed = True
+        logger.error("💥 Page crashed")
+
+    def _on_close(self, *args):
+        self.closed = True
+        logger.info("Page closed")
+
+    def _on_frame_navigated(self, frame):
+        # Sub-frame navigations (ads, iframes) do not affect the page itself
+        if self.page is not None and getattr(self.page, "main_frame", frame) is not frame:
+            return
+        self.navigation_count += 1
+        self.needs_probe = True
@@ -7,7 +7,6 @@ import json
 import sys
 from pathlib import Path
 from typing import Optional
-import yaml
 
 from core.engine import (
     WebAutomationEngine, 
@@ -16,6 +15,8 @@ from core.engine import (
     ActionType
 )
 from core.controller import AutomationController
+from utils.metrics_registry import start_metrics_server
+from utils.span_tracer import enable_tracing
 import signal
 
 class AutomationCLI:
@@ -57,6 +58,15 @@ Examples:
   # Run with browser visible
   automation run -c my_automation.json --show-browser
   
+  # Record a timeline of actions and download phases
+  automation run -c my_automation.json --trace trace.json
+  
+  # Reuse the login of earlier runs (LOGIN is skipped while the session is valid)
+  automation run -c my_automation.json --session-profile work
+  
+  # Continue an interrupted run from its last checkpoint
+  automation run --resume my_automation_20250905_170629
+  
   # Create new automation interactively
   automation create -n "My Task" -u https://example.com
   
@@ -65,22 +75,37 @@ Examples:
   
   # List available actions
   automation list-actions
+  
+  # Report CLI cold-start import time
+  automation --profile-startup
             """
         )
         
         parser.add_argument('-v', '--verbose', action='store_true', 
                           help='Enable verbose logging')
+        parser.add_argument('--profile-startup', action='store_true',
+                          help='Report cold-start import time of the CLI and exit')
         
         subparsers = parser.add_subparsers(dest='command', help='Available commands')
         
         # Run command
         run_parser = subparsers.add_parser('run', help='Run automation from config file')
-        run_parser.add_argument('-c', '--config', required=True, 
+        run_parser.add_argument('-c', '--config',
                               help='Path to automation config file (JSON/YAML)')
+        run_parser.add_argument('--resume', metavar='CHECKPOINT_ID',
+                              help='Continue an interrupted run from its last checkpoint')
         run_parser.add_argument('--show-browser', action='store_true',
                               help='Show browser window (disable headless mode)')
         run_parser.add_argument('--continue-on-error', action='store_true',
                               help='Continue automation even if an action fails')
+        run_parser.add_argument('--trace', metavar='FILE',
+                              help='Save a Chrome trace (Perfetto / chrome://tracing) of the run to FILE')
+        run_parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                              help='Serve Prometheus metrics on localhost:PORT/metrics during the run')
+        run_parser.add_argument('--session-profile', metavar='NAME',
+                              help='Restore and save login state in a named session profile (skips LOGIN while valid)')
+        run_parser.add_argument('--persistent-profile', action='store_true',
+                              help='Keep the session profile as a browser user-data dir with a shared disk cache')
         
         # Create command
         create_parser = subparsers.add_parser('create', 
@@ -136,6 +161,11 @@ Examples:
             import logging
             logging.getLogger().setLevel(logging.DEBUG)
             
+        if args.profile_startup:
+            from utils.startup_profile import profile_startup
+            print(profile_startup().format_report())
+            return
+            
         if not args.command:
             self.parser.print_help()
             return
@@ -160,12 +190,23 @@ Examples:
                 
     def _handle_run(self, args):
         """Handle run command"""
-        config_path = Path(args.config)
+        # Create controller for automation control
+        self.controller = AutomationController()
+        checkpoint = None
+        if args.resume:
+            checkpoint = self.controller.load_checkpoint(args.resume)
+            if checkpoint is None:
+                raise FileNotFoundError(f"Checkpoint not found: {args.resume}")
+        config_file = args.config or (checkpoint.execution_context.get("config_file") if checkpoint else None)
+        if not config_file:
+            raise ValueError("A config file is required (-c), or --resume with a checkpoint that recorded one")
+        config_path = Path(config_file)
         if not config_path.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
             
         # Load config
         if config_path.suffix == '.yaml' or config_path.suffix == '.yml':
+            import yaml
             with open(config_path, 'r') as f:
                 data = yaml.safe_load(f)
             config = self._dict_to_config(data)
@@ -175,23 +216,32 @@ Examples:
         # Override headless if requested
         if args.show_browser:
             config.headless = False
+        if args.session_profile:
+            config.session_profile = args.session_profile
+        if args.persistent_profile:
+            config.persistent_profile = True
             
         # Run automation
         print(f"Starting automation: {config.name}")
         print(f"Target URL: {config.url}")
         print(f"Total actions: {len(config.actions)}")
+        if checkpoint:
+            print(f"Resuming from checkpoint {checkpoint.checkpoint_id} at action {checkpoint.action_index + 1}")
         print("-" * 50)
         
-        # Create controller for automation control
-        self.controller = AutomationController()
-        
         # Start the controller for the automation
         self.controller.start_automation(total_actions=len(config.actions))
         
         # Create engine with controller
         self.engine = WebAutomationEngine(config, controller=self.controller)
+        self.engine.config_file = str(config_path.resolve())
+        if checkpoint:
+            self.engine.resume_from(checkpoint)
         if args.continue_on_error:
             self.engine.continue_on_error = True
+        if args.trace:
+            enable_tracing(args.trace)
+        metrics_server = start_metrics_server(args.metrics_port) if args.metrics_port else None
             
         print("🚀 Starting automation... (Press Ctrl+C to stop gracefully)")
         try:
@@ -206,9 +256,12 @@ Examples:
                 'outputs': {}
             }
         finally:
+            checkpoint_id = self.engine.checkpoint_id
             # Cleanup
             self.controller = None
             self.engine = None
+            if metrics_server:
+                metrics_server.stop()
         
         # Display results
         print("\n" + "-" * 50)
@@ -224,6 +277,9 @@ Examples:
             print("\nErrors:")
             for error in results['errors']:
                 print(f"  - {error}")
+        
+        if not results['success'] and checkpoint_id:
+            print(f"\n💾 Checkpoint saved - continue with: run --resume {checkpoint_id}")
                 
     def _handle_create(self, args):
         """Handle create command"""
@@ -326,6 +382,7 @@ Examples:
         
         try:
             if config_path.suffix in ['.yaml', '.yml']:
+                import yaml
                 with open(config_path, 'r') as f:
                     data = yaml.safe_load(f)
                 config = self._dict_to_config(data)
@@ -353,6 +410,9 @@ Examples:
         input_path = Path(args.input)
         output_path = Path(args.output)
         
+        # yaml is only imported by the commands that read or write it
+        import yaml
+
         # Load from input format
         if input_path.suffix in ['.yaml', '.yml']:
             with open(input_path, 'r') as f:
@@ -423,7 +483,9 @@ Examples:
             url=data['url'],
             headless=data.get('headless', True),
             viewport=data.get('viewport'),
-            actions=[]
+            actions=[],
+            session_profile=data.get('session_profile'),
+            persistent_profile=data.get('persistent_profile', False)
         )
         
         for action_data in data.get('actions', []):
@@ -9,6 +9,7 @@ Key Features:
 - Early termination when conditions are met
 - Performance tracking and learning
 - Fallback to maximum timeout for safety
+- Learned timings persisted per site, reloaded on startup
 
 Expected Performance Impact:
 - Reduces average wait time from 2-3s to 0.1-2s
@@ -17,9 +18,13 @@ Expected Performance Impact:
 """
 
 import asyncio
+import json
+import os
 import time
 import logging
+from pathlib import Path
 from typing import Callable, Dict, List, Optional, Any, Union
+from urllib.parse import urlparse
 from dataclasses import dataclass, field
 from collections import defaultdict
 import statistics
@@ -45,6 +50,32 @@ class OperationStats:
     optimal_timeout: float = 2.0
     last_updated: float = field(default_factory=time.time)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'completion_times': [round(t, 4) for t in self.completion_times[-50:]],
+            'success_count': self.success_count,
+            'failure_count': self.failure_count,
+            'optimal_timeout': round(self.optimal_timeout, 4),
+            'last_updated': self.last_updated
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'OperationStats':
+        return cls(
+            completion_times=[float(t) for t in data.get('completion_times', [])],
+            success_count=int(data.get('success_count', 0)),
+            failure_count=int(data.get('failure_count', 0)),
+            optimal_timeout=float(data.get('optimal_timeout', 2.0)),
+            last_updated=float(data.get('last_updated', time.time()))
+        )
+
+
+def site_key(url: Optional[str]) -> str:
+    """Key under which learned timeouts are stored for a page URL (its host)"""
+    if not url or not isinstance(url, str):
+        return "default"
+    return urlparse(url).netloc or "default"
+
 
 class AdaptiveTimeoutManager:
     """
@@ -60,7 +91,9 @@ class AdaptiveTimeoutManager:
                  min_timeout: float = 0.1,
                  max_timeout: float = 30.0,
                  check_interval: float = 0.1,
-                 learning_enabled: bool = True):
+                 learning_enabled: bool = True,
+                 state_file: Optional[Union[str, Path]] = None,
+                 site: str = "default"):
         """
         Initialize the adaptive timeout manager.
         
@@ -70,6 +103,8 @@ class AdaptiveTimeoutManager:
             max_timeout: Maximum timeout for safety
             check_interval: How often to check conditions (seconds)
             learning_enabled: Whether to learn and adapt timeouts
+            state_file: JSON file learned timings are loaded from and saved to
+            site: Site whose timings are active (see ``use_site``)
         """
         self.default_timeout = default_timeout
         self.min_timeout = min_timeout
@@ -77,13 +112,75 @@ class AdaptiveTimeoutManager:
         self.check_interval = check_interval
         self.learning_enabled = learning_enabled
         
-        # Performance tracking
-        self.operation_stats: Dict[str, OperationStats] = defaultdict(OperationStats)
+        # Performance tracking, one stats table per site
+        self.site = site
+        self._site_stats: Dict[str, Dict[str, OperationStats]] = {site: defaultdict(OperationStats)}
+        self.operation_stats: Dict[str, OperationStats] = self._site_stats[site]
         self.total_operations = 0
         self.total_time_saved = 0.0
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
+        
+        self.state_file = Path(state_file) if state_file else None
+        if self.state_file:
+            self.load_state()
+    
+    def use_site(self, site: str):
+        """Switch learned timings to another site (e.g. the host of the current page)"""
+        if site == self.site:
+            return
+        self.site = site
+        self.operation_stats = self._site_stats.setdefault(site, defaultdict(OperationStats))
+    
+    def get_timeout(self, operation_name: str, default: Optional[float] = None) -> float:
+        """Timeout budget for an operation: learned p95 once known, else ``default``"""
+        return self._get_optimal_timeout(operation_name, default)
+    
+    def record_operation(self, operation_name: str, duration: float, success: bool):
+        """Record the outcome of a wait performed outside ``wait_for_condition``"""
+        self._record_operation(operation_name, duration, success)
+    
+    def load_state(self) -> bool:
+        """Load learned timings for every site from ``state_file``"""
+        if not self.state_file or not self.state_file.exists():
+            return False
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for site, operations in data.get('sites', {}).items():
+                table = self._site_stats.setdefault(site, defaultdict(OperationStats))
+                for operation_name, stats in operations.items():
+                    table[operation_name] = OperationStats.from_dict(stats)
+            self.operation_stats = self._site_stats.setdefault(self.site, defaultdict(OperationStats))
+            self.logger.debug(f"Loaded learned timeouts for {len(data.get('sites', {}))} sites from {self.state_file}")
+            return True
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Could not load learned timeouts from {self.state_file}: {e}")
+            return False
+    
+    def save_state(self) -> bool:
+        """Write learned timings for every site to ``state_file`` (atomically)"""
+        if not self.state_file:
+            return False
+        data = {
+            'version': 1,
+            'sites': {
+                site: {name: stats.to_dict() for name, stats in table.items() if stats.success_count or stats.failure_count}
+                for site, table in self._site_stats.items()
+            }
+        }
+        data['sites'] = {site: operations for site, operations in data['sites'].items() if operations}
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_file.with_name(self.state_file.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.state_file)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not save learned timeouts to {self.state_file}: {e}")
+            return False
     
     async def wait_for_condition(self,
                                 condition: Callable[[], Union[bool, Any]],
@@ -316,24 +413,28 @@ class AdaptiveTimeoutManager:
             timeout
         )
     
-    def _get_optimal_timeout(self, operation_name: str) -> float:
+    def _get_optimal_timeout(self, operation_name: str, default: Optional[float] = None) -> float:
         """
         Get the optimal timeout for a specific operation based on learning.
         
         Args:
             operation_name: Name of the operation
+            default: Timeout to use until enough timings are known
         
         Returns:
             Optimal timeout value
         """
+        if default is None:
+            default = self.default_timeout
+        
         if not self.learning_enabled:
-            return self.default_timeout
+            return default
         
         stats = self.operation_stats[operation_name]
         
         if len(stats.completion_times) < 5:
             # Not enough data, use default
-            return self.default_timeout
+            return default
         
         # Calculate 95th percentile as optimal timeout
         p95_time = statistics.quantiles(stats.completion_times, n=20)[18]  # 95th percentile
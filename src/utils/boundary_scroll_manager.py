@@ -18,6 +18,9 @@ import time
 from typing import Dict, List, Optional, Tuple, Set
 from playwright.async_api import Page, ElementHandle
 
+from .container_watcher import ContainerAppendWatcher
+from .metrics_registry import SCROLL_STEPS
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +51,21 @@ class BoundaryScrollManager:
         self.detected_containers = set()  # Track container IDs to detect new ones
         self.max_scroll_attempts = 2000  # Support very large galleries with 3000+ generations
         self.min_scroll_distance = 2500  # Minimum distance per scroll (increased for better container detection)
+        self.container_watcher = ContainerAppendWatcher(page)
+        self.quiet_period = 3.0  # Seconds without appended containers before a scroll counts as empty
+    
+    async def enable_container_events(self) -> bool:
+        """Switch post-scroll waits from fixed sleeps to MutationObserver events"""
+        if self.container_watcher.active:
+            return True
+        return await self.container_watcher.start()
+    
+    async def wait_for_dom_update(self, marker: int, timeout: float) -> int:
+        """Wait for containers appended after ``marker``; a fixed sleep when events are unavailable"""
+        if self.container_watcher.active:
+            return await self.container_watcher.wait_for_new(marker, timeout)
+        await asyncio.sleep(timeout)
+        return 0
         
     async def get_scroll_position(self) -> Dict:
         """Get current scroll position and container count with comprehensive container detection"""
@@ -198,6 +216,7 @@ class BoundaryScrollManager:
             initial_state = await self.get_scroll_position()
             initial_scroll = initial_state['windowScrollY']
             result.containers_before = initial_state['containerCount']
+            marker = await self.container_watcher.arm()
             
             # Log detected scrollable containers for debugging
             scrollable_containers = initial_state.get('scrollableContainers', [])
@@ -314,7 +333,7 @@ class BoundaryScrollManager:
             """, target_distance)
             
             # Wait for scroll to complete and DOM to update
-            await asyncio.sleep(1.0)
+            await self.wait_for_dom_update(marker, 1.0)
             
             final_state = await self.get_scroll_position()
             result.containers_after = final_state['containerCount']
@@ -381,6 +400,7 @@ class BoundaryScrollManager:
             initial_state = await self.get_scroll_position()
             initial_scroll = initial_state['windowScrollY']
             result.containers_before = initial_state['containerCount']
+            marker = await self.container_watcher.arm()
             
             # Get scrollable containers for debugging
             scrollable_containers = initial_state.get('scrollableContainers', [])
@@ -461,7 +481,7 @@ class BoundaryScrollManager:
             """, target_distance)
             
             # Wait for scroll to complete and DOM to update
-            await asyncio.sleep(1.0)
+            await self.wait_for_dom_update(marker, 1.0)
             
             final_state = await self.get_scroll_position()
             result.containers_after = final_state['containerCount']
@@ -523,6 +543,7 @@ class BoundaryScrollManager:
         Perform scrolling using primary method with fallback
         """
         logger.info(f"Attempting scroll of {target_distance}px")
+        SCROLL_STEPS.inc()
         
         # Try primary method first (Element.scrollIntoView)
         result = await self.scroll_method_1_element_scrollintoview(target_distance)
@@ -671,6 +692,7 @@ class BoundaryScrollManager:
         logger.info("Starting boundary detection with verified scroll methods")
         logger.info(f"Boundary criteria: {boundary_criteria}")
         
+        await self.enable_container_events()
         boundary_found = None
         consecutive_failed_scrolls = 0
         max_consecutive_failures = 100  # Allow many more attempts before giving up
@@ -681,6 +703,7 @@ class BoundaryScrollManager:
             # Get initial state
             initial_state = await self.get_scroll_position()
             initial_containers = initial_state['containers']
+            marker = await self.container_watcher.arm()
             
             # Perform scroll
             scroll_result = await self.perform_scroll_with_fallback(self.min_scroll_distance)
@@ -703,7 +726,7 @@ class BoundaryScrollManager:
             
             # Wait for new content to load
             logger.info("Waiting for new content to load...")
-            await asyncio.sleep(3)
+            await self.wait_for_dom_update(marker, self.quiet_period)
             
             # Detect new containers
             has_new, new_containers = await self.detect_new_containers(initial_containers)
@@ -719,8 +742,9 @@ class BoundaryScrollManager:
             else:
                 logger.info("No new containers detected, continuing scroll...")
             
-            # Additional wait between scroll attempts
-            await asyncio.sleep(1)
+            # Additional wait between scroll attempts (events already waited for the content)
+            if not self.container_watcher.active:
+                await asyncio.sleep(1)
         
         # Log final statistics
         logger.info(f"Boundary search completed:")
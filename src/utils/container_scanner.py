@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Container Scanner
+Scan-as-you-scroll extraction of generation containers in one round trip.
+
+Each ``scan_new`` call runs a single ``page.evaluate`` that walks every
+generation container (``<hash>__<index>``) in the DOM, parses its creation
+time, prompt prefix and status in the page, and returns only containers the
+page-side "seen" set has not reported before. Boundary detection on a large
+``/generate`` page then costs one round trip per scroll instead of one per
+selector, container and span.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Container texts that mean the generation has no downloadable result (yet)
+SKIP_STATUSES = ("Queuing", "Something went wrong", "Video is rendering",
+                 "Processing", "Failed", "Error", "Loading...")
+
+# Prompt block inside a container; an ellipsis marks a text prompt
+PROMPT_CONTAINER_SELECTOR = "div.sc-eKQYOU.bdGRCs"
+
+CONTAINER_SCAN_SCRIPT = """
+(args) => {
+    const store = (window.__automatonContainerScan = window.__automatonContainerScan || {});
+    if (args.reset || !store[args.scope]) {
+        store[args.scope] = new Set();
+    }
+    const seen = store[args.scope];
+    const timeWithLabel = /Creation Time\\s*(\\d{1,2}\\s+\\w{3}\\s+\\d{4}\\s+\\d{2}:\\d{2}:\\d{2})/;
+    const bareTime = /(\\d{1,2}\\s+\\w{3}\\s+\\d{4}\\s+\\d{2}:\\d{2}:\\d{2})/;
+    const leadingDate = /^\\d{1,2}\\s+\\w{3}\\s+\\d{4}/;
+    const results = [];
+
+    for (const el of document.querySelectorAll('div[id*="__"]')) {
+        const idMatch = /^(.+)__(\\d+)$/.exec(el.id);
+        if (!idMatch) continue;
+
+        const text = el.textContent || '';
+        const status = args.statusMarkers.find(marker => text.includes(marker)) || null;
+        const timeMatch = timeWithLabel.exec(text) || bareTime.exec(text);
+        const creationTime = timeMatch ? timeMatch[1] : '';
+        // Still rendering its metadata: leave unseen so the next scan picks it up
+        if (!creationTime && !status) continue;
+
+        // Creation time is unique per generation; indices shift as the list grows
+        const key = creationTime || idMatch[1];
+        if (seen.has(key)) continue;
+        seen.add(key);
+
+        let promptPrefix = '';
+        let hasEllipsis = false;
+        const promptBox = el.querySelector(args.promptSelector);
+        if (promptBox) {
+            hasEllipsis = promptBox.innerHTML.includes('...');
+            const firstSpan = hasEllipsis ? promptBox.querySelector('span') : null;
+            promptPrefix = firstSpan ? (firstSpan.textContent || '').trim() : '';
+        } else {
+            for (const span of el.querySelectorAll('span')) {
+                const spanText = (span.textContent || '').trim();
+                if (spanText.length > 10 && !spanText.includes('Creation Time') &&
+                    !spanText.includes('Inspiration Mode') && !leadingDate.test(spanText)) {
+                    promptPrefix = spanText;
+                    break;
+                }
+            }
+        }
+
+        results.push({
+            hash_id: idMatch[1],
+            container_id: el.id,
+            index: parseInt(idMatch[2], 10),
+            creation_time: creationTime,
+            prompt_prefix: (promptPrefix || 'NO PROMPT').substring(0, args.maxPromptLength),
+            has_ellipsis: hasEllipsis,
+            status: status
+        });
+    }
+    return results;
+}
+"""
+
+
+@dataclass
+class ContainerRecord:
+    """One generation container as reported by the in-page scan"""
+    hash_id: str
+    container_id: str
+    index: int
+    creation_time: str
+    prompt_prefix: str
+    has_ellipsis: bool
+    status: Optional[str] = None
+
+    @property
+    def downloadable(self) -> bool:
+        return self.status is None and bool(self.creation_time)
+
+
+class ContainerScanner:
+    """Reports each generation container once, scanning the page in a single evaluate"""
+
+    def __init__(self, page, scope: str = "boundary", status_markers: Sequence[str] = SKIP_STATUSES,
+                 prompt_selector: str = PROMPT_CONTAINER_SELECTOR, max_prompt_length: int = 200):
+        self.page = page
+        self.scope = scope
+        self.status_markers = list(status_markers)
+        self.prompt_selector = prompt_selector
+        self.max_prompt_length = max_prompt_length
+        self.round_trips = 0
+        self.containers_reported = 0
+        self._seen_keys = set()
+        self._reset_pending = True
+
+    def reset(self):
+        """Forget seen containers; the page-side set is cleared on the next scan"""
+        self._seen_keys.clear()
+        self._reset_pending = True
+
+    async def scan_new(self) -> List[ContainerRecord]:
+        """Containers not reported before, in page order (newest first)"""
+        args: Dict[str, Any] = {
+            "scope": self.scope,
+            "reset": self._reset_pending,
+            "statusMarkers": self.status_markers,
+            "promptSelector": self.prompt_selector,
+            "maxPromptLength": self.max_prompt_length,
+        }
+        self.round_trips += 1
+        try:
+            raw_records = await self.page.evaluate(CONTAINER_SCAN_SCRIPT, args) or []
+        except Exception as e:
+            logger.debug(f"Container scan failed: {e}")
+            return []
+        self._reset_pending = False
+
+        records = []
+        for raw in raw_records:
+            record = ContainerRecord(**raw)
+            # The page-side set is lost on navigation; keep a Python-side guard too
+            key = record.creation_time or record.hash_id
+            if key in self._seen_keys:
+                continue
+            self._seen_keys.add(key)
+            records.append(record)
+        self.containers_reported += len(records)
+        return records
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Container Watcher
+Event-driven discovery of containers appended by infinite-scroll galleries.
+
+An in-page MutationObserver counts newly attached elements that match a
+selector and pushes "N appended" events to Python through
+``page.expose_binding``. Scroll loops arm the watcher before scrolling and then
+wait for the next event instead of sleeping a fixed time, so each step takes
+as long as the server needs to deliver content. A scroll that produces no
+event within the quiet period is treated as "nothing more to load".
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Generation containers on /generate: <hash>__<index>
+GENERATION_CONTAINER_SELECTOR = 'div[id*="__"]'
+GENERATION_CONTAINER_ID_PATTERN = r"__\d+$"
+
+# Gallery thumbnails (the "-mask" overlays are not thumbnails)
+GALLERY_THUMBNAIL_SELECTOR = "div[class*='thumsCou']"
+
+CONTAINER_OBSERVER_SCRIPT = """
+(args) => {
+    const registry = (window.__automatonWatchers = window.__automatonWatchers || {});
+    if (registry[args.channel]) return true;
+    const notify = window[args.binding];
+    if (!document.body || typeof notify !== 'function') return false;
+
+    const idPattern = args.idPattern ? new RegExp(args.idPattern) : null;
+    const matches = (el) => {
+        if (!el.matches(args.selector)) return false;
+        if (idPattern && !idPattern.test(el.id || '')) return false;
+        if (args.excludeClass && String(el.className).includes(args.excludeClass)) return false;
+        return true;
+    };
+    const countMatches = (node) => {
+        if (node.nodeType !== 1) return 0;
+        let count = matches(node) ? 1 : 0;
+        for (const el of node.querySelectorAll(args.selector)) {
+            if (matches(el)) count++;
+        }
+        return count;
+    };
+
+    // Coalesce one render burst into a single event
+    let pending = 0;
+    let scheduled = false;
+    const flush = () => {
+        scheduled = false;
+        const appended = pending;
+        pending = 0;
+        if (appended > 0) notify(appended);
+    };
+    const observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) pending += countMatches(node);
+        }
+        if (pending > 0 && !scheduled) {
+            scheduled = true;
+            setTimeout(flush, args.batchMs);
+        }
+    });
+    observer.observe(document.body, { childList: true, subtree: true });
+    registry[args.channel] = observer;
+    return true;
+}
+"""
+
+
+class ContainerAppendWatcher:
+    """Pushes "containers appended" events from the page into asyncio waits"""
+
+    def __init__(self, page, channel: str = "generation", selector: str = GENERATION_CONTAINER_SELECTOR,
+                 id_pattern: Optional[str] = GENERATION_CONTAINER_ID_PATTERN, exclude_class: Optional[str] = None,
+                 batch_ms: int = 50):
+        self.page = page
+        self.channel = channel
+        self.selector = selector
+        self.id_pattern = id_pattern
+        self.exclude_class = exclude_class
+        self.batch_ms = batch_ms
+        self.binding_name = f"__automatonContainersAppended_{channel}"
+
+        self.active = False
+        self.appended_total = 0
+        self.events_received = 0
+        self.last_event_time: Optional[float] = None
+        self._installed = False
+        self._binding_exposed = False
+        self._listening = False
+        self._event = asyncio.Event()
+
+    async def start(self) -> bool:
+        """Expose the binding and install the observer; False leaves callers on fixed waits"""
+        if not self._binding_exposed:
+            try:
+                await self.page.expose_binding(self.binding_name, self._on_appended)
+                self._binding_exposed = True
+            except Exception as e:
+                logger.debug(f"Container watcher unavailable ({self.channel}): {e}")
+                return False
+        await self._install()
+        return self.active
+
+    async def arm(self) -> int:
+        """Marker to pass to ``wait_for_new``; call before the scroll that should load content"""
+        if self._binding_exposed and not self._installed:
+            await self._install()
+        return self.appended_total
+
+    async def wait_for_new(self, marker: int, timeout: float, settle: float = 0.25) -> int:
+        """Wait until containers are appended after ``marker``
+
+        Returns the number appended since the marker, or 0 when the page stayed
+        quiet for ``timeout`` seconds. Once content starts arriving, waits up to
+        ``settle`` seconds for the rest of the same batch.
+        """
+        deadline = time.monotonic() + timeout
+        if not await self._wait_until(lambda: self.appended_total > marker, deadline):
+            return 0
+
+        settle_deadline = min(deadline, time.monotonic() + settle)
+        while True:
+            seen = self.appended_total
+            if not await self._wait_until(lambda: self.appended_total > seen, settle_deadline):
+                break
+        return self.appended_total - marker
+
+    async def _wait_until(self, predicate, deadline: float) -> bool:
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return predicate()
+        return True
+
+    async def _install(self):
+        args = {
+            "channel": self.channel,
+            "binding": self.binding_name,
+            "selector": self.selector,
+            "idPattern": self.id_pattern,
+            "excludeClass": self.exclude_class,
+            "batchMs": self.batch_ms,
+        }
+        try:
+            installed = await self.page.evaluate(CONTAINER_OBSERVER_SCRIPT, args)
+        except Exception as e:
+            logger.debug(f"Could not install container observer ({self.channel}): {e}")
+            installed = False
+        self._installed = installed is True
+        self.active = self._installed
+        if self.active and not self._listening:
+            # A navigation drops the observer but keeps the binding
+            self.page.on("framenavigated", self._on_frame_navigated)
+            self._listening = True
+            logger.debug(f"👀 Container watcher active ({self.channel})")
+
+    def _on_appended(self, source, count):
+        self.appended_total += int(count)
+        self.events_received += 1
+        self.last_event_time = time.monotonic()
+        self._event.set()
+
+    def _on_frame_navigated(self, frame):
+        if getattr(self.page, "main_frame", frame) is frame:
+            self._installed = False
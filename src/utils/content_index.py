@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Content Index
+Chunked file hashing and a persistent content-hash index of a downloads folder.
+
+Files are hashed in fixed-size chunks read into one reusable buffer, so a
+multi-gigabyte video costs a bounded amount of memory and, when run in a
+worker thread, no event-loop hops. The index maps SHA-256 digests to the
+files already in the downloads folder and is stored as an append-only JSON
+lines file: adding a file appends one record, and a later record for the
+same path supersedes the earlier one. Files already indexed are not hashed
+again unless their size or modification time changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .ndjson_writer import read_ndjson
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+INDEX_FILENAME = ".content_index.jsonl"
+
+# Bookkeeping files that live in the downloads folder but are never indexed
+_IGNORED_SUFFIXES = (".part", ".crdownload", ".tmp", ".json", ".jsonl")
+
+
+def hash_file(path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """SHA-256 of a file, read in ``chunk_size`` pieces (blocking - run it in an executor)"""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+class ContentHashIndex:
+    """SHA-256 → file index over a downloads folder, persisted as append-only JSON lines
+
+    Methods block on disk I/O and hashing; async callers run them in an executor.
+    """
+
+    def __init__(self, folder, index_name: str = INDEX_FILENAME, chunk_size: int = HASH_CHUNK_SIZE):
+        self.folder = Path(folder)
+        self.index_path = self.folder / index_name
+        self.chunk_size = chunk_size
+        # relative path -> (size, mtime_ns, sha256)
+        self._by_path: Dict[str, Tuple[int, int, str]] = {}
+        self._by_digest: Dict[str, List[str]] = {}
+        self._records = 0
+        self._loaded = False
+        self._synced = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._by_path)
+
+    def _relative(self, path) -> str:
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.folder.resolve()).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    def _absolute(self, relative: str) -> Path:
+        path = Path(relative)
+        return path if path.is_absolute() else self.folder / path
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for record in read_ndjson(self.index_path, include_rotated=False):
+            self._records += 1
+            relative = record.get("path")
+            if not relative:
+                continue
+            if record.get("removed"):
+                self._forget(relative)
+            elif record.get("sha256"):
+                self._remember(relative, record.get("size", 0), record.get("mtime_ns", 0), record["sha256"])
+        if self._records > 2 * len(self._by_path) + 100:
+            self.compact()
+
+    def _remember(self, relative: str, size: int, mtime_ns: int, digest: str):
+        self._forget(relative)
+        self._by_path[relative] = (size, mtime_ns, digest)
+        self._by_digest.setdefault(digest, []).append(relative)
+
+    def _forget(self, relative: str):
+        entry = self._by_path.pop(relative, None)
+        if entry is None:
+            return
+        copies = self._by_digest.get(entry[2], [])
+        if relative in copies:
+            copies.remove(relative)
+        if not copies:
+            self._by_digest.pop(entry[2], None)
+
+    def _append(self, record: dict):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._records += 1
+
+    def add(self, path, digest: Optional[str] = None) -> str:
+        """Index ``path`` (hashing it unless ``digest`` is given); returns its digest"""
+        path = Path(path)
+        stat = path.stat()
+        if digest is None:
+            digest = hash_file(path, self.chunk_size)
+        relative = self._relative(path)
+        with self._lock:
+            self._ensure_loaded()
+            self._remember(relative, stat.st_size, stat.st_mtime_ns, digest)
+            self._append({"path": relative, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest})
+        return digest
+
+    def remove(self, path):
+        """Drop ``path`` from the index"""
+        relative = self._relative(path)
+        with self._lock:
+            self._ensure_loaded()
+            if relative in self._by_path:
+                self._forget(relative)
+                self._append({"path": relative, "removed": True})
+
+    def find(self, digest: str, exclude=None) -> Optional[Path]:
+        """An existing indexed file with this content (other than ``exclude``), or None"""
+        excluded = self._relative(exclude) if exclude is not None else None
+        with self._lock:
+            self._ensure_loaded()
+            for relative in list(self._by_digest.get(digest, ())):
+                if relative == excluded:
+                    continue
+                path = self._absolute(relative)
+                try:
+                    if path.stat().st_size == self._by_path[relative][0]:
+                        return path
+                except OSError:
+                    pass
+                # Deleted or replaced since it was indexed
+                self._forget(relative)
+                self._append({"path": relative, "removed": True})
+        return None
+
+    def sync(self) -> int:
+        """Index files in the folder that are new or changed since last indexed; returns how many were hashed"""
+        hashed = 0
+        with self._lock:
+            self._ensure_loaded()
+            seen = set()
+            if self.folder.exists():
+                for path in self.folder.rglob("*"):
+                    if not path.is_file() or path.name.startswith(".") or path.suffix in _IGNORED_SUFFIXES:
+                        continue
+                    relative = self._relative(path)
+                    seen.add(relative)
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entry = self._by_path.get(relative)
+                    if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+                        continue
+                    try:
+                        self.add(path)
+                        hashed += 1
+                    except OSError as e:
+                        logger.debug(f"Could not index {path}: {e}")
+            for relative in [relative for relative in self._by_path if relative not in seen]:
+                self._forget(relative)
+                self._append({"path": relative, "removed": True})
+            self._synced = True
+        if hashed:
+            logger.info(f"Content index: hashed {hashed} new or changed files in {self.folder}")
+        return hashed
+
+    def ensure_synced(self):
+        """Sync once per instance"""
+        if not self._synced:
+            self.sync()
+
+    def compact(self):
+        """Rewrite the index with one record per live file"""
+        with self._lock:
+            temporary = self.index_path.with_name(self.index_path.name + ".tmp")
+            with open(temporary, 'w', encoding='utf-8') as f:
+                for relative, (size, mtime_ns, digest) in self._by_path.items():
+                    f.write(json.dumps({"path": relative, "size": size, "mtime_ns": mtime_ns, "sha256": digest},
+                                       ensure_ascii=False) + "\n")
+            os.replace(temporary, self.index_path)
+            self._records = len(self._by_path)
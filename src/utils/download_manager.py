@@ -16,7 +16,9 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime
 import aiofiles
-import hashlib
+
+from .content_index import HASH_CHUNK_SIZE, ContentHashIndex, hash_file
+from .ndjson_writer import read_ndjson
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +34,8 @@ class DownloadConfig:
     auto_rename_duplicates: bool = True
     verify_downloads: bool = True
     create_download_log: bool = True
+    dedupe_by_content: bool = True   # Drop downloads byte-identical to a file already in the folder
+    hash_chunk_size: int = HASH_CHUNK_SIZE
 
 
 @dataclass
@@ -45,7 +49,8 @@ class DownloadInfo:
     source_url: str
     mime_type: str = None
     checksum: str = None
-    status: str = "pending"  # pending, downloading, completed, failed
+    status: str = "pending"  # pending, downloading, completed, failed, duplicate
+    duplicate_of: str = None
 
 
 class DownloadManager:
@@ -55,6 +60,8 @@ class DownloadManager:
         self.config = config or DownloadConfig()
         self.downloads: List[DownloadInfo] = []
         self.download_callbacks: Dict[str, Callable] = {}
+        self.content_index = ContentHashIndex(self.config.base_download_path,
+                                              chunk_size=self.config.hash_chunk_size)
         
         # Ensure download directory exists
         self._setup_download_directory()
@@ -343,6 +350,10 @@ class DownloadManager:
                 checksum = await self._calculate_checksum(filepath)
                 download_info.checksum = checksum
             
+            if download_info.checksum and self.config.dedupe_by_content:
+                if await self._drop_if_duplicate(download_info):
+                    return
+            
             download_info.status = "completed"
             logger.info(f"Download verified: {filepath} ({actual_size} bytes)")
             
@@ -351,31 +362,49 @@ class DownloadManager:
             download_info.status = "failed"
     
     async def _calculate_checksum(self, filepath: Path) -> str:
-        """Calculate SHA256 checksum of file"""
+        """Calculate SHA256 checksum of file in fixed-size chunks on a worker thread"""
         try:
-            hash_sha256 = hashlib.sha256()
-            async with aiofiles.open(filepath, 'rb') as f:
-                async for chunk in f:
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, hash_file, filepath, self.config.hash_chunk_size)
         except Exception as e:
             logger.error(f"Checksum calculation failed: {e}")
             return ""
     
+    async def _drop_if_duplicate(self, download_info: DownloadInfo) -> bool:
+        """Delete a download whose content is already in the folder; index it otherwise"""
+        filepath = Path(download_info.file_path)
+        index = self.content_index
+        
+        def check():
+            index.ensure_synced()
+            existing = index.find(download_info.checksum, exclude=filepath)
+            if existing is None:
+                index.add(filepath, download_info.checksum)
+                return None
+            index.remove(filepath)
+            filepath.unlink()
+            return existing
+        
+        try:
+            existing = await asyncio.get_running_loop().run_in_executor(None, check)
+        except Exception as e:
+            logger.warning(f"Content dedupe check failed for {filepath}: {e}")
+            return False
+        if existing is None:
+            return False
+        
+        download_info.status = "duplicate"
+        download_info.duplicate_of = str(existing)
+        download_info.file_path = str(existing)
+        download_info.filename = existing.name
+        logger.info(f"Duplicate download dropped: {filepath.name} is identical to {existing}")
+        return True
+    
     async def _log_download(self, download_info: DownloadInfo):
-        """Log download information to file"""
+        """Append download information to the JSON lines ledger"""
         try:
-            log_file = Path(self.config.base_download_path) / "download_log.json"
-            
-            # Load existing log
-            downloads_log = []
-            if log_file.exists():
-                async with aiofiles.open(log_file, 'r') as f:
-                    content = await f.read()
-                    if content.strip():
-                        downloads_log = json.loads(content)
+            log_file = Path(self.config.base_download_path) / "download_log.jsonl"
             
-            # Add new download
             download_dict = {
                 "filename": download_info.filename,
                 "original_filename": download_info.original_filename,
@@ -385,13 +414,13 @@ class DownloadManager:
                 "source_url": download_info.source_url,
                 "mime_type": download_info.mime_type,
                 "checksum": download_info.checksum,
-                "status": download_info.status
+                "status": download_info.status,
+                "duplicate_of": download_info.duplicate_of
             }
-            downloads_log.append(download_dict)
             
-            # Save updated log
-            async with aiofiles.open(log_file, 'w') as f:
-                await f.write(json.dumps(downloads_log, indent=2))
+            # One appended line per download; earlier entries are never rewritten
+            async with aiofiles.open(log_file, 'a') as f:
+                await f.write(json.dumps(download_dict) + "\n")
             
             logger.debug(f"Download logged to: {log_file}")
             
@@ -402,6 +431,7 @@ class DownloadManager:
         """Get summary of all downloads"""
         completed = [d for d in self.downloads if d.status == "completed"]
         failed = [d for d in self.downloads if d.status == "failed"]
+        duplicates = [d for d in self.downloads if d.status == "duplicate"]
         
         total_size = sum(d.file_size for d in completed)
         
@@ -409,6 +439,7 @@ class DownloadManager:
             "total_downloads": len(self.downloads),
             "completed": len(completed),
             "failed": len(failed),
+            "duplicates": len(duplicates),
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
             "download_directory": self.config.base_download_path,
@@ -437,6 +468,22 @@ class DownloadManager:
                     logger.error(f"Failed to remove failed download: {e}")
 
 
+def read_download_log(base_path: str) -> List[Dict[str, Any]]:
+    """Logged downloads oldest first: the legacy download_log.json, then the JSON lines ledger"""
+    base = Path(base_path)
+    entries: List[Dict[str, Any]] = []
+    legacy_file = base / "download_log.json"
+    if legacy_file.exists():
+        try:
+            content = legacy_file.read_text()
+            if content.strip():
+                entries.extend(json.loads(content))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read legacy download log {legacy_file}: {e}")
+    entries.extend(read_ndjson(base / "download_log.jsonl", include_rotated=False))
+    return entries
+
+
 # Factory function for easy usage
 def create_download_manager(base_path: str = None, 
                           organize_by_date: bool = True,
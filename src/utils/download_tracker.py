@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Download Tracker
+Event-driven download completion for generation downloads.
+
+A single ``download`` listener on the browser context hands every Playwright
+``Download`` to the generation that is waiting for it. Each generation
+registers an expectation before clicking its download button and awaits a
+future that resolves once the file is saved, so completion no longer depends
+on polling the downloads folder for recently modified files.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+
+from .metrics_registry import QUEUE_DEPTH
+from .span_tracer import trace_span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrackedDownload:
+    """Result of a download tied to the generation that triggered it"""
+    key: str
+    path: Optional[Path]
+    size: int
+    suggested_filename: str
+    url: str = ""
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.path is not None and self.error is None
+
+
+@dataclass
+class DownloadExpectation:
+    """A generation waiting for its download to start and finish"""
+    key: str
+    page: Any = None
+    target_path: Optional[Path] = None
+    future: Optional[asyncio.Future] = None
+    created_at: float = 0.0
+    started: bool = False
+
+
+class DownloadTracker:
+    """Routes Playwright download events to awaiting generations"""
+
+    def __init__(self, downloads_folder: str):
+        self.downloads_path = Path(downloads_folder)
+        self._pending: List[DownloadExpectation] = []
+        self._contexts: List[Any] = []
+        self._save_tasks = set()
+
+    def attach(self, context) -> bool:
+        """Register the download listener on a browser context (idempotent)"""
+        if context is None or any(c is context for c in self._contexts):
+            return False
+        try:
+            context.on("download", self._on_download)
+            self._contexts.append(context)
+            logger.debug("📥 Download tracker attached to browser context")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not attach download tracker: {e}")
+            return False
+
+    def detach(self):
+        """Remove the download listener and fail any outstanding expectations"""
+        for context in self._contexts:
+            try:
+                context.remove_listener("download", self._on_download)
+            except Exception:
+                pass
+        self._contexts.clear()
+        for expectation in self._pending:
+            if not expectation.future.done():
+                expectation.future.cancel()
+        self._pending.clear()
+        self._publish_depth()
+
+    def expect(self, key: str, page=None, target_path: Optional[Path] = None) -> DownloadExpectation:
+        """Register interest in the next download started from ``page``
+
+        Call this before clicking the download button. The download is saved to
+        ``target_path`` when given, otherwise under its suggested filename in
+        the downloads folder.
+        """
+        expectation = DownloadExpectation(
+            key=key,
+            page=page,
+            target_path=Path(target_path) if target_path else None,
+            future=asyncio.get_running_loop().create_future(),
+            created_at=time.time()
+        )
+        self._pending.append(expectation)
+        self._publish_depth()
+        return expectation
+
+    def cancel(self, expectation: DownloadExpectation):
+        """Stop waiting for a download that was never triggered"""
+        if expectation in self._pending:
+            self._pending.remove(expectation)
+            self._publish_depth()
+        if not expectation.future.done():
+            expectation.future.cancel()
+
+    def pending_for(self, page) -> Optional[DownloadExpectation]:
+        """Oldest live expectation registered for ``page``"""
+        for expectation in self._pending:
+            if expectation.page is page and not expectation.future.done():
+                return expectation
+        return None
+
+    def resolve(self, expectation: DownloadExpectation, result: TrackedDownload):
+        """Complete an expectation with a file saved outside the browser (direct fetch)"""
+        if expectation in self._pending:
+            self._pending.remove(expectation)
+            self._publish_depth()
+        expectation.started = True
+        if not expectation.future.done():
+            expectation.future.set_result(result)
+
+    async def wait(self, expectation: DownloadExpectation, timeout: float) -> Optional[TrackedDownload]:
+        """Await the saved download for an expectation, or None on timeout"""
+        try:
+            return await asyncio.wait_for(asyncio.shield(expectation.future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ No download completed for {expectation.key} within {timeout:.0f}s")
+            self.cancel(expectation)
+            return None
+        except asyncio.CancelledError:
+            return None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _publish_depth(self):
+        QUEUE_DEPTH.labels(queue="downloads_pending").set(len(self._pending))
+
+    def _match(self, download) -> Optional[DownloadExpectation]:
+        """Pop the oldest live expectation for the page that started the download"""
+        source_page = getattr(download, 'page', None)
+        for expectation in list(self._pending):
+            if expectation.future.done():
+                self._pending.remove(expectation)
+                continue
+            if expectation.page is None or source_page is None or expectation.page is source_page:
+                self._pending.remove(expectation)
+                return expectation
+        return None
+
+    def _on_download(self, download):
+        """Context ``download`` listener; saving runs as a background task"""
+        expectation = self._match(download)
+        self._publish_depth()
+        if expectation:
+            expectation.started = True
+            logger.info(f"📥 Download started for {expectation.key}: {download.suggested_filename}")
+        else:
+            logger.debug(f"📥 Untracked download started: {download.suggested_filename}")
+        task = asyncio.ensure_future(self._save(download, expectation))
+        task.set_name(f"download-save-{download.suggested_filename}")
+        self._save_tasks.add(task)
+        task.add_done_callback(self._save_tasks.discard)
+
+    async def _save(self, download, expectation: Optional[DownloadExpectation]):
+        """Save a download to its target path and resolve the waiting future"""
+        suggested = download.suggested_filename
+        target = expectation.target_path if expectation and expectation.target_path else self.downloads_path / suggested
+        started = expectation.created_at if expectation else time.time()
+        result = TrackedDownload(
+            key=expectation.key if expectation else suggested,
+            path=None,
+            size=0,
+            suggested_filename=suggested,
+            url=getattr(download, 'url', '') or ''
+        )
+        with trace_span("rename", "download", key=result.key, target=target.name) as span:
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # save_as resolves once the browser has finished writing the file
+                await download.save_as(str(target))
+                result.path = target
+                result.size = target.stat().st_size
+                span.set(size=result.size)
+                logger.debug(f"Download saved to: {target} ({result.size} bytes)")
+            except Exception as e:
+                result.error = str(e)
+                span.set(error=type(e).__name__)
+                logger.warning(f"Download save failed for {result.key}: {e}")
+        result.duration = time.time() - started
+        if expectation and not expectation.future.done():
+            expectation.future.set_result(result)
+        return result
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Downloads Manifest
+Persistent record of the files in the downloads folder.
+
+Session start used to glob every video in the downloads folder and
+regex-parse each name, and picking a free filename probed ``exists()`` once
+per taken candidate. Both scale with the size of the folder. The manifest keeps
+name, parsed creation time, size and mtime of every file in an append-only
+JSON lines journal next to the downloads. Files the automation creates or
+renames are recorded as it goes; anything else is picked up by reconciling
+against the directory, which only happens when the directory's mtime differs
+from the one recorded after the last reconcile, and only stats names that
+are new to the manifest.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from .ndjson_writer import read_ndjson
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".downloads_manifest.jsonl"
+MANIFEST_SUFFIXES = (".mp4",)
+
+# Creation time embedded in downloaded names: video_2025-08-27-02-20-06_gen_#000000001.mp4
+CREATION_TIME_PATTERN = re.compile(r'video_(\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2})_')
+
+
+def parse_creation_time(name: str) -> Optional[str]:
+    """Creation time (``YYYY-MM-DD-HH-MM-SS``) encoded in a downloaded filename, if any"""
+    match = CREATION_TIME_PATTERN.search(name)
+    return match.group(1) if match else None
+
+
+class DownloadsManifest:
+    """Name → (creation time, size, mtime) record of one downloads folder"""
+
+    def __init__(self, folder, manifest_name: str = MANIFEST_FILENAME):
+        self.folder = Path(folder)
+        self.manifest_path = self.folder / manifest_name
+        self._files: Dict[str, Tuple[Optional[str], int, int]] = {}
+        # creation time -> number of files carrying it
+        self._creation_times: Dict[str, int] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._records = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+        self.reconciles = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._files)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            return name in self._files
+
+    @staticmethod
+    def tracks(name: str) -> bool:
+        return name.endswith(MANIFEST_SUFFIXES) and not name.startswith(".")
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for record in read_ndjson(self.manifest_path, include_rotated=False):
+            self._records += 1
+            if "dir_mtime_ns" in record:
+                self._dir_mtime_ns = record["dir_mtime_ns"]
+                continue
+            name = record.get("name")
+            if not name:
+                continue
+            if record.get("removed"):
+                self._forget(name)
+            else:
+                self._remember(name, record.get("creation_time"), record.get("size", 0), record.get("mtime_ns", 0))
+
+    def _remember(self, name: str, creation_time: Optional[str], size: int, mtime_ns: int):
+        self._forget(name)
+        self._files[name] = (creation_time, size, mtime_ns)
+        if creation_time:
+            self._creation_times[creation_time] = self._creation_times.get(creation_time, 0) + 1
+
+    def _forget(self, name: str):
+        entry = self._files.pop(name, None)
+        if entry is None or not entry[0]:
+            return
+        remaining = self._creation_times.get(entry[0], 0) - 1
+        if remaining > 0:
+            self._creation_times[entry[0]] = remaining
+        else:
+            self._creation_times.pop(entry[0], None)
+
+    def _append(self, *records: dict):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._records += len(records)
+
+    def _directory_mtime_ns(self) -> Optional[int]:
+        try:
+            return self.folder.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _entry_record(self, name: str) -> dict:
+        creation_time, size, mtime_ns = self._files[name]
+        return {"name": name, "creation_time": creation_time, "size": size, "mtime_ns": mtime_ns}
+
+    def refresh(self) -> int:
+        """Bring the manifest in line with the folder; returns the number of changes found
+
+        Costs one ``stat`` of the folder when nothing changed outside the
+        manifest's knowledge, otherwise one directory listing plus a ``stat``
+        per new file.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            current = self._directory_mtime_ns()
+            if current is None:
+                return 0
+            if current == self._dir_mtime_ns:
+                return 0
+
+            records = []
+            seen: Set[str] = set()
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if not self.tracks(entry.name):
+                        continue
+                    seen.add(entry.name)
+                    if entry.name in self._files:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    self._remember(entry.name, parse_creation_time(entry.name), stat.st_size, stat.st_mtime_ns)
+                    records.append(self._entry_record(entry.name))
+            for name in [name for name in self._files if name not in seen]:
+                self._forget(name)
+                records.append({"name": name, "removed": True})
+
+            self.reconciles += 1
+            if self._records + len(records) > 2 * len(self._files) + 100:
+                self._compact()
+            else:
+                # Also creates the journal, so its creation is not mistaken for an outside change
+                self._append(*records)
+            self._mark_current()
+            if records:
+                logger.debug(f"Downloads manifest: {len(records)} changes in {self.folder}")
+            return len(records)
+
+    def record(self, path) -> bool:
+        """Record a file that appeared in the folder (e.g. a download the browser saved)"""
+        path = Path(path)
+        if path.parent.resolve() != self.folder.resolve() or not self.tracks(path.name):
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        with self._lock:
+            self._ensure_loaded()
+            self._remember(path.name, parse_creation_time(path.name), stat.st_size, stat.st_mtime_ns)
+            self._append(self._entry_record(path.name))
+        return True
+
+    def rename(self, source, target) -> Path:
+        """Rename a file and record both sides of it"""
+        source, target = Path(source), Path(target)
+        with self._lock:
+            self._ensure_loaded()
+            was_current = self._is_current()
+            source.rename(target)
+            if source.name in self._files:
+                self._forget(source.name)
+                self._append({"name": source.name, "removed": True})
+            self.record(target)
+            if was_current:
+                self._mark_current()
+        return target
+
+    def delete(self, path):
+        """Delete a file and record its removal"""
+        path = Path(path)
+        with self._lock:
+            self._ensure_loaded()
+            was_current = self._is_current()
+            path.unlink()
+            if path.name in self._files:
+                self._forget(path.name)
+                self._append({"name": path.name, "removed": True})
+            if was_current:
+                self._mark_current()
+
+    def _is_current(self) -> bool:
+        """True when nothing changed in the folder since the last reconcile"""
+        return self._dir_mtime_ns is not None and self._directory_mtime_ns() == self._dir_mtime_ns
+
+    def _mark_current(self):
+        # The folder's mtime moved with a change the manifest already recorded
+        self._dir_mtime_ns = self._directory_mtime_ns()
+        self._append({"dir_mtime_ns": self._dir_mtime_ns})
+
+    def creation_times(self) -> Set[str]:
+        """Creation times of the files in the folder"""
+        with self._lock:
+            self.refresh()
+            return set(self._creation_times)
+
+    def has_creation_time(self, creation_time: str) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            return creation_time in self._creation_times
+
+    def free_path(self, path, pattern: str = "{stem}_{counter}{suffix}", limit: int = 999) -> Optional[Path]:
+        """``path`` or the first ``pattern`` variant of it that is not taken; None past ``limit``
+
+        Candidates known to the manifest are skipped without touching the
+        disk; the one picked is confirmed with a single ``exists()`` in case
+        it appeared outside the manifest's knowledge.
+        """
+        path = Path(path)
+        counter = 0
+        candidate = path
+        with self._lock:
+            self._ensure_loaded()
+            while True:
+                if candidate.name not in self._files and not candidate.exists():
+                    return candidate
+                counter += 1
+                if counter > limit:
+                    return None
+                candidate = path.with_name(pattern.format(stem=path.stem, counter=counter, suffix=path.suffix))
+
+    def _compact(self):
+        """Rewrite the journal with one record per file"""
+        temporary = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(temporary, 'w', encoding='utf-8') as f:
+            for name in self._files:
+                f.write(json.dumps(self._entry_record(name), ensure_ascii=False) + "\n")
+        os.replace(temporary, self.manifest_path)
+        self._records = len(self._files)
@@ -11,6 +11,8 @@ import time
 from typing import Dict, Optional, Any, List, Tuple
 from playwright.async_api import ElementHandle, Page, Error as PlaywrightError
 
+from .span_tracer import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +40,7 @@ class MetadataExtractionConfig:
         self.log_extraction_details = True
 
 
+@traced("extract", "download")
 async def extract_container_metadata_enhanced(container: ElementHandle, text_content: str, retry_count: int = 0, config: MetadataExtractionConfig = None) -> Optional[Dict[str, str]]:
     """
     Enhanced metadata extraction with comprehensive retry logic and multiple strategies.
@@ -2,18 +2,38 @@
 """
 Generation Debug Logger
 Comprehensive debugging system for generation download metadata extraction.
+
+Every debug event is appended as one record to a session NDJSON stream by a
+background writer, and only the most recent records of each section are kept
+in memory. The aggregated JSON view is rebuilt from the stream on demand
+(``load_debug_view``), so debug mode costs the same per event however long
+the session runs.
 """
 
 import os
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 
+from .ndjson_writer import NDJSONWriter, read_ndjson
+
 logger = logging.getLogger(__name__)
 
+# Sections of the aggregated debug view that collect one entry per event
+DEBUG_SECTIONS = (
+    "steps",
+    "element_snapshots",
+    "date_extractions",
+    "prompt_extractions",
+    "thumbnail_clicks",
+    "file_naming",
+    "page_states",
+)
+
 
 @dataclass
 class ElementDebugInfo:
@@ -63,18 +83,53 @@ class PromptExtractionDebug:
     error: Optional[str] = None
 
 
+class BoundedList(list):
+    """List that keeps only the newest ``maxlen`` entries"""
+
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self.maxlen = maxlen
+
+    def append(self, item):
+        super().append(item)
+        if len(self) > self.maxlen:
+            del self[0]
+
+
+def load_debug_view(stream_file, include_rotated: bool = True) -> Dict[str, Any]:
+    """Rebuild the aggregated debug JSON view from a session NDJSON stream"""
+    view: Dict[str, Any] = {"session_info": {}, "configuration": {}}
+    for section in DEBUG_SECTIONS:
+        view[section] = []
+
+    for record in read_ndjson(stream_file, include_rotated=include_rotated):
+        section = record.get("section")
+        data = record.get("data")
+        if section == "session_info":
+            view["session_info"].update(data or {})
+        elif section == "configuration":
+            view["configuration"] = data or {}
+        elif section in view:
+            view[section].append(data)
+    return view
+
+
 class GenerationDebugLogger:
     """Enhanced debug logging system for generation downloads"""
     
-    def __init__(self, logs_folder: str = "/home/olereon/workspace/github.com/olereon/automaton/logs"):
+    def __init__(self, logs_folder: str = "/home/olereon/workspace/github.com/olereon/automaton/logs",
+                 ring_size: int = 500, max_stream_bytes: int = 50 * 1024 * 1024, stream_backups: int = 3):
         self.logs_folder = Path(logs_folder)
         self.logs_folder.mkdir(parents=True, exist_ok=True)
         
-        # Create session-specific debug log file
+        # Create session-specific debug files: the NDJSON event stream and the
+        # aggregated JSON view written from it on demand
         session_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.debug_log_file = self.logs_folder / f"debug_generation_downloads_{session_timestamp}.json"
+        self.debug_stream_file = self.logs_folder / f"debug_generation_downloads_{session_timestamp}.ndjson"
+        self._writer = NDJSONWriter(self.debug_stream_file, max_bytes=max_stream_bytes, backup_count=stream_backups)
         
-        # Initialize debug data structure
+        # Initialize debug data structure; sections keep only the latest ring_size entries
         self.debug_data = {
             "session_info": {
                 "start_time": datetime.now().isoformat(),
@@ -82,20 +137,26 @@ class GenerationDebugLogger:
                 "version": "1.0.0"
             },
             "configuration": {},
-            "steps": [],
-            "element_snapshots": [],
-            "date_extractions": [],
-            "prompt_extractions": [],
-            "thumbnail_clicks": [],
-            "file_naming": [],
-            "page_states": []
         }
+        for section in DEBUG_SECTIONS:
+            self.debug_data[section] = BoundedList(ring_size)
+        self.section_counts = {section: 0 for section in DEBUG_SECTIONS}
+        self._lock = threading.Lock()
         
-        logger.info(f"🔍 Debug logger initialized: {self.debug_log_file}")
+        self._writer.write({"section": "session_info", "data": self.debug_data["session_info"]})
+        logger.info(f"🔍 Debug logger initialized: {self.debug_stream_file}")
+    
+    def _record(self, section: str, entry: Dict[str, Any]):
+        """Keep an entry in the in-memory ring and append it to the stream"""
+        with self._lock:
+            self.debug_data[section].append(entry)
+            self.section_counts[section] += 1
+        self._writer.write({"section": section, "data": entry})
     
     def log_configuration(self, config_dict: Dict[str, Any]):
         """Log the configuration used for this session"""
         self.debug_data["configuration"] = config_dict
+        self._writer.write({"section": "configuration", "data": config_dict})
         logger.debug("Configuration logged to debug file")
     
     def log_step(self, thumbnail_index: int, step_type: str, data: Dict[str, Any], 
@@ -109,10 +170,8 @@ class GenerationDebugLogger:
             "success": success,
             "error": error
         }
-        self.debug_data["steps"].append(step_data)
-        
-        # Also save to file immediately for real-time debugging
-        self._save_debug_file()
+        # Streamed to the NDJSON file by the background writer for real-time debugging
+        self._record("steps", step_data)
     
     async def log_page_elements(self, page, thumbnail_index: int, search_patterns: List[str]):
         """Log all elements on the page that match date/time search patterns"""
@@ -169,7 +228,7 @@ class GenerationDebugLogger:
                     continue
             
             # Save element snapshot
-            self.debug_data["element_snapshots"].append({
+            self._record("element_snapshots", {
                 "timestamp": datetime.now().isoformat(),
                 "thumbnail_index": thumbnail_index,
                 "total_elements_found": len(elements_info),
@@ -431,7 +490,7 @@ class GenerationDebugLogger:
             error=error
         )
         
-        self.debug_data["date_extractions"].append(asdict(extraction_debug))
+        self._record("date_extractions", asdict(extraction_debug))
         logger.debug(f"Date extraction logged: {method} -> {selected_date}")
     
     def log_prompt_extraction(self, thumbnail_index: int, method: str, pattern: str,
@@ -451,7 +510,7 @@ class GenerationDebugLogger:
             error=error
         )
         
-        self.debug_data["prompt_extractions"].append(asdict(extraction_debug))
+        self._record("prompt_extractions", asdict(extraction_debug))
         logger.debug(f"Prompt extraction logged: {method} -> {selected_prompt[:50]}...")
     
     def log_thumbnail_click(self, thumbnail_index: int, thumbnail_selector: str, click_success: bool):
@@ -463,7 +522,7 @@ class GenerationDebugLogger:
             "success": click_success
         }
         
-        self.debug_data["thumbnail_clicks"].append(click_data)
+        self._record("thumbnail_clicks", click_data)
         logger.debug(f"Thumbnail click logged: {thumbnail_selector} -> {click_success}")
     
     def log_metadata_extraction(self, thumbnail_index: int, extraction_method: str, 
@@ -478,7 +537,7 @@ class GenerationDebugLogger:
             "data_quality": self._assess_metadata_quality(extracted_data)
         }
         
-        self.debug_data["steps"].append({
+        self._record("steps", {
             "timestamp": datetime.now().isoformat(),
             "thumbnail_index": thumbnail_index,
             "step_type": "METADATA_EXTRACTION",
@@ -499,7 +558,7 @@ class GenerationDebugLogger:
             "error": error
         }
         
-        self.debug_data["file_naming"].append(naming_log)
+        self._record("file_naming", naming_log)
         logger.debug(f"File naming logged: {original_filename} -> {new_filename}")
     
     def _assess_metadata_quality(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
@@ -556,7 +615,7 @@ class GenerationDebugLogger:
                 "viewport": await page.evaluate("() => ({ width: window.innerWidth, height: window.innerHeight })")
             }
             
-            self.debug_data["page_states"].append(page_state)
+            self._record("page_states", page_state)
             
             logger.info(f"📸 Debug screenshot saved: {screenshot_path}")
             return str(screenshot_path)
@@ -565,32 +624,44 @@ class GenerationDebugLogger:
             logger.error(f"Error creating visual debug report: {e}")
             return ""
     
+    def flush(self):
+        """Wait until every logged event has been written to the stream"""
+        self._writer.flush()
+    
     def _save_debug_file(self):
-        """Save debug data to JSON file"""
+        """Write the aggregated JSON view, rebuilt from the event stream"""
         try:
+            self.flush()
+            debug_view = load_debug_view(self.debug_stream_file)
             with open(self.debug_log_file, 'w', encoding='utf-8') as f:
-                json.dump(self.debug_data, f, indent=2, ensure_ascii=False)
+                json.dump(debug_view, f, indent=2, ensure_ascii=False)
         except Exception as e:
             logger.error(f"Error saving debug file: {e}")
     
     def get_debug_summary(self) -> Dict[str, Any]:
         """Get a summary of debug information"""
+        with self._lock:
+            counts = dict(self.section_counts)
         return {
             "session_id": self.debug_data["session_info"]["session_id"],
             "start_time": self.debug_data["session_info"]["start_time"],
-            "total_steps": len(self.debug_data["steps"]),
-            "date_extractions": len(self.debug_data["date_extractions"]),
-            "prompt_extractions": len(self.debug_data["prompt_extractions"]),
-            "thumbnail_clicks": len(self.debug_data["thumbnail_clicks"]),
-            "element_snapshots": len(self.debug_data["element_snapshots"]),
-            "page_states": len(self.debug_data["page_states"]),
-            "debug_log_file": str(self.debug_log_file)
+            "total_steps": counts["steps"],
+            "date_extractions": counts["date_extractions"],
+            "prompt_extractions": counts["prompt_extractions"],
+            "thumbnail_clicks": counts["thumbnail_clicks"],
+            "element_snapshots": counts["element_snapshots"],
+            "page_states": counts["page_states"],
+            "debug_log_file": str(self.debug_log_file),
+            "debug_stream_file": str(self.debug_stream_file)
         }
     
     def finalize_debug_session(self):
         """Finalize and save the complete debug session"""
-        self.debug_data["session_info"]["end_time"] = datetime.now().isoformat()
+        end_time = datetime.now().isoformat()
+        self.debug_data["session_info"]["end_time"] = end_time
+        self._writer.write({"section": "session_info", "data": {"end_time": end_time}})
         self._save_debug_file()
+        self._writer.close()
         
         summary = self.get_debug_summary()
         logger.info(f"🔍 Debug session finalized: {summary}")
@@ -7,10 +7,11 @@ Comprehensive system for automating the download of generated content with metad
 import os
 import json
 import asyncio
+import itertools
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 import re
 from dataclasses import dataclass, asdict
@@ -18,11 +19,129 @@ from enum import Enum
 
 from .download_manager import DownloadManager, DownloadConfig
 from .boundary_scroll_manager import BoundaryScrollManager
+from .container_scanner import ContainerScanner
+from .container_watcher import ContainerAppendWatcher, GALLERY_THUMBNAIL_SELECTOR
+from .adaptive_timeout_manager import AdaptiveTimeoutManager
+from .metrics_registry import DUPLICATE_HITS, SCROLL_STEPS, record_download
+from .network_profiles import format_report, merge_reports, network_phase
+from .page_waits import PageWaits, download_wait_conditions
+from .span_tracer import trace_span, traced
 from .enhanced_metadata_extraction import extract_container_metadata_enhanced
 from .gallery_navigation_fix import RobustGalleryNavigator, gallery_navigator
+from .download_tracker import DownloadTracker
+from .generation_download_pipeline import GenerationDownloadPipeline
+from .generation_log_store import GenerationDuplicateIndex, GenerationLogStore, PLACEHOLDER_ID
+from .media_fetcher import DEFAULT_MEDIA_URL_SELECTORS, DirectMediaFetcher
+from .downloads_manifest import DownloadsManifest
 
 logger = logging.getLogger(__name__)
 
+# In-page thumbnail signature, shared by the batched gallery snapshot, the
+# single-element identifier and the stale-reference lookup so all three agree.
+THUMBNAIL_RECORD_JS = r"""
+(el, index) => {
+    const parts = [];
+    let dateText = null;
+    let imgHash = null;
+    const dataAttributes = {};
+
+    // Method 1: creation time or date text (most reliable)
+    for (const elem of el.querySelectorAll('[class*="time"], [class*="date"], span[title]')) {
+        const text = elem.textContent;
+        if (text && ['aug', 'jul', 'sep', '2025', '2024'].some(word => text.toLowerCase().includes(word))) {
+            dateText = text.trim();
+            parts.push(`date:${dateText}`);
+            break;
+        }
+    }
+
+    // Method 2: long alphanumeric sequence or hash from the image source
+    for (const img of el.querySelectorAll('img')) {
+        const src = img.getAttribute('src');
+        const match = src && src.match(/([a-fA-F0-9]{16,}|[a-zA-Z0-9_-]{16,})/);
+        if (match) {
+            imgHash = match[1];
+            parts.push(`img:${imgHash}`);
+            break;
+        }
+    }
+
+    // Method 3: meaningful data attributes
+    let dataPart = null;
+    for (const attr of ['data-id', 'data-key', 'data-item', 'data-spm-anchor-id', 'id']) {
+        const value = el.getAttribute(attr);
+        if (value) {
+            dataAttributes[attr] = value;
+            if (!dataPart && value.length > 5) {
+                dataPart = `${attr}:${value}`;
+            }
+        }
+    }
+    if (dataPart) {
+        parts.push(dataPart);
+    }
+
+    // Method 4: DOM signature from classes, sibling index and text hash
+    const dom = [];
+    if (typeof el.className === 'string' && el.className.length > 0) {
+        const classes = el.className.split(' ').filter(c => c.length > 0).sort();
+        if (classes.length > 0) {
+            dom.push(`cls:${classes.join(',')}`);
+        }
+    }
+    if (el.parentElement) {
+        const siblingIndex = Array.from(el.parentElement.children).indexOf(el);
+        if (siblingIndex >= 0) {
+            dom.push(`idx:${siblingIndex}`);
+        }
+    }
+    const text = (el.textContent || '').trim();
+    if (text.length > 0 && text.length < 100) {
+        let hash = 0;
+        for (let i = 0; i < text.length; i++) {
+            hash = ((hash << 5) - hash + text.charCodeAt(i)) & 0xffffffff;
+        }
+        dom.push(`txt:${Math.abs(hash)}`);
+    }
+    const domSignature = dom.join('|');
+    if (domSignature.length > 5) {
+        parts.push(`dom:${domSignature}`);
+    }
+
+    // Method 5: position fallback only when nothing else identifies the thumbnail
+    const rect = el.getBoundingClientRect();
+    if (parts.length === 0) {
+        parts.push(`pos:${Math.trunc(rect.x)}_${Math.trunc(rect.y)}`);
+    }
+
+    const style = window.getComputedStyle(el);
+    return {
+        index: index,
+        unique_id: parts.length > 1 ? `${parts[0]}#${parts[1]}` : parts[0],
+        date_text: dateText,
+        img_hash: imgHash,
+        data_attributes: dataAttributes,
+        bbox: {x: rect.x, y: rect.y, width: rect.width, height: rect.height},
+        visible: rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden'
+    };
+}
+"""
+
+THUMBNAIL_SNAPSHOT_JS = f"""
+selector => {{
+    const record = {THUMBNAIL_RECORD_JS};
+    return Array.from(document.querySelectorAll(selector), (el, index) => record(el, index));
+}}
+"""
+
+THUMBNAIL_LOOKUP_JS = f"""
+([selector, uniqueId]) => {{
+    const record = {THUMBNAIL_RECORD_JS};
+    const elements = Array.from(document.querySelectorAll(selector));
+    return elements.find((el, index) => record(el, index).unique_id === uniqueId) || null;
+}}
+"""
+
 
 class DuplicateMode(Enum):
     """Duplicate handling modes for generation downloads"""
@@ -185,6 +304,8 @@ class GenerationDownloadConfig:
     scroll_wait_time: int = 2000  # Wait time after scrolling (ms)
     max_scroll_attempts: int = 2000  # Max attempts to find new thumbnails (support very large galleries)
     scroll_detection_threshold: int = 3  # Min new thumbnails to consider scroll successful
+    content_quiet_period: float = 3.0  # Seconds without appended containers before a scroll counts as empty
+    learned_timeouts_file: Optional[str] = None  # Learned wait budgets (default: <logs_folder>/learned_timeouts.json)
     
     # Button panel and icon-based selectors
     button_panel_selector: str = ".sc-eYHxxX.fmURBt"  # Static button panel selector
@@ -214,7 +335,21 @@ class GenerationDownloadConfig:
     
     # START FROM SPECIFIC GENERATION SETTINGS
     start_from: Optional[str] = None             # Start from specific datetime (format: "DD MMM YYYY HH:MM:SS")
-    
+
+    # PIPELINED DOWNLOAD SETTINGS (generation container mode)
+    pipeline_workers: int = 1                    # Worker pages downloading in parallel (1 = sequential mode)
+    max_inflight_downloads: int = 2              # Max downloads awaiting completion at once
+    pipeline_queue_size: int = 8                 # Containers scanned ahead of the workers
+
+    # NETWORK PROFILES (request blocking per phase; None leaves routing untouched)
+    scan_network_profile: Optional[str] = "scan"          # Scrolling/boundary search: no images, media, fonts, trackers
+    download_network_profile: Optional[str] = "download"  # Opening items and downloading: no fonts, trackers
+
+    # DIRECT MEDIA FETCH (fast path: media URL from the DOM fetched via context.request; clicks are the fallback)
+    direct_fetch_enabled: bool = False           # Off by default: the DOM URL may be the watermarked preview on some sites
+    direct_fetch_concurrency: int = 3            # Direct fetches running at once
+    media_url_selectors: tuple = DEFAULT_MEDIA_URL_SELECTORS  # Elements whose href/src is the media URL
+
     # Legacy selectors (kept for backward compatibility)
     
     @classmethod
@@ -278,6 +413,9 @@ class GenerationDownloadLogger:
         self.log_file_path = Path(config.logs_folder) / config.log_filename
         self.ensure_log_directory()
         
+        # Append-only indexed store; the text log is its newest-first export view
+        self.store = GenerationLogStore(self.log_file_path)
+        
         # Enhanced chronological logging features
         self.use_chronological_ordering = True
         self.placeholder_id = "#999999999"
@@ -334,37 +472,21 @@ class GenerationDownloadLogger:
             return False
     
     def log_download_chronologically(self, metadata: GenerationMetadata) -> bool:
-        """Log a generation download in chronological order (newest first)"""
+        """Log a generation download in chronological order (newest first)
+        
+        The entry is appended to the indexed log store; the newest-first text file
+        is extended in place or regenerated lazily (see flush()).
+        """
         try:
-            # Parse the new entry's date
-            new_date = self._parse_date_for_comparison(metadata.generation_date)
-            if not new_date:
+            if not self._parse_date_for_comparison(metadata.generation_date):
                 logger.warning(f"Invalid date format for chronological insertion: {metadata.generation_date}")
-                # Fall back to append mode
-                return self._log_download_append(metadata)
-            
-            # Read all existing entries
-            existing_entries = self._read_all_log_entries()
-            
-            # Create new entry
-            new_entry = {
-                'file_id': metadata.file_id,
-                'generation_date': metadata.generation_date,
-                'prompt': metadata.prompt,
-                'parsed_date': new_date
-            }
             
-            # Insert in chronological order (newest first)
-            existing_entries.append(new_entry)
-            # Sort with None values last (for invalid dates)
-            existing_entries.sort(key=lambda x: (x['parsed_date'] is None, x['parsed_date']), reverse=True)
+            file_id = metadata.file_id
+            if not file_id or file_id == 'NEW' or not file_id.startswith('#'):
+                file_id = self.placeholder_id  # Placeholder for new entries
             
-            # Rewrite entire file with sorted entries
-            write_success = self._write_all_log_entries(existing_entries)
-            if not write_success:
-                raise Exception("Failed to write log entries to file")
-            
-            logger.info(f"Logged download chronologically: {metadata.file_id}")
+            self.store.append(file_id, metadata.generation_date, metadata.prompt)
+            logger.info(f"Logged download chronologically: {file_id}")
             return True
             
         except Exception as e:
@@ -376,6 +498,14 @@ class GenerationDownloadLogger:
                 logger.error(f"Failed to log download (fallback): {fallback_error}")
                 return False
     
+    def flush(self) -> bool:
+        """Regenerate the newest-first text log if out-of-order entries are pending"""
+        try:
+            return self.store.flush()
+        except Exception as e:
+            logger.error(f"Failed to export generation log: {e}")
+            return False
+    
     def _log_download_append(self, metadata: GenerationMetadata) -> bool:
         """Original append-only logging method (fallback)"""
         try:
@@ -456,84 +586,27 @@ class GenerationDownloadLogger:
             return date_string
     
     def _read_all_log_entries(self) -> List[Dict]:
-        """Read all log entries from the file and return as list of dictionaries"""
+        """Read all log entries (newest first) and return as list of dictionaries"""
         entries = []
         
-        if not self.log_file_path.exists():
-            return entries
-            
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                
-            if not content:
-                return entries
-            
-            # Split by separator lines
-            sections = content.split('=' * 40)
-            
-            for section in sections:
-                section = section.strip()
-                if not section:
-                    continue
-                    
-                lines = section.split('\n')
-                if len(lines) >= 3:
-                    file_id = lines[0].strip()
-                    generation_date = lines[1].strip()
-                    prompt = '\n'.join(lines[2:]).strip()
-                    
-                    # Parse date for sorting
-                    parsed_date = self._parse_date_for_comparison(generation_date)
-                    
-                    if file_id and generation_date:  # Only add valid entries
-                        entries.append({
-                            'file_id': file_id,
-                            'generation_date': generation_date,
-                            'prompt': prompt,
-                            'parsed_date': parsed_date
-                        })
+            for entry in self.store.entries():
+                entries.append({
+                    'file_id': entry.file_id,
+                    'generation_date': entry.creation_time,
+                    'prompt': entry.prompt,
+                    'parsed_date': self._parse_date_for_comparison(entry.creation_time)
+                })
                         
         except Exception as e:
             logger.error(f"Error reading log entries: {e}")
             
         return entries
-    
-    def _write_all_log_entries(self, entries: List[Dict]) -> bool:
-        """Write all entries to the log file in chronological order"""
-        try:
-            with open(self.log_file_path, 'w', encoding='utf-8') as f:
-                for entry in entries:
-                    # Use placeholder ID for new entries
-                    file_id = entry['file_id']
-                    if not file_id or file_id == 'NEW' or not file_id.startswith('#'):
-                        file_id = '#999999999'  # Placeholder for new entries
-                        
-                    log_entry = f"{file_id}\n{entry['generation_date']}\n{entry['prompt']}\n{'=' * 40}\n"
-                    f.write(log_entry)
-                    
-                # Explicitly flush to ensure immediate disk write
-                f.flush()
-                import os
-                os.fsync(f.fileno())  # Force OS to write to disk
-                    
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error writing log entries: {e}")
-            return False
 
     def get_download_count(self) -> int:
         """Get the current number of logged downloads"""
-        if not self.log_file_path.exists():
-            return 0
-            
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Count delimiter lines to determine number of entries
-            return content.count('=' * 40)
+            return len(self.store)
             
         except Exception as e:
             logger.error(f"Error counting downloads: {e}")
@@ -541,18 +614,19 @@ class GenerationDownloadLogger:
     
     def get_last_log_entry(self) -> Optional[Dict[str, str]]:
         """Get the last (most recent) log entry as a checkpoint for fast-forward skip mode"""
-        if not self.log_file_path.exists():
-            logger.info("📄 No log file found - starting fresh download session")
-            return None
-            
         try:
-            entries = self._read_all_log_entries()
-            if not entries:
+            newest = self.store.newest()
+            if not newest:
                 logger.info("📄 Log file is empty - starting fresh download session")
                 return None
             
-            # Get the first entry (newest due to chronological ordering)
-            last_entry = entries[0]
+            # Newest entry by creation time, read straight from the index
+            last_entry = {
+                'file_id': newest.file_id,
+                'generation_date': newest.creation_time,
+                'prompt': newest.prompt,
+                'parsed_date': self._parse_date_for_comparison(newest.creation_time)
+            }
             
             logger.info(f"🔖 Last downloaded checkpoint found:")
             logger.info(f"   📅 Creation Time: {last_entry.get('generation_date')}")
@@ -575,31 +649,13 @@ class GenerationFileManager:
         self.downloads_path = Path(config.downloads_folder)
         self.file_namer = EnhancedFileNamer(config)
         self.ensure_downloads_directory()
+        # Known files in the downloads folder, so collisions are checked without probing the disk
+        self.manifest = DownloadsManifest(self.downloads_path)
         
     def ensure_downloads_directory(self):
         """Ensure the downloads directory exists"""
         self.downloads_path.mkdir(parents=True, exist_ok=True)
         
-    async def wait_for_download(self, timeout: int = 30) -> Optional[Path]:
-        """Wait for a new file to appear in downloads folder"""
-        initial_files = set(self.downloads_path.glob('*'))
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            current_files = set(self.downloads_path.glob('*'))
-            new_files = current_files - initial_files
-            
-            if new_files:
-                # Return the newest file
-                newest_file = max(new_files, key=lambda f: f.stat().st_mtime)
-                logger.info(f"New download detected: {newest_file.name}")
-                return newest_file
-                
-            await asyncio.sleep(1)
-            
-        logger.warning(f"No new download detected within {timeout} seconds")
-        return None
-    
     def rename_file(self, file_path: Path, new_id: str = None, creation_date: str = None) -> Optional[Path]:
         """Rename downloaded file with enhanced naming or legacy ID"""
         try:
@@ -618,23 +674,17 @@ class GenerationFileManager:
                 logger.warning("No naming method specified, keeping original filename")
                 return file_path
             
-            new_path = file_path.parent / new_filename
-            
-            # Check if file already exists and create unique name if needed
-            counter = 1
-            original_new_path = new_path
-            while new_path.exists():
-                name_part = original_new_path.stem
-                extension_part = original_new_path.suffix
-                new_path = original_new_path.parent / f"{name_part}_{counter}{extension_part}"
-                counter += 1
-                
-                if counter > 999:  # Safety limit
-                    logger.error(f"Could not create unique filename after 999 attempts")
-                    return None
+            # Create unique name if the file already exists
+            new_path = self.manifest.free_path(file_path.parent / new_filename)
+            if new_path is None:  # Safety limit
+                logger.error(f"Could not create unique filename after 999 attempts")
+                return None
             
             # Rename the file
-            file_path.rename(new_path)
+            if file_path.parent == self.downloads_path:
+                self.manifest.rename(file_path, new_path)
+            else:
+                file_path.rename(new_path)
             logger.info(f"Renamed {file_path.name} to {new_filename}")
             return new_path
             
@@ -671,6 +721,14 @@ class GenerationDownloadManager:
         self.logger = GenerationDownloadLogger(config)
         self.file_manager = GenerationFileManager(config)
         self.file_namer = EnhancedFileNamer(config)
+        self.download_tracker = DownloadTracker(config.downloads_folder)
+        
+        # Condition-based waits with per-site timeout budgets learned across runs
+        timeouts_file = config.learned_timeouts_file or str(Path(config.logs_folder) / "learned_timeouts.json")
+        self.page_waits = PageWaits(
+            download_wait_conditions(config),
+            AdaptiveTimeoutManager(min_timeout=0.2, max_timeout=15.0, state_file=timeouts_file)
+        )
         
         # Initialize robust gallery navigator (September 2025 fix)
         self.gallery_navigator = RobustGalleryNavigator()
@@ -741,6 +799,24 @@ class GenerationDownloadManager:
         
         # Boundary scroll manager (will be initialized when needed)
         self.boundary_scroll_manager = None
+        self._thumbnail_watcher = None
+        
+        # Request blockers of every page a scan/download phase ran on
+        self.network_blockers = []
+        
+        # Direct media fetch fast path (used only when direct_fetch_enabled)
+        self.media_fetcher = DirectMediaFetcher(
+            concurrency=config.direct_fetch_concurrency,
+            timeout_ms=config.download_timeout,
+            url_selectors=config.media_url_selectors,
+            gallery_anchor_selector=f"svg use[href='{config.download_icon_href}'], "
+                                    f"svg use[*|href='{config.download_icon_href}']"
+        )
+        
+        # Last container whose download was logged; reported to checkpoint_callback so a
+        # resumed run can start from it (see WebAutomationEngine checkpoints)
+        self.last_processed_container: Optional[Dict[str, Optional[str]]] = None
+        self.checkpoint_callback: Optional[Callable[[Dict[str, Optional[str]]], None]] = None
         
     def should_continue_downloading(self) -> bool:
         """Check if we should continue downloading"""
@@ -758,14 +834,26 @@ class GenerationDownloadManager:
         self.should_stop = True
         logger.info("Stop requested for generation downloads")
     
+    async def _get_thumbnail_watcher(self, page) -> ContainerAppendWatcher:
+        """Appended-thumbnail events for the gallery, created once per page"""
+        if self._thumbnail_watcher is None or self._thumbnail_watcher.page is not page:
+            self._thumbnail_watcher = ContainerAppendWatcher(
+                page, channel="thumbnails", selector=GALLERY_THUMBNAIL_SELECTOR,
+                id_pattern=None, exclude_class="-mask")
+            await self._thumbnail_watcher.start()
+        return self._thumbnail_watcher
+    
     def initialize_boundary_scroll_manager(self, page):
         """Initialize the boundary scroll manager with verified scroll methods"""
         if self.boundary_scroll_manager is None:
             self.boundary_scroll_manager = BoundaryScrollManager(page)
+            self.boundary_scroll_manager.quiet_period = self.config.content_quiet_period
             logger.info("🎯 Initialized boundary scroll manager with verified methods:")
             logger.info("   Primary: Element.scrollIntoView() - 1060px, 0.515s")
             logger.info("   Fallback: container.scrollTop - 1016px, 0.515s")
     
+    @traced("scroll", "download")
+    @network_phase("scan_network_profile")
     async def scroll_to_find_boundary_generations(self, page, boundary_criteria: Dict) -> Optional[Dict]:
         """
         Use verified scrolling methods to find boundary generations on /generate page.
@@ -798,29 +886,22 @@ class GenerationDownloadManager:
         if not self.config.duplicate_check_enabled:
             return set()
             
-        existing_times = set()
         downloads_path = Path(self.config.downloads_folder)
         
         if not downloads_path.exists():
             logger.info("📁 Downloads folder does not exist yet")
-            return existing_times
+            return set()
         
         logger.info(f"🔍 Scanning existing files in: {downloads_path}")
         
-        # Pattern to match files with creation time: video_2025-08-27-02-20-06_gen_#000000001.mp4
-        import re
-        file_pattern = re.compile(r'video_(\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2})_')
-        
-        file_count = 0
-        for file_path in downloads_path.glob("*.mp4"):
-            match = file_pattern.search(file_path.name)
-            if match:
-                creation_time = match.group(1)
-                existing_times.add(creation_time)
-                logger.debug(f"   📄 Found: {file_path.name} -> {creation_time}")
-                file_count += 1
-        
-        logger.info(f"✅ Found {file_count} existing files with {len(existing_times)} unique creation times")
+        # Files named video_2025-08-27-02-20-06_gen_#000000001.mp4; the manifest only
+        # lists the folder again when it changed since the last scan
+        manifest = self.file_manager.manifest
+        changes = manifest.refresh()
+        existing_times = manifest.creation_times()
+        
+        logger.info(f"✅ Found {len(manifest)} existing files with {len(existing_times)} unique creation times "
+                    f"({changes} changes since last scan)")
         return existing_times
     
     def check_duplicate_exists(self, creation_time: str, prompt_text: str, existing_log_entries: Dict = None) -> str:
@@ -840,170 +921,68 @@ class GenerationDownloadManager:
         if existing_log_entries is None:
             existing_log_entries = getattr(self, 'existing_log_entries', {})
         
-        # Compare datetime + first 100 characters of prompt as specified
-        prompt_key = prompt_text[:100] if prompt_text else ""
+        # O(1) lookup: the session index also matches normalized creation times
+        if isinstance(existing_log_entries, GenerationDuplicateIndex):
+            log_entry = existing_log_entries.find(creation_time)
+        else:
+            log_entry = existing_log_entries.get(creation_time)
         
-        for log_datetime, log_entry in existing_log_entries.items():
-            # CRITICAL FIX REMOVED: Don't skip #999999999 entries - they are valid downloads awaiting renumbering
-            # The #999999999 placeholder is used for all new downloads until renumber script runs
-            # Only skip entries that are completely empty or invalid
-            log_prompt = log_entry.get('prompt', '')
-            
-            # Skip only truly empty/invalid entries, not placeholder IDs
-            if not log_datetime or (not log_prompt and not log_entry.get('file_id')):
-                logger.debug(f"⏭️ FILTERING: Skipping empty/invalid log entry: {log_datetime}")
-                continue
-            
-            # Match ONLY datetime for duplicate detection (as per original requirement)
-            if log_datetime == creation_time:
-                logger.warning(f"🚫 Algorithm Duplicate detected! Time: {creation_time}")
-                
-                # Step 6a: Initiate skipping if in SKIP mode
-                if self.config.duplicate_mode == DuplicateMode.SKIP:
-                    logger.info("🚀 SKIP Mode: Initiating exit-scan-return workflow")
-                    return "exit_scan_return"
-                else:
-                    logger.info("🛑 FINISH Mode: Stopping on duplicate")
-                    return True
-                    
-        return False
-    
-    async def wait_for_download_completion(self, page, expected_filename: str = None, timeout: int = 10000) -> bool:
-        """Wait for download to complete by monitoring downloads folder"""
-        if not self.config.download_completion_detection:
-            # If completion detection is disabled, just wait a fixed time
-            await page.wait_for_timeout(2000)
-            return True
-            
-        downloads_path = Path(self.config.downloads_folder)
-        start_time = time.time()
-        timeout_seconds = timeout / 1000
+        if log_entry is None:
+            return False
         
-        logger.debug(f"⏳ Waiting for download completion (timeout: {timeout_seconds}s)")
+        # CRITICAL FIX REMOVED: Don't skip #999999999 entries - they are valid downloads awaiting renumbering
+        # Skip only truly empty/invalid entries, not placeholder IDs
+        if not log_entry.get('prompt', '') and not log_entry.get('file_id'):
+            logger.debug(f"⏭️ FILTERING: Skipping empty/invalid log entry: {creation_time}")
+            return False
         
-        initial_files = set(f.name for f in downloads_path.glob("*.mp4")) if downloads_path.exists() else set()
+        # Match ONLY datetime for duplicate detection (as per original requirement)
+        logger.warning(f"🚫 Algorithm Duplicate detected! Time: {creation_time}")
+        DUPLICATE_HITS.inc()
         
-        while (time.time() - start_time) < timeout_seconds:
-            if downloads_path.exists():
-                current_files = set(f.name for f in downloads_path.glob("*.mp4"))
-                new_files = current_files - initial_files
-                
-                if new_files:
-                    new_file = list(new_files)[0]  # Get the first new file
-                    logger.info(f"✅ Download completed: {new_file}")
-                    return True
-            
-            await asyncio.sleep(0.5)  # Check every 500ms
+        # Step 6a: Initiate skipping if in SKIP mode
+        if self.config.duplicate_mode == DuplicateMode.SKIP:
+            logger.info("🚀 SKIP Mode: Initiating exit-scan-return workflow")
+            return "exit_scan_return"
+        else:
+            logger.info("🛑 FINISH Mode: Stopping on duplicate")
+            return True
+    
+    def _expect_download(self, page, key: str, target_path: Path = None):
+        """Attach the download tracker to the page's context and register an expected download"""
+        try:
+            self.download_tracker.attach(page.context)
+        except Exception as e:
+            logger.debug(f"Could not attach download tracker to page context: {e}")
+        return self.download_tracker.expect(key, page=page, target_path=target_path)
+    
+    async def _fetch_media_directly(self, page, key: str, target_path: Path, container=None):
+        """Fast path: fetch the item's media URL from the DOM; None means use the download button"""
+        if not self.config.direct_fetch_enabled:
+            return None
+        return await self.media_fetcher.try_fetch(page, key, target_path, container)
+    
+    async def wait_for_tracked_download(self, page, expectation, timeout: int = None):
+        """Wait for the download registered by ``_expect_download`` to be saved"""
+        timeout_seconds = (timeout or self.config.download_timeout) / 1000
+        logger.debug(f"⏳ Waiting for download event for {expectation.key} (timeout: {timeout_seconds}s)")
         
-        logger.warning(f"⏰ Download completion timeout after {timeout_seconds}s")
-        return False
+        tracked = await self.download_tracker.wait(expectation, timeout_seconds)
+        if tracked and tracked.success:
+            logger.info(f"✅ Download completed: {tracked.path.name} ({tracked.size} bytes)")
+        return tracked
     
     async def get_unique_thumbnail_identifier(self, page, thumbnail_element) -> Optional[str]:
-        """Get a unique identifier for a thumbnail based on its content with enhanced stability"""
+        """Get a unique identifier for a thumbnail based on its content with enhanced stability
+
+        Uses the same in-page signature as the batched gallery snapshot, so IDs
+        from a single element and from ``snapshot_thumbnails`` always match.
+        """
         try:
-            # Try multiple methods to get a unique identifier
-            identifier_parts = []
-            
-            # Method 1: Try to get creation time or date from thumbnail (MOST RELIABLE)
-            try:
-                date_elements = await thumbnail_element.query_selector_all('[class*="time"], [class*="date"], span[title]')
-                for elem in date_elements:
-                    text = await elem.text_content()
-                    if text and any(word in text.lower() for word in ['aug', 'jul', 'sep', '2025', '2024']):
-                        identifier_parts.append(f"date:{text.strip()}")
-                        break
-            except:
-                pass
-            
-            # Method 2: Try to get image source or background image with enhanced matching
-            try:
-                img_elements = await thumbnail_element.query_selector_all('img')
-                for img in img_elements:
-                    src = await img.get_attribute('src')
-                    if src:
-                        # Extract unique part from URL (e.g., filename or ID)
-                        import re
-                        # Look for long alphanumeric sequences or hashes
-                        match = re.search(r'([a-fA-F0-9]{16,}|[a-zA-Z0-9_-]{16,})', src)
-                        if match:
-                            identifier_parts.append(f"img:{match.group(1)}")
-                            break
-            except:
-                pass
-            
-            # Method 3: Try to get unique data attributes
-            try:
-                for attr in ['data-id', 'data-key', 'data-item', 'data-spm-anchor-id', 'id']:
-                    value = await thumbnail_element.get_attribute(attr)
-                    if value and len(value) > 5:  # Ensure meaningful values
-                        identifier_parts.append(f"{attr}:{value}")
-                        break
-            except:
-                pass
-            
-            # Method 4: Enhanced DOM-based identifier using multiple attributes
-            try:
-                dom_signature = await thumbnail_element.evaluate("""
-                    el => {
-                        // Create a stable signature from multiple DOM attributes
-                        const parts = [];
-                        
-                        // Get class signature (sorted for stability)
-                        if (el.className && el.className.length > 0) {
-                            const classes = el.className.split(' ').filter(c => c.length > 0).sort();
-                            if (classes.length > 0) {
-                                parts.push(`cls:${classes.join(',')}`);
-                            }
-                        }
-                        
-                        // Get index within parent (stable for gallery order)
-                        try {
-                            const siblings = Array.from(el.parentElement.children);
-                            const index = siblings.indexOf(el);
-                            if (index >= 0) {
-                                parts.push(`idx:${index}`);
-                            }
-                        } catch(e) {}
-                        
-                        // Get inner text hash for uniqueness (if present)
-                        const text = (el.textContent || '').trim();
-                        if (text.length > 0 && text.length < 100) {
-                            // Create simple text hash
-                            let hash = 0;
-                            for (let i = 0; i < text.length; i++) {
-                                hash = ((hash << 5) - hash + text.charCodeAt(i)) & 0xffffffff;
-                            }
-                            parts.push(`txt:${Math.abs(hash)}`);
-                        }
-                        
-                        return parts.join('|');
-                    }
-                """)
-                if dom_signature and len(dom_signature) > 5:
-                    identifier_parts.append(f"dom:{dom_signature}")
-            except:
-                pass
-            
-            # Method 5: Use position-based fallback ONLY if no other identifier found
-            # Position should NOT be primary as it changes after downloads
-            if not identifier_parts:
-                try:
-                    bbox = await thumbnail_element.bounding_box()
-                    if bbox:
-                        position = f"pos:{int(bbox['x'])}_{int(bbox['y'])}"
-                        identifier_parts.append(position)
-                except:
-                    pass
+            record = await thumbnail_element.evaluate(f"el => ({THUMBNAIL_RECORD_JS})(el, 0)")
+            unique_id = record.get('unique_id') if record else None
             
-            # Create composite identifier
-            if identifier_parts:
-                # Use the FIRST (most reliable) identifier, but combine multiple for uniqueness
-                if len(identifier_parts) == 1:
-                    unique_id = identifier_parts[0]
-                else:
-                    # Combine top 2 most reliable identifiers
-                    unique_id = f"{identifier_parts[0]}#{identifier_parts[1] if len(identifier_parts) > 1 else ''}"
-                
+            if unique_id:
                 logger.debug(f"Generated enhanced unique ID: {unique_id}")
                 return unique_id
             else:
@@ -1016,28 +995,32 @@ class GenerationDownloadManager:
             logger.debug(f"Could not get unique identifier for thumbnail: {e}")
             return None
     
+    async def snapshot_thumbnails(self, page) -> List[Dict[str, Any]]:
+        """Collect every gallery thumbnail's identity, bbox and visibility in one evaluate call"""
+        selector = f"{self.config.thumbnail_container_selector} {self.config.thumbnail_selector}"
+        return await page.evaluate(THUMBNAIL_SNAPSHOT_JS, selector) or []
+    
+    async def resolve_thumbnail_element(self, page, thumbnail_info: Dict[str, Any]) -> Optional[object]:
+        """Fetch the element handle for a snapshot record, only when it is about to be used"""
+        if thumbnail_info.get('element') is None:
+            thumbnail_info['element'] = await self.refresh_element_reference(page, thumbnail_info['unique_id'])
+        return thumbnail_info['element']
+    
     async def refresh_element_reference(self, page, unique_id: str) -> Optional[object]:
         """Refresh a stale element reference by finding it again using unique ID"""
         try:
             logger.debug(f"Refreshing element reference for: {unique_id}")
             
-            # Get all current thumbnail elements
-            thumbnail_elements = await page.query_selector_all(f"{self.config.thumbnail_container_selector} {self.config.thumbnail_selector}")
+            # Match the identifier in-page and hand back only that element
+            selector = f"{self.config.thumbnail_container_selector} {self.config.thumbnail_selector}"
+            handle = await page.evaluate_handle(THUMBNAIL_LOOKUP_JS, [selector, unique_id])
+            element = handle.as_element()
             
-            for element in thumbnail_elements:
-                try:
-                    # Get identifier for this element
-                    element_id = await self.get_unique_thumbnail_identifier(page, element)
-                    
-                    # Check if this matches our target
-                    if element_id == unique_id:
-                        logger.debug(f"Found fresh element reference for: {unique_id}")
-                        return element
-                        
-                except Exception as e:
-                    logger.debug(f"Error checking element during refresh: {e}")
-                    continue
+            if element:
+                logger.debug(f"Found fresh element reference for: {unique_id}")
+                return element
             
+            await handle.dispose()
             logger.warning(f"Could not find fresh element reference for: {unique_id}")
             return None
             
@@ -1046,71 +1029,52 @@ class GenerationDownloadManager:
             return None
 
     async def get_robust_thumbnail_list(self, page) -> List[Dict[str, Any]]:
-        """Get list of thumbnails with unique identifiers and enhanced metadata tracking"""
+        """Get list of thumbnails with unique identifiers and enhanced metadata tracking
+
+        The whole gallery is read with a single ``page.evaluate``; the ``element``
+        key stays ``None`` until ``resolve_thumbnail_element`` is called for the
+        thumbnail that is actually clicked.
+        """
         try:
-            # Get all thumbnail elements with retry on failure
-            thumbnail_elements = []
+            # Snapshot all thumbnails with retry on failure
+            records = []
             retry_count = 0
             max_retries = 3
             
             while retry_count < max_retries:
                 try:
-                    thumbnail_elements = await page.query_selector_all(f"{self.config.thumbnail_container_selector} {self.config.thumbnail_selector}")
-                    if thumbnail_elements:
+                    records = await self.snapshot_thumbnails(page)
+                    if records:
                         break
                 except Exception as e:
-                    logger.debug(f"Retry {retry_count + 1} getting thumbnail elements: {e}")
+                    logger.debug(f"Retry {retry_count + 1} getting thumbnail snapshot: {e}")
                     await page.wait_for_timeout(1000)
                     retry_count += 1
             
-            if not thumbnail_elements:
+            if not records:
                 logger.warning("No thumbnail elements found after retries")
                 return []
             
+            last_seen = datetime.now().isoformat()
             thumbnails = []
-            for i, element in enumerate(thumbnail_elements):
-                try:
-                    # Get unique identifier for this thumbnail
-                    unique_id = await self.get_unique_thumbnail_identifier(page, element)
-                    
-                    if not unique_id:
-                        logger.debug(f"Could not generate unique ID for thumbnail {i}")
-                        continue
-                    
-                    # Check if element is visible with retry
-                    is_visible = False
-                    try:
-                        is_visible = await element.is_visible()
-                        # Double check visibility with bounding box
-                        bbox = await element.bounding_box()
-                        if bbox and (bbox['width'] == 0 or bbox['height'] == 0):
-                            is_visible = False
-                    except:
-                        # If visibility check fails, assume not visible
-                        is_visible = False
-                    
-                    # Get bounding box for position tracking
-                    bbox = None
-                    try:
-                        bbox = await element.bounding_box()
-                    except:
-                        pass
-                    
-                    thumbnail_info = {
-                        'element': element,
-                        'unique_id': unique_id,
-                        'position': i,
-                        'visible': is_visible,
-                        'bbox': bbox,
-                        'processed': unique_id in self.processed_thumbnails if unique_id else False,
-                        'last_seen': datetime.now().isoformat()
-                    }
-                    
-                    thumbnails.append(thumbnail_info)
-                    
-                except Exception as e:
-                    logger.debug(f"Error processing thumbnail {i}: {e}")
+            for record in records:
+                unique_id = record.get('unique_id')
+                if not unique_id:
+                    logger.debug(f"Could not generate unique ID for thumbnail {record.get('index')}")
                     continue
+                
+                thumbnails.append({
+                    'element': None,
+                    'unique_id': unique_id,
+                    'position': record['index'],
+                    'visible': bool(record.get('visible')),
+                    'bbox': record.get('bbox'),
+                    'date_text': record.get('date_text'),
+                    'img_hash': record.get('img_hash'),
+                    'data_attributes': record.get('data_attributes') or {},
+                    'processed': unique_id in self.processed_thumbnails,
+                    'last_seen': last_seen
+                })
             
             logger.debug(f"Found {len(thumbnails)} thumbnails ({sum(1 for t in thumbnails if t['visible'])} visible, {sum(1 for t in thumbnails if t['processed'])} processed)")
             return thumbnails
@@ -1366,6 +1330,7 @@ class GenerationDownloadManager:
             logger.error(f"Error in robust gallery navigation: {e}")
             return False
     
+    @network_phase("scan_network_profile")
     async def preload_gallery_thumbnails(self, page) -> bool:
         """Pre-load the gallery by scrolling to reveal all available thumbnails"""
         try:
@@ -1679,6 +1644,7 @@ class GenerationDownloadManager:
             logger.debug(f"Manual element scroll failed: {e}")
             return 0
 
+    @network_phase("scan_network_profile")
     async def scroll_and_find_more_thumbnails(self, page) -> bool:
         """Scroll the gallery and check for new thumbnails using landmark approach"""
         try:
@@ -1696,6 +1662,8 @@ class GenerationDownloadManager:
                         before_containers.append(elem)
             
             before_count = len(before_containers)
+            watcher = await self._get_thumbnail_watcher(page)
+            marker = await watcher.arm()
             
             # Find scrollable container and scroll
             scrollable_container = await self._find_scrollable_container(page)
@@ -1708,6 +1676,16 @@ class GenerationDownloadManager:
                     # Use container scrolling
                     await scrollable_container.evaluate(f"el => el.scrollBy(0, {self.config.scroll_amount})")
                     logger.debug(f"📦 Used container scrolling: {self.config.scroll_amount}px")
+                
+                # Advance as soon as the gallery appends thumbnails; quiet period means nothing loaded
+                if watcher.active:
+                    new_count = await watcher.wait_for_new(marker, self.config.content_quiet_period)
+                    if new_count:
+                        logger.info(f"✅ Scroll successful: {new_count} new thumbnail containers loaded")
+                        return True
+                    logger.debug(f"📊 Scroll completed but no thumbnails appended within {self.config.content_quiet_period}s")
+                    return False
+                
                 await page.wait_for_timeout(1000)  # Wait for new content to load
                 
                 # Check if new thumbnails appeared (excluding masks)
@@ -2119,6 +2097,7 @@ class GenerationDownloadManager:
         
         return best_date[0]
     
+    @network_phase("scan_network_profile")
     async def scroll_thumbnail_gallery(self, page) -> bool:
         """Enhanced scroll method with multiple validation and recovery mechanisms"""
         try:
@@ -2500,6 +2479,11 @@ class GenerationDownloadManager:
         try:
             max_click_attempts = 3
             
+            if thumbnail_element is None:
+                thumbnail_element = await self.refresh_element_reference(page, thumbnail_id)
+                if thumbnail_element is None:
+                    return False
+            
             for attempt in range(max_click_attempts):
                 try:
                     logger.debug(f"Click attempt {attempt + 1} for thumbnail: {thumbnail_id}")
@@ -2553,10 +2537,26 @@ class GenerationDownloadManager:
             return False
     
     def _load_existing_log_entries(self) -> Dict[str, Dict[str, str]]:
-        """Load existing log entries from generation_downloads.txt"""
+        """Load existing log entries from generation_downloads.txt
+        
+        For the configured log this returns the session duplicate index, which is
+        built once and updated in memory as downloads are logged.
+        """
         log_entries = {}
         log_path = Path(self.config.logs_folder) / "generation_downloads.txt"
         
+        if log_path == Path(self.config.log_file_path):
+            try:
+                log_entries = self._generation_log_store().duplicate_index
+                logger.info(f"📋 Loaded {len(log_entries)} existing log entries for duplicate detection")
+                return log_entries
+            except Exception as e:
+                logger.warning(f"Duplicate index unavailable, parsing log file: {e}")
+                log_entries = {}
+        
+        # Materialize the text view if out-of-order entries are pending
+        self.flush_generation_log()
+        
         if not log_path.exists():
             logger.debug("No existing log file found for duplicate detection")
             return log_entries
@@ -2808,8 +2808,8 @@ class GenerationDownloadManager:
                     is_visible = await parent_span.evaluate("el => el && el.offsetParent !== null")
                     if is_visible:
                         await parent_span.click()
-                        # Add small wait to ensure click is processed
-                        await page.wait_for_timeout(500)
+                        # Wait until the click opened the download options
+                        await self.page_waits.wait(page, "download_options_shown", default=0.5)
                         logger.info("Successfully clicked download button using SVG icon strategy")
                         return True
                     else:
@@ -2917,7 +2917,8 @@ class GenerationDownloadManager:
                     logger.debug(f"Landmarks ready after {landmark_wait_attempts} attempts")
                 else:
                     logger.debug(f"Landmarks not ready (attempt {landmark_wait_attempts}), waiting...")
-                    await page.wait_for_timeout(1500)
+                    # No panel showing yet (first open), so its appearance is the condition
+                    await self.page_waits.wait(page, "metadata_panel_loaded")
             
             if not landmarks_ready:
                 logger.warning(f"Landmarks not ready after {max_landmark_wait} attempts, proceeding with extraction")
@@ -3339,11 +3340,20 @@ class GenerationDownloadManager:
                 'landmark_elements_visible': False
             }
     
+    @network_phase("download_network_profile")
     async def execute_download_sequence(self, page) -> bool:
         """Execute the complete download sequence: SVG icon → watermark option"""
         try:
             logger.debug("Starting enhanced download sequence...")
             
+            # Fast path: fetch the media directly and complete the caller's expected download
+            expectation = self.download_tracker.pending_for(page)
+            if expectation is not None and expectation.target_path is not None:
+                tracked = await self._fetch_media_directly(page, expectation.key, expectation.target_path)
+                if tracked:
+                    self.download_tracker.resolve(expectation, tracked)
+                    return True
+            
             # Step 1: Click the download button (SVG icon)
             download_button_clicked = await self.find_and_click_download_button(page)
             if not download_button_clicked:
@@ -3353,7 +3363,7 @@ class GenerationDownloadManager:
             logger.debug("Download button clicked successfully, waiting for options...")
             
             # Step 2: Wait for download options to appear
-            await page.wait_for_timeout(1500)
+            await self.page_waits.wait(page, "download_options_shown")
             
             # Step 3: Look for and click the watermark option with enhanced strategy
             watermark_clicked = await self._enhanced_watermark_click_sequence(page)
@@ -3655,7 +3665,7 @@ class GenerationDownloadManager:
         logger.debug("Attempting to find 'Download without Watermark' option...")
         
         # Wait for download options to appear after clicking download button
-        await page.wait_for_timeout(2000)
+        await self.page_waits.wait(page, "download_options_shown", default=2.0)
         
         # Strategy 1: Use CSS selector first (highest priority)
         try:
@@ -3753,8 +3763,8 @@ class GenerationDownloadManager:
         try:
             logger.debug("🎯 Attempting to close overlay popup with thumbs-up click...")
             
-            # Wait a moment for the overlay to fully appear
-            await page.wait_for_timeout(1000)
+            # Wait for the overlay to fully appear
+            await self.page_waits.wait(page, "overlay_opened")
             
             # Strategy 1: Target the specific thumbs-up icon using the provided HTML structure
             thumbs_up_selectors = [
@@ -3794,7 +3804,7 @@ class GenerationDownloadManager:
                             logger.info(f"✅ Successfully clicked thumbs-up icon using selector: {selector}")
                             
                             # Wait to ensure overlay closes
-                            await page.wait_for_timeout(500)
+                            await self.page_waits.wait(page, "overlay_closed")
                             return True
                     
                 except Exception as e:
@@ -3816,7 +3826,7 @@ class GenerationDownloadManager:
                     if element and await element.is_visible():
                         await element.click()
                         logger.info(f"✅ Clicked first icon in panel using: {panel_selector}")
-                        await page.wait_for_timeout(500)
+                        await self.page_waits.wait(page, "overlay_closed")
                         return True
                         
             except Exception as e:
@@ -3963,6 +3973,7 @@ class GenerationDownloadManager:
         except Exception as e:
             logger.debug(f"Error closing download shelf: {e}")
     
+    @network_phase("download_network_profile")
     async def download_single_generation_robust(self, page, thumbnail_info: Dict[str, Any], existing_files: set = None) -> bool:
         """Download a single generation using robust thumbnail tracking with Enhanced SKIP mode support"""
         # CRITICAL DEBUG: Log function entry to catch if it's called at all
@@ -3973,7 +3984,6 @@ class GenerationDownloadManager:
         boundary_metadata_dict = None
         
         try:
-            thumbnail_element = thumbnail_info['element']
             thumbnail_id = thumbnail_info['unique_id']
             thumbnail_position = thumbnail_info['position']
             
@@ -4004,6 +4014,9 @@ class GenerationDownloadManager:
                 })
             
             # Enhanced click with comprehensive stale element recovery
+            thumbnail_element = await self.resolve_thumbnail_element(page, thumbnail_info)
+            # The previous item's panel stays open across the click: wait for its creation time to change
+            panel_before = await self.page_waits.probe(page, "metadata_panel_loaded")
             click_success = await self._robust_thumbnail_click(page, thumbnail_element, thumbnail_id)
                 
             if not click_success:
@@ -4011,12 +4024,12 @@ class GenerationDownloadManager:
                 return False
             
             # Wait for content to load
-            await page.wait_for_timeout(2000)
+            await self.page_waits.wait_for_change(page, "metadata_panel_loaded", panel_before, default=2.0)
             
             # ENHANCED SKIP MODE: Check if we're still in old content after clicking
             if hasattr(self, 'fast_forward_mode') and self.fast_forward_mode:
                 # We're in fast-forward mode, check if this is still old content
-                metadata = await self._extract_metadata_after_click(page, thumbnail_id)
+                metadata = await self._extract_metadata_after_click(page, thumbnail_id, panel_before)
                 if metadata:
                     # Check if this is still a duplicate (old content)
                     is_still_old = await self._is_still_duplicate(metadata)
@@ -4240,17 +4253,9 @@ class GenerationDownloadManager:
             file_id = self.logger.get_next_file_id()
             download_start_time = time.time()
             
-            # Set up download handling
+            # Register the expected download before triggering it
             download_path = Path(self.config.downloads_folder)
-            logger.debug(f"Monitoring download directory: {download_path}")
-            
-            download_promise = None
-            def handle_download(download):
-                nonlocal download_promise
-                download_promise = download
-                logger.info(f"Download started: {download.suggested_filename}")
-            
-            page.on("download", handle_download)
+            expectation = self._expect_download(page, thumbnail_id, download_path / f"{file_id}_temp.mp4")
             
             try:
                 # Trigger download using existing download sequence
@@ -4258,35 +4263,14 @@ class GenerationDownloadManager:
                 
                 if not download_triggered:
                     logger.warning(f"Failed to trigger download for thumbnail {thumbnail_id}")
+                    self.download_tracker.cancel(expectation)
                     return False
                 
-                # FAST OPTIMIZATION: Use download completion detection
-                if self.config.fast_navigation_mode:
-                    await page.wait_for_timeout(1000)
-                    completion_success = await self.wait_for_download_completion(
-                        page, 
-                        timeout=self.config.download_timeout if hasattr(self.config, 'download_timeout') else 8000
-                    )
-                    if not completion_success:
-                        logger.warning(f"⏰ Download may still be in progress for thumbnail {thumbnail_id}")
-                else:
-                    await page.wait_for_timeout(3000)
-                
-                # Handle download completion and file naming
-                downloaded_file = None
-                if download_promise:
-                    try:
-                        target_filename = f"{file_id}_temp.mp4"
-                        target_path = download_path / target_filename
-                        await download_promise.save_as(str(target_path))
-                        downloaded_file = target_path
-                        logger.info(f"Download saved: {downloaded_file.name}")
-                    except Exception as e:
-                        logger.error(f"Failed to save download: {e}")
-                
-                # Fallback file detection if needed
-                if not downloaded_file:
-                    downloaded_file = await self.file_manager.wait_for_download(timeout=10)
+                # Resolves as soon as Playwright has saved the file
+                tracked = await self.wait_for_tracked_download(page, expectation)
+                downloaded_file = tracked.path if tracked else None
+                if downloaded_file:
+                    logger.info(f"Download saved: {downloaded_file.name}")
                 
                 if downloaded_file and downloaded_file.exists():
                     # CRITICAL FIX: Use boundary metadata if available, otherwise use gallery metadata
@@ -4300,7 +4284,7 @@ class GenerationDownloadManager:
                     )
                     final_path = download_path / final_filename
                     
-                    downloaded_file.rename(final_path)
+                    self.file_manager.manifest.rename(downloaded_file, final_path)
                     logger.info(f"📁 File renamed to: {final_filename}")
                     
                     # Log verification for boundary downloads
@@ -4334,8 +4318,8 @@ class GenerationDownloadManager:
                     return False
                     
             finally:
-                # Remove download listener
-                page.remove_listener("download", handle_download)
+                # Drop the expectation if no download ever arrived
+                self.download_tracker.cancel(expectation)
             
         except Exception as e:
             logger.error(f"🚨 EXCEPTION: Error in robust download for thumbnail {thumbnail_info.get('unique_id', 'unknown')}: {e}")
@@ -4345,6 +4329,7 @@ class GenerationDownloadManager:
             logger.error(f"🚨 EXCEPTION: Traceback: {traceback.format_exc()}")
             return False
     
+    @network_phase("download_network_profile")
     async def download_single_generation(self, page, thumbnail_index: int, existing_files: set = None) -> bool:
         """Download a single generation and handle all associated tasks with Enhanced SKIP mode support"""
         try:
@@ -4374,6 +4359,8 @@ class GenerationDownloadManager:
             thumbnail_clicked = False
             click_attempts = 0
             max_click_attempts = 3
+            # The previous item's panel stays open across the click: wait for its creation time to change
+            panel_before = await self.page_waits.probe(page, "metadata_panel_loaded")
             
             for selector in self.config.thumbnail_selector.split(", "):
                 if thumbnail_clicked:
@@ -4398,7 +4385,7 @@ class GenerationDownloadManager:
                         await page.click(thumbnail_selector, timeout=5000)
                         
                         # CRITICAL FIX: Enhanced validation with multiple checks
-                        await page.wait_for_timeout(1500)  # Initial wait for UI update
+                        await self.page_waits.wait_for_change(page, "metadata_panel_loaded", panel_before)
                         
                         # Multiple validation approaches for state change
                         state_validations = await self._perform_comprehensive_state_validation(page, thumbnail_index)
@@ -4469,14 +4456,9 @@ class GenerationDownloadManager:
             
             # Set up download handling before clicking download button
             download_path = Path(self.config.downloads_folder)
-            logger.debug(f"Monitoring download directory: {download_path}")
-            
-            # Get initial file list
-            initial_files = set(download_path.glob('*')) if download_path.exists() else set()
-            logger.debug(f"Initial files in directory: {len(initial_files)}")
             
             # CRITICAL FIX: Enhanced content loading validation with landmark-based approach
-            await page.wait_for_timeout(1500)  # Increased wait time
+            await self.page_waits.wait_for_change(page, "metadata_panel_loaded", panel_before)
             
             # Validate content is properly loaded for this thumbnail
             content_loaded = await self.validate_content_loaded_for_thumbnail(page, thumbnail_index)
@@ -4574,124 +4556,51 @@ class GenerationDownloadManager:
             # Start download process
             download_start_time = time.time()
             
-            # Set up download event listener
-            download_promise = None
-            
-            def handle_download(download):
-                nonlocal download_promise
-                download_promise = download
-                logger.info(f"Download started: {download.suggested_filename}")
-            
-            # Add download listener to page
-            page.on("download", handle_download)
+            # Register the expected download before clicking the download button
+            expectation = self._expect_download(page, f"thumbnail_{thumbnail_index}", download_path / f"{file_id}_temp.mp4")
             
             # CRITICAL FIX: Enhanced download button sequence with proper SVG → Watermark flow
             download_initiated = await self.execute_download_sequence(page)
             if not download_initiated:
                 logger.error("Failed to execute download sequence")
-                page.remove_listener("download", handle_download)
+                self.download_tracker.cancel(expectation)
                 return False
             
             # The download sequence is now handled in execute_download_sequence method
             # This includes both the SVG icon click and watermark option handling
             logger.debug("Download sequence completed, checking for additional confirmations...")
             
-            # Wait longer and check for additional UI elements
-            await page.wait_for_timeout(2000)
-            
             # Check if any additional confirmation dialogs or buttons appeared
-            logger.debug("Checking for any additional confirmation buttons...")
-            confirmation_buttons = [
-                "button:has-text('Confirm')",
-                "button:has-text('Download')", 
-                "button:has-text('OK')",
-                "button:has-text('Yes')",
-                "[role='button']:has-text('Download')",
-                ".download-confirm"
-            ]
-            
-            for button_selector in confirmation_buttons:
-                try:
-                    button = await page.wait_for_selector(button_selector, timeout=2000)
-                    if button and await button.is_visible():
-                        await button.click()
-                        logger.info(f"Clicked additional confirmation button: {button_selector}")
-                        await page.wait_for_timeout(2000)
-                        break
-                except:
-                    continue
+            if not expectation.started:
+                logger.debug("Checking for any additional confirmation buttons...")
+                confirmation_buttons = [
+                    "button:has-text('Confirm')",
+                    "button:has-text('Download')", 
+                    "button:has-text('OK')",
+                    "button:has-text('Yes')",
+                    "[role='button']:has-text('Download')",
+                    ".download-confirm"
+                ]
+                
+                for button_selector in confirmation_buttons:
+                    try:
+                        button = await page.wait_for_selector(button_selector, timeout=2000)
+                        if button and await button.is_visible():
+                            await button.click()
+                            logger.info(f"Clicked additional confirmation button: {button_selector}")
+                            break
+                    except:
+                        continue
             
-            # FAST OPTIMIZATION: Quick wait for download to start, then check completion
-            if self.config.fast_navigation_mode:
-                await page.wait_for_timeout(1000)  # Reduced from 3000ms
-                # Use fast completion detection
-                completion_success = await self.wait_for_download_completion(
-                    page, 
-                    timeout=self.config.download_timeout if hasattr(self.config, 'download_timeout') else 8000
-                )
-                if not completion_success:
-                    logger.warning(f"⏰ Download may still be in progress for thumbnail {thumbnail_index}")
-            else:
-                # Legacy wait time for compatibility
-                await page.wait_for_timeout(3000)
+            # Resolves as soon as Playwright has saved the file
+            tracked = await self.wait_for_tracked_download(page, expectation)
+            downloaded_file = tracked.path if tracked else None
+            if downloaded_file:
+                logger.info(f"Download saved via Playwright: {downloaded_file.name}")
             
             # Try to close Chrome download shelf if it appears
             await self.close_download_shelf(page)
             
-            # Handle Playwright download if detected
-            downloaded_file = None
-            if download_promise:
-                try:
-                    logger.info("Processing Playwright download...")
-                    # Define the target path for the download
-                    target_filename = f"{file_id}_temp.mp4"
-                    target_path = download_path / target_filename
-                    
-                    # Save the download
-                    await download_promise.save_as(str(target_path))
-                    downloaded_file = target_path
-                    logger.info(f"Download saved via Playwright: {downloaded_file.name}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to save Playwright download: {e}")
-            else:
-                logger.debug("No Playwright download event detected")
-            
-            # Fallback: Try file system detection if Playwright download didn't work
-            if not downloaded_file:
-                logger.debug("Playwright download not detected, trying file system detection...")
-                
-                # Try multiple approaches to detect download
-                for attempt in range(3):
-                    # Method 1: Wait using file manager
-                    logger.debug(f"Download detection attempt {attempt + 1}/3")
-                    downloaded_file = await self.file_manager.wait_for_download(
-                        timeout=15  # Shorter timeout per attempt
-                    )
-                    
-                    if downloaded_file:
-                        logger.info(f"Download detected via file manager: {downloaded_file.name}")
-                        break
-                        
-                    # Method 2: Check if any new files appeared in the directory
-                    logger.debug("Checking for new files in download directory...")
-                    current_files = set(download_path.glob('*')) if download_path.exists() else set()
-                    new_files = current_files - initial_files
-                    
-                    if new_files:
-                        # Found new files, use the most recent one
-                        downloaded_file = max(new_files, key=lambda f: f.stat().st_mtime)
-                        logger.info(f"Found new file via directory scan: {downloaded_file.name}")
-                        break
-                    
-                    # Wait a bit more before next attempt
-                    if attempt < 2:
-                        logger.debug("No download detected, waiting longer...")
-                        await page.wait_for_timeout(5000)
-            
-            # Clean up download listener
-            page.remove_listener("download", handle_download)
-            
             if not downloaded_file:
                 logger.error(f"Download did not complete for thumbnail {thumbnail_index}")
                 return False
@@ -4907,6 +4816,7 @@ class GenerationDownloadManager:
         except Exception as e:
             logger.error(f"Failed to initialize chronological logging: {e}")
     
+    @network_phase("scan_network_profile")
     async def _enhanced_start_from_navigation(self, page) -> Dict[str, Any]:
         """Enhanced START_FROM navigation with improved search algorithm"""
         try:
@@ -4981,6 +4891,7 @@ class GenerationDownloadManager:
             self.enhanced_skip_v2_active = False
             return False
     
+    @network_phase("scan_network_profile")
     async def _advanced_thumbnail_discovery(self, page) -> List[Dict[str, Any]]:
         """Advanced thumbnail discovery with metadata pre-extraction"""
         try:
@@ -5260,6 +5171,17 @@ class GenerationDownloadManager:
             results['errors'].append(str(e))
             results['success'] = False
             return results
+        
+        finally:
+            self.flush_generation_log()
+            self.download_tracker.detach()
+            self.page_waits.save()
+            self._log_network_report()
+    
+    def _log_network_report(self):
+        report = self.network_report()
+        if report:
+            logger.info(format_report(report))
     
     async def run_download_automation(self, page) -> Dict[str, Any]:
         """Run the complete generation download automation with intelligent scrolling"""
@@ -5829,6 +5751,10 @@ class GenerationDownloadManager:
         
         finally:
             results['end_time'] = datetime.now().isoformat()
+            self.flush_generation_log()
+            self.download_tracker.detach()
+            self.page_waits.save()
+            self._log_network_report()
             logger.info(f"🏁 Download automation session ended. Total downloads: {results['downloads_completed']}")
         
         return results
@@ -6172,9 +6098,6 @@ class GenerationDownloadManager:
             logger.info("   - --disable-features=DownloadNotification")
             logger.info("📄 No runtime settings changes required - download popups are suppressed at browser level")
             
-            # Small delay to simulate configuration time
-            await page.wait_for_timeout(500)
-            
             return True
             
         except Exception as e:
@@ -6230,11 +6153,16 @@ class GenerationDownloadManager:
         # This method is now deprecated, use _extract_metadata_after_click instead
         return await self._extract_metadata_after_click(page, thumbnail_id)
     
-    async def _extract_metadata_after_click(self, page, thumbnail_id: str) -> Optional[Dict[str, str]]:
-        """Extract metadata after clicking on thumbnail (when it's visible)"""
+    async def _extract_metadata_after_click(self, page, thumbnail_id: str,
+                                            panel_before: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Extract metadata after clicking on thumbnail (when it's visible)
+        
+        ``panel_before`` is the panel's creation time read before the click, so the
+        previous item's panel is not mistaken for this one.
+        """
         try:
-            # Wait a bit for the metadata panel to appear
-            await page.wait_for_timeout(1500)  # Increased wait time
+            # Wait for the metadata panel to show this item
+            await self.page_waits.wait_for_change(page, "metadata_panel_loaded", panel_before)
             
             # Extract just the creation time and a portion of the prompt for comparison
             creation_time = None
@@ -6351,6 +6279,7 @@ class GenerationDownloadManager:
             logger.error(f"Error comparing checkpoint: {e}")
             return False
     
+    @network_phase("scan_network_profile")
     async def exit_gallery_and_scan_generations(self, page) -> Optional[Dict[str, Any]]:
         """Algorithm-compliant exit → scan → find boundary workflow (Steps 11-15)"""
         try:
@@ -6407,43 +6336,38 @@ class GenerationDownloadManager:
             logger.error(f"Error in exit-scan workflow: {e}")
             return None
     
+    @traced("find_boundary", "download")
+    @network_phase("scan_network_profile")
     async def _find_download_boundary_sequential(self, page) -> Optional[Dict[str, Any]]:
         """Efficient incremental boundary detection - scan as we scroll, not all at once"""
         try:
             logger.info("🔍 Step 13: Starting incremental boundary scan with scan-as-you-scroll approach")
             
-            # CRITICAL FIX: Always reload log entries for boundary detection
-            # Previous caching caused infinite loops as new downloads weren't reflected
-            
-            # Add a small delay to ensure file system has written the latest download
-            import time
-            time.sleep(0.5)  # Half second delay for file system sync
-            
+            # Session duplicate index: built once, updated in memory as each download is
+            # logged, so new downloads are reflected without re-reading the log file
             self.existing_log_entries = self._load_existing_log_entries()
-            logger.info(f"📚 Reloaded {len(self.existing_log_entries)} log entries for boundary detection (fresh read after 0.5s delay)")
+            logger.info(f"📚 Using {len(self.existing_log_entries)} log entries for boundary detection")
             
-            # Show the most recent log entries for verification
+            # Show the most recently logged entries for verification
             if self.existing_log_entries:
-                sorted_entries = sorted(self.existing_log_entries.items(), reverse=True)  # Most recent first
                 logger.info("📋 Most recent log entries (for boundary detection):")
-                for i, (log_time, log_entry) in enumerate(sorted_entries[:5]):  # Show top 5
-                    log_prompt = log_entry.get('prompt', '')[:50]
+                for i, log_time in enumerate(itertools.islice(reversed(self.existing_log_entries), 5)):
+                    log_prompt = self.existing_log_entries[log_time].get('prompt', '')[:50]
                     logger.info(f"   #{i+1}: '{log_time}' - {log_prompt}...")
-                if len(sorted_entries) > 5:
-                    logger.info(f"   ... and {len(sorted_entries) - 5} more entries")
-                    
-                # Also show if there are any entries with "03 Sep 2025" for debugging
-                sep_3_entries = [entry for entry in sorted_entries if entry[0].startswith('03 Sep 2025')]
-                if sep_3_entries:
-                    logger.info(f"📅 Found {len(sep_3_entries)} entries from '03 Sep 2025' in log file:")
-                    for i, (log_time, log_entry) in enumerate(sep_3_entries[:3]):
-                        log_prompt = log_entry.get('prompt', '')[:30]
-                        logger.info(f"   Sep3-#{i+1}: '{log_time}' - {log_prompt}...")
+                if len(self.existing_log_entries) > 5:
+                    logger.info(f"   ... and {len(self.existing_log_entries) - 5} more entries")
             else:
                 logger.info("📋 No existing log entries found - all generations will be downloaded")
             
-            # Track scanned container IDs to prevent duplicate scanning
-            scanned_container_ids = set()
+            # One in-page scan per scroll reports every container not seen before,
+            # with its creation time, prompt prefix and status already parsed
+            scanner = ContainerScanner(page)
+            
+            # Appended-container events let each scroll step advance as soon as content arrives
+            self.initialize_boundary_scroll_manager(page)
+            content_events = await self.boundary_scroll_manager.enable_container_events()
+            if content_events:
+                logger.info("👀 Waiting on container events instead of fixed post-scroll delays")
             total_containers_scanned = 0
             duplicates_found = 0
             scroll_attempts = 0
@@ -6451,30 +6375,12 @@ class GenerationDownloadManager:
             consecutive_no_new = 0
             max_consecutive_no_new = 50  # Allow more attempts to find new containers in large galleries
             
-            # Use same multi-selector strategy as initial navigation instead of single selector
-            # Extract starting number from config or use default
-            start_num = 8
-            if self.config.completed_task_selector:
-                import re
-                match = re.search(r'__(\d+)', self.config.completed_task_selector)
-                if match:
-                    start_num = int(match.group(1))
-            
-            # Generate multiple selectors like initial navigation does (same approach)
-            # EXPANDED: Check a wider range to find containers after scrolling
-            container_selectors = []
-            for i in range(0, 50):  # Expanded range to find all possible containers
-                container_selectors.append(f"div[id$='__{i}']")
-            
-            logger.info(f"🔍 Using multi-selector approach like initial navigation: {len(container_selectors)} selectors")
-            logger.debug(f"🔍 Container selectors: {container_selectors[:3]}...{container_selectors[-1]}")
-            
             while scroll_attempts < max_scroll_attempts and consecutive_no_new < max_consecutive_no_new:
-                # STEP 1: Get currently visible containers using all selectors
+                # STEP 1: Scan the page for containers not reported before
                 logger.info(f"🔍 Scan iteration {scroll_attempts + 1}: Getting visible containers")
                 
-                # ENHANCED: Wait for DOM to fully update after scroll
-                if scroll_attempts > 0:
+                # ENHANCED: Wait for DOM to fully update after scroll (already awaited via events)
+                if scroll_attempts > 0 and not content_events:
                     logger.debug("   ⏳ Waiting for DOM updates after scroll...")
                     await page.wait_for_timeout(2000)  # 2 seconds for DOM updates
                     
@@ -6485,69 +6391,9 @@ class GenerationDownloadManager:
                     except:
                         logger.debug("   ⏰ Network idle timeout (normal)")
                 
-                # Collect containers from all selectors (same as initial navigation)
-                all_containers = []
-                container_selector_stats = {}  # Track which selectors find containers
-                
-                for selector in container_selectors:
-                    try:
-                        containers = await page.query_selector_all(selector)
-                        if containers:
-                            all_containers.extend(containers)
-                            container_selector_stats[selector] = len(containers)
-                        logger.debug(f"   Selector {selector}: found {len(containers)} containers")
-                    except Exception as e:
-                        logger.debug(f"   Selector {selector} failed: {e}")
-                
-                # ENHANCED: Also try content-based container detection for scrolled content
-                try:
-                    # Look for containers with creation time pattern (more reliable than ID selectors)
-                    content_containers = await page.query_selector_all("div:has-text('Creation Time'), div:has-text('Sep 2025'), div:has-text('Aug 2025')")
-                    for container in content_containers:
-                        if container not in all_containers:
-                            all_containers.append(container)
-                            logger.debug(f"   Content-based detection: found additional container")
-                except Exception as e:
-                    logger.debug(f"   Content-based detection failed: {e}")
-                
-                logger.info(f"   Total containers found across all selectors: {len(all_containers)}")
-                if container_selector_stats:
-                    active_selectors = [(k, v) for k, v in container_selector_stats.items() if v > 0]
-                    logger.debug(f"   Active selectors: {active_selectors[:3]}..." if len(active_selectors) > 3 else f"   Active selectors: {active_selectors}")
+                new_records = await scanner.scan_new()
                 
-                # Filter out already scanned containers
-                new_containers = []
-                for container in all_containers:
-                    try:
-                        # Get container ID or unique identifier
-                        container_id = await container.get_attribute('id')
-                        
-                        # Extract the datetime as a unique identifier instead of using dynamic ID
-                        text_content = await container.text_content() or ""
-                        
-                        # Look for datetime pattern as unique key
-                        import re
-                        datetime_match = re.search(r'(\d{1,2}\s+\w{3}\s+\d{4}\s+\d{2}:\d{2}:\d{2})', text_content)
-                        if datetime_match:
-                            # Use datetime as the unique identifier (it's unique per generation)
-                            unique_key = datetime_match.group(1)
-                        else:
-                            # Fallback to container ID or text hash
-                            unique_key = container_id if container_id else str(hash(text_content[:200]))
-                        
-                        if unique_key not in scanned_container_ids:
-                            new_containers.append((container, unique_key))
-                            scanned_container_ids.add(unique_key)
-                            if len(new_containers) <= 3:
-                                logger.debug(f"   New container: key='{unique_key}', id='{container_id}'")
-                        else:
-                            if scroll_attempts == 0 and len(scanned_container_ids) <= 15:
-                                logger.debug(f"   Already scanned: key='{unique_key}'")
-                    except Exception as e:
-                        logger.debug(f"Error getting container ID: {e}")
-                        continue
-                
-                if not new_containers:
+                if not new_records:
                     consecutive_no_new += 1
                     logger.info(f"   No new containers found (consecutive: {consecutive_no_new}/{max_consecutive_no_new})")
                     
@@ -6556,192 +6402,68 @@ class GenerationDownloadManager:
                         break
                 else:
                     consecutive_no_new = 0
-                    logger.info(f"📊 Found {len(new_containers)} new containers to scan (total scanned: {total_containers_scanned})")
+                    logger.info(f"📊 Found {len(new_records)} new containers to scan (total scanned: {total_containers_scanned})")
                 
-                # STEP 2: Scan only the NEW containers for boundary
-                for container, container_id in new_containers:
+                # STEP 2: Check only the NEW containers for the boundary
+                for record in new_records:
                     total_containers_scanned += 1
                     
-                    try:
-                        # ENHANCED: Retry logic for container processing
-                        container_metadata = None
-                        extraction_attempts = 0
-                        max_extraction_attempts = 3
-                        
-                        while extraction_attempts < max_extraction_attempts and not container_metadata:
-                            extraction_attempts += 1
-                            
-                            # Check if this container has content (not queued/failed)
-                            text_content = await container.text_content() or ""
-                            
-                            # More comprehensive status detection
-                            skip_statuses = ["Queuing", "Something went wrong", "Video is rendering", 
-                                           "Processing", "Failed", "Error", "Loading..."]
-                            
-                            skip_container = False
-                            for status_text in skip_statuses:
-                                if status_text in text_content:
-                                    logger.debug(f"⏭️ Container {total_containers_scanned}: {status_text}, skipping")
-                                    skip_container = True
-                                    break
-                            
-                            if skip_container:
-                                break
-                            
-                            # Extract metadata from container using enhanced method
-                            container_metadata = await extract_container_metadata_enhanced(container, text_content)
-                            
-                            if not container_metadata and extraction_attempts < max_extraction_attempts:
-                                logger.debug(f"   ⏰ Metadata extraction failed (attempt {extraction_attempts}/{max_extraction_attempts}), retrying after wait...")
-                                await page.wait_for_timeout(1000)  # Wait 1 second before retry
-                        
-                        if not container_metadata:
-                            logger.debug(f"   ❌ Container {total_containers_scanned}: Failed to extract metadata after {max_extraction_attempts} attempts")
-                            continue
-                        
-                        container_time = container_metadata.get('creation_time', '')
-                        container_prompt = container_metadata.get('prompt', '')[:100]
-                        
-                        if not container_time or not container_prompt:
-                            logger.debug(f"⚠️ Container {total_containers_scanned}: Missing metadata, skipping")
-                            continue
-                        
-                        # ENHANCED: Log each container we're checking with more detail
-                        if total_containers_scanned <= 5 or total_containers_scanned % 10 == 0:
-                            logger.info(f"🔍 Scanning container #{total_containers_scanned}: datetime='{container_time}', prompt='{container_prompt[:30]}...'")
-                            
-                        # ULTRA-DEBUG: For the specific case we're tracking, log everything
-                        if "03 Sep 2025 16:" in container_time:
-                            logger.info(f"🎯 TARGET RANGE DETECTED: Container #{total_containers_scanned}")
-                            logger.info(f"   📅 Full datetime: '{container_time}'")
-                            logger.info(f"   📝 Full prompt: {container_prompt[:100]}...") 
-                            logger.info(f"   🔍 Will check against {len(self.existing_log_entries)} log entries")
-                        
-                        # ENHANCED Step 14: Compare with log entries with better logging
-                        has_matching_log_entry = False
-                        logger.debug(f"🔍 Container #{total_containers_scanned}: Checking datetime '{container_time}' against {len(self.existing_log_entries)} log entries")
-                        
-                        # ENHANCED: Quick check with detailed logging for target case
-                        exact_match_found = container_time in self.existing_log_entries
-                        if exact_match_found:
-                            logger.debug(f"   📝 Container datetime '{container_time}' found in log entries")
-                        elif "03 Sep 2025 16:" in container_time:
-                            logger.info(f"🎯 POTENTIAL BOUNDARY: '{container_time}' NOT found in log entries (exact match check)")
-                            
-                            # Show nearby log entries for context
-                            similar_entries = []
-                            for log_time in self.existing_log_entries.keys():
-                                if log_time.startswith("03 Sep 2025 16:") or log_time.startswith("03 Sep 2025 17:"):
-                                    similar_entries.append(log_time)
-                            
-                            similar_entries.sort()
-                            logger.info(f"   📅 Nearby log entries from same timeframe:")
-                            for similar_time in similar_entries[:5]:
-                                logger.info(f"      - {similar_time}")
-                            if len(similar_entries) > 5:
-                                logger.info(f"      ... and {len(similar_entries) - 5} more")
-                        
-                        # ENHANCED: More detailed comparison logic with better logging
-                        comparison_count = 0
-                        for log_time, log_entry in self.existing_log_entries.items():
-                            comparison_count += 1
-                            log_prompt = log_entry.get('prompt', '')[:100]
-                            
-                            # ENHANCED DEBUG: Show comparisons for target timeframe or first few
-                            show_comparison = (
-                                total_containers_scanned <= 3 or  # First few containers
-                                "03 Sep 2025 16:" in container_time or  # Target timeframe
-                                "03 Sep 2025 16:" in log_time  # Log entries in target timeframe
-                            )
-                            
-                            if show_comparison and comparison_count <= 10:  # Limit to avoid spam
-                                logger.debug(f"   🔍 Comparing container '{container_time}' vs log '{log_time}' - Match: {log_time == container_time}")
-                                if log_time == container_time:
-                                    logger.debug(f"   🔍 Prompt comparison: '{container_prompt[:30]}...' vs '{log_prompt[:30]}...' - Match: {log_prompt == container_prompt}")
-                            
-                            # CRITICAL: Use datetime as primary key for boundary detection
-                            # Container prompts from /generate page are often truncated vs gallery prompts
-                            # Since datetime is unique per generation, we can rely on it primarily
-                            if log_time == container_time:
-                                # DateTime match is sufficient - prompts may differ between views
-                                has_matching_log_entry = True
-                                duplicates_found += 1
-                                
-                                if "03 Sep 2025 16:" in container_time:
-                                    logger.info(f"   ✅ DUPLICATE CONFIRMED: Container datetime '{container_time}' matches log entry")
-                                else:
-                                    logger.debug(f"   ✅ DUPLICATE MATCH: Container datetime '{container_time}' matches log entry")
-                                
-                                # Optional prompt validation (for debugging)
-                                prompt_match = (
-                                    log_prompt == container_prompt or  # Exact match
-                                    log_prompt.startswith(container_prompt[:50]) or  # Log starts with container
-                                    container_prompt.startswith(log_prompt[:50])  # Container starts with log
-                                )
-                                
-                                if not prompt_match and len(container_prompt) > 20 and len(log_prompt) > 20:
-                                    if "03 Sep 2025 16:" in container_time:
-                                        logger.info(f"   📝 Note: Prompt differs but datetime match is sufficient")
-                                        logger.info(f"      Container: '{container_prompt[:50]}...'")
-                                        logger.info(f"      Log:       '{log_prompt[:50]}...'")
-                                    else:
-                                        logger.debug(f"   📝 Note: Prompt differs but datetime match is sufficient")
-                                
-                                break
-                        
-                        if not has_matching_log_entry:
-                            # ENHANCED: Found the boundary - this container has no corresponding log entry
-                            logger.info(f"🎯 BOUNDARY FOUND at container #{total_containers_scanned}")
-                            logger.info(f"   📊 Containers scanned: {total_containers_scanned}")
-                            logger.info(f"   🔍 Duplicates found before boundary: {duplicates_found}")
-                            logger.info(f"   📅 BOUNDARY DATETIME: '{container_time}' ⭐")
-                            logger.info(f"   📝 Boundary prompt: {container_prompt[:75]}...")
-                            logger.info(f"   🔄 Found after {scroll_attempts + 1} scroll iterations")
-                            
-                            # ENHANCED: Additional validation and context for boundary
-                            logger.info(f"   🔍 VALIDATION: Checked against {len(self.existing_log_entries)} log entries")
-                            logger.info(f"   📅 Container datetime '{container_time}' confirmed NOT in log file")
-                            
-                            # Special logging for our target case
-                            if "03 Sep 2025 16:15:18" in container_time:
-                                logger.info(f"   🎉 SUCCESS: Found the specific missing generation from user report!")
-                                logger.info(f"   🎯 This matches the reported missing datetime: '03 Sep 2025 16:15:18'")
-                            logger.info(f"   ✨ This generation is NOT in the log file - ready for download!")
-                            
-                            # ENHANCED: Click this container to open gallery and download the boundary generation
-                            logger.info(f"   🖱️ Attempting to click boundary container...")
-                            
-                            # Get hash ID for robust container identification
-                            full_container_id = await container.get_attribute('id')
-                            if full_container_id:
-                                container_hash = self._get_container_hash_id(full_container_id)
-                                logger.debug(f"   📦 Using hash ID {container_hash} for boundary click")
-                                click_success = await self._click_boundary_container_enhanced(container, total_containers_scanned, container_time, page, container_hash)
-                            else:
-                                logger.warning("   ⚠️ Could not get container ID, using original method")
-                                click_success = await self._click_boundary_container_enhanced(container, total_containers_scanned, container_time, page)
-                            
-                            if click_success:
-                                logger.info("✅ Gallery opened at boundary, ready to download boundary generation")
-                                return {
-                                    'found': True,
-                                    'container_index': total_containers_scanned,
-                                    'creation_time': container_time,
-                                    'prompt': container_prompt,
-                                    'containers_scanned': total_containers_scanned,
-                                    'duplicates_found': duplicates_found,
-                                    'scroll_iterations': scroll_attempts + 1
-                                }
-                            else:
-                                logger.warning("❌ Could not click boundary container")
-                                return None
-                        else:
-                            if total_containers_scanned <= 5 or total_containers_scanned % 50 == 0:
-                                logger.debug(f"✓ Container {total_containers_scanned}: Duplicate found, continuing scan")
+                    if record.status:
+                        logger.debug(f"⏭️ Container {total_containers_scanned}: {record.status}, skipping")
+                        continue
                     
-                    except Exception as e:
-                        logger.debug(f"Error checking container {total_containers_scanned}: {e}")
+                    container_time = record.creation_time
+                    container_prompt = record.prompt_prefix[:100]
+                    
+                    if not container_time or not container_prompt:
+                        logger.debug(f"⚠️ Container {total_containers_scanned}: Missing metadata, skipping")
                         continue
+                    
+                    if total_containers_scanned <= 5 or total_containers_scanned % 10 == 0:
+                        logger.info(f"🔍 Scanning container #{total_containers_scanned}: datetime='{container_time}', prompt='{container_prompt[:30]}...'")
+                    
+                    # CRITICAL: Use datetime as primary key for boundary detection (O(1) lookup)
+                    # Container prompts from /generate page are often truncated vs gallery prompts
+                    # Since datetime is unique per generation, we can rely on it primarily
+                    if isinstance(self.existing_log_entries, GenerationDuplicateIndex):
+                        log_entry = self.existing_log_entries.find(container_time)
+                    else:
+                        log_entry = self.existing_log_entries.get(container_time)
+                    
+                    if log_entry is not None:
+                        # DateTime match is sufficient - prompts may differ between views
+                        duplicates_found += 1
+                        if total_containers_scanned <= 5 or total_containers_scanned % 50 == 0:
+                            logger.debug(f"✓ Container {total_containers_scanned}: Duplicate found, continuing scan")
+                        continue
+                    
+                    # Found the boundary - this container has no corresponding log entry
+                    logger.info(f"🎯 BOUNDARY FOUND at container #{total_containers_scanned}")
+                    logger.info(f"   📊 Containers scanned: {total_containers_scanned}")
+                    logger.info(f"   🔍 Duplicates found before boundary: {duplicates_found}")
+                    logger.info(f"   📅 BOUNDARY DATETIME: '{container_time}' ⭐")
+                    logger.info(f"   📝 Boundary prompt: {container_prompt[:75]}...")
+                    logger.info(f"   🔄 Found after {scroll_attempts + 1} scroll iterations ({scanner.round_trips} page scans)")
+                    logger.info(f"   ✨ This generation is NOT in the log file - ready for download!")
+                    
+                    # Resolve the container by its stable hash ID only now that it is needed
+                    logger.info(f"   🖱️ Attempting to click boundary container...")
+                    container = self._find_container_by_hash_id(page, record.hash_id)
+                    click_success = await self._click_boundary_container_enhanced(container, total_containers_scanned, container_time, page, record.hash_id)
+                    if click_success:
+                        logger.info("✅ Gallery opened at boundary, ready to download boundary generation")
+                        return {
+                            'found': True,
+                            'container_index': total_containers_scanned,
+                            'creation_time': container_time,
+                            'prompt': container_prompt,
+                            'containers_scanned': total_containers_scanned,
+                            'duplicates_found': duplicates_found,
+                            'scroll_iterations': scroll_attempts + 1
+                        }
+                    else:
+                        logger.warning("❌ Could not click boundary container")
+                        return None
                 
                 # STEP 3: If no boundary found in current batch, scroll to reveal more
                 # CRITICAL FIX: Always scroll when no boundary found, regardless of new containers
@@ -6758,6 +6480,7 @@ class GenerationDownloadManager:
                         # Get initial state before scrolling
                         initial_state = await self.boundary_scroll_manager.get_scroll_position()
                         logger.info(f"   📊 Before scroll: {initial_state['windowScrollY']}px, {initial_state['containerCount']} containers")
+                        marker = await self.boundary_scroll_manager.container_watcher.arm()
                         
                         # Perform verified scroll with automatic fallback
                         scroll_result = await self.boundary_scroll_manager.perform_scroll_with_fallback(2500)
@@ -6772,7 +6495,18 @@ class GenerationDownloadManager:
                             logger.info(f"   📊 After scroll: {final_state['windowScrollY']}px, {final_state['containerCount']} containers")
                             
                             # Wait for new content to fully load
-                            await page.wait_for_timeout(2000)
+                            if content_events:
+                                appended = await self.boundary_scroll_manager.wait_for_dom_update(marker, self.config.content_quiet_period)
+                                if appended:
+                                    logger.info(f"   👀 {appended} new containers appended")
+                                else:
+                                    logger.info(f"   🔇 No containers appended within {self.config.content_quiet_period}s")
+                                    if await self.boundary_scroll_manager.check_end_of_gallery():
+                                        # One final scan picks up containers that finished rendering meanwhile
+                                        logger.info("   📍 End of gallery detected (quiet period) - final scan")
+                                        consecutive_no_new = max_consecutive_no_new - 1
+                            else:
+                                await page.wait_for_timeout(2000)
                             
                         else:
                             logger.warning(f"   ⚠️ VERIFIED SCROLL FAILED: {scroll_result.error_message}")
@@ -7282,7 +7016,7 @@ class GenerationDownloadManager:
             try:
                 logger.debug("   🎯 Strategy 1: Direct container click")
                 await container.click(timeout=5000)
-                await page.wait_for_timeout(2000)  # Wait for navigation
+                await self.page_waits.wait(page, "gallery_opened")  # Wait for navigation
                 
                 if await self._verify_gallery_opened(page):
                     logger.info("   ✅ Strategy 1 success: Direct click opened gallery")
@@ -7298,7 +7032,7 @@ class GenerationDownloadManager:
                 logger.debug(f"   🔍 Using hash selector: {container_selector}")
                 
                 await page.click(container_selector, timeout=5000)
-                await page.wait_for_timeout(2000)
+                await self.page_waits.wait(page, "gallery_opened")
                 
                 if await self._verify_gallery_opened(page):
                     logger.info("   ✅ Strategy 2 success: Hash selector click opened gallery")
@@ -7377,6 +7111,7 @@ class GenerationDownloadManager:
             logger.error(f"Enhanced boundary click error: {e}")
             return False
             
+    @traced("extract", "download")
     async def _extract_container_metadata(self, container, text_content: str) -> Optional[Dict[str, str]]:
         """
         Extract creation time and prompt from container using simplified selector-based approach
@@ -7656,6 +7391,7 @@ class GenerationDownloadManager:
             logger.error(f"Error in sequential container scan: {e}")
             return None
     
+    @network_phase("scan_network_profile")
     async def _scan_generation_containers(self, page, target_time: str, target_prompt: str) -> Optional[Dict[str, Any]]:
         """Scan generation containers on main page for matching metadata"""
         try:
@@ -7781,6 +7517,10 @@ class GenerationDownloadManager:
             logger.error(f"Error navigating to next thumbnail: {e}")
             return False
 
+    def network_report(self) -> Dict[str, Dict[str, Any]]:
+        """Blocked requests and estimated bytes saved per network profile"""
+        return merge_reports(*(blocker.report() for blocker in self.network_blockers))
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the download manager"""
         return {
@@ -7805,7 +7545,9 @@ class GenerationDownloadManager:
                 'total_thumbnails_seen': self.total_thumbnails_seen,
                 'current_scroll_position': self.current_scroll_position,
                 'last_scroll_thumbnail_count': self.last_scroll_thumbnail_count
-            }
+            },
+            'network_profiles': self.network_report(),
+            'direct_fetch': self.media_fetcher.get_stats()
         }
     
     def _validate_datetime_format(self, datetime_str: str) -> bool:
@@ -7817,6 +7559,7 @@ class GenerationDownloadManager:
         except:
             return False
     
+    @network_phase("scan_network_profile")
     async def _find_start_from_generation(self, page, target_datetime: str) -> Dict[str, Any]:
         """Find the generation with the specified datetime to start downloading from the next one"""
         
@@ -8029,6 +7772,7 @@ class GenerationDownloadManager:
                 'error': str(e)
             }
     
+    @traced("generation_container_mode", "download")
     async def execute_generation_container_mode(self, page, results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute downloads using generation containers on /generate page instead of thumbnail navigation"""
         try:
@@ -8061,6 +7805,13 @@ class GenerationDownloadManager:
             if settings_configured:
                 logger.info("✅ Chromium download settings configured successfully")
             
+            # Pipelined mode: scan on this page, download on worker pages in the same context
+            if self.config.pipeline_workers > 1:
+                pipeline = GenerationDownloadPipeline(self, page, existing_files)
+                pipeline_results = await pipeline.run(results)
+                if pipeline_results is not None:
+                    return pipeline_results
+            
             # Find available generation containers using dynamic detection
             logger.info("📋 Using dynamic container detection for unlimited range (div[id*='__'])")
             
@@ -8264,8 +8015,9 @@ class GenerationDownloadManager:
                         
                         # Click the generation container to open it in the gallery
                         logger.info(f"   🖱️ Clicking generation container to open in gallery...")
-                        await container.click()
-                        await page.wait_for_timeout(3000)  # Wait for gallery to open
+                        with trace_span("click_container", "download", creation_time=container_time):
+                            await container.click()
+                        await self.page_waits.wait(page, "gallery_opened", default=3.0)
                         
                         # Try to download from the opened gallery - PASS EXISTING METADATA
                         download_success = await self._attempt_download_from_current_position(page, containers_processed, container, existing_metadata=metadata)
@@ -8373,8 +8125,10 @@ class GenerationDownloadManager:
                     logger.info(f"📜 ALGORITHM Step 6: No completed containers found, scrolling to find more content (attempt {scroll_attempts + 1}/{max_scroll_attempts})")
                     try:
                         # Scroll down to load more generations  
-                        await page.evaluate("window.scrollBy(0, 2500)")
-                        await page.wait_for_timeout(3000)  # Wait for new content to load
+                        SCROLL_STEPS.inc()
+                        with trace_span("scroll", "download", attempt=scroll_attempts + 1):
+                            await page.evaluate("window.scrollBy(0, 2500)")
+                            await page.wait_for_timeout(3000)  # Wait for new content to load
                         
                         # Rescan for new containers after scroll
                         logger.info("   🔄 Rescanning for new containers after scroll...")
@@ -8431,6 +8185,8 @@ class GenerationDownloadManager:
             results['end_time'] = datetime.now().isoformat()
             return results
     
+    @traced("download_item", "download")
+    @network_phase("download_network_profile")
     async def _attempt_download_from_current_position(self, page, container_index: int, container=None, existing_metadata=None) -> bool:
         """
         Attempt to download from the currently opened generation in the gallery
@@ -8441,89 +8197,6 @@ class GenerationDownloadManager:
         try:
             logger.info(f"   🎯 DOWNLOAD ATTEMPT: Container {container_index} - following algorithm steps 5f-5g")
             
-            # Wait for gallery to fully load
-            await page.wait_for_timeout(3000)
-            
-            # Step 5f: Look for the Download button in icon panel
-            # According to task spec: find text containing [Video, Effects, Frame, References, Repaint, Inpaint]
-            # then locate the third icon which is the Download button
-            logger.debug("   🔍 Step 5f: Looking for Download button in icon panel...")
-            
-            # Strategy 1: Look for download icon by SVG reference (from task example)
-            download_icon_selectors = [
-                'span[role="img"]:has(svg use[xlink:href="#icon-icon_tongyong_20px_xiazai"])',  # Exact from task spec
-                'span.anticon.operate-icon:has(svg use[xlink:href*="xiazai"])',  # Variant
-                'span[class*="operate-icon"]:has(svg)',  # Generic icon approach
-            ]
-            
-            download_button = None
-            for selector in download_icon_selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        download_button = element
-                        logger.info(f"   ✅ Found download icon: {selector}")
-                        break
-                except Exception as e:
-                    logger.debug(f"   Download icon selector {selector} failed: {e}")
-            
-            if not download_button:
-                logger.warning(f"   ⚠️ Download icon not found, trying alternative approaches...")
-                # Fallback: Look for any clickable element with download indication
-                fallback_selectors = [
-                    'button:has-text("Download")',
-                    '[aria-label*="download"]',
-                    '[title*="download"]',
-                    'span:has(svg[fill="currentColor"]):nth-child(3)',  # Third icon approach
-                ]
-                for selector in fallback_selectors:
-                    try:
-                        element = await page.query_selector(selector)
-                        if element and await element.is_visible():
-                            download_button = element
-                            logger.info(f"   ✅ Found download element (fallback): {selector}")
-                            break
-                    except Exception as e:
-                        logger.debug(f"   Fallback selector {selector} failed: {e}")
-            
-            if not download_button:
-                logger.error(f"   ❌ No download button found for container {container_index}")
-                return False
-            
-            # Click the download button to open download options
-            logger.info(f"   🖱️ Step 5f: Clicking download button...")
-            await download_button.click()
-            await page.wait_for_timeout(2000)  # Wait for download options to appear
-            
-            # Step 5f continued: Look for "Download without Watermark" or "Download with Watermark"
-            logger.debug("   🔍 Looking for watermark download options...")
-            
-            watermark_selectors = [
-                'text="Download without Watermark"',  # Exact text match
-                'button:has-text("Download without Watermark")',
-                'span:has-text("Download without Watermark")',
-                'text="Download with Watermark"',  # Fallback option
-                'button:has-text("Download with Watermark")',
-                'span:has-text("Download with Watermark")',
-            ]
-            
-            watermark_option = None
-            selected_option = None
-            for selector in watermark_selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        watermark_option = element
-                        selected_option = "without" if "without" in selector else "with"
-                        logger.info(f"   ✅ Found watermark option: {selector}")
-                        break
-                except Exception as e:
-                    logger.debug(f"   Watermark selector {selector} failed: {e}")
-            
-            if not watermark_option:
-                logger.error(f"   ❌ No watermark download option found for container {container_index}")
-                return False
-            
             # Get metadata BEFORE starting download (we need creation time and prompt for naming)
             current_metadata = None
             
@@ -8559,52 +8232,150 @@ class GenerationDownloadManager:
             
             logger.info(f"   ✅ Container metadata extraction successful - Time: {creation_time}, Prompt: {prompt_text[:50]}...")
             
-            # REUSE WORKING IMPLEMENTATION: Set up download promise handling BEFORE clicking
-            download_promise = None
-            
-            def handle_download(download):
-                nonlocal download_promise
-                download_promise = download
-                logger.info(f"   📥 Download started: {download.suggested_filename}")
-            
-            page.on("download", handle_download)
-            
-            try:
-                # Click the watermark option to start download
-                logger.info(f"   🖱️ Step 5f: Clicking 'Download {selected_option} Watermark' option...")
-                await watermark_option.click()
-                
-                # Step 5g: Detect download start, intercept file, save with naming schema
-                logger.info("   🎯 Step 5g: Intercepting download and applying naming schema...")
-                
-                # Wait for download to start
-                await page.wait_for_timeout(3000)
-                
-                # Step 5g: Process download using working promise pattern
-                success = await self._process_download_with_promise(creation_time, prompt_text, download_promise)
-                
-                if success:
-                    logger.info(f"   ✅ Successfully downloaded generation {container_index}: {creation_time}")
-                    return True
-                else:
-                    logger.warning(f"   ⚠️ Failed to download generation {container_index}: {creation_time}")
+            tracked = await self._fetch_media_directly(page, creation_time, self._skip_test_target_path(creation_time), container)
+            if tracked is None:
+                watermark_option, selected_option = await self._open_download_options(page, container_index)
+                if not watermark_option:
                     return False
-                    
-            finally:
-                # Clean up event listener
+                tracked = await self._click_and_track_download(page, watermark_option, selected_option, creation_time)
+            
+            # Step 5g: Log the saved file for this generation
+            hash_id = None
+            if container is not None:
                 try:
-                    page.remove_listener("download", handle_download)
-                except:
-                    pass  # Ignore cleanup errors
+                    container_id = await container.get_attribute('id')
+                    hash_id = self._get_container_hash_id(container_id) if container_id else None
+                except Exception:
+                    pass
+            success = await self._process_tracked_download(creation_time, prompt_text, tracked, hash_id)
             
-        except Exception as metadata_error:
-            logger.error(f"   ❌ Failed to extract metadata for download: {metadata_error}")
-            return False
+            if success:
+                logger.info(f"   ✅ Successfully downloaded generation {container_index}: {creation_time}")
+                return True
+            else:
+                logger.warning(f"   ⚠️ Failed to download generation {container_index}: {creation_time}")
+                return False
             
         except Exception as e:
             logger.error(f"   ❌ Download attempt failed for container {container_index}: {e}")
             return False
+    
+    @traced("open_download_options", "download")
+    async def _open_download_options(self, page, container_index: int):
+        """
+        Algorithm Step 5f: Click the Download icon of the opened gallery and find the watermark option
+        
+        Returns:
+            tuple: (watermark option element, "without" or "with"), or (None, None) if not found
+        """
+        # Wait for gallery to load: returns as soon as the download icon is visible
+        download_icon_selectors = [
+            'span[role="img"]:has(svg use[xlink:href="#icon-icon_tongyong_20px_xiazai"])',  # Exact from task spec
+            'span.anticon.operate-icon:has(svg use[xlink:href*="xiazai"])',  # Variant
+            'span[class*="operate-icon"]:has(svg)',  # Generic icon approach
+        ]
+        try:
+            await page.wait_for_selector(download_icon_selectors[0], state="visible", timeout=3000)
+        except Exception:
+            logger.debug("   Download icon not visible after 3s, continuing with selector search")
+        
+        # Step 5f: Look for the Download button in icon panel
+        # According to task spec: find text containing [Video, Effects, Frame, References, Repaint, Inpaint]
+        # then locate the third icon which is the Download button
+        logger.debug("   🔍 Step 5f: Looking for Download button in icon panel...")
+        
+        # Strategy 1: Look for download icon by SVG reference (from task example)
+        download_button = None
+        for selector in download_icon_selectors:
+            try:
+                element = await page.query_selector(selector)
+                if element and await element.is_visible():
+                    download_button = element
+                    logger.info(f"   ✅ Found download icon: {selector}")
+                    break
+            except Exception as e:
+                logger.debug(f"   Download icon selector {selector} failed: {e}")
+        
+        if not download_button:
+            logger.warning(f"   ⚠️ Download icon not found, trying alternative approaches...")
+            # Fallback: Look for any clickable element with download indication
+            fallback_selectors = [
+                'button:has-text("Download")',
+                '[aria-label*="download"]',
+                '[title*="download"]',
+                'span:has(svg[fill="currentColor"]):nth-child(3)',  # Third icon approach
+            ]
+            for selector in fallback_selectors:
+                try:
+                    element = await page.query_selector(selector)
+                    if element and await element.is_visible():
+                        download_button = element
+                        logger.info(f"   ✅ Found download element (fallback): {selector}")
+                        break
+                except Exception as e:
+                    logger.debug(f"   Fallback selector {selector} failed: {e}")
+        
+        if not download_button:
+            logger.error(f"   ❌ No download button found for container {container_index}")
+            return None, None
+        
+        # Click the download button to open download options
+        logger.info(f"   🖱️ Step 5f: Clicking download button...")
+        await download_button.click()
+        
+        # Step 5f continued: Look for "Download without Watermark" or "Download with Watermark"
+        logger.debug("   🔍 Looking for watermark download options...")
+        try:
+            await page.wait_for_selector('text=/Download with(out)? Watermark/', state="visible", timeout=2000)
+        except Exception:
+            logger.debug("   Watermark options not visible after 2s, continuing with selector search")
+        
+        watermark_selectors = [
+            'text="Download without Watermark"',  # Exact text match
+            'button:has-text("Download without Watermark")',
+            'span:has-text("Download without Watermark")',
+            'text="Download with Watermark"',  # Fallback option
+            'button:has-text("Download with Watermark")',
+            'span:has-text("Download with Watermark")',
+        ]
+        
+        for selector in watermark_selectors:
+            try:
+                element = await page.query_selector(selector)
+                if element and await element.is_visible():
+                    logger.info(f"   ✅ Found watermark option: {selector}")
+                    return element, ("without" if "without" in selector else "with")
+            except Exception as e:
+                logger.debug(f"   Watermark selector {selector} failed: {e}")
+        
+        logger.error(f"   ❌ No watermark download option found for container {container_index}")
+        return None, None
+    
+    @traced("click_download", "download")
+    async def _click_and_track_download(self, page, watermark_option, selected_option: str, creation_time: str):
+        """
+        Algorithm Step 5f-5g: Click the watermark option and await the download it triggers
+        
+        Returns:
+            TrackedDownload for the saved file, or None if no download completed
+        """
+        # Register the expected download BEFORE clicking, tied to this generation
+        expectation = self._expect_download(page, creation_time, self._skip_test_target_path(creation_time))
+        
+        try:
+            # Click the watermark option to start download
+            logger.info(f"   🖱️ Step 5f: Clicking 'Download {selected_option} Watermark' option...")
+            await watermark_option.click()
+            
+            # Step 5g: Detect download start, intercept file, save with naming schema
+            logger.info("   🎯 Step 5g: Intercepting download and applying naming schema...")
+            return await self.wait_for_tracked_download(page, expectation)
+            
+        finally:
+            # Drop the expectation if no download ever arrived
+            self.download_tracker.cancel(expectation)
 
+    @traced("extract_gallery", "download")
     async def _extract_gallery_metadata(self, page) -> Optional[Dict[str, str]]:
         """
         Extract metadata from current gallery view
@@ -8734,270 +8505,49 @@ class GenerationDownloadManager:
                 return True
         return False
 
-    async def _process_download_file(self, creation_time: str, prompt_text: str) -> bool:
+    def _skip_test_target_path(self, creation_time: str) -> Path:
+        """Build a non-conflicting vid_<time>_skipTest.mp4 path in the downloads folder"""
+        downloads_path = Path(self.config.downloads_folder)
+        time_formatted = self._format_creation_time(creation_time)
+        target_path = downloads_path / f"vid_{time_formatted}_skipTest.mp4"
+        return self.file_manager.manifest.free_path(target_path, "{stem}_v{counter}{suffix}", limit=1_000_000)
+    
+    @traced("process_download", "download")
+    async def _process_tracked_download(self, creation_time: str, prompt_text: str, tracked,
+                                        hash_id: Optional[str] = None) -> bool:
         """
-        Process downloaded file: rename with naming schema and add to log
+        Log a download resolved by the download tracker
         Following Algorithm Step 5g-5h: File management and logging
         """
         try:
-            logger.info(f"   📁 Step 5g: Processing download file for {creation_time}")
-            
-            # REUSE WORKING IMPLEMENTATION: File system detection fallback only
-            downloads_path = Path(self.config.downloads_folder)
-            downloads_path.mkdir(parents=True, exist_ok=True)
-            
-            # Try to find recently downloaded file
-            downloaded_file = await self._fallback_file_detection(creation_time, downloads_path)
-            
-            if downloaded_file:
+            record_download(bool(tracked and tracked.success))
+            if tracked and tracked.success:
+                self.file_manager.manifest.record(tracked.path)
                 # Log successful download
-                await self._add_to_generation_log(creation_time, prompt_text, downloaded_file.name)
-                logger.info(f"   ✅ Step 5g: Successfully processed download: {downloaded_file.name}")
+                await self._add_to_generation_log(creation_time, prompt_text, tracked.path.name)
+                logger.info(f"   ✅ Step 5g: Successfully processed download: {tracked.path.name} ({tracked.size} bytes, {tracked.duration:.1f}s)")
+                self._container_processed(creation_time, hash_id)
                 return True
             else:
                 # Log failed download
                 await self._add_to_generation_log(creation_time, prompt_text, "download_failed")
                 logger.warning(f"   ⚠️ Step 5g: No download file found for {creation_time}")
+                self._container_processed(creation_time, hash_id)
                 return False
                 
         except Exception as e:
-            logger.error(f"   ❌ Error processing download file: {e}")
+            logger.error(f"   ❌ Error processing tracked download: {e}")
             return False
     
-    async def _fallback_file_detection(self, creation_time: str, downloads_path: Path) -> Path:
-        """
-        Fallback file detection - look for recently downloaded files
-        REUSE WORKING IMPLEMENTATION: Based on proven file detection patterns
-        """
-        try:
-            import time
-            current_time = time.time()
-            time_window = 120  # Look for files in last 2 minutes
-            
-            # Search locations (reuse working pattern from docs)
-            search_locations = [
-                downloads_path,  # Configured download path
-                Path.home() / "Downloads",  # Default browser downloads
-                Path("/tmp"),  # Temp downloads
-                Path("."),  # Current directory
-            ]
-            
-            new_files = []
-            
-            for location in search_locations:
-                if not location.exists():
-                    continue
-                    
-                try:
-                    for file_path in location.iterdir():
-                        if file_path.is_file() and file_path.suffix.lower() in ['.mp4', '.mov', '.avi', '.webm', '.mkv']:
-                            file_age = current_time - file_path.stat().st_mtime
-                            if file_age < time_window:  # Recent download
-                                new_files.append(file_path)
-                except Exception as e:
-                    logger.debug(f"   Could not scan {location}: {e}")
-            
-            if new_files:
-                # Return most recent file
-                latest_file = max(new_files, key=lambda f: f.stat().st_mtime)
-                logger.info(f"   ✅ Found recent download: {latest_file.name} (age: {current_time - latest_file.stat().st_mtime:.1f}s)")
-                
-                # Move to downloads folder if needed
-                if latest_file.parent != downloads_path:
-                    time_formatted = self._format_creation_time(creation_time)
-                    new_name = f"vid_{time_formatted}_skipTest{latest_file.suffix}"
-                    target_path = downloads_path / new_name
-                    
-                    # Handle conflicts
-                    counter = 1
-                    while target_path.exists():
-                        name_parts = new_name.split('.')
-                        name_without_ext = '.'.join(name_parts[:-1])
-                        ext = name_parts[-1] if len(name_parts) > 1 else ''
-                        new_name = f"{name_without_ext}_v{counter}.{ext}" if ext else f"{name_without_ext}_v{counter}"
-                        target_path = downloads_path / new_name
-                        counter += 1
-                    
-                    import shutil
-                    shutil.move(str(latest_file), str(target_path))
-                    logger.info(f"   📁 Moved file to: {target_path.name}")
-                    return target_path
-                else:
-                    return latest_file
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"   ❌ Fallback file detection failed: {e}")
-            return None
-    
-    async def _process_download_with_promise(self, creation_time: str, prompt_text: str, download_promise) -> bool:
-        """
-        Process download using Playwright download promise - REUSE WORKING IMPLEMENTATION
-        This is the proven pattern from the existing working download methods
-        """
-        try:
-            downloads_path = Path(self.config.downloads_folder)
-            downloads_path.mkdir(parents=True, exist_ok=True)
-            
-            downloaded_file = None
-            
-            # Primary method: Use download promise (WORKING IMPLEMENTATION)
-            if download_promise:
-                try:
-                    # Generate filename with proper naming schema
-                    time_formatted = self._format_creation_time(creation_time)
-                    target_filename = f"vid_{time_formatted}_skipTest.mp4"
-                    target_path = downloads_path / target_filename
-                    
-                    # Handle filename conflicts
-                    if target_path.exists():
-                        counter = 1
-                        while target_path.exists():
-                            target_filename = f"vid_{time_formatted}_skipTest_v{counter}.mp4"
-                            target_path = downloads_path / target_filename
-                            counter += 1
-                    
-                    # WORKING PATTERN: Save download using promise (from lines 4280-4281)
-                    await download_promise.save_as(str(target_path))
-                    downloaded_file = target_path
-                    logger.info(f"   ✅ Download saved using promise: {downloaded_file.name}")
-                    
-                except Exception as e:
-                    logger.error(f"   ❌ Failed to save download using promise: {e}")
-            
-            # Fallback: File detection if promise failed  
-            if not downloaded_file:
-                logger.info(f"   🔍 Fallback: Searching for download files...")
-                downloaded_file = await self._fallback_file_detection(creation_time, downloads_path)
-            
-            if downloaded_file:
-                # Log successful download
-                await self._add_to_generation_log(creation_time, prompt_text, downloaded_file.name)
-                logger.info(f"   ✅ Step 5g: Successfully processed download: {downloaded_file.name}")
-                return True
-            else:
-                # Log failed download
-                await self._add_to_generation_log(creation_time, prompt_text, "download_failed")
-                logger.warning(f"   ⚠️ Step 5g: No download file found for {creation_time}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"   ❌ Error processing download with promise: {e}")
-            return False
+    def _container_processed(self, creation_time: str, hash_id: Optional[str]):
+        """Remember the last logged container and report it for checkpointing"""
+        self.last_processed_container = {"creation_time": creation_time, "hash_id": hash_id}
+        if self.checkpoint_callback:
+            try:
+                self.checkpoint_callback(dict(self.last_processed_container))
+            except Exception as e:
+                logger.warning(f"Checkpoint callback failed: {e}")
     
-    async def _detect_downloaded_files(self, creation_time: str, prompt_text: str, max_wait_attempts: int, wait_time: int) -> bool:
-        """
-        Detect downloaded files with retry logic and timeout protection
-        """
-            
-        downloads_path = Path(self.config.downloads_folder)
-        downloads_path.mkdir(parents=True, exist_ok=True)
-        
-        # Check browser's actual download directory first
-        browser_download_paths = [
-            downloads_path,  # Our configured path
-            Path.home() / "Downloads",  # Default browser downloads
-            Path("/tmp"),  # Temp downloads
-            Path("."),  # Current directory
-        ]
-        
-        logger.info(f"   🔍 Searching for downloads in: {len(browser_download_paths)} locations")
-        for path in browser_download_paths:
-            logger.debug(f"     📂 {path}")
-        
-        new_files = []
-        
-        # ENHANCED: Retry file detection with timeout protection
-        for attempt in range(max_wait_attempts):
-                logger.debug(f"   🔍 Attempt {attempt + 1}/{max_wait_attempts}: Checking for downloaded files...")
-                
-                # Wait for download to complete
-                await asyncio.sleep(wait_time)
-                
-                # Check downloads folder for new files (extended time window)
-                import time
-                current_time = time.time()
-                new_files = []
-                
-                # ENHANCED: Look for files modified in the last 120 seconds (2 minutes)
-                time_window = 120
-                
-                for file_path in downloads_path.iterdir():
-                    if file_path.is_file():
-                        file_age = current_time - file_path.stat().st_mtime
-                        if file_age < time_window:  # File modified in last 2 minutes
-                            new_files.append(file_path)
-                
-                # ENHANCED: Check all potential download locations
-                for download_dir in browser_download_paths[1:]:  # Skip configured path (already checked)
-                    if download_dir.exists():
-                        for file_path in download_dir.iterdir():
-                            if file_path.is_file() and file_path.suffix.lower() in ['.mp4', '.mov', '.avi', '.webm', '.mkv']:
-                                file_age = current_time - file_path.stat().st_mtime
-                                if file_age < time_window:  # Recent download
-                                    new_files.append(file_path)
-                
-                # If files found, break out of retry loop
-                if new_files:
-                    logger.info(f"   ✅ Found {len(new_files)} download file(s) on attempt {attempt + 1}")
-                    break
-                    
-                # Log attempt status with more detail
-                if attempt < max_wait_attempts - 1:
-                    logger.debug(f"   ⏳ Attempt {attempt + 1}/{max_wait_attempts}: No files found, waiting {wait_time}s...")
-                else:
-                    logger.warning(f"   ⚠️ Final attempt {attempt + 1}/{max_wait_attempts}: No files found")
-            
-        if not new_files:
-            logger.warning(f"   ⚠️ No recent download files found after {max_wait_attempts} attempts ({max_wait_attempts * wait_time}s total wait)")
-            logger.info(f"   📂 Searched in {len(browser_download_paths)} locations for video files (.mp4, .mov, .avi, .webm, .mkv)")
-            # Log as attempted but failed
-            await self._add_to_generation_log(creation_time, prompt_text, "download_not_found")
-            return False  # Return False since no file was actually processed
-            
-        # Use the most recent file
-        latest_file = max(new_files, key=lambda f: f.stat().st_mtime)
-        logger.info(f"   ✅ Found download file: {latest_file.name} (size: {latest_file.stat().st_size} bytes)")
-        
-        # ENHANCED: Generate proper filename with naming schema
-        time_formatted = self._format_creation_time(creation_time)
-        file_extension = latest_file.suffix  # Preserve original extension
-        new_filename = f"vid_{time_formatted}_skipTest{file_extension}"
-        target_path = downloads_path / new_filename
-        
-        # ENHANCED: Move and rename the file with error handling
-        import shutil
-        try:
-            # Ensure target doesn't exist (avoid conflicts)
-            if target_path.exists():
-                counter = 1
-                while target_path.exists():
-                    name_parts = new_filename.split('.')
-                    name_without_ext = '.'.join(name_parts[:-1])
-                    ext = name_parts[-1] if len(name_parts) > 1 else ''
-                    new_filename = f"{name_without_ext}_v{counter}.{ext}" if ext else f"{name_without_ext}_v{counter}"
-                    target_path = downloads_path / new_filename
-                    counter += 1
-            
-            shutil.move(str(latest_file), str(target_path))
-            logger.info(f"   ✅ Step 5g: File renamed and moved: {new_filename}")
-            
-            # FIXED: Add metadata to generation_downloads.txt
-            await self._add_to_generation_log(creation_time, prompt_text, new_filename)
-            
-            return True
-            
-        except Exception as move_error:
-            logger.error(f"   ❌ Failed to move file: {move_error}")
-            # Still try to log the download attempt
-            await self._add_to_generation_log(creation_time, prompt_text, latest_file.name)
-            return False
-            
-        except Exception as e:
-            logger.error(f"   ❌ File processing failed: {e}")
-            return False
-
     def _format_creation_time(self, creation_time: str) -> str:
         """Convert creation time to filename format: YYYY-MM-DD-HH-MM-SS"""
         try:
@@ -9011,35 +8561,14 @@ class GenerationDownloadManager:
             from datetime import datetime
             return datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
 
+    @traced("log", "download")
     async def _add_failed_generation_to_log(self, creation_time: str, prefixed_prompt: str):
         """Add failed generation entry to generation_downloads.txt with FAILED prefix and chronological ordering"""
         try:
-            log_file = Path(self.config.log_file_path)
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create new failed entry with proper format (matching original schema)
-            new_entry = {
-                'id': '#999999999',
-                'creation_time': creation_time,
-                'prompt_text': prefixed_prompt,  # Already has "FAILED!!!__" prefix
-                'separator': '========================================'
-            }
-            
             logger.info(f"   📝 CLEANUP: Adding failed generation to log: {creation_time}")
             
-            # Read and parse existing entries if file exists
-            existing_entries = []
-            if log_file.exists():
-                existing_entries = self._parse_log_entries(log_file)
-            
-            # Add new failed entry to list
-            existing_entries.append(new_entry)
-            
-            # Sort by creation time (newest first) - same as successful downloads
-            sorted_entries = self._sort_entries_by_creation_time(existing_entries)
-            
-            # Write back to file with proper formatting
-            self._write_sorted_entries_to_log(log_file, sorted_entries)
+            # Same append-only store as successful downloads (prompt already has "FAILED!!!__" prefix)
+            self._generation_log_store().append(PLACEHOLDER_ID, creation_time, prefixed_prompt)
             
             logger.info(f"   ✅ CLEANUP: Failed generation logged successfully: {creation_time}")
             
@@ -9047,6 +8576,7 @@ class GenerationDownloadManager:
             logger.error(f"   ❌ CLEANUP ERROR: Failed to log failed generation: {e}")
             # Don't raise - let cleanup continue
     
+    @traced("delete", "download")
     async def _delete_failed_generation(self, container, container_index: int, creation_time: str, hash_id: str = None) -> bool:
         """
         CLEANUP: Delete failed generation container by clicking Delete button
@@ -9121,127 +8651,36 @@ class GenerationDownloadManager:
             logger.error(f"   ❌ CLEANUP ERROR: Failed to delete failed generation {container_index}: {e}")
             return False
 
+    @traced("log", "download")
     async def _add_to_generation_log(self, creation_time: str, prompt_text: str, filename: str):
         """Add entry to generation_downloads.txt with true chronological ordering by Creation Time (newest first)"""
         try:
-            log_file = Path(self.config.log_file_path)
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create new entry with proper format (matching original schema)
-            new_entry = {
-                'id': '#999999999',
-                'creation_time': creation_time,
-                'prompt_text': prompt_text,
-                'separator': '========================================'
-            }
-            
             logger.info(f"   ✅ Step 5g: Adding to log with chronological sorting: {creation_time}")
             
-            # Read and parse existing entries if file exists
-            existing_entries = []
-            if log_file.exists():
-                existing_entries = self._parse_log_entries(log_file)
-            
-            # Add new entry to list
-            existing_entries.append(new_entry)
-            
-            # Sort by creation time (newest first)
-            sorted_entries = self._sort_entries_by_creation_time(existing_entries)
-            
-            # Write all entries back to file in proper chronological order
-            self._write_sorted_entries_to_log(log_file, sorted_entries)
+            # Append-only write; the newest-first text view is extended or regenerated lazily
+            self._generation_log_store().append(PLACEHOLDER_ID, creation_time, prompt_text)
                 
             logger.info(f"   ✅ Step 5g: Metadata logged successfully with chronological ordering")
             
         except Exception as e:
             logger.error(f"   ❌ Failed to add to generation log: {e}")
     
-    def _parse_log_entries(self, log_file: Path) -> list:
-        """Parse existing log entries from file"""
-        entries = []
+    def flush_generation_log(self):
+        """Write out the newest-first text log(s) if entries were inserted out of order"""
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-            
-            if not content:
-                return entries
-            
-            # Split by separator and process each entry
-            raw_entries = content.split('========================================')
-            
-            for raw_entry in raw_entries:
-                raw_entry = raw_entry.strip()
-                if not raw_entry:
-                    continue
-                    
-                lines = raw_entry.split('\n')
-                if len(lines) >= 3:
-                    entry = {
-                        'id': lines[0].strip(),
-                        'creation_time': lines[1].strip(),
-                        'prompt_text': '\n'.join(lines[2:]).strip(),
-                        'separator': '========================================'
-                    }
-                    entries.append(entry)
-            
-            logger.debug(f"   📊 Parsed {len(entries)} existing log entries")
-            return entries
-            
+            self._generation_log_store().flush()
         except Exception as e:
-            logger.error(f"   ❌ Error parsing log entries: {e}")
-            return entries
+            logger.error(f"   ❌ Failed to export generation log: {e}")
     
-    def _sort_entries_by_creation_time(self, entries: list) -> list:
-        """Sort entries by creation time (newest first)"""
-        try:
-            from datetime import datetime
-            
-            def parse_creation_time(time_str: str):
-                """Parse creation time string to datetime for sorting"""
-                try:
-                    # Handle format: "05 Sep 2025 17:06:29"
-                    return datetime.strptime(time_str, '%d %b %Y %H:%M:%S')
-                except ValueError:
-                    try:
-                        # Handle alternative format: "2025-09-05 17:06:29" 
-                        return datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        # Fallback: return very old date so it appears last
-                        logger.warning(f"   ⚠️ Cannot parse creation time: {time_str}")
-                        return datetime(1900, 1, 1)
-            
-            # Sort by creation time (newest first)
-            sorted_entries = sorted(entries, 
-                                  key=lambda x: parse_creation_time(x['creation_time']), 
-                                  reverse=True)
-            
-            logger.debug(f"   ✅ Sorted {len(sorted_entries)} entries by creation time (newest first)")
-            return sorted_entries
-            
-        except Exception as e:
-            logger.error(f"   ❌ Error sorting entries: {e}")
-            return entries
-    
-    def _write_sorted_entries_to_log(self, log_file: Path, entries: list):
-        """Write sorted entries back to log file"""
-        try:
-            with open(log_file, 'w', encoding='utf-8') as f:
-                for i, entry in enumerate(entries):
-                    # Write entry in original format
-                    f.write(f"{entry['id']}\n{entry['creation_time']}\n{entry['prompt_text']}\n{entry['separator']}")
-                    
-                    # Add newline between entries (except after last entry)
-                    if i < len(entries) - 1:
-                        f.write('\n')
-                
-                # Add final newline
-                f.write('\n')
-            
-            logger.debug(f"   ✅ Wrote {len(entries)} entries to log file in chronological order")
-            
-        except Exception as e:
-            logger.error(f"   ❌ Error writing entries to log: {e}")
+    def _generation_log_store(self) -> GenerationLogStore:
+        """Log store backing config.log_file_path (shared with the metadata logger)"""
+        if Path(self.config.log_file_path) == self.logger.log_file_path:
+            return self.logger.store
+        if getattr(self, '_log_store', None) is None:
+            self._log_store = GenerationLogStore(self.config.log_file_path)
+        return self._log_store
     
+    @traced("delete", "download")
     async def _delete_duplicate_generation(self, container, container_index: int, creation_time: str, hash_id: str = None) -> bool:
         """
         Algorithm Step 5b: Delete duplicate generation by clicking Delete button
@@ -9341,6 +8780,7 @@ class GenerationDownloadManager:
             logger.error(f"   ❌ Error deleting duplicate generation {container_index}: {e}")
             return False
     
+    @traced("close_gallery", "download")
     async def _close_gallery_view(self, page) -> bool:
         """
         Algorithm Step 5h: Close gallery by clicking the Close icon
@@ -9372,7 +8812,7 @@ class GenerationDownloadManager:
                     if close_element and await close_element.is_visible():
                         logger.info(f"   ✅ Found Close icon using selector: {selector}")
                         await close_element.click()
-                        await page.wait_for_timeout(2000)  # Wait for gallery to close
+                        await self.page_waits.wait(page, "gallery_closed")
                         logger.info("   🚫 Gallery closed successfully")
                         return True
                 except Exception as e:
@@ -9399,6 +8839,7 @@ class GenerationDownloadManager:
             logger.error(f"   ❌ Error deleting downloaded generation {container_index}: {e}")
             return False
     
+    @traced("confirm_delete", "download")
     async def _handle_delete_confirmation(self, page) -> bool:
         """
         Handle deletion confirmation popup if it appears
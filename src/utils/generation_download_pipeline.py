@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Generation Download Pipeline
+Concurrent multi-page variant of generation container mode.
+
+The page the automation was started on only scans: it snapshots the
+generation containers in one round trip, filters by status and duplicates,
+and queues the completed ones. Worker pages opened in the same browser
+context click each queued container, trigger its download and await it
+through the download tracker, with the number of downloads in flight bounded
+by a semaphore. Log entries go through a single ordered writer so the
+generation log keeps the scan (newest-first) order regardless of which
+worker finishes first.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .enhanced_metadata_extraction import extract_container_metadata_enhanced
+from .metrics_registry import QUEUE_DEPTH, SCROLL_STEPS
+from .network_profiles import apply_network_profile, get_request_blocker
+from .span_tracer import trace_span, traced
+
+logger = logging.getLogger(__name__)
+
+# One round trip for every generation container (hash__index) on the page
+CONTAINER_SNAPSHOT_SCRIPT = """
+() => Array.from(document.querySelectorAll('div[id*="__"]'))
+    .filter(el => {
+        const parts = el.id.split('__');
+        return parts.length === 2 && parts[0] && /^\\d+$/.test(parts[1]);
+    })
+    .map(el => ({ id: el.id, text: el.textContent || '' }))
+"""
+
+# Container status markers that mean "not ready for download"
+PENDING_STATUS_MARKERS = ("Queuing", "Estimated", "rendering")
+FAILED_STATUS_MARKER = "wrong"
+
+
+@dataclass
+class PipelineItem:
+    """A completed generation queued for download"""
+    sequence: int
+    hash_id: str
+    creation_time: str
+    prompt: str
+    metadata: Dict[str, str] = field(default_factory=dict)
+    media_url: Optional[str] = None  # Set when the container exposes its media URL (direct fetch)
+
+
+class OrderedLogWriter:
+    """Applies log writes strictly in sequence order
+
+    Sequence numbers are reserved in scan order. Writes submitted out of order
+    are held back until every earlier sequence has been submitted, then applied
+    one at a time, so the log sees the same order as a sequential run.
+    """
+
+    def __init__(self):
+        self._issued = 0
+        self._next = 0
+        self._pending: Dict[int, Optional[Callable[[], Awaitable[Any]]]] = {}
+        self._lock = asyncio.Lock()
+
+    def reserve(self) -> int:
+        """Reserve the next sequence number"""
+        sequence = self._issued
+        self._issued += 1
+        return sequence
+
+    async def submit(self, sequence: int, write: Optional[Callable[[], Awaitable[Any]]] = None):
+        """Submit the write for a sequence (None when there is nothing to log)"""
+        self._pending[sequence] = write
+        async with self._lock:
+            while self._next in self._pending:
+                await self._apply(self._pending.pop(self._next))
+                self._next += 1
+
+    async def drain(self):
+        """Apply remaining writes in order, skipping sequences that were never submitted"""
+        async with self._lock:
+            for sequence in sorted(self._pending):
+                await self._apply(self._pending.pop(sequence))
+            self._next = self._issued
+
+    @property
+    def backlog(self) -> int:
+        """Writes waiting for an earlier sequence"""
+        return len(self._pending)
+
+    async def _apply(self, write):
+        if write is None:
+            return
+        try:
+            await write()
+        except Exception as e:
+            logger.error(f"❌ Ordered log write failed: {e}")
+
+
+class GenerationDownloadPipeline:
+    """Scan on one page, download on worker pages, log in order"""
+
+    def __init__(self, manager, page, existing_files: set = None):
+        self.manager = manager
+        self.config = manager.config
+        self.page = page
+        self.existing_files = existing_files or set()
+
+        self.worker_count = max(1, self.config.pipeline_workers)
+        self.writer = OrderedLogWriter()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.pipeline_queue_size))
+        self.inflight = asyncio.Semaphore(max(1, self.config.max_inflight_downloads))
+        # Download budget: one slot per queued container, returned when a download fails
+        self.budget = asyncio.Semaphore(max(0, self.config.max_downloads))
+
+        self.worker_pages: List[Any] = []
+        self.queued_times = set()
+        self.containers_processed = 0
+        self.downloads_completed = 0
+        self.downloads_failed = 0
+        self.max_scroll_attempts = 5
+        self._stop = asyncio.Event()
+        if self.config.max_downloads <= 0:
+            self._stop.set()
+        self._scanner: Optional[asyncio.Task] = None
+
+    async def run(self, results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run the pipeline; returns None if no worker page could be opened"""
+        await self._open_worker_pages()
+        if not self.worker_pages:
+            logger.warning("⚠️ PIPELINE: No worker pages available, falling back to sequential container mode")
+            return None
+
+        logger.info(f"🚀 PIPELINE: 1 scan page, {len(self.worker_pages)} worker pages, "
+                    f"max {self.config.max_inflight_downloads} downloads in flight")
+        # The scan page only reads container text; worker pages got the download profile when opened
+        scan_profile = self.config.scan_network_profile
+        blockers = getattr(self.manager, "network_blockers", None)
+        previous_profile = await apply_network_profile(self.page, scan_profile, blockers)
+        workers: List[asyncio.Task] = []
+        try:
+            self._scanner = asyncio.create_task(self._scan(), name="pipeline-scanner")
+            workers = [asyncio.create_task(self._work(worker_page, index + 1), name=f"pipeline-worker-{index + 1}")
+                       for index, worker_page in enumerate(self.worker_pages)]
+
+            try:
+                await self._scanner
+            except asyncio.CancelledError:
+                if not self._stop.is_set():
+                    raise
+            for _ in workers:
+                await self.queue.put(None)
+            await asyncio.gather(*workers)
+            await self.writer.drain()
+        finally:
+            # On a scanner or worker failure nothing else will wake the workers blocked on
+            # queue.get(); stop every task before its page is closed underneath it
+            tasks = [task for task in [self._scanner, *workers] if task is not None and not task.done()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._close_worker_pages()
+            if previous_profile is not None and previous_profile != scan_profile:
+                await get_request_blocker(self.page).set_profile(previous_profile)
+
+        results['success'] = self.downloads_completed > 0
+        results['downloads_completed'] = self.downloads_completed
+        results['total_thumbnails_processed'] = self.containers_processed
+        results['end_time'] = datetime.now().isoformat()
+
+        logger.info("🏁 PIPELINE completed:")
+        logger.info(f"   📊 Containers processed: {self.containers_processed}")
+        logger.info(f"   ⬇️ Downloads completed: {self.downloads_completed}")
+        logger.info(f"   ❌ Downloads failed: {self.downloads_failed}")
+        return results
+
+    async def _open_worker_pages(self):
+        """Open worker pages on the same URL in the scan page's browser context"""
+        for index in range(self.worker_count):
+            try:
+                worker_page = await self.page.context.new_page()
+                await apply_network_profile(worker_page, self.config.download_network_profile,
+                                            getattr(self.manager, "network_blockers", None))
+                await worker_page.goto(self.page.url, wait_until="domcontentloaded")
+                self.worker_pages.append(worker_page)
+            except Exception as e:
+                logger.warning(f"⚠️ PIPELINE: Could not open worker page {index + 1}: {e}")
+                break
+
+    async def _close_worker_pages(self):
+        for worker_page in self.worker_pages:
+            try:
+                await worker_page.close()
+            except Exception as e:
+                logger.debug(f"Worker page close failed: {e}")
+        self.worker_pages.clear()
+
+    async def _snapshot_containers(self) -> List[Dict[str, str]]:
+        try:
+            return await self.page.evaluate(CONTAINER_SNAPSHOT_SCRIPT) or []
+        except Exception as e:
+            logger.debug(f"Container snapshot failed: {e}")
+            return []
+
+    @traced("scroll", "download")
+    async def _scroll(self, page):
+        SCROLL_STEPS.inc()
+        await page.evaluate(f"window.scrollBy(0, {self.config.scroll_amount})")
+        await page.wait_for_timeout(self.config.scroll_wait_time)
+
+    async def _scan(self):
+        """Producer: queue completed, non-duplicate containers in page order"""
+        seen = set()
+        scroll_attempts = 0
+
+        while not self._stop.is_set() and scroll_attempts < self.max_scroll_attempts:
+            snapshot = await self._snapshot_containers()
+            fresh = []
+            for entry in snapshot:
+                hash_id = self.manager._get_container_hash_id(entry['id'])
+                if hash_id not in seen:
+                    seen.add(hash_id)
+                    fresh.append((hash_id, entry['text']))
+
+            if fresh:
+                scroll_attempts = 0
+            else:
+                scroll_attempts += 1
+                logger.info(f"📜 PIPELINE: No new containers, scrolling (attempt {scroll_attempts}/{self.max_scroll_attempts})")
+
+            for hash_id, text_content in fresh:
+                if self._stop.is_set():
+                    return
+                self.containers_processed += 1
+                item = await self._prepare(hash_id, text_content)
+                if item is None:
+                    continue
+                await self.budget.acquire()
+                if self._stop.is_set():
+                    return
+                item.sequence = self.writer.reserve()
+                await self.queue.put(item)
+                QUEUE_DEPTH.labels(queue="pipeline").set(self.queue.qsize())
+
+            await self._scroll(self.page)
+
+    async def _prepare(self, hash_id: str, text_content: str) -> Optional[PipelineItem]:
+        """Classify a container; handles failed and duplicate generations on the scan page"""
+        if not text_content:
+            return None
+        for marker in PENDING_STATUS_MARKERS:
+            if marker in text_content:
+                logger.info(f"   ⏳ PIPELINE SKIP: Container {hash_id[:8]}... is {marker}")
+                return None
+
+        container = self.manager._find_container_by_hash_id(self.page, hash_id)
+        metadata = await extract_container_metadata_enhanced(container, text_content)
+
+        if FAILED_STATUS_MARKER in text_content:
+            await self._cleanup_failed(container, hash_id, metadata)
+            return None
+
+        if not metadata or not metadata.get('creation_time'):
+            logger.debug(f"   ⏭️ PIPELINE SKIP: Container {hash_id[:8]}... has no creation time metadata")
+            return None
+
+        creation_time = metadata['creation_time']
+        prompt = metadata.get('prompt', 'No prompt available')
+
+        if creation_time in self.queued_times:
+            logger.info(f"   ⏭️ PIPELINE SKIP: {creation_time} already queued this session")
+            return None
+
+        if self.config.duplicate_check_enabled:
+            is_duplicate = creation_time in self.existing_files or self.manager.check_duplicate_exists(creation_time, prompt)
+            if is_duplicate:
+                logger.info(f"🚨 PIPELINE DUPLICATE: {creation_time} - deleting duplicate")
+                await self.manager._delete_duplicate_generation(container, self.containers_processed, creation_time, hash_id)
+                return None
+
+        media_url = None
+        if self.config.direct_fetch_enabled:
+            media_url = await self.manager.media_fetcher.resolve_url(None, container)
+
+        self.queued_times.add(creation_time)
+        logger.info(f"   📥 PIPELINE QUEUED: {creation_time} (queue: {self.queue.qsize() + 1})")
+        return PipelineItem(sequence=-1, hash_id=hash_id, creation_time=creation_time, prompt=prompt,
+                            metadata=metadata, media_url=media_url)
+
+    async def _cleanup_failed(self, container, hash_id: str, metadata: Optional[Dict[str, str]]):
+        """Log a failed generation (in order) and delete its container"""
+        failed_time = metadata.get('creation_time') if metadata else None
+        if failed_time:
+            prefixed_prompt = f"FAILED!!!__{metadata.get('prompt', 'No prompt available')}"
+            await self.writer.submit(
+                self.writer.reserve(),
+                lambda: self.manager._add_failed_generation_to_log(failed_time, prefixed_prompt)
+            )
+        await self.manager._delete_failed_generation(container, self.containers_processed, failed_time or "UNKNOWN_TIME", hash_id)
+
+    async def _reveal(self, worker_page, container) -> bool:
+        """Scroll a worker page until the container is rendered"""
+        for _ in range(self.max_scroll_attempts):
+            if await container.count() and await container.is_visible():
+                return True
+            await self._scroll(worker_page)
+        return False
+
+    async def _work(self, worker_page, worker_id: int):
+        """Consumer: open, download, close and delete one queued container at a time"""
+        while True:
+            item = await self.queue.get()
+            QUEUE_DEPTH.labels(queue="pipeline").set(self.queue.qsize())
+            if item is None:
+                return
+
+            tracked = None
+            attempted = False
+            with trace_span("download_item", "download", worker=worker_id, creation_time=item.creation_time):
+                try:
+                    container = self.manager._find_container_by_hash_id(worker_page, item.hash_id)
+                    if item.media_url:
+                        # Fast path: no gallery, no download button; the worker only deletes afterwards
+                        attempted = True
+                        target = self.manager._skip_test_target_path(item.creation_time)
+                        async with self.inflight:
+                            fetched = await self.manager.media_fetcher.fetch(worker_page, item.media_url, target,
+                                                                             item.creation_time)
+                        if fetched.success:
+                            tracked = fetched
+                    if tracked is not None:
+                        if await self._reveal(worker_page, container):
+                            await self.manager._delete_downloaded_generation(worker_page, container, item.sequence, item.creation_time, item.hash_id)
+                    elif not await self._reveal(worker_page, container):
+                        logger.warning(f"   ⚠️ Worker {worker_id}: container {item.hash_id[:8]}... not found")
+                    else:
+                        with trace_span("click_container", "download"):
+                            await container.click()
+                        option, selected = await self.manager._open_download_options(worker_page, item.sequence)
+                        if option:
+                            attempted = True
+                            async with self.inflight:
+                                tracked = await self.manager._click_and_track_download(worker_page, option, selected, item.creation_time)
+                        await self.manager._close_gallery_view(worker_page)
+                        if tracked and tracked.success:
+                            await self.manager._delete_downloaded_generation(worker_page, container, item.sequence, item.creation_time, item.hash_id)
+                except Exception as e:
+                    logger.error(f"❌ Worker {worker_id}: error processing {item.creation_time}: {e}")
+
+            await self._finish(item, tracked, attempted)
+
+    async def _finish(self, item: PipelineItem, tracked, attempted: bool):
+        """Record the outcome and hand the log write to the ordered writer"""
+        if tracked and tracked.success:
+            self.downloads_completed += 1
+            logger.info(f"✅ PIPELINE: Downloaded {item.creation_time} ({self.downloads_completed}/{self.config.max_downloads})")
+            if self.downloads_completed >= self.config.max_downloads:
+                logger.info(f"🎯 Reached max downloads ({self.config.max_downloads}), stopping pipeline")
+                self._stop.set()
+                if self._scanner and not self._scanner.done():
+                    self._scanner.cancel()
+        else:
+            self.downloads_failed += 1
+            self.budget.release()
+
+        def write():
+            return self.manager._process_tracked_download(item.creation_time, item.prompt, tracked, item.hash_id)
+
+        await self.writer.submit(item.sequence, write if attempted else None)
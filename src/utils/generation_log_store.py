@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Generation Log Store
+Append-only storage for generation download log entries.
+
+Entries are appended to a JSON-lines journal and to a small on-disk index keyed
+by normalized creation time. The newest-first ``generation_downloads.txt`` file
+(``#ID / date / prompt / ====`` format) is treated as an export view: it is
+extended in place when a new entry sorts last and otherwise regenerated on
+demand, so logging a download no longer re-reads, re-sorts and rewrites the
+whole file.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LOG_SEPARATOR = "=" * 40
+PLACEHOLDER_ID = "#999999999"
+SORT_KEY_FORMAT = "%Y-%m-%d-%H-%M-%S"
+
+# Creation time formats seen in the gallery UI and in existing log files
+CREATION_TIME_FORMATS = [
+    "%d %b %Y %H:%M:%S",     # "24 Aug 2025 01:37:01"
+    "%Y-%m-%d %H:%M:%S",     # "2025-08-24 01:37:01"
+    "%Y-%m-%d-%H-%M-%S",     # "2025-08-24-01-37-01"
+    "%Y-%m-%d %H:%M",        # "2025-08-24 01:37"
+    "%d/%m/%Y %H:%M:%S",     # "24/08/2025 01:37:01"
+    "%m/%d/%Y %H:%M:%S",     # "08/24/2025 01:37:01"
+]
+
+
+def normalize_creation_time(creation_time: str) -> Optional[str]:
+    """Normalize a creation time string to ``YYYY-MM-DD-HH-MM-SS`` (None if unparseable)"""
+    if not creation_time:
+        return None
+
+    text = creation_time.strip()
+    for fmt in CREATION_TIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime(SORT_KEY_FORMAT)
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass
+class GenerationLogEntry:
+    """A single generation log entry"""
+    file_id: str
+    creation_time: str
+    prompt: str
+
+    @property
+    def sort_key(self) -> str:
+        """Normalized creation time used for ordering ('' sorts oldest)"""
+        return normalize_creation_time(self.creation_time) or ""
+
+    def to_text(self) -> str:
+        """Render the entry in the generation_downloads.txt format"""
+        return f"{self.file_id}\n{self.creation_time}\n{self.prompt}\n{LOG_SEPARATOR}\n"
+
+
+def split_log_preamble(content: str) -> Tuple[str, str]:
+    """Split off any summary header (e.g. from scripts/renumber_generation_ids.py)"""
+    position = 0
+    for line in content.splitlines(keepends=True):
+        if line.startswith('#'):
+            break
+        position += len(line)
+    return content[:position], content[position:]
+
+
+def parse_log_text(content: str) -> List[GenerationLogEntry]:
+    """Parse the text export format into entries (file order is preserved)"""
+    entries = []
+    for section in content.split(LOG_SEPARATOR):
+        lines = section.strip().split('\n')
+        if len(lines) < 3:
+            continue
+
+        file_id = lines[0].strip()
+        creation_time = lines[1].strip()
+        prompt = '\n'.join(lines[2:]).strip()
+        if file_id and creation_time:
+            entries.append(GenerationLogEntry(file_id, creation_time, prompt))
+    return entries
+
+
+class GenerationDuplicateIndex(dict):
+    """Session-wide duplicate lookup over logged generations
+
+    Behaves like the legacy ``existing_log_entries`` mapping (raw creation time ->
+    ``{'id', 'date', 'prompt'}``) and additionally keys every entry by normalized
+    creation time, so lookups are O(1) in any supported time format regardless
+    of how many generations have been logged. Duplicates are matched on creation
+    time alone: prompts shown on /generate are truncated versions of the logged
+    ones, so a prompt comparison would miss real duplicates.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._by_time: Dict[str, str] = {}
+
+    @staticmethod
+    def time_key(creation_time: str) -> str:
+        return normalize_creation_time(creation_time) or (creation_time or "").strip()
+
+    def add(self, file_id: str, creation_time: str, prompt: str):
+        """Record a logged generation (called as each download is logged)"""
+        if not creation_time:
+            return
+        time_key = self.time_key(creation_time)
+        self[creation_time] = {'id': file_id, 'date': creation_time, 'prompt': prompt}
+        self._by_time[time_key] = creation_time
+
+    def find(self, creation_time: str) -> Optional[Dict[str, str]]:
+        """Return the logged entry for a creation time in any supported format"""
+        entry = self.get(creation_time)
+        if entry is None and creation_time:
+            raw_key = self._by_time.get(self.time_key(creation_time))
+            entry = self.get(raw_key) if raw_key is not None else None
+        return entry
+
+    def contains_time(self, creation_time: str) -> bool:
+        return self.find(creation_time) is not None
+
+
+class GenerationLogStore:
+    """Append-only generation log with a creation-time index and a lazy text view"""
+
+    def __init__(self, log_file_path):
+        self.text_path = Path(log_file_path)
+        self.journal_path = self.text_path.with_suffix('.journal')
+        self.index_path = self.text_path.with_suffix('.idx')
+        self.state_path = self.text_path.with_suffix('.state.json')
+
+        # Sorted ascending by (sort_key, -sequence) so that reversing yields newest
+        # first with ties kept in insertion order.
+        self._index: List[Tuple[str, int, int]] = []
+        self._journal_size = 0
+        self._text_stale = False
+        self._text_signature: Optional[Tuple[int, int]] = None
+        self._preamble = ""
+        self._duplicate_index: Optional[GenerationDuplicateIndex] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self):
+        """Load lazily so constructing a store never touches the disk"""
+        if not self._loaded:
+            self._open()
+            self._loaded = True
+
+    def _open(self):
+        """Load the index, importing the legacy text file when no journal exists"""
+        if not self.journal_path.exists():
+            if self.text_path.parent.exists():
+                self._import_text_file()
+            return
+
+        self._load_index()
+        self._load_state()
+
+        if self._text_changed_externally():
+            logger.info(f"📄 {self.text_path.name} changed outside the log store - re-importing")
+            self._import_text_file()
+        elif not self.text_path.exists() and self._index:
+            self._text_stale = True
+
+    def _load_index(self):
+        """Read the on-disk index and index any journal records it is missing"""
+        self._index = []
+        indexed_until = 0
+
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t')
+                    if len(parts) != 2:
+                        continue
+                    offset = int(parts[1])
+                    self._index.append((parts[0], -len(self._index), offset))
+                    indexed_until = offset
+
+        self._journal_size = self.journal_path.stat().st_size
+
+        # Records written to the journal after the last index line (interrupted append)
+        if self._index:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(indexed_until)
+                indexed_until += len(f.readline())
+
+        if indexed_until < self._journal_size:
+            with open(self.journal_path, 'rb') as f, open(self.index_path, 'a', encoding='utf-8') as idx:
+                f.seek(indexed_until)
+                offset = indexed_until
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break
+                    record = json.loads(raw)
+                    sort_key = normalize_creation_time(record['time']) or ""
+                    idx.write(f"{sort_key}\t{offset}\n")
+                    self._index.append((sort_key, -len(self._index), offset))
+                    offset += len(raw)
+            logger.debug(f"Indexed journal tail of {self.journal_path.name}")
+
+        self._index.sort()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self._text_signature = tuple(state['text_signature']) if state.get('text_signature') else None
+            self._text_stale = bool(state.get('text_stale', False))
+            self._preamble = state.get('preamble', "")
+        except (OSError, ValueError, KeyError):
+            self._text_signature = None
+            self._text_stale = True
+
+    def _save_state(self):
+        state = {
+            'text_signature': list(self._text_signature) if self._text_signature else None,
+            'text_stale': self._text_stale,
+            'preamble': self._preamble,
+            'entries': len(self._index),
+        }
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+    def _current_text_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.text_path.stat()
+            return (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return None
+
+    def _text_changed_externally(self) -> bool:
+        current = self._current_text_signature()
+        return current is not None and current != self._text_signature
+
+    def _import_text_file(self):
+        """Rebuild journal and index from the text view (first run or external edit)"""
+        self._duplicate_index = None
+        entries = []
+        content = ""
+        if self.text_path.exists():
+            with open(self.text_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        self._preamble, body = split_log_preamble(content)
+        entries = parse_log_text(body)
+
+        with open(self.journal_path, 'wb') as journal, open(self.index_path, 'w', encoding='utf-8') as idx:
+            offset = 0
+            self._index = []
+            # The text file is newest first; journal order only decides ties
+            for entry in entries:
+                raw = self._encode(entry)
+                journal.write(raw)
+                idx.write(f"{entry.sort_key}\t{offset}\n")
+                self._index.append((entry.sort_key, -len(self._index), offset))
+                offset += len(raw)
+        self._journal_size = offset
+        self._index.sort()
+
+        self._text_signature = self._current_text_signature()
+        self._text_stale = False
+        self._save_state()
+
+        # Normalize the text view once if it held malformed sections
+        if self._preamble + ''.join(entry.to_text() for entry in entries) != content:
+            self.export_text()
+        if entries:
+            logger.info(f"📚 Imported {len(entries)} entries from {self.text_path.name}")
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode(entry: GenerationLogEntry) -> bytes:
+        record = {'id': entry.file_id, 'time': entry.creation_time, 'prompt': entry.prompt}
+        return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def append(self, file_id: str, creation_time: str, prompt: str) -> GenerationLogEntry:
+        """Append an entry; O(log n) index update plus constant-size writes"""
+        entry = GenerationLogEntry(file_id or PLACEHOLDER_ID, creation_time, prompt)
+
+        with self._lock:
+            self.refresh()
+            if not self.journal_path.exists():
+                self.text_path.parent.mkdir(parents=True, exist_ok=True)
+                self._import_text_file()
+
+            offset = self._journal_size
+            raw = self._encode(entry)
+            with open(self.journal_path, 'ab') as journal:
+                journal.write(raw)
+            self._journal_size += len(raw)
+
+            sort_key = entry.sort_key
+            with open(self.index_path, 'a', encoding='utf-8') as idx:
+                idx.write(f"{sort_key}\t{offset}\n")
+
+            item = (sort_key, -len(self._index), offset)
+            position = bisect.bisect_left(self._index, item)
+            self._index.insert(position, item)
+            if self._duplicate_index is not None:
+                self._duplicate_index.add(entry.file_id, entry.creation_time, entry.prompt)
+
+            # Oldest entry goes at the end of the newest-first text view: extend in place
+            if position == 0 and not self._text_stale:
+                with open(self.text_path, 'a', encoding='utf-8') as f:
+                    f.write(entry.to_text())
+                self._text_signature = self._current_text_signature()
+            else:
+                self._text_stale = True
+            self._save_state()
+
+        return entry
+
+    def refresh(self):
+        """Re-import the text view if another tool (e.g. the renumber script) rewrote it"""
+        with self._lock:
+            self._ensure_loaded()
+            if self._text_changed_externally():
+                logger.info(f"📄 {self.text_path.name} changed outside the log store - re-importing")
+                self._import_text_file()
+
+    def export_text(self, path=None) -> Path:
+        """Write the newest-first text view to ``path`` (defaults to the log file)"""
+        with self._lock:
+            self._ensure_loaded()
+            target = Path(path) if path else self.text_path
+            tmp_path = target.with_name(target.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self._preamble)
+                for entry in self.iter_entries():
+                    f.write(entry.to_text())
+            os.replace(tmp_path, target)
+
+            if target == self.text_path:
+                self._text_signature = self._current_text_signature()
+                self._text_stale = False
+                self._save_state()
+                logger.debug(f"Exported {len(self._index)} entries to {target.name}")
+            return target
+
+    def flush(self) -> bool:
+        """Bring the text view up to date if entries were inserted out of order"""
+        with self._lock:
+            self._ensure_loaded()
+            if not self._text_stale:
+                return False
+            self.export_text()
+            return True
+
+    @property
+    def duplicate_index(self) -> GenerationDuplicateIndex:
+        """Duplicate index built once from the journal and kept current by append()"""
+        with self._lock:
+            self.refresh()
+            if self._duplicate_index is None:
+                index = GenerationDuplicateIndex()
+                # Oldest first, so the newest entry wins for a repeated creation time
+                for entry in reversed(list(self.iter_entries())):
+                    index.add(entry.file_id, entry.creation_time, entry.prompt)
+                self._duplicate_index = index
+                logger.debug(f"Built duplicate index with {len(index)} entries")
+            return self._duplicate_index
+
+    @property
+    def text_stale(self) -> bool:
+        self._ensure_loaded()
+        return self._text_stale
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._index)
+
+    def _read_records(self) -> Dict[int, dict]:
+        records = {}
+        if not self.journal_path.exists():
+            return records
+        with open(self.journal_path, 'rb') as f:
+            offset = 0
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break
+                records[offset] = json.loads(raw)
+                offset += len(raw)
+        return records
+
+    @staticmethod
+    def _to_entry(record: dict) -> GenerationLogEntry:
+        return GenerationLogEntry(record['id'], record['time'], record['prompt'])
+
+    def iter_entries(self) -> Iterator[GenerationLogEntry]:
+        """Iterate entries newest first (single sequential journal read)"""
+        with self._lock:
+            self._ensure_loaded()
+            records = self._read_records()
+            index = list(self._index)
+        for _, _, offset in reversed(index):
+            record = records.get(offset)
+            if record is not None:
+                yield self._to_entry(record)
+
+    def entries(self) -> List[GenerationLogEntry]:
+        self.refresh()
+        return list(self.iter_entries())
+
+    def newest(self) -> Optional[GenerationLogEntry]:
+        """Return the newest entry by creation time using a single seek"""
+        with self._lock:
+            self.refresh()
+            if not self._index:
+                return None
+            offset = self._index[-1][2]
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                return self._to_entry(json.loads(f.readline()))
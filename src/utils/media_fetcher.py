@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Media Fetcher
+Direct HTTP fetch of generation media, skipping the download-button UI.
+
+Clicking through the download icon and the "Download without Watermark"
+option costs several round trips and waits per item before the browser even
+starts the file. When the media URL is already in the DOM - on the generation
+container, or in the opened gallery panel around the download icon - the
+file can be fetched through the browser context's ``APIRequestContext``
+(``context.request``), which shares the session cookies and keeps its
+connections pooled. Fetches are bounded by a semaphore, so several can run
+at once. Each one is written to a ``.part`` file off the event loop and
+renamed to the final filename when complete.
+
+Callers fall back to the click path whenever no URL resolves or a fetch
+fails; the result is a ``TrackedDownload`` either way.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+from urllib.parse import urlparse
+
+from .download_tracker import TrackedDownload
+from .metrics_registry import DIRECT_FETCHES
+from .span_tracer import trace_span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEDIA_URL_SELECTORS = ("a[download][href]", "video source[src]", "video[src]")
+
+# How far above the download icon the gallery panel's media element may sit
+GALLERY_ANCESTOR_DEPTH = 8
+
+# First usable media URL under ``root``; blob:/data: URLs cannot be fetched
+MEDIA_URL_SCRIPT = """
+(root, selectors) => {
+    for (const selector of selectors) {
+        for (const el of root.querySelectorAll(selector)) {
+            const raw = el.getAttribute('href') || el.getAttribute('src') || el.currentSrc || '';
+            if (!raw || raw === '#' || raw.startsWith('blob:') || raw.startsWith('data:')) continue;
+            try { return new URL(raw, document.baseURI).href; } catch (e) {}
+        }
+    }
+    return null;
+}
+"""
+
+# Media URL of the opened gallery item: nearest ancestor of the download icon holding one
+GALLERY_MEDIA_URL_SCRIPT = f"""
+([selectors, anchorSelector, maxDepth]) => {{
+    const find = {MEDIA_URL_SCRIPT};
+    let el = document.querySelector(anchorSelector);
+    for (let depth = 0; el && depth < maxDepth; depth++, el = el.parentElement) {{
+        const url = find(el, selectors);
+        if (url) return url;
+    }}
+    return null;
+}}
+"""
+
+
+def _write_atomically(target: Path, body: bytes):
+    """Write ``body`` next to ``target`` and rename it into place"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(target.name + ".part")
+    with open(partial, 'wb') as f:
+        f.write(body)
+    os.replace(partial, target)
+
+
+class DirectMediaFetcher:
+    """Resolves media URLs from the DOM and fetches them over the context's request API"""
+
+    def __init__(self, concurrency: int = 3, timeout_ms: int = 120000,
+                 url_selectors: Sequence[str] = DEFAULT_MEDIA_URL_SELECTORS,
+                 gallery_anchor_selector: str = "svg use[href*='xiazai']"):
+        self.timeout_ms = timeout_ms
+        self.url_selectors = list(url_selectors)
+        self.gallery_anchor_selector = gallery_anchor_selector
+        self.concurrency = max(1, concurrency)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.fetched = 0
+        self.failed = 0
+        self.unresolved = 0
+        self.bytes_fetched = 0
+
+    async def resolve_url(self, page, container=None) -> Optional[str]:
+        """Media URL from the container, else from the opened gallery panel"""
+        if container is not None:
+            try:
+                url = await container.evaluate(MEDIA_URL_SCRIPT, self.url_selectors)
+                if url:
+                    return url
+            except Exception as e:
+                logger.debug(f"Container media URL lookup failed: {e}")
+        if page is not None:
+            try:
+                url = await page.evaluate(GALLERY_MEDIA_URL_SCRIPT,
+                                          [self.url_selectors, self.gallery_anchor_selector, GALLERY_ANCESTOR_DEPTH])
+                if url:
+                    return url
+            except Exception as e:
+                logger.debug(f"Gallery media URL lookup failed: {e}")
+        return None
+
+    async def fetch(self, page, url: str, target_path: Path, key: str) -> TrackedDownload:
+        """Fetch ``url`` with the page's context cookies and save it as ``target_path``"""
+        target_path = Path(target_path)
+        started = time.time()
+        result = TrackedDownload(key=key, path=None, size=0,
+                                 suggested_filename=Path(urlparse(url).path).name or target_path.name, url=url)
+        if self._slots is None:
+            # Created on first use so it binds to the running event loop
+            self._slots = asyncio.Semaphore(self.concurrency)
+        async with self._slots:
+            with trace_span("direct_fetch", "download", key=key) as span:
+                response = None
+                try:
+                    response = await page.context.request.get(url, timeout=self.timeout_ms)
+                    if not response.ok:
+                        raise RuntimeError(f"HTTP {response.status}")
+                    content_type = response.headers.get("content-type", "")
+                    if content_type.startswith("text/"):
+                        # A login or error page instead of the media file
+                        raise RuntimeError(f"unexpected content type '{content_type}'")
+                    body = await response.body()
+                    if not body:
+                        raise RuntimeError("empty response body")
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, _write_atomically, target_path, body)
+                    result.path = target_path
+                    result.size = len(body)
+                    span.set(size=result.size)
+                except Exception as e:
+                    result.error = str(e)
+                    span.set(error=type(e).__name__)
+                finally:
+                    if response is not None:
+                        try:
+                            await response.dispose()
+                        except Exception:
+                            pass
+        result.duration = time.time() - started
+
+        if result.success:
+            self.fetched += 1
+            self.bytes_fetched += result.size
+            DIRECT_FETCHES.labels(outcome="fetched").inc()
+            logger.info(f"⚡ Direct fetch: {target_path.name} ({result.size} bytes, {result.duration:.1f}s)")
+        else:
+            self.failed += 1
+            DIRECT_FETCHES.labels(outcome="failed").inc()
+            logger.warning(f"⚠️ Direct fetch failed for {key}: {result.error} - falling back to the download button")
+        return result
+
+    async def try_fetch(self, page, key: str, target_path: Path, container=None) -> Optional[TrackedDownload]:
+        """Resolve and fetch; None when the caller should use the click path"""
+        url = await self.resolve_url(page, container)
+        if not url:
+            self.unresolved += 1
+            DIRECT_FETCHES.labels(outcome="unresolved").inc()
+            logger.debug(f"No media URL in the DOM for {key} - using the download button")
+            return None
+        tracked = await self.fetch(page, url, target_path, key)
+        return tracked if tracked.success else None
+
+    def get_stats(self) -> dict:
+        return {
+            'fetched': self.fetched,
+            'failed': self.failed,
+            'unresolved': self.unresolved,
+            'bytes_fetched': self.bytes_fetched,
+        }
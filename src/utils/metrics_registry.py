@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Metrics Registry
+Fixed-memory counters, gauges and latency histograms with a Prometheus view.
+
+Every metric has a bounded footprint no matter how long the process runs:
+histograms are HDR-style log-linear bucket arrays (16 sub-buckets per power
+of two, so any recorded latency is within ~6% of its bucket), and rates use
+a fixed ring of time slots. Process memory and CPU are read by a background
+``ResourceSampler`` thread, so the action path never calls psutil.
+
+``start_metrics_server`` serves the registry in Prometheus text format on a
+local port for long-running CLI and scheduler hosts.
+"""
+
+import bisect
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Prometheus ``le`` boundaries (seconds) reported for every histogram
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    """Monotonically increasing value"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def get(self) -> float:
+        return self.value
+
+
+class Gauge:
+    """Value that goes up and down, or is read from a callback"""
+
+    __slots__ = ("value", "_function")
+
+    def __init__(self):
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from ``function`` whenever the gauge is collected"""
+        self._function = function
+
+    def get(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class Histogram:
+    """HDR-style latency histogram over integer microseconds
+
+    Values below 32us get exact buckets; above that each power of two is split
+    into 16 linear sub-buckets. 544 counters cover 1us to ~19 hours.
+    """
+
+    SUB_BUCKET_BITS = 4
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    MAX_SHIFT = 32
+    BUCKET_COUNT = (MAX_SHIFT + 2) * SUB_BUCKETS
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @classmethod
+    def bucket_index(cls, micros: int) -> int:
+        if micros < 2 * cls.SUB_BUCKETS:
+            return max(micros, 0)
+        shift = micros.bit_length() - (cls.SUB_BUCKET_BITS + 1)
+        if shift > cls.MAX_SHIFT:
+            return cls.BUCKET_COUNT - 1
+        return (shift + 1) * cls.SUB_BUCKETS + (micros >> shift) - cls.SUB_BUCKETS
+
+    @classmethod
+    def bucket_bounds(cls, index: int) -> Tuple[int, int]:
+        """[lower, upper) microseconds covered by a bucket"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index, index + 1
+        shift = index // cls.SUB_BUCKETS - 1
+        mantissa = cls.SUB_BUCKETS + index % cls.SUB_BUCKETS
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def observe(self, seconds: float):
+        seconds = max(seconds, 0.0)
+        self.counts[self.bucket_index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q`` quantile in seconds (0 with no observations)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                lower, upper = self.bucket_bounds(index)
+                value = (lower + upper) / 2 / 1_000_000
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def cumulative_buckets(self, boundaries: Sequence[float] = DEFAULT_BUCKETS) -> List[Tuple[float, int]]:
+        """(le, count of observations <= le) for Prometheus exposition"""
+        limits = [int(boundary * 1_000_000) for boundary in boundaries]
+        totals = [0] * len(limits)
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                position = bisect.bisect_left(limits, self.bucket_bounds(index)[0])
+                if position < len(totals):
+                    totals[position] += bucket_count
+        cumulative, running = [], 0
+        for boundary, total in zip(boundaries, totals):
+            running += total
+            cumulative.append((boundary, running))
+        return cumulative
+
+    def get(self) -> float:
+        return float(self.count)
+
+
+class RateWindow:
+    """Events per minute over a sliding window kept in a fixed ring of slots"""
+
+    def __init__(self, window_seconds: float = 300.0, slots: int = 30, clock: Callable[[], float] = time.monotonic):
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / slots
+        self.clock = clock
+        self.started = clock()
+        self._counts = [0] * slots
+        self._slot_ids = [-1] * slots
+
+    def mark(self, count: int = 1):
+        slot_id = int(self.clock() // self.slot_seconds)
+        position = slot_id % len(self._counts)
+        if self._slot_ids[position] != slot_id:
+            self._slot_ids[position] = slot_id
+            self._counts[position] = 0
+        self._counts[position] += count
+
+    def per_minute(self) -> float:
+        now = self.clock()
+        oldest = int(now // self.slot_seconds) - len(self._counts) + 1
+        total = sum(count for count, slot_id in zip(self._counts, self._slot_ids) if slot_id >= oldest)
+        elapsed = min(self.window_seconds, max(now - self.started, self.slot_seconds))
+        return total * 60.0 / elapsed
+
+
+class MetricFamily:
+    """A named metric and its children, one per label-value combination"""
+
+    def __init__(self, name: str, help_text: str, kind: str, label_names: Sequence[str], factory):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return list(self._children.items())
+
+    # Unlabelled families act as their single child
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self.labels().set_function(function)
+
+    def observe(self, seconds: float):
+        self.labels().observe(seconds)
+
+    def get(self) -> float:
+        return self.labels().get()
+
+
+class MetricsRegistry:
+    """Get-or-create store of metric families"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, help_text: str, kind: str, labels: Sequence[str], factory) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = MetricFamily(name, help_text, kind, labels, factory)
+                self._families[name] = family
+            elif family.kind != kind:
+                raise ValueError(f"Metric {name} already registered as a {family.kind}")
+            return family
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> MetricFamily:
+        return self._family(name, help_text, "counter", labels, Counter)
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> MetricFamily:
+        return self._family(name, help_text, "gauge", labels, Gauge)
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = ()) -> MetricFamily:
+        return self._family(name, help_text, "histogram", labels, Histogram)
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+
+    def render_prometheus(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda family: family.name)
+        lines = []
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for key, child in sorted(family.children()):
+                labels = list(zip(family.label_names, key))
+                if family.kind == "histogram":
+                    for boundary, cumulative in child.cumulative_buckets():
+                        lines.append(f"{family.name}_bucket{_format_labels(labels + [('le', _format_value(boundary))])} {cumulative}")
+                    lines.append(f"{family.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {child.count}")
+                    lines.append(f"{family.name}_sum{_format_labels(labels)} {_format_value(child.sum)}")
+                    lines.append(f"{family.name}_count{_format_labels(labels)} {child.count}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(child.get())}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return str(int(value))
+    return repr(value)
+
+
+class ResourceSampler:
+    """Background thread that samples process RSS and CPU into gauges"""
+
+    def __init__(self, registry: "MetricsRegistry" = None, interval: float = 5.0):
+        registry = registry or metrics_registry
+        self.interval = interval
+        self.rss_bytes = registry.gauge("automaton_process_resident_memory_bytes", "Resident memory of the automation process")
+        self.cpu_percent = registry.gauge("automaton_process_cpu_percent", "CPU use of the automation process")
+        self.latest_rss_mb = 0.0
+        self.latest_cpu_percent = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = None
+
+    def _load_process(self):
+        """psutil is imported on first sample so it stays off the startup path"""
+        if self._process is None:
+            try:
+                import psutil
+            except ImportError:
+                return None
+            self._process = psutil.Process()
+        return self._process
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def sample(self):
+        process = self._load_process()
+        if process is None:
+            return
+        try:
+            rss = process.memory_info().rss
+            cpu = process.cpu_percent(interval=None)
+        except Exception as e:
+            logger.debug(f"Resource sample failed: {e}")
+            return
+        self.latest_rss_mb = rss / 1024 / 1024
+        self.latest_cpu_percent = cpu
+        self.rss_bytes.set(rss)
+        self.cpu_percent.set(cpu)
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+        if self._load_process() is None:
+            logger.warning("⚠️ psutil not available - resource sampling disabled")
+            return False
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+class MetricsServer:
+    """Local HTTP endpoint serving ``/metrics`` from a registry"""
+
+    def __init__(self, registry: "MetricsRegistry" = None, port: int = 9464, host: str = "127.0.0.1"):
+        from http.server import ThreadingHTTPServer
+
+        self.registry = registry or metrics_registry
+        handler = self._handler_class(self.registry)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server", daemon=True)
+
+    @staticmethod
+    def _handler_class(registry: "MetricsRegistry"):
+        from http.server import BaseHTTPRequestHandler
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+        return Handler
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        logger.info(f"📈 Metrics endpoint: {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Global registry instance
+metrics_registry = MetricsRegistry()
+
+# Well-known automation metrics
+ACTION_DURATION = metrics_registry.histogram(
+    "automaton_action_duration_seconds", "Duration of automation actions", ("action",))
+ACTIONS = metrics_registry.counter(
+    "automaton_actions_total", "Automation actions executed", ("action", "status"))
+DOWNLOADS = metrics_registry.counter(
+    "automaton_downloads_total", "Generation downloads by outcome", ("status",))
+DOWNLOAD_RATE = RateWindow()
+metrics_registry.gauge(
+    "automaton_downloads_per_minute", "Successful downloads per minute over the last 5 minutes"
+).set_function(DOWNLOAD_RATE.per_minute)
+SCROLL_STEPS = metrics_registry.counter(
+    "automaton_scroll_steps_total", "Gallery scroll steps performed")
+DUPLICATE_HITS = metrics_registry.counter(
+    "automaton_duplicate_hits_total", "Generations found already logged")
+QUEUE_DEPTH = metrics_registry.gauge(
+    "automaton_queue_depth", "Items waiting in a work queue", ("queue",))
+BLOCKED_REQUESTS = metrics_registry.counter(
+    "automaton_blocked_requests_total", "Requests aborted by a network profile", ("profile",))
+BLOCKED_BYTES = metrics_registry.counter(
+    "automaton_blocked_bytes_total", "Estimated bytes not fetched because of a network profile", ("profile",))
+DIRECT_FETCHES = metrics_registry.counter(
+    "automaton_direct_fetches_total", "Direct media fetches by outcome (fetched, failed, unresolved)", ("outcome",))
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the global metrics registry"""
+    return metrics_registry
+
+
+def record_download(success: bool):
+    """Count a finished download and feed the downloads/min window"""
+    DOWNLOADS.labels(status="success" if success else "failed").inc()
+    if success:
+        DOWNLOAD_RATE.mark()
+
+
+_resource_sampler: Optional[ResourceSampler] = None
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """Shared background sampler for the global registry"""
+    global _resource_sampler
+    if _resource_sampler is None:
+        _resource_sampler = ResourceSampler(metrics_registry)
+    return _resource_sampler
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = None) -> MetricsServer:
+    """Serve metrics on ``host:port`` and start the resource sampler"""
+    if registry is None:
+        get_resource_sampler().start()
+    return MetricsServer(registry, port=port, host=host).start()
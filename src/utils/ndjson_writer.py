@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+NDJSON Writer
+Append-only, newline-delimited JSON logging with a background writer.
+
+Records are serialized in the caller (so later mutation of the source dict
+cannot change what was logged) and handed to a writer thread that appends
+them in batches, flushes after each batch and rotates the file once it grows
+past ``max_bytes``. Writing a record costs one ``json.dumps`` of that
+record, independent of how much has been logged before.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class NDJSONWriter:
+    """Buffered background writer for one NDJSON file with size-based rotation"""
+
+    def __init__(self, path, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 3,
+                 batch_size: int = 256):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.records_written = 0
+        self.rotations = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._file = None
+
+    def write(self, record: Dict[str, Any]):
+        """Queue one record for appending"""
+        try:
+            line = json.dumps(record, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error serializing debug record: {e}")
+            return
+        self._ensure_started()
+        self._queue.put(line)
+
+    def flush(self):
+        """Block until every queued record has been written and flushed"""
+        if self._thread is None:
+            return
+        self._queue.join()
+
+    def close(self):
+        """Flush outstanding records and stop the writer thread"""
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+            self._thread = None
+        thread.join()
+        atexit.unregister(self.close)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name=f"ndjson-{self.path.name}", daemon=True)
+                self._thread.start()
+                # Do not lose buffered records if the process exits without close()
+                atexit.register(self.close)
+
+    def _run(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        try:
+            while True:
+                batch: List[str] = []
+                stop = False
+                item = self._queue.get()
+                # Drain whatever else is queued into the same batch
+                while True:
+                    if item is _STOP:
+                        stop = True
+                    else:
+                        batch.append(item)
+                    if stop or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                try:
+                    if batch:
+                        self._write_batch(batch)
+                    self._file.flush()
+                except Exception as e:
+                    logger.error(f"Error writing debug records to {self.path}: {e}")
+                finally:
+                    for _ in range(len(batch) + (1 if stop else 0)):
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            self._file.close()
+            self._file = None
+
+    def _write_batch(self, batch: List[str]):
+        for line in batch:
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._file.write("\n")
+        self.records_written += len(batch)
+
+    def _rotate(self):
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest backup"""
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = rotated_path(self.path, index)
+                if source.exists():
+                    os.replace(source, rotated_path(self.path, index + 1))
+            os.replace(self.path, rotated_path(self.path, 1))
+        else:
+            self.path.unlink()
+        self.rotations += 1
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+
+def rotated_path(path: Path, index: int) -> Path:
+    """Path of the ``index``-th rotated backup of an NDJSON file"""
+    return path.with_name(f"{path.name}.{index}")
+
+
+def read_ndjson(path, include_rotated: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield records oldest first, skipping malformed lines (e.g. a torn final write)"""
+    path = Path(path)
+    files = []
+    if include_rotated:
+        index = 1
+        while rotated_path(path, index).exists():
+            files.append(rotated_path(path, index))
+            index += 1
+        files.reverse()
+    if path.exists():
+        files.append(path)
+
+    for file_path in files:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.debug(f"Skipping malformed record {file_path}:{line_number}")
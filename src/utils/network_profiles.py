@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Network Profiles
+Request-interception profiles that keep the browser from fetching what a
+phase never looks at.
+
+Gallery scanning, boundary search and thumbnail browsing only read text and
+ids, yet every scroll step pulls in preview images, video posters, fonts and
+analytics beacons. A ``RequestBlocker`` routes the requests of one page or
+browser context through the active ``NetworkProfile`` and aborts the resource
+types and tracker hosts it blocks. Profiles are switched per phase ("scan"
+while scrolling, "download" while clicking through to a file, "full" for
+everything), and each profile keeps counts of blocked requests and an
+estimate of the bytes they would have cost.
+
+Playwright disables the HTTP cache of a page while it has routes, so the
+"full" profile removes the route instead of passing every request through.
+"""
+
+import asyncio
+import functools
+import logging
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from .metrics_registry import BLOCKED_BYTES, BLOCKED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Hosts and paths of analytics/telemetry beacons (matched as URL substrings)
+TRACKER_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "clarity.ms",
+    "hotjar.com",
+    "sentry.io",
+    "segment.io",
+    "mixpanel.com",
+    "mmstat.com",
+    "arms-retcode",
+    "/alilog/",
+)
+
+# Transfer size assumed for a blocked request until responses of its type were seen
+DEFAULT_RESOURCE_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "tracker": 1_000,
+}
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """Resource types and URL patterns a phase does not need"""
+    name: str
+    blocked_resource_types: FrozenSet[str] = frozenset()
+    blocked_url_patterns: Tuple[str, ...] = ()
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_url_patterns)
+
+    def block_reason(self, resource_type: str, url: str) -> Optional[str]:
+        """Resource type (or "tracker") the request is blocked as, None when allowed"""
+        if any(pattern in url for pattern in self.blocked_url_patterns):
+            return "tracker"
+        if resource_type in self.blocked_resource_types:
+            return resource_type
+        return None
+
+
+NETWORK_PROFILES: Dict[str, NetworkProfile] = {
+    "full": NetworkProfile("full"),
+    "scan": NetworkProfile("scan", frozenset({"image", "media", "font"}), TRACKER_PATTERNS),
+    "download": NetworkProfile("download", frozenset({"font"}), TRACKER_PATTERNS),
+}
+
+
+def get_network_profile(name: str) -> NetworkProfile:
+    """Look up a profile by name"""
+    try:
+        return NETWORK_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown network profile '{name}' (available: {', '.join(NETWORK_PROFILES)})")
+
+
+@dataclass
+class ProfileStats:
+    """Requests seen while one profile was active"""
+    allowed_requests: int = 0
+    blocked_requests: int = 0
+    bytes_saved_estimate: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+
+class RequestBlocker:
+    """Applies network profiles to one page or browser context"""
+
+    def __init__(self, target, profile: str = "full"):
+        self.target = target
+        self.profile = get_network_profile(profile)
+        self.stats: Dict[str, ProfileStats] = {}
+        self._routed = False
+        self._listening = False
+        self._lock = asyncio.Lock()
+        # Running transfer size per resource type from responses that were let through
+        self._seen_bytes: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def profile_name(self) -> str:
+        return self.profile.name
+
+    async def set_profile(self, name: str) -> str:
+        """Activate a profile; returns the name of the previously active one"""
+        profile = get_network_profile(name)
+        async with self._lock:
+            previous = self.profile.name
+            needs_route = profile.blocks_anything or self._overrides_context()
+            try:
+                if needs_route and not self._routed:
+                    await self.target.route("**/*", self._handle_route)
+                    self._routed = True
+                elif not needs_route and self._routed:
+                    await self.target.unroute("**/*", self._handle_route)
+                    self._routed = False
+            except Exception as e:
+                logger.warning(f"Could not apply network profile '{profile.name}': {e}")
+                return previous
+            self.profile = profile
+            self.stats.setdefault(profile.name, ProfileStats())
+            if not self._listening:
+                self._listen()
+        if previous != profile.name:
+            logger.debug(f"🌐 Network profile: {previous} → {profile.name}")
+        return previous
+
+    async def detach(self):
+        """Remove the route and stop listening (e.g. before a pooled context is reused)"""
+        async with self._lock:
+            if self._routed:
+                try:
+                    await self.target.unroute("**/*", self._handle_route)
+                except Exception:
+                    pass
+                self._routed = False
+            if self._listening:
+                try:
+                    self.target.remove_listener("response", self._on_response)
+                except Exception:
+                    pass
+                self._listening = False
+            self.profile = NETWORK_PROFILES["full"]
+
+    def _overrides_context(self) -> bool:
+        """A page must keep its route to let through what its context's profile blocks"""
+        context = getattr(self.target, "context", None)
+        if context is None or context is self.target:
+            return False
+        parent = _blockers.get(context)
+        return parent is not None and parent.profile.blocks_anything
+
+    def _listen(self):
+        try:
+            self.target.on("response", self._on_response)
+            self._listening = True
+        except Exception as e:
+            logger.debug(f"Could not listen for responses: {e}")
+
+    async def _handle_route(self, route):
+        request = route.request
+        profile = self.profile
+        stats = self.stats.setdefault(profile.name, ProfileStats())
+        reason = profile.block_reason(request.resource_type, request.url)
+        try:
+            if reason is None:
+                stats.allowed_requests += 1
+                await route.continue_()
+                return
+            stats.blocked_requests += 1
+            stats.blocked_by_type[reason] = stats.blocked_by_type.get(reason, 0) + 1
+            saved = self.estimated_size(reason)
+            stats.bytes_saved_estimate += saved
+            BLOCKED_REQUESTS.labels(profile=profile.name).inc()
+            BLOCKED_BYTES.labels(profile=profile.name).inc(saved)
+            await route.abort("blockedbyclient")
+        except Exception as e:
+            # Page closed or the request was already handled
+            logger.debug(f"Route handling failed for {request.url}: {e}")
+
+    def _on_response(self, response):
+        try:
+            length = response.headers.get("content-length")
+            if not length:
+                return
+            resource_type = response.request.resource_type
+            if any(pattern in response.url for pattern in TRACKER_PATTERNS):
+                resource_type = "tracker"
+            count, total = self._seen_bytes.get(resource_type, (0, 0))
+            self._seen_bytes[resource_type] = (count + 1, total + int(length))
+        except Exception:
+            pass
+
+    def estimated_size(self, resource_type: str) -> int:
+        """Average seen transfer size for a resource type, or its default"""
+        count, total = self._seen_bytes.get(resource_type, (0, 0))
+        if count:
+            return total // count
+        return DEFAULT_RESOURCE_BYTES.get(resource_type, 10_000)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-profile request counts and estimated bytes saved"""
+        return {
+            name: {
+                "allowed_requests": stats.allowed_requests,
+                "blocked_requests": stats.blocked_requests,
+                "bytes_saved_estimate": stats.bytes_saved_estimate,
+                "blocked_by_type": dict(stats.blocked_by_type),
+            }
+            for name, stats in self.stats.items()
+        }
+
+
+# One blocker per page/context, so every phase switches the same route
+_blockers: "weakref.WeakKeyDictionary[Any, RequestBlocker]" = weakref.WeakKeyDictionary()
+
+
+def get_request_blocker(target) -> RequestBlocker:
+    """The request blocker of a page or browser context, created on first use"""
+    blocker = _blockers.get(target)
+    if blocker is None:
+        blocker = RequestBlocker(target)
+        _blockers[target] = blocker
+    return blocker
+
+
+def network_phase(config_attr: str):
+    """Decorator running ``method(self, page, ...)`` under the profile named by ``self.config.<config_attr>``
+
+    The page's previous profile is restored afterwards, so a scan step nested
+    in a download (or the reverse) switches back when it returns. A profile
+    of None leaves the page's routing untouched.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, page, *args, **kwargs):
+            profile = getattr(self.config, config_attr, None)
+            previous = await apply_network_profile(page, profile, getattr(self, "network_blockers", None))
+            try:
+                return await func(self, page, *args, **kwargs)
+            finally:
+                if previous is not None and previous != profile:
+                    await get_request_blocker(page).set_profile(previous)
+        return wrapper
+    return decorator
+
+
+async def apply_network_profile(target, profile: Optional[str], blockers: Optional[list] = None) -> Optional[str]:
+    """Switch a page/context to ``profile``; returns the previous profile (None when nothing was done)
+
+    ``blockers`` collects every blocker touched so a caller can report on all
+    of its pages after they are closed.
+    """
+    if not profile or target is None or not hasattr(target, "route"):
+        return None
+    blocker = get_request_blocker(target)
+    if blockers is not None and blocker not in blockers:
+        blockers.append(blocker)
+    return await blocker.set_profile(profile)
+
+
+def report_for(*targets) -> Dict[str, Dict[str, Any]]:
+    """Merged per-profile report of the blockers attached to the given pages/contexts"""
+    return merge_reports(*(_blockers[target].report() for target in targets
+                           if target is not None and target in _blockers))
+
+
+def merge_reports(*reports: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Sum per-profile reports of several blockers (scan page, worker pages, context)"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for report in reports:
+        for name, stats in report.items():
+            entry = merged.setdefault(name, {"allowed_requests": 0, "blocked_requests": 0,
+                                             "bytes_saved_estimate": 0, "blocked_by_type": {}})
+            entry["allowed_requests"] += stats["allowed_requests"]
+            entry["blocked_requests"] += stats["blocked_requests"]
+            entry["bytes_saved_estimate"] += stats["bytes_saved_estimate"]
+            for resource_type, count in stats["blocked_by_type"].items():
+                entry["blocked_by_type"][resource_type] = entry["blocked_by_type"].get(resource_type, 0) + count
+    return merged
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    """One log line per profile"""
+    lines = []
+    for name, stats in report.items():
+        saved_mb = stats["bytes_saved_estimate"] / 1024 / 1024
+        lines.append(f"🌐 Network profile '{name}': {stats['blocked_requests']} requests blocked "
+                     f"(~{saved_mb:.1f} MB saved), {stats['allowed_requests']} allowed")
+    return "\n".join(lines)
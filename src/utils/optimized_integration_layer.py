@@ -526,20 +526,10 @@ class OptimizedMetadataExtractor:
             task_ids.append(task_id)
         
         # Wait for results
-        results = []
         max_wait_time = config.get('timeout', 300)  # 5 minutes default
-        start_time = time.time()
-        
-        while len(results) < len(task_ids) and (time.time() - start_time) < max_wait_time:
-            for task_id in task_ids:
-                if task_id not in [r.get('task_id') for r in results]:
-                    result = await self.scalable_engine.get_task_result(task_id)
-                    if result:
-                        results.append(result)
-            
-            await asyncio.sleep(0.5)  # Brief pause between checks
+        results_by_id = await self.scalable_engine.wait_for_tasks(task_ids, timeout=max_wait_time)
         
-        return results
+        return [result for result in results_by_id.values() if result]
     
     async def _extract_batch_concurrent(self, pages: List[Any], 
                                       config: Dict[str, Any]) -> List[Dict[str, Any]]:
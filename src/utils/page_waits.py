@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Page Waits
+Named, condition-based waits for the generation download path.
+
+Each named wait resolves as soon as its page condition holds (an element
+rendered, an overlay gone) instead of sleeping a fixed time. Its timeout
+budget is the learned p95 of past completions for that operation on the
+current site, kept by ``AdaptiveTimeoutManager`` and persisted between runs;
+until enough timings are known the budget is the fixed delay the wait replaced.
+
+A condition can also carry a probe, a script that reads a value off the page
+(for the metadata panel, the creation time it shows). After a thumbnail or
+container switch the previous item's panel is still on screen, so the panel
+being visible says nothing; ``wait_for_change`` instead waits for the probed
+value to differ from the one read before the click.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from .adaptive_timeout_manager import AdaptiveTimeoutManager, site_key
+from .span_tracer import trace_span
+
+logger = logging.getLogger(__name__)
+
+# Text of the value next to a label span (e.g. the creation time beside "Creation Time"), or null
+LABELED_VALUE_PROBE = """(label) => {
+    for (const span of document.querySelectorAll('span')) {
+        if (span.textContent.trim() === label) {
+            const value = span.nextElementSibling;
+            return value ? value.textContent.trim() : null;
+        }
+    }
+    return null;
+}"""
+
+
+@dataclass(frozen=True)
+class WaitCondition:
+    """A page condition: ``selector`` reaching ``state`` (Playwright wait_for_selector states)
+
+    ``probe`` (called with ``probe_arg``) reads the value ``wait_for_change`` compares.
+    """
+    name: str
+    selector: str
+    state: str = "visible"
+    default_timeout: float = 2.0
+    probe: Optional[str] = None
+    probe_arg: Optional[str] = None
+
+
+def download_wait_conditions(config) -> Dict[str, WaitCondition]:
+    """Named waits used on the per-item download path, built from the download config"""
+    conditions = [
+        WaitCondition("metadata_panel_loaded", f"text={config.creation_time_text}", "visible", 1.5,
+                      probe=LABELED_VALUE_PROBE, probe_arg=config.creation_time_text),
+        WaitCondition("download_button_rendered", f"svg use[href='{config.download_icon_href}']", "attached", 1.5),
+        WaitCondition("download_options_shown", f"text={config.download_no_watermark_text}", "visible", 1.5),
+        WaitCondition("overlay_opened", "svg use[href*='icon_tongyong_20px_zan']", "attached", 1.0),
+        WaitCondition("overlay_closed", "svg use[href*='icon_tongyong_20px_zan']", "hidden", 0.5),
+        WaitCondition("gallery_opened", ".thumsItem, .thumbnail-item, .thumsCou, span.close-icon", "visible", 2.0),
+        WaitCondition("gallery_closed", "span.close-icon", "hidden", 2.0),
+    ]
+    return {condition.name: condition for condition in conditions}
+
+
+class PageWaits:
+    """Runs named waits with learned, per-site timeout budgets"""
+
+    def __init__(self, conditions: Dict[str, WaitCondition], timeout_manager: Optional[AdaptiveTimeoutManager] = None):
+        self.conditions = conditions
+        self.timeout_manager = timeout_manager or AdaptiveTimeoutManager(min_timeout=0.2, max_timeout=15.0)
+        self.waits_met = 0
+        self.waits_timed_out = 0
+
+    def budget(self, name: str, default: Optional[float] = None) -> float:
+        """Seconds the named wait may take on the active site"""
+        condition = self.conditions[name]
+        return self.timeout_manager.get_timeout(name, condition.default_timeout if default is None else default)
+
+    async def wait(self, page, name: str, default: Optional[float] = None) -> bool:
+        """Wait for the named condition; False when it did not hold within the budget
+
+        ``default`` overrides the condition's budget until timings are learned,
+        for call sites that used to sleep a different fixed time.
+        """
+        condition = self.conditions[name]
+        return await self._timed(page, name, default, lambda budget: page.wait_for_selector(
+            condition.selector, state=condition.state, timeout=budget * 1000))
+
+    async def probe(self, page, name: str) -> Optional[str]:
+        """Current value of the named condition's probe (None when absent or unreadable)"""
+        condition = self.conditions[name]
+        if not condition.probe:
+            return None
+        try:
+            return await page.evaluate(condition.probe, condition.probe_arg)
+        except Exception as e:
+            logger.debug(f"⏱️ Probe for '{name}' failed: {e}")
+            return None
+
+    async def wait_for_change(self, page, name: str, previous: Optional[str], default: Optional[float] = None) -> bool:
+        """Wait until the named probe reads a value other than ``previous`` (read before the click)
+
+        With no previous value (first open of the panel) this is the plain
+        condition wait. A value that has already changed returns at once and
+        is not timed, so the learned budget only reflects real waits.
+        """
+        condition = self.conditions[name]
+        if previous is None or not condition.probe:
+            return await self.wait(page, name, default)
+        current = await self.probe(page, name)
+        if current and current != previous:
+            return True
+        script = (f"([arg, previous]) => {{ const current = ({condition.probe})(arg); "
+                  f"return !!current && current !== previous; }}")
+        return await self._timed(page, name, default, lambda budget: page.wait_for_function(
+            script, arg=[condition.probe_arg, previous], polling=100, timeout=budget * 1000))
+
+    async def _timed(self, page, name: str, default: Optional[float],
+                     waiter: Callable[[float], Awaitable]) -> bool:
+        """Run ``waiter(budget)`` under the named budget and learn from how long it took"""
+        self.timeout_manager.use_site(site_key(getattr(page, "url", None)))
+        budget = self.budget(name, default)
+
+        start_time = time.monotonic()
+        with trace_span(f"wait:{name}", "wait", budget=round(budget, 3)) as span:
+            try:
+                await waiter(budget)
+                met = True
+            except Exception as e:
+                logger.debug(f"⏱️ Wait '{name}' not met within {budget:.2f}s: {e}")
+                met = False
+            span.set(met=met)
+        duration = time.monotonic() - start_time
+
+        self.timeout_manager.record_operation(name, duration, met)
+        if met:
+            self.waits_met += 1
+            logger.debug(f"⏱️ Wait '{name}' met in {duration:.2f}s (budget {budget:.2f}s)")
+        else:
+            self.waits_timed_out += 1
+        return met
+
+    def save(self) -> bool:
+        """Persist learned timings so the next run starts with them"""
+        return self.timeout_manager.save_state()
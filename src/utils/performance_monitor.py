@@ -6,14 +6,18 @@ Tracks execution times, resource usage, and optimization opportunities
 
 import time
 import asyncio
-import psutil
+import heapq
+import itertools
 import logging
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 from pathlib import Path
 import json
 
+from .metrics_registry import ACTION_DURATION, ACTIONS, Histogram, get_resource_sampler
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -21,19 +25,43 @@ class PerformanceMetrics:
     """Container for performance metrics"""
     action_type: str
     execution_time: float
-    memory_usage_mb: float
-    cpu_percent: float
+    memory_usage_mb: Optional[float]
+    cpu_percent: Optional[float]
     success: bool
     timestamp: float
     details: Optional[str] = None
 
 class PerformanceMonitor:
-    """Monitor and track automation performance"""
+    """Monitor and track automation performance
+
+    Keeps the most recent ``max_history`` metrics plus running totals and a
+    fixed-size latency histogram per action type, so memory stays flat over
+    long sessions. Memory and CPU come from the background resource sampler,
+    not from psutil calls on the action path; the sampler is started with
+    ``start_monitoring`` or on the first tracked action, and both fields are
+    None when it cannot run.
+    """
     
-    def __init__(self, enable_monitoring: bool = True):
+    def __init__(self, enable_monitoring: bool = True, max_history: int = 1000):
         self.enable_monitoring = enable_monitoring
-        self.metrics: List[PerformanceMetrics] = []
+        self.metrics: Deque[PerformanceMetrics] = deque(maxlen=max_history)
         self.session_start = time.time()
+        self.sampler = get_resource_sampler()
+        self._action_stats: Dict[str, Dict] = {}
+        self._slowest: List = []  # min-heap of (execution_time, seq, metrics)
+        self._sequence = itertools.count()
+        self._sampler_requested = False
+
+    async def start_monitoring(self, interval: float = None):
+        """Start background memory/CPU sampling"""
+        if interval:
+            self.sampler.interval = interval
+        self._sampler_requested = True
+        return self.sampler.start()
+
+    async def stop_monitoring(self):
+        """Stop background memory/CPU sampling"""
+        self.sampler.stop()
         
     @asynccontextmanager
     async def track_action(self, action_type: str, details: str = None):
@@ -42,9 +70,13 @@ class PerformanceMonitor:
             yield
             return
             
+        if not self._sampler_requested:
+            self._sampler_requested = True
+            self.sampler.start()
+        sampling = self.sampler.running
+        
         start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-        start_cpu = psutil.cpu_percent()
+        start_memory = self.sampler.latest_rss_mb
         
         success = True
         try:
@@ -55,20 +87,18 @@ class PerformanceMonitor:
         finally:
             end_time = time.time()
             execution_time = end_time - start_time
-            end_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-            end_cpu = psutil.cpu_percent()
             
             metrics = PerformanceMetrics(
                 action_type=action_type,
                 execution_time=execution_time,
-                memory_usage_mb=end_memory - start_memory,
-                cpu_percent=(start_cpu + end_cpu) / 2,
+                memory_usage_mb=self.sampler.latest_rss_mb - start_memory if sampling else None,
+                cpu_percent=self.sampler.latest_cpu_percent if sampling else None,
                 success=success,
                 timestamp=end_time,
                 details=details
             )
             
-            self.metrics.append(metrics)
+            self._record(metrics)
             
             # Log performance info
             if execution_time > 5.0:  # Warn for slow operations
@@ -76,42 +106,56 @@ class PerformanceMonitor:
             else:
                 logger.info(f"⚡ {action_type}: {execution_time:.2f}s")
     
+    def _record(self, metrics: PerformanceMetrics):
+        """Fold one action into the running totals, histograms and registry"""
+        self.metrics.append(metrics)
+        
+        stats = self._action_stats.get(metrics.action_type)
+        if stats is None:
+            stats = {"count": 0, "total_time": 0.0, "successes": 0, "histogram": Histogram()}
+            self._action_stats[metrics.action_type] = stats
+        stats["count"] += 1
+        stats["total_time"] += metrics.execution_time
+        stats["successes"] += metrics.success
+        stats["histogram"].observe(metrics.execution_time)
+        
+        entry = (metrics.execution_time, next(self._sequence), metrics)
+        if len(self._slowest) < 5:
+            heapq.heappush(self._slowest, entry)
+        elif entry[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+        
+        ACTION_DURATION.labels(action=metrics.action_type).observe(metrics.execution_time)
+        ACTIONS.labels(action=metrics.action_type, status="success" if metrics.success else "failure").inc()
+    
     def get_summary(self) -> Dict:
         """Get performance summary statistics"""
-        if not self.metrics:
+        if not self._action_stats:
             return {"status": "No metrics collected"}
         
-        total_time = sum(m.execution_time for m in self.metrics)
-        avg_time = total_time / len(self.metrics)
-        max_time = max(m.execution_time for m in self.metrics)
-        min_time = min(m.execution_time for m in self.metrics)
-        
-        success_rate = sum(1 for m in self.metrics if m.success) / len(self.metrics) * 100
-        
-        # Group by action type
-        by_action = {}
-        for metric in self.metrics:
-            if metric.action_type not in by_action:
-                by_action[metric.action_type] = []
-            by_action[metric.action_type].append(metric)
+        total_actions = sum(stats["count"] for stats in self._action_stats.values())
+        total_time = sum(stats["total_time"] for stats in self._action_stats.values())
+        successes = sum(stats["successes"] for stats in self._action_stats.values())
         
         action_stats = {}
-        for action_type, action_metrics in by_action.items():
+        for action_type, stats in self._action_stats.items():
+            histogram = stats["histogram"]
             action_stats[action_type] = {
-                "count": len(action_metrics),
-                "avg_time": sum(m.execution_time for m in action_metrics) / len(action_metrics),
-                "total_time": sum(m.execution_time for m in action_metrics),
-                "success_rate": sum(1 for m in action_metrics if m.success) / len(action_metrics) * 100
+                "count": stats["count"],
+                "avg_time": stats["total_time"] / stats["count"],
+                "total_time": stats["total_time"],
+                "p95_time": histogram.quantile(0.95),
+                "success_rate": stats["successes"] / stats["count"] * 100
             }
         
         return {
             "session_duration": time.time() - self.session_start,
-            "total_actions": len(self.metrics),
+            "total_actions": total_actions,
             "total_execution_time": total_time,
-            "average_time_per_action": avg_time,
-            "max_action_time": max_time,
-            "min_action_time": min_time,
-            "success_rate": success_rate,
+            "average_time_per_action": total_time / total_actions,
+            "max_action_time": max(stats["histogram"].max for stats in self._action_stats.values()),
+            "min_action_time": min(stats["histogram"].min for stats in self._action_stats.values()),
+            "success_rate": successes / total_actions * 100,
             "action_breakdown": action_stats,
             "slowest_actions": [
                 {
@@ -119,7 +163,7 @@ class PerformanceMonitor:
                     "time": m.execution_time,
                     "details": m.details
                 }
-                for m in sorted(self.metrics, key=lambda x: x.execution_time, reverse=True)[:5]
+                for _, _, m in sorted(self._slowest, reverse=True)
             ]
         }
     
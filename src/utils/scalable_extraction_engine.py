@@ -16,8 +16,10 @@ from datetime import datetime, timedelta
 from enum import Enum
 import json
 import uuid
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import itertools
 import multiprocessing as mp
+from types import SimpleNamespace
+from urllib.parse import urlparse
 from pathlib import Path
 import weakref
 import queue
@@ -53,6 +55,14 @@ class ResourceType(Enum):
     BROWSER_CONTEXTS = "browser_contexts"
 
 
+def extract_domain(url: str) -> str:
+    """Domain (host[:port]) of a page URL, used for locality-aware routing"""
+    try:
+        return urlparse(url).netloc or "unknown"
+    except Exception:
+        return "unknown"
+
+
 @dataclass
 class ProcessingNode:
     """Represents a processing node in the scalable system"""
@@ -63,6 +73,7 @@ class ProcessingNode:
     last_heartbeat: datetime = field(default_factory=datetime.now)
     performance_metrics: Dict[str, float] = field(default_factory=dict)
     resource_usage: Dict[ResourceType, float] = field(default_factory=dict)
+    warm_domains: Set[str] = field(default_factory=set)  # Domains already loaded in the node's browser context
     
     def get_load_percentage(self) -> float:
         """Get current load as percentage of capacity"""
@@ -320,29 +331,24 @@ class LoadBalancer:
     
     def _select_locality_aware(self, nodes: List[ProcessingNode], 
                               task: ExtractionTask) -> ProcessingNode:
-        """Select node based on locality (e.g., previous tasks from same domain)"""
-        # Check if any node has processed tasks from the same domain recently
-        task_domain = self._extract_domain(task.page_url)
-        
-        domain_experienced_nodes = []
-        for node in nodes:
-            recent_tasks = [task_id for task_id, node_id, timestamp in self.task_history[-100:]
-                          if node_id == node.node_id and 
-                          timestamp > datetime.now() - timedelta(hours=1)]
-            
-            # This would need task URL tracking in real implementation
-            if recent_tasks:  # Simplified locality check
-                domain_experienced_nodes.append(node)
+        """Select node based on locality (nodes already warm for the task's domain)"""
+        warm_nodes = self._warm_nodes(nodes, task)
+        if warm_nodes:
+            return self._select_least_loaded(warm_nodes)
         
-        if domain_experienced_nodes:
-            return self._select_least_loaded(domain_experienced_nodes)
-        
-        return self._select_least_loaded(nodes)
+        # Keep warm nodes free for their own domains where possible
+        return min(nodes, key=lambda n: (len(n.warm_domains), n.get_load_percentage()))
+    
+    def _warm_nodes(self, nodes: List[ProcessingNode], task: ExtractionTask) -> List[ProcessingNode]:
+        """Nodes whose browser context has already loaded the task's domain"""
+        task_domain = self._extract_domain(task.page_url)
+        return [node for node in nodes if task_domain in node.warm_domains]
     
     def _select_adaptive(self, nodes: List[ProcessingNode], 
                         task: ExtractionTask) -> ProcessingNode:
         """Adaptive node selection based on multiple factors"""
         node_scores = []
+        warm_node_ids = {node.node_id for node in self._warm_nodes(nodes, task)}
         
         for node in nodes:
             # Base score from load
@@ -367,11 +373,15 @@ class LoadBalancer:
             # Priority bonus for high-priority tasks
             priority_bonus = 1.0 + (task.priority / 20.0)  # Up to 50% bonus
             
+            # Warm page for the task's domain (cookies, cache, open connections)
+            locality_factor = 1.0 if node.node_id in warm_node_ids else 0.0
+            
             combined_score = (load_score * 0.3 + 
                             perf_weight * 0.25 + 
                             success_factor * 0.2 + 
                             resource_factor * 0.15 + 
-                            priority_bonus * 0.1)
+                            priority_bonus * 0.1 +
+                            locality_factor * 0.5)
             
             node_scores.append((node, combined_score))
         
@@ -379,11 +389,7 @@ class LoadBalancer:
     
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL for locality awareness"""
-        try:
-            from urllib.parse import urlparse
-            return urlparse(url).netloc
-        except:
-            return "unknown"
+        return extract_domain(url)
     
     def record_task_assignment(self, task_id: str, node_id: str):
         """Record task assignment for load balancing decisions"""
@@ -407,10 +413,106 @@ class LoadBalancer:
             self.performance_weights[node_id] = max(0.1, min(2.0, weight))
 
 
+# Attribute defaults the extractors read from their config when a task's
+# extraction_config dict does not set them
+EXTRACTION_CONFIG_DEFAULTS = {
+    'image_to_video_text': "Image to video",
+    'creation_time_text': "Creation Time",
+}
+
+
+class SharedBrowserPageProvider:
+    """Gives each worker its own page in its own context of one shared browser
+    
+    The browser is launched on first use. A worker keeps its page between
+    tasks, so cookies, cache and connections for the domains it has visited
+    stay warm; ``discard`` drops a broken page and the next ``get_page``
+    opens a fresh context.
+    """
+    
+    def __init__(self, headless: bool = True, browser_type: str = "chromium",
+                 launch_options: Dict[str, Any] = None, context_options: Dict[str, Any] = None):
+        self.headless = headless
+        self.browser_type = browser_type
+        self.launch_options = launch_options or {}
+        self.context_options = context_options or {}
+        self.playwright = None
+        self.browser = None
+        self._contexts: Dict[str, Any] = {}
+        self._pages: Dict[str, Any] = {}
+        self._launch_lock = asyncio.Lock()
+    
+    async def get_page(self, worker_id: str):
+        """The worker's page, creating its context on first use or after a discard"""
+        page = self._pages.get(worker_id)
+        if page is not None and not page.is_closed():
+            return page
+        
+        await self.discard(worker_id)
+        browser = await self._get_browser()
+        context = await browser.new_context(**self.context_options)
+        page = await context.new_page()
+        self._contexts[worker_id] = context
+        self._pages[worker_id] = page
+        logger.debug(f"Opened browser context for {worker_id}")
+        return page
+    
+    async def discard(self, worker_id: str):
+        """Close the worker's context so its next page starts fresh"""
+        self._pages.pop(worker_id, None)
+        context = self._contexts.pop(worker_id, None)
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing context for {worker_id}: {e}")
+    
+    async def close(self):
+        """Close every worker context and the shared browser"""
+        for worker_id in list(self._contexts):
+            await self.discard(worker_id)
+        
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing shared browser: {e}")
+            self.browser = None
+        
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+    
+    @property
+    def open_pages(self) -> int:
+        return len(self._pages)
+    
+    async def _get_browser(self):
+        async with self._launch_lock:
+            if self.browser is None or not self.browser.is_connected():
+                from playwright.async_api import async_playwright
+                
+                if self.playwright is None:
+                    self.playwright = await async_playwright().start()
+                launcher = getattr(self.playwright, self.browser_type)
+                self.browser = await launcher.launch(headless=self.headless, **self.launch_options)
+                logger.info(f"Launched shared {self.browser_type} browser for extraction workers")
+        return self.browser
+
+
 class ScalableExtractionEngine:
-    """Main scalable extraction engine with enterprise features"""
+    """Main scalable extraction engine with enterprise features
+    
+    Submitted tasks wait in a priority queue (highest priority first, FIFO
+    within a priority). A dispatcher hands each task to an idle worker chosen
+    by the load balancer, which prefers workers whose page is already warm for
+    the task's domain. Every worker owns one real browser page from the page
+    provider and extracts metadata from it with PerformanceOptimizedExtractor.
+    Playwright pages belong to the event loop, so ``processing_mode`` no
+    longer selects thread or process pools; it is kept for reporting.
+    """
     
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, page_provider=None):
         self.config = config or {}
         self.processing_mode = ProcessingMode(self.config.get('processing_mode', 'multi_threaded'))
         
@@ -421,16 +523,26 @@ class ScalableExtractionEngine:
         self.resource_monitor = ResourceMonitor(
             self.config.get('resource_monitor_interval', 10)
         )
+        self.page_provider = page_provider or SharedBrowserPageProvider(
+            headless=self.config.get('headless', True),
+            browser_type=self.config.get('browser_type', 'chromium'),
+            context_options=self.config.get('context_options')
+        )
+        self.navigation_timeout = self.config.get('navigation_timeout', 30.0)
+        self.navigation_wait_until = self.config.get('navigation_wait_until', 'domcontentloaded')
         
         # Task management
-        self.task_queue = asyncio.Queue(maxsize=self.config.get('max_queue_size', 10000))
+        self.task_queue = asyncio.PriorityQueue(maxsize=self.config.get('max_queue_size', 10000))
         self.completed_tasks: Dict[str, ExtractionTask] = {}
         self.failed_tasks: Dict[str, ExtractionTask] = {}
+        self._task_sequence = itertools.count()
+        self._task_futures: Dict[str, asyncio.Future] = {}
         
-        # Processing pools
+        # Workers
         self.max_workers = self.config.get('max_workers', min(32, mp.cpu_count() * 4))
-        self.thread_executor = None
-        self.process_executor = None
+        self._worker_inboxes: Dict[str, asyncio.Queue] = {}
+        self._node_freed = asyncio.Event()
+        self._dispatcher_task: Optional[asyncio.Task] = None
         
         # State management
         self.is_running = False
@@ -455,18 +567,20 @@ class ScalableExtractionEngine:
         
         logger.info(f"Starting scalable extraction engine in {self.processing_mode.value} mode")
         
-        # Initialize processing pools
-        await self._initialize_processing_pools()
-        
         # Start resource monitoring
         asyncio.create_task(self.resource_monitor.start_monitoring())
         
-        # Start worker tasks
+        # Start worker tasks, one processing node (and browser page) each
         num_workers = min(self.max_workers, self.config.get('concurrent_workers', 8))
         for i in range(num_workers):
-            worker_task = asyncio.create_task(self._worker_loop(f"worker_{i}"))
+            worker_id = f"worker_{i}"
+            self.load_balancer.register_node(ProcessingNode(node_id=worker_id, capacity=1))
+            self._worker_inboxes[worker_id] = asyncio.Queue(maxsize=1)
+            worker_task = asyncio.create_task(self._worker_loop(worker_id))
             self.worker_tasks.append(worker_task)
         
+        self._dispatcher_task = asyncio.create_task(self._dispatch_loop())
+        
         # Start statistics updater
         asyncio.create_task(self._update_statistics_loop())
         
@@ -483,46 +597,34 @@ class ScalableExtractionEngine:
         # Stop resource monitoring
         self.resource_monitor.stop_monitoring()
         
-        # Cancel worker tasks
-        for task in self.worker_tasks:
+        # Cancel dispatcher and worker tasks
+        tasks = self.worker_tasks + ([self._dispatcher_task] if self._dispatcher_task else [])
+        for task in tasks:
             task.cancel()
         
         # Wait for workers to finish current tasks
-        if self.worker_tasks:
-            await asyncio.gather(*self.worker_tasks, return_exceptions=True)
-        
-        # Shutdown processing pools
-        await self._shutdown_processing_pools()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher_task = None
+        
+        # Tasks handed to a worker but not started go back to the queue
+        for worker_id, inbox in self._worker_inboxes.items():
+            while not inbox.empty():
+                self._enqueue_nowait(inbox.get_nowait())
+            self.load_balancer.unregister_node(worker_id)
+        self._worker_inboxes.clear()
+        
+        # Close worker pages and the shared browser
+        try:
+            await self.page_provider.close()
+        except Exception as e:
+            logger.warning(f"Error closing worker pages: {e}")
         
         # Log final statistics
         await self._log_final_statistics()
         
         logger.info("Engine stopped")
     
-    async def _initialize_processing_pools(self):
-        """Initialize processing pools based on mode"""
-        if self.processing_mode in [ProcessingMode.MULTI_THREADED, ProcessingMode.HYBRID]:
-            self.thread_executor = ThreadPoolExecutor(
-                max_workers=self.max_workers,
-                thread_name_prefix="extraction_thread"
-            )
-        
-        if self.processing_mode in [ProcessingMode.MULTI_PROCESS, ProcessingMode.HYBRID]:
-            self.process_executor = ProcessPoolExecutor(
-                max_workers=min(self.max_workers, mp.cpu_count()),
-                mp_context=mp.get_context('spawn')
-            )
-    
-    async def _shutdown_processing_pools(self):
-        """Shutdown processing pools"""
-        if self.thread_executor:
-            self.thread_executor.shutdown(wait=True)
-            self.thread_executor = None
-        
-        if self.process_executor:
-            self.process_executor.shutdown(wait=True)
-            self.process_executor = None
-    
     async def submit_task(self, page_url: str, extraction_config: Dict[str, Any], 
                          priority: int = 5, max_retries: int = 3) -> str:
         """Submit a new extraction task"""
@@ -534,7 +636,8 @@ class ScalableExtractionEngine:
             max_retries=max_retries
         )
         
-        await self.task_queue.put(task)
+        self._task_futures[task.task_id] = asyncio.get_running_loop().create_future()
+        await self._enqueue(task)
         logger.debug(f"Submitted task {task.task_id} for {page_url}")
         return task.task_id
     
@@ -554,6 +657,19 @@ class ScalableExtractionEngine:
         logger.info(f"Submitted batch of {len(task_ids)} tasks")
         return task_ids
     
+    async def wait_for_tasks(self, task_ids: List[str], 
+                            timeout: Optional[float] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Wait until the given tasks finish; returns their results by task ID
+        
+        Results are what ``get_task_result`` returns. Tasks still unfinished
+        when ``timeout`` expires map to None.
+        """
+        futures = [self._task_futures[task_id] for task_id in task_ids if task_id in self._task_futures]
+        if futures:
+            await asyncio.wait(futures, timeout=timeout)
+        
+        return {task_id: await self.get_task_result(task_id) for task_id in task_ids}
+    
     async def get_task_result(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get result of a completed task"""
         if task_id in self.completed_tasks:
@@ -595,56 +711,92 @@ class ScalableExtractionEngine:
             'message': 'Task is either queued or currently being processed'
         }
     
-    async def _worker_loop(self, worker_id: str):
-        """Main worker loop for processing tasks"""
-        logger.debug(f"Worker {worker_id} started")
-        
+    async def _enqueue(self, task: ExtractionTask):
+        """Queue a task; higher priority first, submission order within a priority"""
+        await self.task_queue.put((-task.priority, next(self._task_sequence), task))
+    
+    def _enqueue_nowait(self, task: ExtractionTask):
+        self.task_queue.put_nowait((-task.priority, next(self._task_sequence), task))
+    
+    async def _dispatch_loop(self):
+        """Hand queued tasks to idle workers chosen by the load balancer"""
         while self.is_running:
             try:
-                # Get task from queue with timeout
-                task = await asyncio.wait_for(self.task_queue.get(), timeout=1.0)
+                # Only take a task once a worker can run it, so later
+                # higher-priority submissions are not stuck behind it
+                await self._wait_for_idle_node()
+                _, _, task = await asyncio.wait_for(self.task_queue.get(), timeout=1.0)
+                
+                node = self.load_balancer.select_node(task)
+                if node is None:
+                    self._finish_failed(task, f"No worker can accept task weight {task.weight}")
+                    continue
                 
-                # Process the task
-                await self._process_task(task, worker_id)
+                node.add_task(task.task_id, task.weight)
+                task.assigned_node = node.node_id
+                self.load_balancer.record_task_assignment(task.task_id, node.node_id)
+                self._worker_inboxes[node.node_id].put_nowait(task)
                 
             except asyncio.TimeoutError:
-                # No task available, continue loop
                 continue
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Dispatcher error: {e}")
+    
+    async def _wait_for_idle_node(self):
+        while not any(node.can_accept_task() for node in self.load_balancer.nodes.values()):
+            self._node_freed.clear()
+            await self._node_freed.wait()
+    
+    async def _worker_loop(self, worker_id: str):
+        """Main worker loop for processing tasks"""
+        logger.debug(f"Worker {worker_id} started")
+        inbox = self._worker_inboxes[worker_id]
+        
+        while self.is_running:
+            try:
+                task = await inbox.get()
+            except asyncio.CancelledError:
+                logger.debug(f"Worker {worker_id} cancelled")
+                break
+            
+            retry = False
+            try:
+                retry = await self._process_task(task, worker_id)
             except asyncio.CancelledError:
                 logger.debug(f"Worker {worker_id} cancelled")
+                if task.status == "processing":
+                    task.status = "pending"
+                    self._enqueue_nowait(task)
                 break
             except Exception as e:
                 logger.error(f"Worker {worker_id} error: {e}")
-                continue
+            finally:
+                node = self.load_balancer.nodes.get(worker_id)
+                if node is not None:
+                    node.remove_task(task.task_id, task.weight)
+                self._node_freed.set()
+            
+            if retry:
+                await self._enqueue(task)
         
         logger.debug(f"Worker {worker_id} stopped")
     
-    async def _process_task(self, task: ExtractionTask, worker_id: str):
-        """Process a single extraction task"""
+    async def _process_task(self, task: ExtractionTask, worker_id: str) -> bool:
+        """Process a single extraction task; True when it should be retried"""
         start_time = time.time()
         task.status = "processing"
         
         logger.debug(f"Worker {worker_id} processing task {task.task_id}")
         
         try:
-            # Select processing method based on mode
-            if self.processing_mode == ProcessingMode.SINGLE_THREADED:
-                result = await self._process_task_async(task)
-            
-            elif self.processing_mode == ProcessingMode.MULTI_THREADED:
-                result = await self._process_task_threaded(task)
-            
-            elif self.processing_mode == ProcessingMode.MULTI_PROCESS:
-                result = await self._process_task_multiprocess(task)
-            
-            elif self.processing_mode == ProcessingMode.HYBRID:
-                result = await self._process_task_adaptive(task)
-            
-            else:
-                raise ValueError(f"Unsupported processing mode: {self.processing_mode}")
+            result = await self._extract_on_worker_page(task, worker_id)
             
             # Task completed successfully
             processing_time = time.time() - start_time
+            result['task_id'] = task.task_id
+            result['url'] = task.page_url
             result['processing_time'] = processing_time
             result['worker_id'] = worker_id
             result['processing_mode'] = self.processing_mode.value
@@ -652,16 +804,17 @@ class ScalableExtractionEngine:
             task.result = result
             task.status = "completed"
             self.completed_tasks[task.task_id] = task
+            self._resolve_future(task, result)
             
             # Update statistics
             self.statistics['tasks_processed'] += 1
             self.statistics['total_processing_time'] += processing_time
             
             logger.debug(f"Task {task.task_id} completed in {processing_time:.2f}s")
+            return False
             
         except Exception as e:
             # Task failed
-            processing_time = time.time() - start_time
             task.error = str(e)
             task.retry_count += 1
             
@@ -671,90 +824,58 @@ class ScalableExtractionEngine:
             if task.retry_count < task.max_retries:
                 logger.info(f"Retrying task {task.task_id} (attempt {task.retry_count + 1}/{task.max_retries})")
                 task.status = "pending"
-                await self.task_queue.put(task)
-            else:
-                task.status = "failed"
-                self.failed_tasks[task.task_id] = task
-                self.statistics['tasks_failed'] += 1
-                
-                logger.error(f"Task {task.task_id} failed permanently after {task.retry_count} attempts")
+                return True
+            
+            self._finish_failed(task, str(e))
+            logger.error(f"Task {task.task_id} failed permanently after {task.retry_count} attempts")
+            return False
     
-    async def _process_task_async(self, task: ExtractionTask) -> Dict[str, Any]:
-        """Process task in single-threaded async mode"""
-        # This would use the optimized extractor directly
+    async def _extract_on_worker_page(self, task: ExtractionTask, worker_id: str) -> Dict[str, Any]:
+        """Navigate the worker's page to the task URL and extract its metadata"""
         from .performance_optimized_extractor import PerformanceOptimizedExtractor
         
-        # Create a mock page object for demonstration
-        # In real implementation, this would create/manage browser page
-        mock_page = type('MockPage', (), {
-            'url': task.page_url,
-            'query_selector_all': lambda self, selector: []
-        })()
+        page = await self.page_provider.get_page(worker_id)
+        node = self.load_balancer.nodes.get(worker_id)
         
-        extractor = PerformanceOptimizedExtractor(task.extraction_config)
-        result = await extractor.extract_metadata_optimized(mock_page)
-        
-        return result
-    
-    async def _process_task_threaded(self, task: ExtractionTask) -> Dict[str, Any]:
-        """Process task using thread executor"""
-        loop = asyncio.get_event_loop()
+        try:
+            await page.goto(task.page_url, wait_until=self.navigation_wait_until,
+                            timeout=self.navigation_timeout * 1000)
+        except Exception:
+            # Start the next task on a fresh context rather than a broken page
+            await self.page_provider.discard(worker_id)
+            if node is not None:
+                node.warm_domains.clear()
+            raise
         
-        # Run extraction in thread pool
-        result = await loop.run_in_executor(
-            self.thread_executor,
-            self._extract_sync,
-            task
-        )
+        if node is not None:
+            node.warm_domains.add(extract_domain(task.page_url))
         
-        return result
-    
-    async def _process_task_multiprocess(self, task: ExtractionTask) -> Dict[str, Any]:
-        """Process task using process executor"""
-        loop = asyncio.get_event_loop()
+        extractor = PerformanceOptimizedExtractor(self._extraction_settings(task.extraction_config))
+        result = await extractor.extract_metadata_optimized(page)
         
-        # Run extraction in process pool
-        result = await loop.run_in_executor(
-            self.process_executor,
-            _extract_in_process,  # Global function for pickling
-            task.to_dict()
-        )
+        if result.get('extraction_method') == 'fallback_failed':
+            raise RuntimeError(result.get('error') or "Metadata extraction failed")
         
         return result
     
-    async def _process_task_adaptive(self, task: ExtractionTask) -> Dict[str, Any]:
-        """Adaptively choose processing method based on system state"""
-        # Check system resources
-        cpu_usage = self.resource_monitor.get_current_usage(ResourceType.CPU) or 50
-        memory_usage = self.resource_monitor.get_current_usage(ResourceType.MEMORY) or 60
-        
-        # Decision logic
-        if cpu_usage > 80 or memory_usage > 85:
-            # High resource usage - use single-threaded
-            return await self._process_task_async(task)
-        
-        elif task.priority >= 8:
-            # High priority - use dedicated thread
-            return await self._process_task_threaded(task)
-        
-        elif len(task.page_url) > 100:  # Complex URL indicating complex page
-            # Complex task - use process isolation
-            return await self._process_task_multiprocess(task)
-        
-        else:
-            # Default to threaded
-            return await self._process_task_threaded(task)
-    
-    def _extract_sync(self, task: ExtractionTask) -> Dict[str, Any]:
-        """Synchronous extraction for thread execution"""
-        # Simplified synchronous extraction
-        return {
-            'task_id': task.task_id,
-            'extraction_method': 'threaded_sync',
-            'generation_date': 'Unknown Date',
-            'prompt': 'Unknown Prompt',
-            'url': task.page_url
-        }
+    def _extraction_settings(self, extraction_config):
+        """Extractors read settings as attributes; task configs may be plain dicts"""
+        if isinstance(extraction_config, dict):
+            return SimpleNamespace(**{**EXTRACTION_CONFIG_DEFAULTS, **extraction_config})
+        return extraction_config
+    
+    def _finish_failed(self, task: ExtractionTask, error: str):
+        task.error = error
+        task.status = "failed"
+        self.failed_tasks[task.task_id] = task
+        self.statistics['tasks_failed'] += 1
+        self._resolve_future(task, {'error': error, 'task_id': task.task_id, 'status': 'failed'})
+    
+    def _resolve_future(self, task: ExtractionTask, result: Dict[str, Any]):
+        # Waiters hold the future itself; later lookups go through completed/failed tasks
+        future = self._task_futures.pop(task.task_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
     
     async def _update_statistics_loop(self):
         """Update engine statistics periodically"""
@@ -807,6 +928,7 @@ class ScalableExtractionEngine:
             'failed_tasks_count': len(self.failed_tasks),
             'active_workers': len([t for t in self.worker_tasks if not t.done()]),
             'processing_mode': self.processing_mode.value,
+            'open_pages': getattr(self.page_provider, 'open_pages', None),
             'resource_usage': {
                 resource.value: self.resource_monitor.get_current_usage(resource)
                 for resource in ResourceType
@@ -827,21 +949,6 @@ class ScalableExtractionEngine:
         }
 
 
-# Global function for multiprocess execution
-def _extract_in_process(task_dict: Dict[str, Any]) -> Dict[str, Any]:
-    """Extract metadata in separate process (for process pool executor)"""
-    # This would implement the actual extraction logic
-    # For now, return mock result
-    return {
-        'task_id': task_dict['task_id'],
-        'extraction_method': 'multiprocess',
-        'generation_date': 'Unknown Date',
-        'prompt': 'Unknown Prompt',
-        'url': task_dict['page_url'],
-        'process_id': mp.current_process().pid
-    }
-
-
 # Factory function for creating scalable engines
 def create_scalable_engine(scale_level: str = "medium", 
                          custom_config: Dict[str, Any] = None) -> ScalableExtractionEngine:
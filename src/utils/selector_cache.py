@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Selector Strategy Cache
+Persisted, per-site record of which fallback strategy found each selector.
+
+When an action's selector stops matching as written, the engine's fallback
+chain (see ``WebAutomationEngine._find_element_with_fallback``) tries its
+alternatives in a fixed order behind stacked timeouts, so every run pays the
+same multi-second miss cascade for the same element. This cache remembers the
+strategy and concrete selector that worked for each target selector, one
+append-only JSON lines journal per site under ``<cache dir>/<host>.jsonl``.
+Later runs try the remembered winner first with a short timeout. An entry is
+dropped when the selector matches as written again, and after
+``max_misses`` consecutive misses.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from .ndjson_writer import read_ndjson
+
+logger = logging.getLogger(__name__)
+
+SELECTOR_CACHE_DIR_ENV = "AUTOMATON_SELECTOR_CACHE_DIR"
+DEFAULT_MAX_MISSES = 2
+
+_UNSAFE_FILENAME_CHARACTERS = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+def default_cache_dir() -> Path:
+    """``$AUTOMATON_SELECTOR_CACHE_DIR``, else ``~/.automaton/selector_cache``"""
+    configured = os.environ.get(SELECTOR_CACHE_DIR_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".automaton" / "selector_cache"
+
+
+def site_key(url: Optional[str]) -> str:
+    """Filename-safe site name of a URL (its host and port)"""
+    host = urlparse(url or "").netloc.lower()
+    return _UNSAFE_FILENAME_CHARACTERS.sub("_", host) or "local"
+
+
+@dataclass
+class SelectorWinner:
+    """Strategy that last found a target selector"""
+    strategy: str
+    selector: str
+    misses: int = 0
+
+
+class SelectorStrategyCache:
+    """Target selector → winning fallback strategy, for one site"""
+
+    def __init__(self, site: str, cache_dir: Optional[str] = None, max_misses: int = DEFAULT_MAX_MISSES):
+        self.site = site
+        self.max_misses = max_misses
+        self.path = (Path(cache_dir).expanduser() if cache_dir else default_cache_dir()) / f"{site}.jsonl"
+        self._entries: Dict[str, SelectorWinner] = {}
+        self._records = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for record in read_ndjson(self.path, include_rotated=False):
+            self._records += 1
+            target = record.get("target")
+            if not target:
+                continue
+            if record.get("removed"):
+                self._entries.pop(target, None)
+            elif "strategy" in record:
+                self._entries[target] = SelectorWinner(record["strategy"], record.get("selector", target),
+                                                       record.get("misses", 0))
+            elif target in self._entries:
+                self._entries[target].misses = record.get("misses", 0)
+
+    def _append(self, record: dict):
+        try:
+            if self._records + 1 > 2 * len(self._entries) + 100:
+                self._compact()
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._records += 1
+        except OSError as e:
+            logger.debug(f"Could not update selector cache {self.path}: {e}")
+
+    def _compact(self):
+        """Rewrite the journal with one record per target"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary, 'w', encoding='utf-8') as f:
+            for target, winner in self._entries.items():
+                f.write(json.dumps({"target": target, "strategy": winner.strategy, "selector": winner.selector,
+                                    "misses": winner.misses}, ensure_ascii=False) + "\n")
+        os.replace(temporary, self.path)
+        self._records = len(self._entries)
+
+    def winner(self, target: str) -> Optional[SelectorWinner]:
+        """The strategy to try first for ``target``, if one is known"""
+        with self._lock:
+            self._ensure_loaded()
+            return self._entries.get(target)
+
+    def record_success(self, target: str, strategy: str, selector: str):
+        """Remember the strategy that found ``target`` (written only when it changed)"""
+        with self._lock:
+            self._ensure_loaded()
+            known = self._entries.get(target)
+            if known and (known.strategy, known.selector, known.misses) == (strategy, selector, 0):
+                return
+            self._entries[target] = SelectorWinner(strategy, selector)
+            self._append({"target": target, "strategy": strategy, "selector": selector})
+
+    def record_miss(self, target: str) -> bool:
+        """Count a miss of the remembered strategy; returns True when the entry was dropped"""
+        with self._lock:
+            self._ensure_loaded()
+            known = self._entries.get(target)
+            if known is None:
+                return False
+            known.misses += 1
+            if known.misses < self.max_misses:
+                self._append({"target": target, "misses": known.misses})
+                return False
+            logger.info(f"Selector cache: dropping {known.strategy} for {target} after {known.misses} misses")
+            self._forget(target)
+            return True
+
+    def forget(self, target: str):
+        """Drop the entry for ``target``"""
+        with self._lock:
+            self._ensure_loaded()
+            self._forget(target)
+
+    def _forget(self, target: str):
+        if self._entries.pop(target, None) is not None:
+            self._append({"target": target, "removed": True})
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Session Profiles
+Named browser profiles that carry login state from one run to the next.
+
+Every run used to start from a fresh browser context, so each scheduled run
+repeated its LOGIN action and fetched the whole app shell again. A session
+profile keeps, under ``<profiles dir>/<name>/``:
+
+- ``state.json``: a Playwright ``storage_state`` snapshot (cookies and
+  localStorage), restored into new contexts, and
+- ``user-data/``: a Chromium user-data directory, used instead of the
+  snapshot when the profile is persistent
+  (``launch_persistent_context``).
+
+Persistent profiles share one HTTP disk cache (``<profiles dir>/_cache``),
+so static assets fetched by any profile are reused by all of them. Contexts
+created from a snapshot are off the record in Chromium and keep their cache
+in memory only.
+
+Snapshots contain session cookies; they are written with owner-only
+permissions.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR_ENV = "AUTOMATON_PROFILES_DIR"
+SHARED_CACHE_DIRNAME = "_cache"
+
+_PROFILE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+
+def default_profiles_dir() -> Path:
+    """``$AUTOMATON_PROFILES_DIR``, else ``~/.automaton/profiles``"""
+    configured = os.environ.get(PROFILES_DIR_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".automaton" / "profiles"
+
+
+class SessionProfile:
+    """Files of one named session profile"""
+
+    def __init__(self, name: str, profiles_dir: Optional[str] = None, persistent: bool = False):
+        if not name or not _PROFILE_NAME_PATTERN.match(name) or name == SHARED_CACHE_DIRNAME:
+            raise ValueError(f"Invalid session profile name '{name}' (letters, digits, '_', '.', '-')")
+        self.name = name
+        self.persistent = persistent
+        self.root = Path(profiles_dir).expanduser() if profiles_dir else default_profiles_dir()
+        self.directory = self.root / name
+
+    @property
+    def storage_state_path(self) -> Path:
+        return self.directory / "state.json"
+
+    @property
+    def user_data_dir(self) -> Path:
+        return self.directory / "user-data"
+
+    @property
+    def cache_dir(self) -> Path:
+        return self.root / SHARED_CACHE_DIRNAME
+
+    @property
+    def meta_path(self) -> Path:
+        return self.directory / "profile.json"
+
+    def has_saved_session(self) -> bool:
+        """True when a previous run left login state behind"""
+        if self.persistent:
+            return self.user_data_dir.is_dir() and any(self.user_data_dir.iterdir())
+        return self.storage_state_path.exists()
+
+    def launch_args(self) -> List[str]:
+        """Chromium arguments for a persistent context of this profile"""
+        return [f"--disk-cache-dir={self.cache_dir}"]
+
+    def prepare(self):
+        """Create the profile directories"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.persistent:
+            self.user_data_dir.mkdir(exist_ok=True)
+            self.cache_dir.mkdir(exist_ok=True)
+
+    def load_storage_state(self) -> Optional[Dict[str, Any]]:
+        """The saved snapshot, or None when missing or unreadable"""
+        try:
+            with open(self.storage_state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable session snapshot {self.storage_state_path}: {e}")
+            return None
+
+    async def save(self, context, reason: str = "") -> bool:
+        """Snapshot the context's cookies and storage into the profile"""
+        try:
+            self.prepare()
+            state = await context.storage_state()
+            temporary = self.storage_state_path.with_name("state.json.tmp")
+            descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temporary, self.storage_state_path)
+            self.update_meta(saved_at=time.time(), cookies=len(state.get("cookies", [])))
+            logger.info(f"💾 Session profile '{self.name}' saved{f' ({reason})' if reason else ''}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save session profile '{self.name}': {e}")
+            return False
+
+    def load_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def update_meta(self, **values):
+        meta = self.load_meta()
+        meta.update(values)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+        except OSError as e:
+            logger.debug(f"Could not update session profile metadata: {e}")
+
+
+async def login_form_visible(page, login_data: Dict[str, Any]) -> Optional[bool]:
+    """Whether a LOGIN action's form is showing (None when that cannot be told)
+
+    A ``session_check_selector`` in the login data names an element only
+    logged-in pages show and is the reliable check; without one, the session
+    counts as expired when the username field shows up within
+    ``session_check_timeout``, so a form that renders after load is not missed.
+    """
+    check_selector = login_data.get("session_check_selector")
+    timeout = login_data.get("session_check_timeout", 3000)
+    if check_selector:
+        try:
+            await page.wait_for_selector(check_selector, state="visible", timeout=timeout)
+            return False
+        except Exception:
+            return True
+    username_selector = login_data.get("username_selector")
+    if not username_selector:
+        return None
+    try:
+        await page.wait_for_selector(username_selector, state="visible", timeout=timeout)
+        return True
+    except Exception as e:
+        logger.debug(f"Login form not shown: {e}")
+        return False
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Span Tracer
+Nested, asyncio-task-aware timing spans exported as Chrome trace events.
+
+``PerformanceMonitor`` keeps one flat duration per action. The tracer records
+*where* the time went: every span knows its parent (through a context
+variable, so it follows ``await`` chains and is inherited by tasks spawned
+inside it) and is placed on a timeline row for the asyncio task that ran it.
+Concurrent pipeline workers and background download saves therefore show up
+as separate rows. The export is Chrome trace-event JSON, which opens in
+Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+Tracing is off by default; a disabled tracer hands out a shared no-op span so
+instrumented code costs one attribute check per span.
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Innermost open span of the running task (inherited by tasks created inside it)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("automaton_span", default=None)
+
+# Enough for a multi-hour download session at a few hundred spans per item
+DEFAULT_MAX_EVENTS = 500_000
+
+
+class Span:
+    """One timed region; usable as a sync or async context manager"""
+
+    __slots__ = ("tracer", "name", "category", "args", "parent", "_start_ns", "_token")
+
+    def __init__(self, tracer: "SpanTracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.parent: Optional[Span] = None
+        self._start_ns = 0
+        self._token = None
+
+    def set(self, **args) -> "Span":
+        """Attach arguments discovered while the span is open"""
+        self.args.update(args)
+        return self
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end_ns = time.perf_counter_ns()
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Closed from a different context than it was opened in
+            _current_span.set(self.parent)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self, self._start_ns, end_ns)
+        return False
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+class _NullSpan:
+    """Shared span handed out while tracing is disabled"""
+
+    def set(self, **args) -> "_NullSpan":
+        return self
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    async def __aenter__(self) -> "_NullSpan":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class SpanTracer:
+    """Collects completed spans and exports them in Chrome trace-event format"""
+
+    def __init__(self, enabled: bool = False, output_path: Optional[str] = None,
+                 max_events: int = DEFAULT_MAX_EVENTS):
+        self.enabled = enabled
+        self.output_path = Path(output_path) if output_path else None
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.dropped_events = 0
+        self.pid = os.getpid()
+        self._epoch_ns = time.perf_counter_ns()
+        self._task_ids: "weakref.WeakKeyDictionary[asyncio.Task, int]" = weakref.WeakKeyDictionary()
+        self._thread_ids: Dict[int, int] = {}
+        self._row_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: str = "automation", **args):
+        """Open a span; ``with`` and ``async with`` both work"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category, args)
+
+    def clear(self):
+        """Drop recorded spans and restart the timeline"""
+        with self._lock:
+            self.events.clear()
+            self.dropped_events = 0
+            self._row_names.clear()
+            self._task_ids = weakref.WeakKeyDictionary()
+            self._thread_ids.clear()
+            self._epoch_ns = time.perf_counter_ns()
+
+    def _row(self) -> int:
+        """Timeline row (trace ``tid``) for the running asyncio task or thread"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            tid = self._task_ids.get(task)
+            if tid is None:
+                tid = len(self._row_names) + 1
+                self._task_ids[task] = tid
+                self._row_names[tid] = task.get_name()
+            return tid
+        ident = threading.get_ident()
+        tid = self._thread_ids.get(ident)
+        if tid is None:
+            tid = len(self._row_names) + 1
+            self._thread_ids[ident] = tid
+            self._row_names[tid] = threading.current_thread().name
+        return tid
+
+    def _record(self, span: Span, start_ns: int, end_ns: int):
+        args = dict(span.args)
+        if span.parent is not None:
+            args.setdefault("parent", span.parent.name)
+        with self._lock:
+            event = {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (start_ns - self._epoch_ns) / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": self.pid,
+                "tid": self._row(),
+                "args": args,
+            }
+            if len(self.events) == self.events.maxlen:
+                self.dropped_events += 1
+            self.events.append(event)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace-event JSON object (``traceEvents`` plus row names)"""
+        with self._lock:
+            events = list(self.events)
+            row_names = dict(self._row_names)
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                     "args": {"name": "automaton"}}]
+        metadata.extend(
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": row_name}}
+            for tid, row_name in sorted(row_names.items())
+        )
+        return {
+            "traceEvents": metadata + sorted(events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped_events},
+        }
+
+    def export(self, filepath: Optional[str] = None) -> Optional[Path]:
+        """Write the trace to ``filepath`` (or the configured output path)"""
+        path = Path(filepath) if filepath else self.output_path
+        if path is None:
+            logger.warning("⚠️ No trace output path configured")
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+        logger.info(f"📊 Trace with {len(self.events)} spans saved to: {path} (open in ui.perfetto.dev)")
+        return path
+
+    def phase_totals(self) -> Dict[str, Dict[str, float]]:
+        """Count and total seconds per span name"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in list(self.events):
+            entry = totals.setdefault(event["name"], {"count": 0, "total_time": 0.0})
+            entry["count"] += 1
+            entry["total_time"] += event["dur"] / 1_000_000
+        return totals
+
+
+# Global tracer instance (disabled until enable_tracing is called)
+span_tracer = SpanTracer()
+
+
+def get_tracer() -> SpanTracer:
+    """Get the global span tracer"""
+    return span_tracer
+
+
+def enable_tracing(output_path: Optional[str] = None):
+    """Enable span recording; ``output_path`` is where the run's trace is saved"""
+    span_tracer.enabled = True
+    if output_path:
+        span_tracer.output_path = Path(output_path)
+
+
+def disable_tracing():
+    """Disable span recording"""
+    span_tracer.enabled = False
+
+
+def trace_span(name: str, category: str = "automation", **args):
+    """Open a span on the global tracer"""
+    return span_tracer.span(name, category, **args)
+
+
+def traced(name: str, category: str = "automation"):
+    """Decorator wrapping every call of a sync or async function in a span"""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not span_tracer.enabled:
+                    return await func(*args, **kwargs)
+                with span_tracer.span(name, category):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not span_tracer.enabled:
+                return func(*args, **kwargs)
+            with span_tracer.span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
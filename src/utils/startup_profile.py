@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Startup Profile
+Cold-start import cost of the CLI entry point, measured with ``-X importtime``.
+
+The scheduler starts a fresh CLI process for every config, so whatever
+``interfaces.cli`` imports at module level is paid again on every run. Heavy
+subsystems (generation downloads, the landmark/extraction stack, debug and
+visualizer tools, the enhanced download manager, yaml, psutil) are imported
+on first use instead; the profile reports the total import time, the most
+expensive modules and any deferred subsystem that was loaded eagerly anyway.
+"""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Directory holding the core/, utils/ and interfaces/ packages
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_ENTRY_MODULE = "interfaces.cli"
+
+# Subsystems that must not be imported just to start the CLI
+DEFERRED_MODULES = (
+    "utils.generation_download_manager",
+    "utils.landmark_extractor",
+    "utils.enhanced_metadata_extraction",
+    "utils.enhanced_metadata_extractor",
+    "utils.generation_debug_logger",
+    "utils.element_selection_visualizer",
+    "utils.download_manager",
+    "yaml",
+    "psutil",
+    "aiofiles",
+    # A second copy of the engine, pulled in through the ``src`` package
+    "src.core.engine",
+)
+
+
+@dataclass
+class ImportEntry:
+    """One line of ``-X importtime`` output (times in milliseconds)"""
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    """Parsed import timings for one cold start"""
+    entry_module: str
+    entries: List[ImportEntry] = field(default_factory=list)
+    wall_ms: float = 0.0
+
+    @property
+    def modules(self) -> Dict[str, ImportEntry]:
+        return {entry.module: entry for entry in self.entries}
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of the entry module"""
+        entry = self.modules.get(self.entry_module)
+        if entry is not None:
+            return entry.cumulative_ms
+        return sum(entry.cumulative_ms for entry in self.entries if entry.depth == 0)
+
+    def loaded(self, module: str) -> bool:
+        return module in self.modules
+
+    def eager_deferred_modules(self) -> List[str]:
+        """Deferred subsystems that were imported during startup"""
+        return [module for module in DEFERRED_MODULES if self.loaded(module)]
+
+    def top(self, limit: int = 15) -> List[ImportEntry]:
+        """Top-level packages (depth 0 or 1) ordered by cumulative time"""
+        candidates = [entry for entry in self.entries if entry.depth <= 1 and entry.module != self.entry_module]
+        return sorted(candidates, key=lambda entry: entry.cumulative_ms, reverse=True)[:limit]
+
+    def format_report(self, limit: int = 15) -> str:
+        lines = [
+            f"🚀 Startup profile for '{self.entry_module}'",
+            f"   Import time: {self.total_ms:.1f}ms (process wall time {self.wall_ms:.1f}ms)",
+            f"   Modules imported: {len(self.entries)}",
+            "",
+            f"   {'cumulative':>10}  {'self':>8}  module",
+        ]
+        for entry in self.top(limit):
+            lines.append(f"   {entry.cumulative_ms:>8.1f}ms  {entry.self_ms:>6.1f}ms  {entry.module}")
+        eager = self.eager_deferred_modules()
+        lines.append("")
+        if eager:
+            lines.append(f"   ⚠️ Deferred subsystems loaded at startup: {', '.join(eager)}")
+        else:
+            lines.append("   ✅ No deferred subsystems loaded at startup")
+        return "\n".join(lines)
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """Parse ``import time: self [us] | cumulative | imported package`` lines"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # Header line
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append(ImportEntry(stripped, self_us / 1000, cumulative_us / 1000, max(depth, 0)))
+    return entries
+
+
+def profile_startup(entry_module: str = DEFAULT_ENTRY_MODULE, src_dir: Optional[Path] = None,
+                    timeout: float = 60.0) -> StartupProfile:
+    """Import ``entry_module`` in a fresh interpreter and collect its import timings"""
+    src_dir = Path(src_dir) if src_dir else SRC_DIR
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(src_dir), env.get("PYTHONPATH")]))
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    code = ("import time; _start = time.perf_counter(); "
+            f"import {entry_module}; "
+            "print((time.perf_counter() - _start) * 1000)")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, env=env, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {entry_module} failed: {result.stderr.strip().splitlines()[-1:]}")
+    profile = StartupProfile(entry_module, parse_importtime(result.stderr))
+    try:
+        profile.wall_ms = float(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        pass
+    return profile
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test Compiled Action Programs
+=============================
+
+Validates the jump tables and nesting checks built by compile_actions,
+pre-parsed variable substitution, and IF/ELIF/ELSE and WHILE/BREAK/CONTINUE
+execution through the engine's main loop.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core.action_program import NO_JUMP, ProgramCompileError, compile_actions, compile_config, parse_template, substitute
+from src.core.action_types import Action, ActionType, AutomationConfig
+from src.core.engine import WebAutomationEngine
+
+
+def check(name):
+    """CHECK_ELEMENT placeholder; the fake engine returns scripted results"""
+    return Action(type=ActionType.CHECK_ELEMENT, selector=f"#{name}", value={"check": "equals", "value": "1"})
+
+
+def log(message):
+    return Action(type=ActionType.LOG_MESSAGE, value={"message": message, "log_file": "unused.log"})
+
+
+def control(action_type, condition=None):
+    return Action(type=action_type, value={"condition": condition} if condition else {})
+
+
+def make_engine(actions, check_results):
+    """Engine with browser setup and action execution replaced by fakes"""
+    engine = WebAutomationEngine.__new__(WebAutomationEngine)
+    engine.config = AutomationConfig(name="program test", url="https://example.com", actions=actions)
+    engine.controller = None
+    engine.variables = {}
+    engine.program = None
+    engine.keep_browser_open = True
+    engine.page = None
+    engine.resume_checkpoint = None
+    engine.checkpoint_id = None
+    engine.generation_progress = None
+    engine._run_state = None
+    engine._program_fingerprint = None
+    engine._last_checkpoint_time = 0.0
+    engine._actions_since_checkpoint = 0
+    engine.messages = []
+    results = list(check_results)
+
+    async def noop(*args, **kwargs):
+        return None
+
+    async def fake_execute(action):
+        if action.type == ActionType.CHECK_ELEMENT:
+            result = results.pop(0)
+            return result if isinstance(result, dict) else {"success": result}
+        if action.type == ActionType.SET_VARIABLE:
+            engine.variables[action.value["variable"]] = action.value["value"]
+            return None
+        engine.messages.append(action.value["message"])
+        return None
+
+    engine.initialize = noop
+    engine.navigate_to_url = noop
+    engine.cleanup = noop
+    engine.execute_action = fake_execute
+    return engine
+
+
+class TestCompileActions:
+
+    def test_if_chain_and_loop_jump_tables(self):
+        actions = [
+            control(ActionType.WHILE_BEGIN, "check_passed"),  # 0
+            control(ActionType.IF_BEGIN),                      # 1
+            control(ActionType.BREAK),                         # 2
+            control(ActionType.ELIF),                          # 3
+            control(ActionType.CONTINUE),                      # 4
+            control(ActionType.ELSE),                          # 5
+            control(ActionType.IF_END),                        # 6
+            control(ActionType.WHILE_END),                     # 7
+        ]
+        program = compile_actions(actions)
+
+        assert program.next_branch[1] == 3
+        assert program.next_branch[3] == 5
+        assert program.next_branch[5] == 6
+        assert [program.block_end[i] for i in (1, 3, 5)] == [6, 6, 6]
+        assert program.block_end[0] == 7
+        assert program.block_start[7] == 0
+        assert program.enclosing_loop[2] == program.enclosing_loop[4] == 0
+        assert program.conditions[0] == "check_passed"
+        assert program.block_end[2] == NO_JUMP
+
+    @pytest.mark.parametrize("actions", [
+        [control(ActionType.IF_BEGIN)],
+        [control(ActionType.IF_END)],
+        [control(ActionType.WHILE_BEGIN), control(ActionType.IF_END)],
+        [control(ActionType.IF_BEGIN), control(ActionType.ELSE), control(ActionType.ELIF), control(ActionType.IF_END)],
+        [control(ActionType.BREAK)],
+    ])
+    def test_invalid_nesting_is_rejected(self, actions):
+        with pytest.raises(ProgramCompileError):
+            compile_actions(actions)
+
+    def test_compiled_program_cached_on_config(self):
+        config = AutomationConfig(name="cached", url="https://example.com", actions=[log("a")])
+        assert compile_config(config) is compile_config(config)
+        config.actions.append(log("b"))
+        assert len(compile_config(config)) == 2
+
+
+class TestSubstitution:
+
+    def test_missing_variables_keep_placeholder(self):
+        assert substitute("item_${index}_${missing}", {"index": 3}) == "item_3_${missing}"
+        assert substitute(42, {"index": 3}) == 42
+        assert parse_template("plain").has_variables is False
+
+    def test_bind_leaves_compiled_action_untouched(self):
+        program = compile_actions([Action(type=ActionType.CLICK_BUTTON, selector="#row-${index}")])
+        bound = program.bind(0, {"index": 1})
+
+        assert bound.selector == "#row-1"
+        assert program.actions[0].selector == "#row-${index}"
+        assert program.bind(0, {"index": 2}).selector == "#row-2"
+
+
+class TestProgramExecution:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("check_result,expected", [
+        ({"success": True}, "if"),
+        ({"success": False, "actual_value": "1", "expected_value": "1"}, "elif"),
+        ({"success": False, "actual_value": "1", "expected_value": "2"}, "else"),
+    ])
+    async def test_if_elif_else_runs_exactly_one_branch(self, check_result, expected):
+        actions = [
+            check("a"),
+            control(ActionType.IF_BEGIN, "check_passed"), log("if"),
+            control(ActionType.ELIF, "value_equals"), log("elif"),
+            control(ActionType.ELSE), log("else"),
+            control(ActionType.IF_END),
+            log("after"),
+        ]
+        engine = make_engine(actions, [check_result])
+
+        results = await engine.run_automation()
+
+        assert not results["errors"]
+        assert engine.messages == [expected, "after"]
+
+    @pytest.mark.asyncio
+    async def test_while_loop_with_break_and_continue(self):
+        actions = [
+            control(ActionType.WHILE_BEGIN, "check_passed"),  # loop while check passes
+            check("skip"),
+            control(ActionType.IF_BEGIN, "check_passed"),
+            check("loop"),
+            control(ActionType.CONTINUE),
+            control(ActionType.IF_END),
+            log("body"),
+            check("stop"),
+            control(ActionType.IF_BEGIN, "check_failed"),
+            control(ActionType.BREAK),
+            control(ActionType.IF_END),
+            check("loop"),
+            control(ActionType.WHILE_END),
+            log("done"),
+        ]
+        # Iteration 1: skip -> continue (loop check passes)
+        # Iteration 2: no skip, body, stop check fails -> break
+        engine = make_engine(actions, [True, True, False, False])
+
+        results = await engine.run_automation()
+
+        assert not results["errors"]
+        assert engine.messages == ["body", "done"]
+
+    @pytest.mark.asyncio
+    async def test_loop_body_reuses_templates_each_iteration(self):
+        actions = [
+            Action(type=ActionType.SET_VARIABLE, value={"variable": "n", "value": "1"}),
+            control(ActionType.WHILE_BEGIN, "check_passed"),
+            Action(type=ActionType.LOG_MESSAGE, value={"message": "row ${n}", "log_file": "unused.log"}),
+            Action(type=ActionType.SET_VARIABLE, value={"variable": "n", "value": "2"}),
+            check("more"),
+            control(ActionType.WHILE_END),
+        ]
+        engine = make_engine(actions, [True, False])
+
+        results = await engine.run_automation()
+
+        assert not results["errors"]
+        assert engine.messages == ["row 1", "row 2"]
+        assert engine.program.actions[2].value["message"] == "row ${n}"
+
+    @pytest.mark.asyncio
+    async def test_invalid_program_fails_before_running(self):
+        engine = make_engine([log("never"), control(ActionType.IF_END)], [])
+
+        results = await engine.run_automation()
+
+        assert engine.messages == []
+        assert "IF_END" in results["errors"][0]["error"]
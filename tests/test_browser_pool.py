@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test Browser Pool
+=================
+
+Validates warm browser reuse, state reset on release and recycling after
+max uses or a failed health check, using stand-ins for Playwright objects.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core import browser_manager as browser_manager_module
+from src.core.browser_manager import BrowserConfig, BrowserManager, BrowserPool, BrowserPoolConfig
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.healthy = True
+        self.closed = False
+        self.urls = []
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        if not self.healthy:
+            raise RuntimeError("page crashed")
+        return 2
+
+    async def goto(self, url, **kwargs):
+        self.urls.append(url)
+
+    async def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.cookies_cleared = 0
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def clear_cookies(self):
+        self.cookies_cleared += 1
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launches = 0
+
+    async def launch(self, **kwargs):
+        self.launches += 1
+        return FakeBrowser()
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+class FakePlaywrightStarter:
+    def __init__(self, playwright):
+        self.playwright = playwright
+
+    async def start(self):
+        return self.playwright
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    playwright = FakePlaywright()
+    monkeypatch.setattr(browser_manager_module, "async_playwright", lambda: FakePlaywrightStarter(playwright))
+    return playwright
+
+
+class TestBrowserPool:
+
+    @pytest.mark.asyncio
+    async def test_released_browser_is_reused_with_clean_state(self, fake_playwright):
+        pool = BrowserPool(BrowserConfig(), BrowserPoolConfig(size=1, max_memory_mb=None))
+        lease = await pool.acquire()
+        extra_page = await lease.context.new_page()
+
+        resets = []
+
+        async def page_reset():
+            resets.append(True)
+
+        await pool.release(lease, page_reset=page_reset)
+        again = await pool.acquire()
+
+        assert again is lease
+        assert fake_playwright.chromium.launches == 1
+        assert resets == [True]
+        assert extra_page.closed
+        assert lease.context.cookies_cleared == 1
+        assert lease.page.urls[-1] == "about:blank"
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_recycled_after_max_uses_and_failed_health_check(self, fake_playwright):
+        pool = BrowserPool(BrowserConfig(), BrowserPoolConfig(size=1, max_uses=1, max_memory_mb=None))
+        first = await pool.acquire()
+        await pool.release(first)
+        second = await pool.acquire()
+        assert second is not first
+        assert not first.browser.is_connected()
+
+        pool.pool_config.max_uses = 10
+        second.page.healthy = False
+        await pool.release(second)
+        third = await pool.acquire()
+        assert third is not second
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_browser_manager_leases_from_pool(self, fake_playwright):
+        pool = BrowserPool(BrowserConfig(), BrowserPoolConfig(size=1, max_memory_mb=None))
+        manager = BrowserManager(BrowserConfig(keep_browser_open=False), pool=pool)
+
+        assert await manager.initialize() is True
+        assert manager.is_initialized()
+        assert pool.leased_count == 1
+
+        await manager.close()
+        assert pool.leased_count == 0
+        assert pool.idle_count == 1
+        assert fake_playwright.chromium.launches == 1
+        await pool.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test Checkpoint Resume
+======================
+
+Validates that the engine checkpoints a running action program through the
+controller (instruction pointer, block stack, variables and an outputs
+summary), resumes it from the saved instruction pointer, refuses checkpoints
+of a changed program, and that generation downloads report the last logged
+container for the checkpoint.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core.action_types import Action, ActionType, AutomationConfig
+from src.core.controller import AutomationController
+from src.core.engine import WebAutomationEngine
+from src.core.execution_context import BlockInfo, BlockType, ExecutionContext
+from src.utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+
+
+class FakePage:
+    url = "https://example.com/step"
+
+
+def make_config(count=4):
+    actions = [Action(type=ActionType.WAIT, value=10, description=f"step {i}") for i in range(count)]
+    return AutomationConfig(name="resumable", url="https://example.com", actions=actions)
+
+
+class ScriptedEngine(WebAutomationEngine):
+    """Engine without a browser, interrupted when it reaches the action described fail_on"""
+
+    def __init__(self, config, controller, fail_on=None):
+        super().__init__(config, controller=controller)
+        self.fail_on = fail_on
+        self.executed = []
+        self.page = FakePage()
+
+    async def initialize(self):
+        pass
+
+    async def navigate_to_url(self):
+        pass
+
+    async def cleanup(self, close_browser=True):
+        pass
+
+    async def execute_action(self, action):
+        if action.description == self.fail_on:
+            raise KeyboardInterrupt("Automation stopped by user")
+        self.executed.append(action.description)
+        self.variables["last"] = action.description
+        return {"step": action.description}
+
+
+@pytest.fixture
+def controller(tmp_path):
+    return AutomationController(checkpoint_dir=str(tmp_path / "checkpoints"))
+
+
+class TestController:
+
+    def test_checkpoint_id_is_reused_and_written_atomically(self, controller):
+        first = controller.save_checkpoint("run", 1, {"a": 1}, {"context": {}})
+        second = controller.save_checkpoint("run", 5, {"a": 2}, {"context": {}}, checkpoint_id=first)
+
+        assert first == second
+        assert controller.list_checkpoints() == [first]
+        assert controller.load_checkpoint(first).action_index == 5
+        assert not list(controller.checkpoint_dir.glob("*.tmp"))
+
+        assert controller.delete_checkpoint(first)
+        assert controller.list_checkpoints() == []
+
+
+class TestEngineCheckpoints:
+
+    def test_interrupted_run_resumes_at_saved_action(self, controller):
+        engine = ScriptedEngine(make_config(), controller, fail_on="step 2")
+        with pytest.raises(KeyboardInterrupt):
+            asyncio.run(engine.run_automation())
+
+        checkpoint = controller.load_checkpoint(engine.checkpoint_id)
+        assert checkpoint.action_index == 2
+        assert checkpoint.variables["last"] == "step 1"
+        assert checkpoint.browser_state == {"url": FakePage.url}
+        assert checkpoint.execution_context["actions_completed"] == 2
+
+        resumed = ScriptedEngine(make_config(), controller)
+        resumed.resume_from(checkpoint)
+        results = asyncio.run(resumed.run_automation())
+
+        assert resumed.executed == ["step 2", "step 3"]
+        assert results["success"]
+        assert results["resumed_from"]["action_index"] == 2
+        assert set(results["outputs"]) == {f"action_{i}" for i in range(4)}
+        # A finished run leaves no checkpoint behind
+        assert controller.list_checkpoints() == []
+
+    def test_block_stack_survives_checkpoint(self, controller):
+        engine = ScriptedEngine(make_config(), controller)
+        context = ExecutionContext(instruction_pointer=3)
+        context.block_stack.append(BlockInfo(block_type=BlockType.WHILE, start_index=1, iteration_count=4))
+        engine._run_state = (context, {"actions_completed": 2, "outputs": {"action_0": "x" * 500}})
+
+        engine._checkpoint(force=True)
+        saved = json.loads((controller.checkpoint_dir / f"{engine.checkpoint_id}.json").read_text())
+
+        restored = ExecutionContext.from_dict(saved["execution_context"]["context"])
+        assert restored.block_stack[0].iteration_count == 4
+        assert len(saved["execution_context"]["outputs_summary"]["action_0"]) < 500
+
+    def test_periodic_checkpoints_are_throttled(self, controller):
+        engine = ScriptedEngine(make_config(), controller)
+        engine._run_state = (ExecutionContext(), {"actions_completed": 0, "outputs": {}})
+        engine._last_checkpoint_time = float("inf")
+
+        engine._actions_since_checkpoint = engine.checkpoint_every_actions - 1
+        assert engine._checkpoint() is None
+        engine._actions_since_checkpoint += 1
+        assert engine._checkpoint() is not None
+        assert engine._actions_since_checkpoint == 0
+
+    def test_changed_program_is_not_resumed(self, controller):
+        engine = ScriptedEngine(make_config(), controller, fail_on="step 1")
+        with pytest.raises(KeyboardInterrupt):
+            asyncio.run(engine.run_automation())
+        checkpoint = controller.load_checkpoint(engine.checkpoint_id)
+
+        changed = ScriptedEngine(make_config(count=5), controller)
+        changed.resume_from(checkpoint)
+        results = asyncio.run(changed.run_automation())
+
+        assert not results["success"]
+        assert "actions have changed" in results["errors"][0]["error"]
+        assert changed.executed == []
+        assert controller.list_checkpoints() == [checkpoint.checkpoint_id]
+
+
+class TestGenerationProgress:
+
+    def test_logged_container_is_reported(self, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"),
+                                          logs_folder=str(tmp_path / "logs"))
+        manager = GenerationDownloadManager(config)
+        reported = []
+        manager.checkpoint_callback = reported.append
+        tracked = SimpleNamespace(success=False, path=None)
+
+        assert not asyncio.run(manager._process_tracked_download("05 Sep 2025 17:06:29", "prompt", tracked,
+                                                                 "abc123"))
+
+        assert reported == [{"creation_time": "05 Sep 2025 17:06:29", "hash_id": "abc123"}]
+        assert manager.last_processed_container == reported[0]
+
+    def test_resumed_engine_records_progress_in_checkpoint(self, controller):
+        engine = ScriptedEngine(make_config(), controller)
+        engine._run_state = (ExecutionContext(instruction_pointer=1), {"actions_completed": 1, "outputs": {}})
+        engine.checkpoint_every_actions = 1
+
+        engine._on_generation_progress({"creation_time": "05 Sep 2025 17:06:29", "hash_id": "abc123"})
+
+        checkpoint = controller.load_checkpoint(engine.checkpoint_id)
+        assert checkpoint.execution_context["generation_progress"]["hash_id"] == "abc123"
@@ -3,6 +3,7 @@
 Test suite for chronological logging functionality in generation download manager
 """
 
+import asyncio
 import unittest
 import tempfile
 import shutil
@@ -14,10 +15,12 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.utils.generation_log_store import GenerationDuplicateIndex, GenerationLogStore
 from src.utils.generation_download_manager import (
     GenerationDownloadLogger, 
     GenerationDownloadConfig, 
     GenerationMetadata,
+    GenerationDownloadManager,
     DuplicateMode
 )
 
@@ -103,6 +106,9 @@ class TestChronologicalLogging(unittest.TestCase):
         for entry in entries:
             result = self.logger.log_download(entry)
             self.assertTrue(result)
+        
+        # Out-of-order inserts are exported lazily
+        self.logger.flush()
             
         # Read and verify order
         log_path = self.logs_dir / "test_generations.txt"
@@ -265,5 +271,104 @@ class TestChronologicalLogging(unittest.TestCase):
         self.assertLess(elapsed_time, 1.0)  # Should complete within 1 second
         
 
+class TestGenerationLogStore(unittest.TestCase):
+    """Test cases for the append-only indexed log store"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.log_path = Path(self.test_dir) / "generation_downloads.txt"
+        
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        
+    def test_oldest_entry_appends_without_rewrite(self):
+        """Entries arriving newest to oldest extend the text view in place"""
+        store = GenerationLogStore(self.log_path)
+        store.append("#999999999", "28 Aug 2025 15:00:00", "Newest")
+        store.append("#999999999", "28 Aug 2025 10:00:00", "Older")
+        
+        self.assertFalse(store.text_stale)
+        content = self.log_path.read_text()
+        self.assertLess(content.index("Newest"), content.index("Older"))
+        
+    def test_out_of_order_entry_exported_on_flush(self):
+        """A newer entry marks the view stale until flush regenerates it"""
+        store = GenerationLogStore(self.log_path)
+        store.append("#999999999", "28 Aug 2025 10:00:00", "Older")
+        store.append("#999999999", "28 Aug 2025 15:00:00", "Newest")
+        
+        self.assertTrue(store.text_stale)
+        self.assertTrue(store.flush())
+        content = self.log_path.read_text()
+        self.assertLess(content.index("Newest"), content.index("Older"))
+        self.assertEqual(store.newest().prompt, "Newest")
+        
+    def test_index_persists_across_instances(self):
+        """A reopened store sees previous entries and pending export state"""
+        store = GenerationLogStore(self.log_path)
+        store.append("#999999999", "28 Aug 2025 10:00:00", "First")
+        store.append("#999999999", "28 Aug 2025 12:00:00", "Second")
+        
+        reopened = GenerationLogStore(self.log_path)
+        self.assertEqual(len(reopened), 2)
+        self.assertTrue(reopened.text_stale)
+        self.assertEqual([e.prompt for e in reopened.entries()], ["Second", "First"])
+        
+    def test_external_rewrite_is_reimported(self):
+        """Renumbered text files (with summary header) replace the journal contents"""
+        store = GenerationLogStore(self.log_path)
+        store.append("#999999999", "28 Aug 2025 10:00:00", "Entry")
+        
+        self.log_path.write_text(
+            "Updated on 2025-08-29 10:00:00\nTotal generations: 1\n" + "=" * 80 + "\n\n"
+            "#000000001\n28 Aug 2025 10:00:00\nEntry\n" + "=" * 40 + "\n"
+        )
+        
+        entries = store.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].file_id, "#000000001")
+        
+        store.append("#999999999", "27 Aug 2025 10:00:00", "Older")
+        content = self.log_path.read_text()
+        self.assertTrue(content.startswith("Updated on 2025-08-29"))
+        self.assertIn("#000000001", content)
+        
+
+class TestGenerationDuplicateIndex(unittest.TestCase):
+    """Test cases for the session-wide duplicate index"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.config = GenerationDownloadConfig(
+            logs_folder=str(Path(self.test_dir) / "logs"),
+            downloads_folder=str(Path(self.test_dir) / "downloads")
+        )
+        
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        
+    def test_lookup_by_normalized_time(self):
+        """Entries match across creation time formats"""
+        index = GenerationDuplicateIndex()
+        index.add("#999999999", "24 Aug 2025 01:37:01", "A camera pans across the scene")
+        
+        self.assertTrue(index.contains_time("24 Aug 2025 01:37:01"))
+        self.assertTrue(index.contains_time("2025-08-24 01:37:01"))
+        self.assertFalse(index.contains_time("24 Aug 2025 01:37:02"))
+        self.assertTrue(index.contains_time("2025-08-24-01-37-01"))
+        self.assertEqual(index["24 Aug 2025 01:37:01"]["id"], "#999999999")
+        
+    def test_index_updated_as_downloads_are_logged(self):
+        """The manager's index reflects new downloads without reloading the log"""
+        manager = GenerationDownloadManager(self.config)
+        manager.existing_log_entries = manager._load_existing_log_entries()
+        self.assertFalse(manager.check_duplicate_exists("28 Aug 2025 14:30:15", "Prompt"))
+        
+        asyncio.run(manager._add_to_generation_log("28 Aug 2025 14:30:15", "Prompt", "video.mp4"))
+        
+        self.assertTrue(manager.check_duplicate_exists("28 Aug 2025 14:30:15", "Prompt"))
+        self.assertIs(manager._load_existing_log_entries(), manager.existing_log_entries)
+        
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
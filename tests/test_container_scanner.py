@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test Scan-As-You-Scroll Container Extraction
+============================================
+
+Validates that boundary detection reads the /generate container list with a
+single ``page.evaluate`` per scroll iteration, that each container is only
+reported once, and that the boundary container is resolved by hash ID.
+"""
+
+import pytest
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.container_scanner import CONTAINER_SCAN_SCRIPT, ContainerScanner
+from src.utils.generation_download_manager import (
+    GenerationDownloadManager,
+    GenerationDownloadConfig,
+)
+
+
+def _record(hash_id, creation_time, prompt="A prompt long enough to compare", status=None, index=0):
+    return {
+        'hash_id': hash_id,
+        'container_id': f"{hash_id}__{index}",
+        'index': index,
+        'creation_time': creation_time,
+        'prompt_prefix': prompt,
+        'has_ellipsis': True,
+        'status': status,
+    }
+
+
+class TestContainerScanner:
+
+    @pytest.mark.asyncio
+    async def test_reset_flag_is_sent_once_and_duplicates_are_dropped(self):
+        page = AsyncMock()
+        page.evaluate.side_effect = [
+            [_record("aaa", "03 Sep 2025 16:15:18"), _record("bbb", "", status="Queuing")],
+            # Page-side set lost (e.g. after navigation): already reported records come back
+            [_record("aaa", "03 Sep 2025 16:15:18"), _record("ccc", "02 Sep 2025 10:00:00")],
+        ]
+        scanner = ContainerScanner(page)
+
+        first = await scanner.scan_new()
+        second = await scanner.scan_new()
+
+        assert [record.hash_id for record in first] == ["aaa", "bbb"]
+        assert not first[1].downloadable
+        assert [record.hash_id for record in second] == ["ccc"]
+        assert scanner.round_trips == 2
+        assert page.evaluate.call_args_list[0].args[0] == CONTAINER_SCAN_SCRIPT
+        assert page.evaluate.call_args_list[0].args[1]["reset"] is True
+        assert page.evaluate.call_args_list[1].args[1]["reset"] is False
+
+    @pytest.mark.asyncio
+    async def test_failed_scan_reports_nothing_and_retries_reset(self):
+        page = AsyncMock()
+        page.evaluate.side_effect = [Exception("Execution context was destroyed"), []]
+        scanner = ContainerScanner(page)
+
+        assert await scanner.scan_new() == []
+        await scanner.scan_new()
+        assert page.evaluate.call_args_list[1].args[1]["reset"] is True
+
+
+class TestSequentialBoundaryScan:
+
+    def setup_method(self):
+        self.config = GenerationDownloadConfig(
+            downloads_folder="/tmp/test_downloads",
+            logs_folder="/tmp/test_logs",
+        )
+        self.manager = GenerationDownloadManager(self.config)
+
+    @pytest.mark.asyncio
+    async def test_boundary_found_with_one_scan_per_iteration(self):
+        self.manager._load_existing_log_entries = MagicMock(return_value={
+            "03 Sep 2025 16:15:18": {"prompt": "A prompt long enough to compare"},
+        })
+        self.manager._click_boundary_container_enhanced = AsyncMock(return_value=True)
+
+        page = AsyncMock()
+        page.locator = MagicMock()
+        page.evaluate.return_value = [
+            _record("aaa", "03 Sep 2025 16:15:18", index=0),
+            _record("bbb", "", status="Video is rendering", index=1),
+            _record("ccc", "02 Sep 2025 10:00:00", index=2),
+        ]
+
+        result = await self.manager._find_download_boundary_sequential(page)
+
+        assert result['found'] is True
+        assert result['creation_time'] == "02 Sep 2025 10:00:00"
+        assert result['containers_scanned'] == 3
+        assert result['duplicates_found'] == 1
+        scans = [call for call in page.evaluate.await_args_list if call.args[0] == CONTAINER_SCAN_SCRIPT]
+        assert len(scans) == 1
+        page.query_selector_all.assert_not_called()
+        page.locator.assert_called_once_with('div[id^="ccc__"]')
+        click_args = self.manager._click_boundary_container_enhanced.await_args.args
+        assert click_args[1:] == (3, "02 Sep 2025 10:00:00", page, "ccc")
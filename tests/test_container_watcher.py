@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test Container Append Watcher
+=============================
+
+Validates that scroll loops wake up on MutationObserver "containers appended"
+events pushed through ``page.expose_binding``, treat a quiet period as "no
+more content", and fall back to fixed waits when the binding is unavailable.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.boundary_scroll_manager import BoundaryScrollManager
+from src.utils.container_watcher import CONTAINER_OBSERVER_SCRIPT, ContainerAppendWatcher
+
+
+class FakePage:
+    """Page stand-in that records exposed bindings and lets tests push observer events"""
+
+    def __init__(self, observer_installs=True):
+        self.main_frame = object()
+        self.bindings = {}
+        self.listeners = {}
+        self.observer_installs = observer_installs
+        self.install_calls = 0
+
+    async def expose_binding(self, name, callback):
+        self.bindings[name] = callback
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    async def evaluate(self, script, args=None):
+        if script == CONTAINER_OBSERVER_SCRIPT:
+            self.install_calls += 1
+            return self.observer_installs
+        return None
+
+    def push(self, binding_name, count):
+        self.bindings[binding_name](None, count)
+
+
+class TestContainerAppendWatcher:
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_as_soon_as_containers_arrive(self):
+        page = FakePage()
+        watcher = ContainerAppendWatcher(page, batch_ms=0)
+        assert await watcher.start()
+
+        marker = await watcher.arm()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, page.push, watcher.binding_name, 6)
+        loop.call_later(0.1, page.push, watcher.binding_name, 4)
+
+        started = time.monotonic()
+        appended = await watcher.wait_for_new(marker, timeout=5.0, settle=0.2)
+        elapsed = time.monotonic() - started
+
+        assert appended == 10
+        assert elapsed < 1.0
+        assert watcher.events_received == 2
+
+    @pytest.mark.asyncio
+    async def test_quiet_period_reports_no_new_content(self):
+        page = FakePage()
+        watcher = ContainerAppendWatcher(page)
+        await watcher.start()
+
+        marker = await watcher.arm()
+        assert await watcher.wait_for_new(marker, timeout=0.1) == 0
+
+    @pytest.mark.asyncio
+    async def test_observer_reinstalled_after_navigation(self):
+        page = FakePage()
+        watcher = ContainerAppendWatcher(page)
+        await watcher.start()
+
+        for handler in page.listeners["framenavigated"]:
+            handler(page.main_frame)
+        await watcher.arm()
+
+        assert page.install_calls == 2
+        assert watcher.active
+
+    @pytest.mark.asyncio
+    async def test_unavailable_binding_leaves_watcher_inactive(self):
+        page = MagicMock()
+        page.expose_binding = AsyncMock(side_effect=Exception("Function already registered"))
+        watcher = ContainerAppendWatcher(page)
+
+        assert not await watcher.start()
+        assert await watcher.arm() == 0
+        page.evaluate.assert_not_called()
+
+
+class TestBoundaryScrollManagerEvents:
+
+    @pytest.mark.asyncio
+    async def test_dom_update_wait_uses_events_when_enabled(self):
+        page = FakePage()
+        manager = BoundaryScrollManager(page)
+        assert await manager.enable_container_events()
+
+        marker = await manager.container_watcher.arm()
+        asyncio.get_running_loop().call_later(0.05, page.push, manager.container_watcher.binding_name, 3)
+
+        started = time.monotonic()
+        assert await manager.wait_for_dom_update(marker, 5.0) == 3
+        assert time.monotonic() - started < 1.0
+
+    @pytest.mark.asyncio
+    async def test_dom_update_wait_falls_back_to_sleep(self):
+        manager = BoundaryScrollManager(FakePage(observer_installs=False))
+        assert not await manager.enable_container_events()
+
+        started = time.monotonic()
+        assert await manager.wait_for_dom_update(0, 0.05) == 0
+        assert time.monotonic() - started >= 0.05
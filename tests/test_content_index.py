@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test Content Index
+==================
+
+Validates chunked file hashing, the persistent append-only content-hash
+index of the downloads folder, and that the download manager drops
+byte-identical re-downloads and appends to its JSON lines ledger instead of
+rewriting it.
+"""
+
+import hashlib
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.content_index import INDEX_FILENAME, ContentHashIndex, hash_file
+from src.utils.download_manager import DownloadConfig, DownloadInfo, DownloadManager, read_download_log
+
+
+def make_download(path):
+    return DownloadInfo(filename=path.name, original_filename=path.name, file_path=str(path),
+                        file_size=0, download_time=datetime.now(), source_url="https://example.com")
+
+
+class TestHashing:
+
+    def test_chunked_hash_matches_sha256(self, tmp_path):
+        content = os.urandom(10_000)
+        path = tmp_path / "video.mp4"
+        path.write_bytes(content)
+
+        assert hash_file(path, chunk_size=4096) == hashlib.sha256(content).hexdigest()
+        assert hash_file(tmp_path / "video.mp4") == hashlib.sha256(content).hexdigest()
+
+
+class TestContentHashIndex:
+
+    def test_index_persists_and_skips_unchanged_files(self, tmp_path):
+        (tmp_path / "a.mp4").write_bytes(b"first")
+        (tmp_path / "2025-09-01").mkdir()
+        (tmp_path / "2025-09-01" / "b.mp4").write_bytes(b"second")
+
+        index = ContentHashIndex(tmp_path)
+        assert index.sync() == 2
+        assert index.find(hashlib.sha256(b"second").hexdigest()) == tmp_path / "2025-09-01" / "b.mp4"
+
+        reopened = ContentHashIndex(tmp_path)
+        assert len(reopened) == 2
+        assert reopened.sync() == 0
+        assert (tmp_path / INDEX_FILENAME).read_text().count("\n") == 2
+
+    def test_deleted_files_are_not_reported(self, tmp_path):
+        path = tmp_path / "a.mp4"
+        path.write_bytes(b"first")
+        index = ContentHashIndex(tmp_path)
+        digest = index.add(path)
+
+        assert index.find(digest, exclude=path) is None
+        path.unlink()
+        assert index.find(digest) is None
+        assert len(ContentHashIndex(tmp_path)) == 0
+
+
+class TestDownloadManagerDedupe:
+
+    @pytest.mark.asyncio
+    async def test_identical_redownload_is_dropped(self, tmp_path):
+        manager = DownloadManager(DownloadConfig(base_download_path=str(tmp_path), organize_by_date=False))
+        original = tmp_path / "video.mp4"
+        original.write_bytes(b"same bytes")
+        first = make_download(original)
+        await manager._verify_download(first)
+        assert first.status == "completed"
+
+        again = tmp_path / "video_1.mp4"
+        again.write_bytes(b"same bytes")
+        second = make_download(again)
+        await manager._verify_download(second)
+
+        assert second.status == "duplicate"
+        assert second.duplicate_of == str(original)
+        assert not again.exists()
+
+        other = tmp_path / "other.mp4"
+        other.write_bytes(b"different bytes")
+        third = make_download(other)
+        await manager._verify_download(third)
+        assert third.status == "completed"
+        assert third.checksum == hashlib.sha256(b"different bytes").hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_ledger_is_appended(self, tmp_path):
+        manager = DownloadManager(DownloadConfig(base_download_path=str(tmp_path), organize_by_date=False))
+        (tmp_path / "download_log.json").write_text('[{"filename": "legacy.mp4"}]')
+
+        for name in ("one.mp4", "two.mp4"):
+            await manager._log_download(make_download(tmp_path / name))
+
+        assert (tmp_path / "download_log.jsonl").read_text().count("\n") == 2
+        assert [entry["filename"] for entry in read_download_log(str(tmp_path))] == \
+            ["legacy.mp4", "one.mp4", "two.mp4"]
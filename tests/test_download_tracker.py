@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test Event-Driven Download Tracker
+==================================
+
+Validates that Playwright download events resolve the generation that
+registered for them, with the saved path and size, without polling the
+downloads folder.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.download_tracker import DownloadTracker
+
+
+class FakeDownload:
+    """Minimal stand-in for a Playwright Download"""
+
+    def __init__(self, page, suggested_filename="video.mp4", content=b"data"):
+        self.page = page
+        self.suggested_filename = suggested_filename
+        self.url = f"https://example.com/{suggested_filename}"
+        self.content = content
+
+    async def save_as(self, path):
+        await asyncio.sleep(0)
+        Path(path).write_bytes(self.content)
+
+
+class FakeContext:
+    """Records listeners registered through ``on``"""
+
+    def __init__(self):
+        self.listeners = []
+
+    def on(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove((event, handler))
+
+    def emit(self, download):
+        for event, handler in list(self.listeners):
+            if event == "download":
+                handler(download)
+
+
+class TestDownloadTracker:
+    """Test routing of download events to waiting generations"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker = DownloadTracker(self.temp_dir)
+        self.context = FakeContext()
+
+    @pytest.mark.asyncio
+    async def test_download_resolves_expectation_with_path_and_size(self):
+        """The saved path and size are returned to the generation that triggered it"""
+        page = object()
+        assert self.tracker.attach(self.context) is True
+        assert self.tracker.attach(self.context) is False  # idempotent
+
+        target = Path(self.temp_dir) / "gen_temp.mp4"
+        expectation = self.tracker.expect("24 Aug 2025 01:37:01", page=page, target_path=target)
+        self.context.emit(FakeDownload(page, content=b"12345"))
+
+        result = await self.tracker.wait(expectation, timeout=1)
+
+        assert result.success
+        assert result.key == "24 Aug 2025 01:37:01"
+        assert result.path == target
+        assert result.size == 5
+        assert expectation.started is True
+        assert self.tracker.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_downloads_are_matched_by_source_page(self):
+        """Concurrent pages each receive their own download"""
+        page_a, page_b = object(), object()
+        self.tracker.attach(self.context)
+        first = self.tracker.expect("a", page=page_a, target_path=Path(self.temp_dir) / "a.mp4")
+        second = self.tracker.expect("b", page=page_b, target_path=Path(self.temp_dir) / "b.mp4")
+
+        self.context.emit(FakeDownload(page_b, "b.mp4"))
+        self.context.emit(FakeDownload(page_a, "a.mp4"))
+
+        result_a = await self.tracker.wait(first, timeout=1)
+        result_b = await self.tracker.wait(second, timeout=1)
+        assert result_a.suggested_filename == "a.mp4"
+        assert result_b.suggested_filename == "b.mp4"
+
+    @pytest.mark.asyncio
+    async def test_untracked_download_saved_under_suggested_name(self):
+        """Downloads nobody is waiting for still land in the downloads folder"""
+        self.tracker.attach(self.context)
+        self.context.emit(FakeDownload(object(), "stray.mp4"))
+        await asyncio.sleep(0.01)
+
+        assert (Path(self.temp_dir) / "stray.mp4").exists()
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_drops_expectation(self):
+        """A download that never starts times out and is no longer pending"""
+        expectation = self.tracker.expect("missing", page=object())
+
+        assert await self.tracker.wait(expectation, timeout=0.01) is None
+        assert self.tracker.pending_count == 0
+
+        self.tracker.attach(self.context)
+        self.tracker.detach()
+        assert self.context.listeners == []
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test Downloads Manifest
+=======================
+
+Validates that the downloads-folder manifest persists across sessions, only
+lists the folder again when its mtime moved, records renames made by the
+file manager, and picks free filenames without probing taken candidates.
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.downloads_manifest import DownloadsManifest, parse_creation_time
+from src.utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+
+
+def touch(folder, name, content=b"video"):
+    path = folder / name
+    path.write_bytes(content)
+    return path
+
+
+class TestDownloadsManifest:
+
+    def test_parse_creation_time(self):
+        assert parse_creation_time("video_2025-08-27-02-20-06_gen_#000000001.mp4") == "2025-08-27-02-20-06"
+        assert parse_creation_time("vid_2025-08-27-02-20-06_skipTest.mp4") is None
+
+    def test_unchanged_folder_is_not_listed_again(self, tmp_path):
+        touch(tmp_path, "video_2025-08-27-02-20-06_gen_#000000001.mp4")
+        touch(tmp_path, "video_2025-08-28-10-00-00_gen_#000000002.mp4")
+        touch(tmp_path, "notes.txt")
+
+        manifest = DownloadsManifest(tmp_path)
+        assert manifest.refresh() == 2
+        assert manifest.creation_times() == {"2025-08-27-02-20-06", "2025-08-28-10-00-00"}
+
+        reopened = DownloadsManifest(tmp_path)
+        with patch("src.utils.downloads_manifest.os.scandir") as scandir:
+            assert reopened.refresh() == 0
+            scandir.assert_not_called()
+        assert len(reopened) == 2
+
+    def test_outside_changes_are_reconciled(self, tmp_path):
+        old = touch(tmp_path, "video_2025-08-27-02-20-06_gen_#000000001.mp4")
+        manifest = DownloadsManifest(tmp_path)
+        manifest.refresh()
+
+        old.unlink()
+        touch(tmp_path, "video_2025-09-01-12-00-00_gen_#000000003.mp4")
+
+        reopened = DownloadsManifest(tmp_path)
+        assert reopened.refresh() == 2
+        assert reopened.creation_times() == {"2025-09-01-12-00-00"}
+
+    def test_own_rename_keeps_manifest_current(self, tmp_path):
+        source = touch(tmp_path, "video_2025-08-27-02-20-06_gen_#000000001.mp4")
+        manifest = DownloadsManifest(tmp_path)
+        manifest.refresh()
+
+        target = tmp_path / "video_2025-08-27-02-20-06_gen_#000000009.mp4"
+        manifest.rename(source, target)
+
+        assert target.exists()
+        reopened = DownloadsManifest(tmp_path)
+        assert reopened.refresh() == 0
+        assert target.name in reopened and source.name not in reopened
+
+    def test_free_path_skips_known_names_without_stat(self, tmp_path):
+        touch(tmp_path, "vid_a.mp4")
+        touch(tmp_path, "vid_a_1.mp4")
+        manifest = DownloadsManifest(tmp_path)
+        manifest.refresh()
+
+        assert manifest.free_path(tmp_path / "vid_a.mp4") == tmp_path / "vid_a_2.mp4"
+        assert manifest.free_path(tmp_path / "vid_b.mp4") == tmp_path / "vid_b.mp4"
+
+        # Appeared outside the manifest: still detected by the final exists() check
+        touch(tmp_path, "vid_a_2.mp4")
+        assert manifest.free_path(tmp_path / "vid_a.mp4") == tmp_path / "vid_a_3.mp4"
+
+
+class TestManagerUsesManifest:
+
+    def test_scan_and_rename_go_through_manifest(self, tmp_path):
+        downloads = tmp_path / "downloads"
+        config = GenerationDownloadConfig(downloads_folder=str(downloads), logs_folder=str(tmp_path / "logs"))
+        manager = GenerationDownloadManager(config)
+        touch(downloads, "video_2025-08-27-02-20-06_gen_#000000001.mp4")
+
+        assert manager.scan_existing_files() == {"2025-08-27-02-20-06"}
+
+        downloaded = touch(downloads, "download.mp4")
+        renamed = manager.file_manager.rename_file(downloaded, creation_date="28 Aug 2025 10:00:00")
+        assert renamed.exists()
+        assert renamed.name in manager.file_manager.manifest
+
+        target = manager._skip_test_target_path("05 Sep 2025 17:06:29")
+        touch(downloads, target.name)
+        manager.file_manager.manifest.record(target)
+        assert manager._skip_test_target_path("05 Sep 2025 17:06:29").name == \
+            "vid_2025-09-05-17-06-29_skipTest_v1.mp4"
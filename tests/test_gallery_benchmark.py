@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test Synthetic Gallery Benchmark
+================================
+
+Validates the synthetic /generate fixture (deterministic items, container
+markup, infinite-scroll paging, deletes, attachment downloads) and the
+benchmark report helpers (phase percentiles, regression comparison).
+"""
+
+import json
+import sys
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.benchmarks.gallery_benchmark import PhaseTimer, compare_reports, percentile
+from scripts.benchmarks.gallery_fixture import GalleryFixture
+
+
+def _get(url):
+    with urllib.request.urlopen(url) as response:
+        return response.status, dict(response.headers), response.read()
+
+
+class TestGalleryFixture:
+
+    def test_items_are_deterministic_and_newest_first(self):
+        fixture = GalleryFixture(items=10000, seed=7, queued=2)
+        first, second = fixture.item(2), fixture.item(3)
+
+        assert fixture.item(2) == first
+        assert first.hash_id != second.hash_id
+        assert first.creation_time == "03 Sep 2025 16:12:04"
+        assert fixture.item(0).status == "Queuing"
+        assert fixture.item(1).status == "Video is rendering"
+        assert first.status is None
+        assert (datetime.strptime(fixture.item(9999).creation_time, "%d %b %Y %H:%M:%S")
+                < datetime.strptime(fixture.item(9998).creation_time, "%d %b %Y %H:%M:%S"))
+        assert fixture.downloadable_items == 9998
+
+    def test_page_renders_initial_batch_and_api_pages_after_deletes(self):
+        with GalleryFixture(items=100, initial_batch=5, page_size=4) as fixture:
+            status, _, body = _get(fixture.generate_url)
+            page = body.decode()
+            assert status == 200
+            assert fixture.item(4).hash_id in page
+            assert fixture.item(5).hash_id not in page
+            assert 'right-container-operation' in page
+
+            deleted = fixture.item(6).hash_id
+            request = urllib.request.Request(f"{fixture.url}/api/delete?hash={deleted}", method="POST")
+            with urllib.request.urlopen(request) as response:
+                assert response.status == 204
+
+            _, _, body = _get(f"{fixture.url}/api/generations?after=4&limit=4")
+            data = json.loads(body)
+            assert [item['position'] for item in data['items']] == [5, 7, 8, 9]
+            assert data['has_more'] is True
+            assert fixture.request_counts['api'] == 1
+
+    def test_download_is_served_as_attachment(self):
+        with GalleryFixture(items=10, download_bytes=4096) as fixture:
+            hash_id = fixture.item(3).hash_id
+            status, headers, body = _get(f"{fixture.url}/download/{hash_id}.mp4")
+
+        assert status == 200
+        assert headers['Content-Disposition'] == f'attachment; filename="{hash_id}.mp4"'
+        assert len(body) == 4096
+        assert fixture.downloaded[hash_id] == 1
+
+
+class TestBenchmarkReport:
+
+    def test_percentile_nearest_rank(self):
+        values = [0.1 * i for i in range(1, 21)]
+        assert percentile(values, 50) == pytest.approx(1.0)
+        assert percentile(values, 95) == pytest.approx(1.9)
+        assert percentile([], 95) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_phase_timer_wraps_manager_methods_and_named_waits(self):
+        class Waits:
+            async def wait(self, page, name, default=None):
+                return True
+
+        class Manager:
+            def __init__(self):
+                self.page_waits = Waits()
+
+            async def _close_gallery_view(self, page):
+                return True
+
+        manager = Manager()
+        timer = PhaseTimer()
+        timer.instrument(manager)
+
+        assert await manager._close_gallery_view(None)
+        assert await manager.page_waits.wait(None, "gallery_closed")
+        summary = timer.summary()
+        assert summary['close_gallery']['count'] == 1
+        assert summary['wait:gallery_closed']['count'] == 1
+
+    def test_compare_flags_throughput_drop_and_phase_growth(self):
+        baseline = {'items_per_minute': 10.0, 'rpcs_per_item': 50.0, 'peak_rss_mb': 400.0,
+                    'phases': {'delete': {'p95': 5.0}, 'download': {'p95': 1.0}}}
+        current = {'items_per_minute': 7.0, 'rpcs_per_item': 52.0, 'peak_rss_mb': None,
+                   'phases': {'delete': {'p95': 5.1}, 'download': {'p95': 1.5}}}
+
+        regressions = compare_reports(current, baseline, tolerance=0.15)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("items_per_minute")
+        assert regressions[1].startswith("download p95")
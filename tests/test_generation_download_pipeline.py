@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test Concurrent Generation Download Pipeline
+============================================
+
+Validates that the pipelined container mode bounds in-flight downloads,
+spreads work over worker pages and keeps log writes in scan order even when
+downloads finish out of order.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.download_tracker import TrackedDownload
+from src.utils.generation_download_manager import GenerationDownloadConfig
+from src.utils.generation_download_pipeline import GenerationDownloadPipeline, OrderedLogWriter
+
+
+class FakeContainer:
+    def __init__(self, hash_id):
+        self.hash_id = hash_id
+
+    async def count(self):
+        return 1
+
+    async def is_visible(self):
+        return True
+
+    async def click(self):
+        pass
+
+
+class FakePage:
+    def __init__(self, context=None, snapshots=None):
+        self.context = context
+        self.url = "https://example.com/generate"
+        self.snapshots = list(snapshots or [])
+        self.closed = False
+
+    async def evaluate(self, script):
+        if "querySelectorAll" in script:
+            return self.snapshots.pop(0) if self.snapshots else []
+        return None
+
+    async def wait_for_timeout(self, ms):
+        await asyncio.sleep(0)
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+
+class FakeManager:
+    """Records the manager calls the pipeline makes"""
+
+    def __init__(self, config, delays):
+        self.config = config
+        self.delays = delays
+        self.logged = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self.pages_used = set()
+
+    def _get_container_hash_id(self, full_container_id):
+        return full_container_id.split('__')[0]
+
+    def _find_container_by_hash_id(self, page, hash_id):
+        return FakeContainer(hash_id)
+
+    def check_duplicate_exists(self, creation_time, prompt_text):
+        return creation_time == "dup"
+
+    async def _delete_duplicate_generation(self, *args):
+        return True
+
+    async def _delete_downloaded_generation(self, *args):
+        return True
+
+    async def _close_gallery_view(self, page):
+        return True
+
+    async def _open_download_options(self, page, index):
+        return object(), "without"
+
+    async def _click_and_track_download(self, page, option, selected, creation_time):
+        self.pages_used.add(id(page))
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        await asyncio.sleep(self.delays.get(creation_time, 0))
+        self.inflight -= 1
+        return TrackedDownload(key=creation_time, path=Path(f"/tmp/{creation_time}.mp4"), size=1, suggested_filename="v.mp4")
+
+    async def _process_tracked_download(self, creation_time, prompt_text, tracked, hash_id=None):
+        self.logged.append(creation_time)
+        return True
+
+
+def make_snapshot(times):
+    return [{'id': f"hash{t}__{i}", 'text': f"Creation Time {t}"} for i, t in enumerate(times)]
+
+
+@pytest.fixture
+def patch_metadata(monkeypatch):
+    async def fake_extract(container, text_content):
+        return {'creation_time': text_content.replace("Creation Time ", ""), 'prompt': "prompt"}
+    monkeypatch.setattr("src.utils.generation_download_pipeline.extract_container_metadata_enhanced", fake_extract)
+
+
+class TestOrderedLogWriter:
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_submissions_are_written_in_sequence(self):
+        writer = OrderedLogWriter()
+        written = []
+        sequences = [writer.reserve() for _ in range(3)]
+
+        async def write(value):
+            written.append(value)
+
+        await writer.submit(sequences[2], lambda: write("c"))
+        await writer.submit(sequences[1], None)
+        assert written == []
+        assert writer.backlog == 2
+
+        await writer.submit(sequences[0], lambda: write("a"))
+        assert written == ["a", "c"]
+        assert writer.backlog == 0
+
+
+class TestGenerationDownloadPipeline:
+
+    def make_pipeline(self, times, delays=None, **config_overrides):
+        config = GenerationDownloadConfig(pipeline_workers=3, max_inflight_downloads=2, scroll_wait_time=0, **config_overrides)
+        manager = FakeManager(config, delays or {})
+        page = FakePage(FakeContext(), snapshots=[make_snapshot(times)])
+        return GenerationDownloadPipeline(manager, page), manager, page
+
+    @pytest.mark.asyncio
+    async def test_log_order_preserved_and_inflight_bounded(self, patch_metadata):
+        times = ["t1", "t2", "t3", "t4", "t5"]
+        pipeline, manager, page = self.make_pipeline(times, delays={"t1": 0.05, "t2": 0.01})
+
+        results = await pipeline.run({'errors': []})
+
+        assert results['downloads_completed'] == 5
+        assert manager.logged == times
+        assert manager.max_inflight <= 2
+        assert len(manager.pages_used) > 1
+        assert all(worker.closed for worker in page.context.pages)
+
+    @pytest.mark.asyncio
+    async def test_duplicates_skipped_and_max_downloads_respected(self, patch_metadata):
+        pipeline, manager, _ = self.make_pipeline(["t1", "dup", "t2", "t3"], max_downloads=2)
+
+        results = await pipeline.run({'errors': []})
+
+        assert results['downloads_completed'] == 2
+        assert manager.logged == ["t1", "t2"]
+
+    @pytest.mark.asyncio
+    async def test_scanner_failure_stops_workers(self, patch_metadata):
+        pipeline, manager, page = self.make_pipeline(["t1"])
+
+        async def closed_page(script):
+            raise RuntimeError("Target page, context or browser has been closed")
+        page.evaluate = closed_page
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pipeline.run({'errors': []}), timeout=5)
+
+        assert all(worker.closed for worker in page.context.pages)
+        assert not [task for task in asyncio.all_tasks() if task.get_name().startswith("pipeline-")]
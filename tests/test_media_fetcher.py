@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test Direct Media Fetch
+=======================
+
+Validates that media URLs found in the DOM are fetched through the browser
+context's request API and written atomically to the target filename, that
+anything other than a media response falls back to the download button, and
+that a direct fetch completes the download the caller was waiting for.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+from src.utils.media_fetcher import DirectMediaFetcher
+
+
+class FakeResponse:
+    """Minimal stand-in for a Playwright APIResponse"""
+
+    def __init__(self, body=b"video-bytes", status=200, content_type="video/mp4"):
+        self._body = body
+        self.status = status
+        self.ok = 200 <= status < 300
+        self.headers = {"content-type": content_type}
+        self.disposed = False
+
+    async def body(self):
+        return self._body
+
+    async def dispose(self):
+        self.disposed = True
+
+
+class FakeRequest:
+    def __init__(self, response):
+        self.response = response
+        self.urls = []
+
+    async def get(self, url, timeout=None):
+        self.urls.append(url)
+        return self.response
+
+
+class FakeContext:
+    def __init__(self, response):
+        self.request = FakeRequest(response)
+
+
+class FakePage:
+    """Page whose gallery panel exposes ``gallery_url``"""
+
+    def __init__(self, response=None, gallery_url=None):
+        self.context = FakeContext(response or FakeResponse())
+        self.gallery_url = gallery_url
+
+    async def evaluate(self, script, args=None):
+        return self.gallery_url
+
+
+class FakeContainer:
+    def __init__(self, url=None):
+        self.url = url
+
+    async def evaluate(self, script, selectors):
+        return self.url
+
+
+class TestDirectMediaFetcher:
+
+    @pytest.mark.asyncio
+    async def test_container_url_is_preferred_over_gallery(self):
+        fetcher = DirectMediaFetcher()
+        page = FakePage(gallery_url="https://cdn.example.com/gallery.mp4")
+
+        assert await fetcher.resolve_url(page, FakeContainer("https://cdn.example.com/card.mp4")) == \
+            "https://cdn.example.com/card.mp4"
+        assert await fetcher.resolve_url(page, FakeContainer()) == "https://cdn.example.com/gallery.mp4"
+        assert await fetcher.resolve_url(None, FakeContainer()) is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_writes_target_atomically(self, tmp_path):
+        fetcher = DirectMediaFetcher()
+        response = FakeResponse(body=b"x" * 2048)
+        page = FakePage(response, gallery_url="https://cdn.example.com/v/abc.mp4")
+        target = tmp_path / "downloads" / "vid_001.mp4"
+
+        tracked = await fetcher.try_fetch(page, "03 Sep 2025 16:15:18", target)
+
+        assert tracked.success
+        assert tracked.path == target
+        assert target.read_bytes() == b"x" * 2048
+        assert not target.with_name(target.name + ".part").exists()
+        assert response.disposed
+        assert fetcher.get_stats()["fetched"] == 1
+        assert fetcher.get_stats()["bytes_fetched"] == 2048
+
+    @pytest.mark.asyncio
+    async def test_non_media_response_falls_back(self, tmp_path):
+        fetcher = DirectMediaFetcher()
+        target = tmp_path / "vid_001.mp4"
+
+        login_page = FakePage(FakeResponse(b"<html>", content_type="text/html"), gallery_url="https://x/a.mp4")
+        assert await fetcher.try_fetch(login_page, "key", target) is None
+
+        forbidden = FakePage(FakeResponse(status=403), gallery_url="https://x/a.mp4")
+        assert await fetcher.try_fetch(forbidden, "key", target) is None
+
+        assert await fetcher.try_fetch(FakePage(), "key", target) is None
+        assert not target.exists()
+        stats = fetcher.get_stats()
+        assert (stats["failed"], stats["unresolved"]) == (2, 1)
+
+
+class TestDownloadSequenceFastPath:
+
+    @pytest.mark.asyncio
+    async def test_direct_fetch_resolves_expected_download(self, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"),
+                                          logs_folder=str(tmp_path / "logs"), direct_fetch_enabled=True)
+        manager = GenerationDownloadManager(config)
+        page = FakePage(gallery_url="https://cdn.example.com/v/abc.mp4")
+        target = Path(config.downloads_folder) / "vid_001.mp4"
+
+        expectation = manager.download_tracker.expect("03 Sep 2025 16:15:18", page=page, target_path=target)
+        assert manager.download_tracker.pending_for(page) is expectation
+
+        assert await manager.execute_download_sequence(page)
+        tracked = await manager.download_tracker.wait(expectation, timeout=1)
+
+        assert tracked.path == target and target.exists()
+        assert manager.download_tracker.pending_for(page) is None
+        assert manager.get_status()["direct_fetch"]["fetched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"),
+                                          logs_folder=str(tmp_path / "logs"))
+        manager = GenerationDownloadManager(config)
+        page = FakePage(gallery_url="https://cdn.example.com/v/abc.mp4")
+
+        assert await manager._fetch_media_directly(page, "key", tmp_path / "vid.mp4") is None
+        assert page.context.request.urls == []
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test Metrics Registry
+=====================
+
+Validates fixed-memory latency histograms, windowed rates, Prometheus text
+exposition and the local metrics endpoint, and that the performance monitor
+and download manager feed the registry without unbounded history.
+"""
+
+import os
+import random
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils import metrics_registry
+from src.utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+from src.utils.metrics_registry import Histogram, MetricsRegistry, MetricsServer, RateWindow, ResourceSampler
+from src.utils.performance_monitor import PerformanceMonitor
+
+
+class TestHistogram:
+
+    def test_quantiles_stay_within_bucket_precision(self):
+        rng = random.Random(3)
+        values = sorted(rng.uniform(0.05, 12.0) for _ in range(20000))
+        histogram = Histogram()
+        for value in values:
+            histogram.observe(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            assert histogram.quantile(q) == pytest.approx(exact, rel=0.07)
+        assert len(histogram.counts) == Histogram.BUCKET_COUNT
+        assert histogram.count == 20000
+
+    def test_bucket_bounds_contain_their_values(self):
+        for micros in (0, 7, 31, 32, 1000, 123456, 3_600_000_000):
+            lower, upper = Histogram.bucket_bounds(Histogram.bucket_index(micros))
+            assert lower <= micros < upper
+
+
+class TestRateWindow:
+
+    def test_rate_counts_only_recent_slots(self):
+        now = [1000.0]
+        window = RateWindow(window_seconds=60, slots=6, clock=lambda: now[0])
+
+        for _ in range(30):
+            window.mark()
+        now[0] += 30
+        assert window.per_minute() == pytest.approx(60.0)
+
+        now[0] += 60
+        assert window.per_minute() == 0.0
+
+
+class TestPrometheusExposition:
+
+    def test_render_counters_gauges_and_histograms(self):
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs", ("status",)).labels(status="ok").inc(3)
+        registry.gauge("depth", "Depth").set_function(lambda: 4)
+        latency = registry.histogram("latency_seconds", "Latency", ("action",))
+        for value in (0.004, 0.2, 0.2, 7.0):
+            latency.labels(action="click").observe(value)
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{status="ok"} 3' in text
+        assert "depth 4" in text
+        assert 'latency_seconds_bucket{action="click",le="0.005"} 1' in text
+        assert 'latency_seconds_bucket{action="click",le="0.25"} 3' in text
+        assert 'latency_seconds_bucket{action="click",le="+Inf"} 4' in text
+        assert 'latency_seconds_count{action="click"} 4' in text
+
+    def test_endpoint_serves_metrics(self):
+        registry = MetricsRegistry()
+        registry.counter("automaton_scroll_steps_total", "Scroll steps").inc(5)
+        server = MetricsServer(registry, port=0).start()
+        try:
+            with urllib.request.urlopen(server.url) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(server.url.replace("/metrics", "/other"))
+        finally:
+            server.stop()
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert "automaton_scroll_steps_total 5" in body
+
+    def test_resource_sampler_sets_gauges(self):
+        registry = MetricsRegistry()
+        sampler = ResourceSampler(registry, interval=60)
+        sampler.sample()
+
+        if sampler._load_process() is not None:
+            assert registry.get("automaton_process_resident_memory_bytes").get() > 0
+            assert sampler.latest_rss_mb > 0
+
+
+class TestRegistryFeeds:
+
+    @pytest.mark.asyncio
+    async def test_monitor_keeps_bounded_history_and_running_totals(self):
+        monitor = PerformanceMonitor(max_history=3)
+        before = metrics_registry.ACTION_DURATION.labels(action="metrics_test_click").count
+
+        for index in range(10):
+            async with monitor.track_action("metrics_test_click", f"click {index}"):
+                pass
+        with pytest.raises(RuntimeError):
+            async with monitor.track_action("metrics_test_fill"):
+                raise RuntimeError("selector missing")
+
+        summary = monitor.get_summary()
+        assert len(monitor.metrics) == 3
+        assert summary["total_actions"] == 11
+        assert summary["action_breakdown"]["metrics_test_click"]["count"] == 10
+        assert summary["action_breakdown"]["metrics_test_fill"]["success_rate"] == 0
+        assert len(summary["slowest_actions"]) == 5
+        assert metrics_registry.ACTION_DURATION.labels(action="metrics_test_click").count == before + 10
+        assert metrics_registry.ACTIONS.labels(action="metrics_test_fill", status="failure").get() >= 1
+
+    @pytest.mark.asyncio
+    async def test_monitor_starts_sampler_on_first_action(self):
+        class FakeSampler:
+            def __init__(self, available):
+                self.available, self.running, self.starts = available, False, 0
+                self.latest_rss_mb, self.latest_cpu_percent = 100.0, 12.5
+
+            def start(self):
+                self.starts += 1
+                self.running = self.available
+                return self.available
+
+        monitor = PerformanceMonitor()
+        monitor.sampler = FakeSampler(available=True)
+        for _ in range(2):
+            async with monitor.track_action("metrics_test_sampled"):
+                pass
+        assert monitor.sampler.starts == 1
+        assert monitor.metrics[-1].memory_usage_mb == 0.0
+        assert monitor.metrics[-1].cpu_percent == 12.5
+
+        monitor = PerformanceMonitor()
+        monitor.sampler = FakeSampler(available=False)
+        for _ in range(2):
+            async with monitor.track_action("metrics_test_unsampled"):
+                pass
+        assert monitor.sampler.starts == 1
+        assert monitor.metrics[-1].memory_usage_mb is None
+        assert monitor.metrics[-1].cpu_percent is None
+
+    @pytest.mark.asyncio
+    async def test_download_manager_counts_downloads_and_duplicates(self, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"),
+                                          logs_folder=str(tmp_path / "logs"))
+        manager = GenerationDownloadManager(config)
+        downloads = metrics_registry.DOWNLOADS.labels(status="success")
+        before_downloads, before_duplicates = downloads.get(), metrics_registry.DUPLICATE_HITS.get()
+
+        tracked = SimpleNamespace(success=True, path=Path("video.mp4"), size=10, duration=0.5)
+        assert await manager._process_tracked_download("03 Sep 2025 16:12:04", "prompt", tracked)
+        manager.existing_log_entries = {"03 Sep 2025 16:12:04": {"prompt": "prompt", "file_id": "#000000001"}}
+        assert manager.check_duplicate_exists("03 Sep 2025 16:12:04", "prompt")
+
+        assert downloads.get() == before_downloads + 1
+        assert metrics_registry.DUPLICATE_HITS.get() == before_duplicates + 1
+        assert metrics_registry.metrics_registry.get("automaton_downloads_per_minute").get() > 0
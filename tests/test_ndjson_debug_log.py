@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Debug Log
+========================
+
+Validates the append-only NDJSON writer (ordering, rotation, torn-line
+tolerance) and that GenerationDebugLogger streams events, keeps a bounded
+in-memory ring and rebuilds the aggregated JSON view on demand.
+"""
+
+import json
+import os
+import sys
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.generation_debug_logger import GenerationDebugLogger, load_debug_view
+from src.utils.ndjson_writer import NDJSONWriter, read_ndjson, rotated_path
+
+
+class TestNDJSONWriter:
+
+    def test_records_are_appended_in_order(self, tmp_path):
+        writer = NDJSONWriter(tmp_path / "events.ndjson")
+        for index in range(50):
+            writer.write({"index": index})
+        writer.flush()
+
+        assert [record["index"] for record in read_ndjson(writer.path)] == list(range(50))
+        writer.close()
+
+    def test_rotation_keeps_backups_and_reader_spans_them(self, tmp_path):
+        writer = NDJSONWriter(tmp_path / "events.ndjson", max_bytes=200, backup_count=2)
+        for index in range(40):
+            writer.write({"index": index, "pad": "x" * 20})
+        writer.close()
+
+        assert writer.rotations > 2
+        assert rotated_path(writer.path, 1).exists()
+        assert rotated_path(writer.path, 2).exists()
+        assert not rotated_path(writer.path, 3).exists()
+
+        indices = [record["index"] for record in read_ndjson(writer.path)]
+        assert indices == sorted(indices)
+        assert indices[-1] == 39
+        assert os.path.getsize(writer.path) <= 200 + 64
+
+    def test_torn_final_line_is_skipped(self, tmp_path):
+        path = tmp_path / "events.ndjson"
+        path.write_text('{"index": 0}\n{"index": 1}\n{"ind')
+
+        assert [record["index"] for record in read_ndjson(path)] == [0, 1]
+
+
+class TestStreamingDebugLogger:
+
+    def test_ring_is_bounded_but_summary_counts_everything(self, tmp_path):
+        debug_logger = GenerationDebugLogger(str(tmp_path), ring_size=10)
+        for index in range(25):
+            debug_logger.log_step(index, "STEP", {"index": index})
+
+        assert isinstance(debug_logger.debug_data["steps"], list)
+        assert len(debug_logger.debug_data["steps"]) == 10
+        assert debug_logger.debug_data["steps"][0]["thumbnail_index"] == 15
+        assert debug_logger.get_debug_summary()["total_steps"] == 25
+
+    def test_debug_view_rebuilt_from_stream(self, tmp_path):
+        debug_logger = GenerationDebugLogger(str(tmp_path), ring_size=5)
+        debug_logger.log_configuration({"max_downloads": 3})
+        for index in range(12):
+            debug_logger.log_step(index, "STEP", {"index": index})
+        debug_logger.log_thumbnail_click(0, "div.thumb", True)
+        debug_logger.flush()
+
+        view = load_debug_view(debug_logger.debug_stream_file)
+        assert view["configuration"] == {"max_downloads": 3}
+        assert [step["thumbnail_index"] for step in view["steps"]] == list(range(12))
+        assert len(view["thumbnail_clicks"]) == 1
+
+        summary = debug_logger.finalize_debug_session()
+        with open(debug_logger.debug_log_file, encoding='utf-8') as f:
+            saved = json.load(f)
+        assert "end_time" in saved["session_info"]
+        assert len(saved["steps"]) == 12
+        assert summary["debug_stream_file"] == str(debug_logger.debug_stream_file)
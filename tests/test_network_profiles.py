@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test Network Profiles
+=====================
+
+Validates that request-blocking profiles abort the resource types and
+tracker hosts they cover, keep per-profile counts and byte estimates, and
+that the download manager switches a page between the scan and download
+profiles and restores it afterwards.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core.browser_manager import BrowserConfig
+from src.utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+from src.utils.network_profiles import (NETWORK_PROFILES, RequestBlocker, get_request_blocker, merge_reports,
+                                        network_phase)
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self, error_code=None):
+        self.outcome = "aborted"
+
+
+class FakeTarget:
+    """Page/context stand-in recording route and listener registration"""
+
+    def __init__(self, context=None):
+        self.context = context
+        self.handler = None
+        self.listeners = {}
+        self.route_calls = 0
+
+    async def route(self, pattern, handler):
+        self.route_calls += 1
+        self.handler = handler
+
+    async def unroute(self, pattern, handler):
+        self.handler = None
+
+    def on(self, event, handler):
+        self.listeners[event] = handler
+
+    def remove_listener(self, event, handler):
+        self.listeners.pop(event, None)
+
+    async def request(self, resource_type, url="https://cdn.example.com/a"):
+        route = FakeRoute(resource_type, url)
+        if self.handler is None:
+            route.outcome = "unrouted"
+        else:
+            await self.handler(route)
+        return route.outcome
+
+
+class TestRequestBlocker:
+
+    @pytest.mark.asyncio
+    async def test_scan_profile_blocks_media_and_trackers(self):
+        page = FakeTarget()
+        blocker = RequestBlocker(page)
+        await blocker.set_profile("scan")
+
+        assert await page.request("image") == "aborted"
+        assert await page.request("media") == "aborted"
+        assert await page.request("font") == "aborted"
+        assert await page.request("script", "https://g.alicdn.com/alilog/mlog/aplus.js") == "aborted"
+        assert await page.request("xhr") == "continued"
+        assert await page.request("document") == "continued"
+
+        stats = blocker.report()["scan"]
+        assert stats["blocked_requests"] == 4
+        assert stats["allowed_requests"] == 2
+        assert stats["blocked_by_type"]["tracker"] == 1
+        assert stats["bytes_saved_estimate"] > 0
+
+    @pytest.mark.asyncio
+    async def test_full_profile_removes_route_and_learns_sizes(self):
+        page = FakeTarget()
+        blocker = RequestBlocker(page)
+        await blocker.set_profile("scan")
+        await blocker.set_profile("full")
+
+        assert await page.request("image") == "unrouted"
+
+        response = SimpleNamespace(headers={"content-length": "1000"}, url="https://cdn.example.com/x.png",
+                                   request=SimpleNamespace(resource_type="image"))
+        page.listeners["response"](response)
+        assert blocker.estimated_size("image") == 1000
+
+        await blocker.set_profile("scan")
+        await page.request("image")
+        assert blocker.report()["scan"]["bytes_saved_estimate"] == 1000
+        assert page.route_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_page_keeps_route_to_override_blocking_context(self):
+        context = FakeTarget()
+        await get_request_blocker(context).set_profile("scan")
+        page = FakeTarget(context)
+        await get_request_blocker(page).set_profile("full")
+
+        assert await page.request("image") == "continued"
+
+    def test_unknown_profile_is_rejected(self):
+        with pytest.raises(ValueError):
+            RequestBlocker(FakeTarget(), "none")
+        with pytest.raises(ValueError):
+            BrowserConfig(network_profile="none")
+        assert BrowserConfig(network_profile="scan").network_profile in NETWORK_PROFILES
+
+    def test_merge_reports_sums_profiles(self):
+        first = {"scan": {"allowed_requests": 1, "blocked_requests": 2, "bytes_saved_estimate": 10,
+                          "blocked_by_type": {"image": 2}}}
+        second = {"scan": {"allowed_requests": 0, "blocked_requests": 1, "bytes_saved_estimate": 5,
+                           "blocked_by_type": {"font": 1}}}
+
+        merged = merge_reports(first, second)["scan"]
+        assert merged["blocked_requests"] == 3
+        assert merged["blocked_by_type"] == {"image": 2, "font": 1}
+
+
+class TestDownloadPhases:
+
+    @pytest.mark.asyncio
+    async def test_phases_switch_and_restore_profiles(self, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"),
+                                          logs_folder=str(tmp_path / "logs"))
+
+        class Phases:
+            def __init__(self):
+                self.config = config
+                self.network_blockers = []
+                self.seen = []
+
+            @network_phase("scan_network_profile")
+            async def scan(self, page):
+                self.seen.append(get_request_blocker(page).profile_name)
+                await self.download(page)
+                self.seen.append(get_request_blocker(page).profile_name)
+
+            @network_phase("download_network_profile")
+            async def download(self, page):
+                self.seen.append(get_request_blocker(page).profile_name)
+
+        page = FakeTarget()
+        phases = Phases()
+        await phases.scan(page)
+
+        assert phases.seen == ["scan", "download", "scan"]
+        assert get_request_blocker(page).profile_name == "full"
+        assert len(phases.network_blockers) == 1
+
+    @pytest.mark.asyncio
+    async def test_manager_reports_blocked_requests(self, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"),
+                                          logs_folder=str(tmp_path / "logs"))
+        manager = GenerationDownloadManager(config)
+        page = FakeTarget()
+
+        @network_phase("scan_network_profile")
+        async def scroll(self, page):
+            await page.request("image")
+
+        await scroll(manager, page)
+
+        assert manager.network_report()["scan"]["blocked_requests"] == 1
+        assert manager.get_status()["network_profiles"]["scan"]["blocked_requests"] == 1
+
+        config.scan_network_profile = None
+        await scroll(manager, page)
+        assert manager.network_report()["scan"]["blocked_requests"] == 1
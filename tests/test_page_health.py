@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Page Health Monitor
+========================
+
+Validates that page liveness is tracked from crash/close/framenavigated
+events and that actions only pay for a responsiveness probe after a
+navigation or a failed action.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core.action_types import Action, ActionType, AutomationConfig
+from src.core.engine import WebAutomationEngine
+from src.core.page_health import PageClosedError, PageHealthMonitor
+
+
+class FakePage:
+    """Page stand-in with Playwright-style event listeners"""
+
+    def __init__(self):
+        self.main_frame = object()
+        self.listeners = {}
+        self.evaluations = 0
+        self.url = "https://example.com"
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def emit(self, event, *args):
+        for handler in list(self.listeners.get(event, [])):
+            handler(*args)
+
+    async def evaluate(self, script):
+        self.evaluations += 1
+        return 2
+
+
+class TestPageHealthMonitor:
+
+    @pytest.mark.asyncio
+    async def test_probe_only_after_navigation_or_failure(self):
+        page = FakePage()
+        monitor = PageHealthMonitor()
+        monitor.attach(page)
+
+        for _ in range(5):
+            assert await monitor.ensure_ready(page)
+        assert page.evaluations == 1
+        assert monitor.probes_skipped == 4
+
+        page.emit("framenavigated", object())  # sub-frame navigation is ignored
+        await monitor.ensure_ready(page)
+        assert page.evaluations == 1
+
+        page.emit("framenavigated", page.main_frame)
+        await monitor.ensure_ready(page)
+        assert page.evaluations == 2
+        assert monitor.navigation_count == 1
+
+        monitor.mark_failed()
+        await monitor.ensure_ready(page)
+        assert page.evaluations == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("event", ["crash", "close"])
+    async def test_crashed_or_closed_page_fails_fast(self, event):
+        page = FakePage()
+        monitor = PageHealthMonitor()
+        monitor.attach(page)
+        page.emit(event, page)
+
+        assert not monitor.alive
+        with pytest.raises(PageClosedError):
+            await monitor.ensure_ready(page)
+        assert page.evaluations == 0
+
+    def test_detach_removes_listeners(self):
+        page = FakePage()
+        monitor = PageHealthMonitor()
+        monitor.attach(page)
+        monitor.detach()
+
+        assert all(not handlers for handlers in page.listeners.values())
+        assert monitor.page is None
+
+
+class TestEngineActionProbes:
+
+    @pytest.mark.asyncio
+    async def test_repeated_actions_do_not_probe_the_page(self):
+        config = AutomationConfig(name="probes", url="https://example.com", actions=[])
+        engine = WebAutomationEngine(config)
+        page = FakePage()
+        engine.page = page
+        engine.page_health.attach(page)
+
+        for _ in range(10):
+            await engine.execute_action(Action(type=ActionType.SET_VARIABLE, value={"variable": "n", "value": "1"}))
+
+        assert page.evaluations == 1
+        assert engine.variables["n"] == "1"
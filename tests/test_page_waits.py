@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test Named Page Waits
+=====================
+
+Validates that download-path waits resolve on page conditions, that their
+timeout budgets come from learned per-site p95 timings, and that the learned
+timings survive a restart through the state file.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.adaptive_timeout_manager import AdaptiveTimeoutManager, site_key
+from src.utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+from src.utils.page_waits import PageWaits, WaitCondition, download_wait_conditions
+
+
+def _page(url="https://wan.video/generate"):
+    page = AsyncMock()
+    page.url = url
+    return page
+
+
+class TestLearnedTimeoutPersistence:
+
+    def test_timings_are_saved_and_reloaded_per_site(self, tmp_path):
+        state_file = tmp_path / "learned_timeouts.json"
+        manager = AdaptiveTimeoutManager(min_timeout=0.1, state_file=state_file)
+        manager.use_site("wan.video")
+        for duration in (0.2, 0.3, 0.25, 0.3, 0.2, 0.4):
+            manager.record_operation("gallery_opened", duration, True)
+        manager.use_site("example.com")
+        manager.record_operation("gallery_opened", 1.0, True)
+        assert manager.save_state()
+
+        reloaded = AdaptiveTimeoutManager(min_timeout=0.1, state_file=state_file, site="wan.video")
+        learned = reloaded.get_timeout("gallery_opened", default=2.0)
+        assert 0.3 < learned < 1.0
+
+        # Too few samples on the other site: its budget stays at the default
+        reloaded.use_site("example.com")
+        assert reloaded.get_timeout("gallery_opened", default=2.0) == 2.0
+
+    def test_corrupt_state_file_is_ignored(self, tmp_path):
+        state_file = tmp_path / "learned_timeouts.json"
+        state_file.write_text("{not json")
+
+        manager = AdaptiveTimeoutManager(state_file=state_file)
+        assert manager.get_timeout("gallery_opened", default=1.5) == 1.5
+
+    def test_site_key_uses_host(self):
+        assert site_key("https://wan.video/generate?x=1") == "wan.video"
+        assert site_key(None) == "default"
+
+
+class TestPageWaits:
+
+    def setup_method(self):
+        self.conditions = {"overlay_closed": WaitCondition("overlay_closed", "div.overlay", "hidden", 0.5)}
+
+    @pytest.mark.asyncio
+    async def test_wait_uses_condition_and_default_budget(self):
+        waits = PageWaits(self.conditions)
+        page = _page()
+
+        assert await waits.wait(page, "overlay_closed")
+        page.wait_for_selector.assert_awaited_once_with("div.overlay", state="hidden", timeout=500)
+        assert waits.timeout_manager.site == "wan.video"
+        page.wait_for_timeout.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unmet_condition_returns_false_and_counts_failure(self):
+        waits = PageWaits(self.conditions)
+        page = _page()
+        page.wait_for_selector.side_effect = TimeoutError("Timeout 500ms exceeded")
+
+        assert not await waits.wait(page, "overlay_closed")
+        assert waits.waits_timed_out == 1
+        assert waits.timeout_manager.operation_stats["overlay_closed"].failure_count == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_follows_learned_timings(self):
+        waits = PageWaits(self.conditions, AdaptiveTimeoutManager(min_timeout=0.2, site="wan.video"))
+        for _ in range(10):
+            waits.timeout_manager.record_operation("overlay_closed", 2.0, True)
+
+        page = _page()
+        await waits.wait(page, "overlay_closed")
+        timeout_ms = page.wait_for_selector.await_args.kwargs["timeout"]
+        assert timeout_ms == pytest.approx(3000)
+
+
+class TestPanelChangeWait:
+
+    def setup_method(self):
+        config = GenerationDownloadConfig()
+        self.waits = PageWaits(download_wait_conditions(config))
+
+    @pytest.mark.asyncio
+    async def test_open_panel_of_previous_item_does_not_satisfy_wait(self):
+        page = _page()
+        page.evaluate.return_value = "05 Sep 2025 17:06:29"
+
+        assert await self.waits.wait_for_change(page, "metadata_panel_loaded", "05 Sep 2025 17:06:29")
+        page.wait_for_selector.assert_not_called()
+        assert page.wait_for_function.await_args.kwargs["arg"] == ["Creation Time", "05 Sep 2025 17:06:29"]
+        assert self.waits.timeout_manager.operation_stats["metadata_panel_loaded"].success_count == 1
+
+    @pytest.mark.asyncio
+    async def test_already_changed_panel_returns_without_timing(self):
+        page = _page()
+        page.evaluate.return_value = "06 Sep 2025 08:00:00"
+
+        assert await self.waits.wait_for_change(page, "metadata_panel_loaded", "05 Sep 2025 17:06:29")
+        page.wait_for_function.assert_not_called()
+        assert "metadata_panel_loaded" not in self.waits.timeout_manager.operation_stats
+
+    @pytest.mark.asyncio
+    async def test_first_open_waits_for_the_panel(self):
+        page = _page()
+
+        assert await self.waits.wait_for_change(page, "metadata_panel_loaded", None)
+        page.wait_for_selector.assert_awaited_once_with("text=Creation Time", state="visible", timeout=1500)
+
+
+class TestDownloadPathWaits:
+
+    @pytest.mark.asyncio
+    async def test_download_settings_configuration_does_not_sleep(self, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"), logs_folder=str(tmp_path / "logs"))
+        manager = GenerationDownloadManager(config)
+        page = _page()
+
+        assert await manager._configure_chromium_download_settings(page)
+        page.wait_for_timeout.assert_not_called()
+        assert manager.page_waits.timeout_manager.state_file == tmp_path / "logs" / "learned_timeouts.json"
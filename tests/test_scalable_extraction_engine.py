@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test Page-Backed Scalable Extraction
+====================================
+
+Validates that ScalableExtractionEngine workers extract from their own pages
+(reused between tasks), that queued tasks run in priority order, that tasks
+for a domain are routed to the worker already warm for it, and that batch
+results can be awaited.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils import performance_optimized_extractor
+from src.utils.scalable_extraction_engine import (
+    ExtractionTask, LoadBalancer, LoadBalancingStrategy, ProcessingNode, ScalableExtractionEngine
+)
+
+
+class FakePage:
+
+    def __init__(self, worker_id, fail_urls=()):
+        self.worker_id = worker_id
+        self.url = "about:blank"
+        self.visited = []
+        self.closed = False
+        self.fail_urls = fail_urls
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        if url in self.fail_urls:
+            self.fail_urls.discard(url)
+            raise Exception("net::ERR_CONNECTION_RESET")
+        self.url = url
+        self.visited.append(url)
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakePageProvider:
+
+    def __init__(self, fail_urls=()):
+        self.pages = {}
+        self.pages_opened = 0
+        self.discarded = []
+        self.closed = False
+        self.fail_urls = set(fail_urls)
+
+    async def get_page(self, worker_id):
+        if worker_id not in self.pages:
+            self.pages[worker_id] = FakePage(worker_id, self.fail_urls)
+            self.pages_opened += 1
+        return self.pages[worker_id]
+
+    async def discard(self, worker_id):
+        self.discarded.append(worker_id)
+        self.pages.pop(worker_id, None)
+
+    async def close(self):
+        self.closed = True
+
+    @property
+    def open_pages(self):
+        return len(self.pages)
+
+
+@pytest.fixture
+def fake_extraction(monkeypatch):
+    """Extractor reads the page it is given; record which page served each URL"""
+    async def extract(self, page):
+        return {'generation_date': f"date of {page.url}", 'prompt': 'prompt', 'extraction_method': 'optimized',
+                'page_worker': page.worker_id}
+
+    monkeypatch.setattr(performance_optimized_extractor.PerformanceOptimizedExtractor,
+                        'extract_metadata_optimized', extract)
+
+
+class TestPageBackedEngine:
+
+    @pytest.mark.asyncio
+    async def test_batch_results_come_from_worker_pages(self, fake_extraction):
+        provider = FakePageProvider()
+        engine = ScalableExtractionEngine({'concurrent_workers': 3, 'max_workers': 3}, page_provider=provider)
+        await engine.start()
+        try:
+            task_ids = await engine.submit_batch_tasks(
+                [{'page_url': f"https://site{i % 4}.example/item/{i}"} for i in range(40)]
+            )
+            results = await engine.wait_for_tasks(task_ids, timeout=5.0)
+        finally:
+            await engine.stop()
+
+        assert all(results[task_id]['generation_date'] == f"date of {results[task_id]['url']}" for task_id in task_ids)
+        assert all(results[task_id]['page_worker'] == results[task_id]['worker_id'] for task_id in task_ids)
+        assert provider.pages_opened <= 3
+        assert engine.statistics['tasks_processed'] == 40
+        assert provider.closed
+        # Completion futures are released once their task finishes
+        assert engine._task_futures == {}
+
+    @pytest.mark.asyncio
+    async def test_queued_tasks_run_highest_priority_first(self, fake_extraction):
+        engine = ScalableExtractionEngine({'concurrent_workers': 1}, page_provider=FakePageProvider())
+        task_ids = [
+            await engine.submit_task("https://a.example/low", {}, priority=2),
+            await engine.submit_task("https://a.example/high", {}, priority=9),
+            await engine.submit_task("https://a.example/mid-1", {}, priority=5),
+            await engine.submit_task("https://a.example/mid-2", {}, priority=5),
+        ]
+
+        await engine.start()
+        try:
+            await engine.wait_for_tasks(task_ids, timeout=5.0)
+        finally:
+            await engine.stop()
+
+        visited = engine.page_provider.pages["worker_0"].visited
+        assert visited == ["https://a.example/high", "https://a.example/mid-1",
+                           "https://a.example/mid-2", "https://a.example/low"]
+
+    @pytest.mark.asyncio
+    async def test_same_domain_goes_to_warm_worker(self, fake_extraction):
+        engine = ScalableExtractionEngine({'concurrent_workers': 3, 'load_balancing_strategy': 'adaptive'},
+                                          page_provider=FakePageProvider())
+        await engine.start()
+        try:
+            workers = {}
+            for url in ["https://a.example/1", "https://b.example/1", "https://a.example/2",
+                        "https://b.example/2", "https://a.example/3"]:
+                task_id = await engine.submit_task(url, {})
+                result = (await engine.wait_for_tasks([task_id], timeout=5.0))[task_id]
+                workers.setdefault(url.split("/")[2], set()).add(result['worker_id'])
+        finally:
+            await engine.stop()
+
+        assert len(workers["a.example"]) == 1
+        assert len(workers["b.example"]) == 1
+        assert workers["a.example"] != workers["b.example"]
+
+    @pytest.mark.asyncio
+    async def test_navigation_failure_discards_page_and_retries(self, fake_extraction):
+        provider = FakePageProvider(fail_urls={"https://a.example/flaky"})
+        engine = ScalableExtractionEngine({'concurrent_workers': 1}, page_provider=provider)
+        await engine.start()
+        try:
+            task_id = await engine.submit_task("https://a.example/flaky", {})
+            result = (await engine.wait_for_tasks([task_id], timeout=5.0))[task_id]
+        finally:
+            await engine.stop()
+
+        assert result['generation_date'] == "date of https://a.example/flaky"
+        assert provider.discarded == ["worker_0"]
+        assert engine.completed_tasks[task_id].retry_count == 1
+
+
+class TestLocalityRouting:
+
+    def test_locality_aware_prefers_warm_node_then_cold_node(self):
+        balancer = LoadBalancer(LoadBalancingStrategy.LOCALITY_AWARE)
+        warm = ProcessingNode(node_id="warm", capacity=1, warm_domains={"a.example"})
+        cold = ProcessingNode(node_id="cold", capacity=1)
+        balancer.register_node(warm)
+        balancer.register_node(cold)
+
+        assert balancer.select_node(ExtractionTask("t1", "https://a.example/x", {})) is warm
+        assert balancer.select_node(ExtractionTask("t2", "https://b.example/x", {})) is cold
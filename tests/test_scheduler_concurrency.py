@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test concurrent execution in the automation scheduler.
+Validates that configs run in parallel within max_concurrency, that run
+starts against the same site are spaced by site_min_interval and that
+failures are retried per config with structured outcomes.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.automation_scheduler import (
+    AutomationOutcome, AutomationResult, AutomationScheduler, SchedulerConfig, SiteRateLimiter
+)
+
+
+def write_configs(tmp_path, urls):
+    files = []
+    for index, url in enumerate(urls):
+        path = tmp_path / f"config_{index}.json"
+        path.write_text(json.dumps({"name": f"config {index}", "url": url, "actions": []}))
+        files.append(str(path))
+    return files
+
+
+def make_scheduler(tmp_path, config_files, **overrides):
+    config = SchedulerConfig(
+        config_files=config_files,
+        failure_wait_time=0,
+        log_file=str(tmp_path / "scheduler.log"),
+        use_cli=False,
+        use_browser_pool=False,
+        **overrides
+    )
+    scheduler = AutomationScheduler(config)
+    scheduler.keyboard_handler = None
+    scheduler.export_detailed_report = lambda: None
+    return scheduler
+
+
+@pytest.mark.asyncio
+async def test_configs_run_concurrently(tmp_path):
+    files = write_configs(tmp_path, [f"https://site{i}.example.com" for i in range(6)])
+    scheduler = make_scheduler(tmp_path, files, max_concurrency=3)
+    running = {"now": 0, "peak": 0}
+
+    async def fake_execute(config_file, timeout, browser_pool=None):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.1)
+        running["now"] -= 1
+        return AutomationOutcome(config_file=config_file, result=AutomationResult.SUCCESS, tasks_created=1)
+
+    scheduler.execute_automation_direct = fake_execute
+
+    start = time.monotonic()
+    await scheduler.run_scheduler()
+    elapsed = time.monotonic() - start
+
+    assert running["peak"] == 3
+    assert elapsed < 0.5
+    assert len(scheduler.runs) == 6
+    assert all(run.result == AutomationResult.SUCCESS for run in scheduler.runs)
+
+
+@pytest.mark.asyncio
+async def test_failed_config_is_retried_with_structured_outcome(tmp_path):
+    files = write_configs(tmp_path, ["https://a.example.com", "https://b.example.com"])
+    scheduler = make_scheduler(tmp_path, files, max_concurrency=2, max_retries=2)
+    attempts = {}
+
+    async def fake_execute(config_file, timeout, browser_pool=None):
+        attempts[config_file] = attempts.get(config_file, 0) + 1
+        result = AutomationResult.FAILURE if config_file == files[0] and attempts[config_file] == 1 else AutomationResult.SUCCESS
+        return AutomationOutcome(config_file=config_file, result=result, message="queue full")
+
+    scheduler.execute_automation_direct = fake_execute
+    await scheduler.run_scheduler()
+
+    assert attempts == {files[0]: 2, files[1]: 1}
+    assert [outcome.result for outcome in scheduler.outcomes].count(AutomationResult.FAILURE) == 1
+
+
+@pytest.mark.asyncio
+async def test_site_rate_limiter_spaces_starts_per_site():
+    limiter = SiteRateLimiter(0.05)
+    starts = []
+
+    async def start(site):
+        await limiter.wait_turn(site)
+        starts.append((site, time.monotonic()))
+
+    await asyncio.gather(start("a"), start("a"), start("b"))
+
+    a_times = [t for site, t in starts if site == "a"]
+    assert a_times[1] - a_times[0] >= 0.045
+    assert starts[0][0] in ("a", "b")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test Selector Cache
+===================
+
+Validates that the per-site selector strategy cache persists which fallback
+strategy found a selector, that the engine tries that strategy first so a
+repeat lookup succeeds on the first attempt, and that entries are dropped on
+repeated misses or when the selector matches as written again, and that a
+cached popover strategy does not click an already-open popover closed.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core.action_types import AutomationConfig
+from src.core.engine import WebAutomationEngine
+from src.utils.selector_cache import SelectorStrategyCache, site_key
+
+TARGET = "#menu.ant-popover-open > span"
+ALTERNATIVE = "#menu span"
+TRIGGER = "#menu"
+
+
+class FakePage:
+    def __init__(self, present):
+        self.present = set(present)
+        self.lookups = []
+
+    async def wait_for_selector(self, selector, timeout=None, state=None):
+        self.lookups.append((selector, timeout))
+        if selector not in self.present:
+            raise TimeoutError(f"{selector} not found in {timeout}ms")
+        return f"<{selector}>"
+
+    async def query_selector_all(self, selector):
+        return []
+
+
+class PopoverPage(FakePage):
+    """The popover opens ``delay`` lookups after its trigger is clicked"""
+
+    def __init__(self, present, delay=0):
+        super().__init__(present)
+        self.delay = delay
+        self.clicks = 0
+        self.opens_at = None
+
+    async def wait_for_selector(self, selector, timeout=None, state=None):
+        if self.opens_at is not None and len(self.lookups) >= self.opens_at:
+            self.present.add(TARGET)
+        found = await super().wait_for_selector(selector, timeout, state)
+        return self if selector == TRIGGER else found
+
+    async def click(self):
+        self.clicks += 1
+        self.opens_at = len(self.lookups) + self.delay
+
+
+def make_engine(tmp_path, page):
+    engine = WebAutomationEngine(AutomationConfig(name="cached", url="https://app.example.com:8443/generate"))
+    engine.selector_cache_dir = str(tmp_path)
+    engine.page = page
+    return engine
+
+
+class TestSelectorStrategyCache:
+
+    def test_site_key(self):
+        assert site_key("https://App.Example.com:8443/generate") == "app.example.com_8443"
+        assert site_key(None) == "local"
+
+    def test_winner_persists_and_is_dropped_after_repeated_misses(self, tmp_path):
+        cache = SelectorStrategyCache("site", str(tmp_path))
+        cache.record_success(TARGET, "alternative", ALTERNATIVE)
+        cache.record_success(TARGET, "alternative", ALTERNATIVE)
+        assert (tmp_path / "site.jsonl").read_text().count("\n") == 1
+
+        reopened = SelectorStrategyCache("site", str(tmp_path))
+        assert reopened.winner(TARGET).selector == ALTERNATIVE
+        assert not reopened.record_miss(TARGET)
+
+        again = SelectorStrategyCache("site", str(tmp_path))
+        assert again.winner(TARGET).misses == 1
+        assert again.record_miss(TARGET)
+        assert SelectorStrategyCache("site", str(tmp_path)).winner(TARGET) is None
+
+
+class TestEngineUsesCache:
+
+    def test_learned_strategy_is_tried_first(self, tmp_path):
+        first = FakePage(present={ALTERNATIVE})
+        element, used = asyncio.run(make_engine(tmp_path, first)._find_element_with_fallback(TARGET))
+        assert used == ALTERNATIVE
+        assert [selector for selector, _ in first.lookups] == [TARGET, ALTERNATIVE]
+
+        # Next run: the alternative is the first and only lookup, with the short timeout
+        second = FakePage(present={ALTERNATIVE})
+        engine = make_engine(tmp_path, second)
+        element, used = asyncio.run(engine._find_element_with_fallback(TARGET))
+        assert used == ALTERNATIVE
+        assert second.lookups == [(ALTERNATIVE, engine.cached_selector_timeout)]
+
+    def test_original_selector_matching_again_drops_entry(self, tmp_path):
+        asyncio.run(make_engine(tmp_path, FakePage(present={ALTERNATIVE}))._find_element_with_fallback(TARGET))
+
+        page = FakePage(present={TARGET})
+        engine = make_engine(tmp_path, page)
+        element, used = asyncio.run(engine._find_element_with_fallback(TARGET))
+
+        assert used == TARGET
+        assert engine.selector_cache.winner(TARGET) is None
+
+    def test_cached_popover_is_not_clicked_when_already_open(self, tmp_path):
+        page = PopoverPage(present={TRIGGER, TARGET})
+        engine = make_engine(tmp_path, page)
+        engine.selector_cache.record_success(TARGET, "popover", TARGET)
+
+        element, used = asyncio.run(engine._find_element_with_fallback(TARGET))
+
+        assert used == TARGET
+        assert page.clicks == 0
+        assert page.lookups == [(TARGET, engine.cached_selector_timeout)]
+        assert engine.selector_cache.winner(TARGET).strategy == "popover"
+
+    def test_slow_popover_keeps_cached_strategy(self, tmp_path):
+        page = PopoverPage(present={TRIGGER}, delay=1)
+        engine = make_engine(tmp_path, page)
+        engine.selector_cache.record_success(TARGET, "popover", TARGET)
+
+        element, used = asyncio.run(engine._find_element_with_fallback(TARGET))
+
+        assert used == TARGET
+        assert page.clicks == 1
+        winner = engine.selector_cache.winner(TARGET)
+        assert (winner.strategy, winner.misses) == ("popover", 0)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test Session Profiles
+=====================
+
+Validates that named session profiles restore saved login state into new
+browser contexts (snapshot or persistent user-data dir), save it again at
+the end of a run, and that the engine skips LOGIN while the restored session
+is still logged in.
+"""
+
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core import browser_manager as browser_manager_module
+from src.core.action_types import Action, ActionType, AutomationConfig
+from src.core.browser_manager import BrowserConfig, BrowserManager
+from src.core.engine import WebAutomationEngine
+from src.utils.session_profiles import SessionProfile
+
+STATE = {"cookies": [{"name": "sid", "value": "abc", "domain": "example.com", "path": "/"}], "origins": []}
+
+
+class FakePage:
+    def __init__(self, login_form_visible=False, logged_in_marker=True):
+        self.login_form_visible = login_form_visible
+        self.logged_in_marker = logged_in_marker
+        self.filled = []
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        visible = self.login_form_visible if selector == "#user" else self.logged_in_marker
+        if not visible:
+            raise TimeoutError(selector)
+
+    async def fill(self, selector, value, timeout=None):
+        self.filled.append(selector)
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, options, browser=None):
+        self.options = options
+        self.browser = browser
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def storage_state(self):
+        return STATE
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    async def new_context(self, **kwargs):
+        return FakeContext(kwargs, browser=self)
+
+    async def close(self):
+        pass
+
+
+class FakeChromium:
+    def __init__(self):
+        self.persistent_launches = []
+
+    async def launch(self, **kwargs):
+        return FakeBrowser()
+
+    async def launch_persistent_context(self, user_data_dir, **kwargs):
+        self.persistent_launches.append((user_data_dir, kwargs))
+        return FakeContext(kwargs)
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+class FakePlaywrightStarter:
+    def __init__(self, playwright):
+        self.playwright = playwright
+
+    async def start(self):
+        return self.playwright
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    playwright = FakePlaywright()
+    monkeypatch.setattr(browser_manager_module, "async_playwright", lambda: FakePlaywrightStarter(playwright))
+    return playwright
+
+
+class TestSessionProfile:
+
+    def test_invalid_names_are_rejected(self, tmp_path):
+        for name in ("", "../etc", "a/b", "_cache"):
+            with pytest.raises(ValueError):
+                SessionProfile(name, str(tmp_path))
+        with pytest.raises(ValueError):
+            BrowserConfig(session_profile="../etc")
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_private_and_round_trips(self, tmp_path):
+        profile = SessionProfile("work", str(tmp_path))
+        assert not profile.has_saved_session()
+
+        assert await profile.save(FakeContext({}), "test")
+
+        assert profile.load_storage_state() == STATE
+        assert stat.S_IMODE(profile.storage_state_path.stat().st_mode) == 0o600
+        assert profile.load_meta()["cookies"] == 1
+
+
+class TestBrowserManagerProfiles:
+
+    @pytest.mark.asyncio
+    async def test_saved_state_is_restored_and_refreshed(self, fake_playwright, tmp_path):
+        config = BrowserConfig(session_profile="work", profiles_dir=str(tmp_path), keep_browser_open=False)
+        first = BrowserManager(config)
+        assert await first.initialize()
+        assert not first.session_restored
+        assert "storage_state" not in first.context.options
+        await first.close()
+
+        second = BrowserManager(config)
+        assert await second.initialize()
+        assert second.session_restored
+        assert second.context.options["storage_state"] == STATE
+
+    @pytest.mark.asyncio
+    async def test_persistent_profile_uses_user_data_dir_and_shared_cache(self, fake_playwright, tmp_path):
+        config = BrowserConfig(session_profile="work", persistent_profile=True, profiles_dir=str(tmp_path),
+                               keep_browser_open=False)
+        manager = BrowserManager(config)
+
+        assert await manager.initialize()
+        assert manager.is_initialized()
+        user_data_dir, options = fake_playwright.chromium.persistent_launches[0]
+        assert user_data_dir == str(tmp_path / "work" / "user-data")
+        assert f"--disk-cache-dir={tmp_path / '_cache'}" in options["args"]
+
+        await manager.close()
+        assert manager.context is None
+
+
+class TestLoginSkip:
+
+    def make_engine(self, tmp_path, page):
+        config = AutomationConfig(name="profiled", url="https://example.com", session_profile="work")
+        engine = WebAutomationEngine(config)
+        engine.browser_manager.session_profile.root = tmp_path
+        engine.page = page
+        return engine
+
+    def login_action(self, **extra):
+        login_data = {"username": "user", "password": "secret", "username_selector": "#user",
+                      "password_selector": "#pass", "submit_selector": "#go"}
+        login_data.update(extra)
+        return Action(type=ActionType.LOGIN, value=login_data)
+
+    @pytest.mark.asyncio
+    async def test_login_skipped_while_session_valid(self, tmp_path):
+        page = FakePage(login_form_visible=False)
+        engine = self.make_engine(tmp_path, page)
+        engine.browser_manager.session_restored = True
+
+        result = await engine._execute_single_action(self.login_action())
+
+        assert result["login_skipped"]
+        assert page.filled == []
+
+    @pytest.mark.asyncio
+    async def test_expired_or_fresh_session_logs_in(self, tmp_path):
+        engine = self.make_engine(tmp_path, FakePage(logged_in_marker=False))
+        engine.browser_manager.session_restored = True
+        assert not await engine._saved_session_valid(self.login_action(session_check_selector=".avatar").value)
+
+        engine.page = FakePage(login_form_visible=True)
+        assert not await engine._saved_session_valid(self.login_action().value)
+
+        engine.browser_manager.session_restored = False
+        engine.page = FakePage(login_form_visible=False)
+        assert not await engine._saved_session_valid(self.login_action().value)
+
+    def test_config_round_trip(self):
+        config = AutomationConfig(name="n", url="https://example.com", session_profile="work",
+                                  persistent_profile=True)
+        restored = AutomationConfig.from_dict(json.loads(json.dumps(config.to_dict())))
+        assert (restored.session_profile, restored.persistent_profile) == ("work", True)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test Span Tracer
+================
+
+Validates nested, task-aware spans and their Chrome trace-event export, and
+that engine actions, control-flow handlers and download manager phases
+record spans while tracing is enabled.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.core.action_types import Action, ActionType, AutomationConfig
+from src.core.engine import WebAutomationEngine
+from src.core.execution_context import ExecutionContext
+from src.utils import span_tracer
+from src.utils.generation_download_manager import GenerationDownloadConfig, GenerationDownloadManager
+from src.utils.span_tracer import NULL_SPAN, SpanTracer, traced
+
+
+@pytest.fixture
+def tracing(tmp_path):
+    """Enable the global tracer for one test"""
+    tracer = span_tracer.get_tracer()
+    tracer.clear()
+    span_tracer.enable_tracing(str(tmp_path / "trace.json"))
+    yield tracer
+    span_tracer.disable_tracing()
+    tracer.output_path = None
+    tracer.clear()
+
+
+def _spans(tracer):
+    return {event["name"]: event for event in tracer.events}
+
+
+class TestSpanTracer:
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = SpanTracer()
+        with tracer.span("idle") as span:
+            span.set(ignored=True)
+
+        assert tracer.span("idle") is NULL_SPAN
+        assert len(tracer.events) == 0
+
+    @pytest.mark.asyncio
+    async def test_nested_spans_export_as_chrome_trace(self, tmp_path):
+        tracer = SpanTracer(enabled=True)
+        async with tracer.span("item", "download", creation_time="03 Sep 2025 16:12:04"):
+            with tracer.span("click"):
+                await asyncio.sleep(0.01)
+            with pytest.raises(RuntimeError):
+                with tracer.span("rename"):
+                    raise RuntimeError("disk full")
+
+        path = tracer.export(str(tmp_path / "trace.json"))
+        trace = json.loads(path.read_text())
+        complete = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+
+        item, click = complete["item"], complete["click"]
+        assert item["cat"] == "download"
+        assert item["args"] == {"creation_time": "03 Sep 2025 16:12:04"}
+        assert click["args"]["parent"] == "item"
+        assert click["dur"] >= 10_000
+        assert item["ts"] <= click["ts"] and click["ts"] + click["dur"] <= item["ts"] + item["dur"]
+        assert complete["rename"]["args"]["error"] == "RuntimeError"
+        assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in trace["traceEvents"])
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_get_their_own_rows(self):
+        tracer = SpanTracer(enabled=True)
+
+        async def worker():
+            with tracer.span("download"):
+                await asyncio.sleep(0.01)
+
+        with tracer.span("session"):
+            await asyncio.gather(asyncio.create_task(worker(), name="worker-1"),
+                                 asyncio.create_task(worker(), name="worker-2"))
+
+        downloads = [event for event in tracer.events if event["name"] == "download"]
+        session = _spans(tracer)["session"]
+        assert len({event["tid"] for event in downloads}) == 2
+        assert session["tid"] not in {event["tid"] for event in downloads}
+        assert all(event["args"]["parent"] == "session" for event in downloads)
+        rows = {event["args"]["name"] for event in tracer.to_chrome_trace()["traceEvents"] if event["ph"] == "M"}
+        assert {"worker-1", "worker-2"} <= rows
+
+    def test_bounded_buffer_counts_dropped_spans(self):
+        tracer = SpanTracer(enabled=True, max_events=3)
+        for _ in range(5):
+            with tracer.span("scroll"):
+                pass
+
+        assert len(tracer.events) == 3
+        assert tracer.to_chrome_trace()["otherData"]["dropped_events"] == 2
+
+
+class TestInstrumentedCode:
+
+    @pytest.mark.asyncio
+    async def test_traced_decorator_follows_global_switch(self, tracing):
+        @traced("phase", "download")
+        async def phase():
+            return 42
+
+        assert await phase() == 42
+        assert _spans(tracing)["phase"]["cat"] == "download"
+
+        span_tracer.disable_tracing()
+        await phase()
+        assert len(tracing.events) == 1
+
+    @pytest.mark.asyncio
+    async def test_engine_actions_and_control_flow_record_spans(self, tracing):
+        engine = WebAutomationEngine(AutomationConfig(name="trace", url="https://example.com", actions=[]))
+        engine.page = None
+        engine.page_health.ensure_ready = lambda page: asyncio.sleep(0)
+
+        await engine.execute_action(Action(type=ActionType.SET_VARIABLE, value={"variable": "n", "value": "1"},
+                                           description="set n"))
+        with pytest.raises(ValueError):
+            await engine._handle_block_action(Action(type=ActionType.IF_END), ExecutionContext())
+
+        spans = _spans(tracing)
+        assert spans["set_variable"]["cat"] == "action"
+        assert spans["set_variable"]["args"]["description"] == "set n"
+        assert spans["if_end"]["cat"] == "control_flow"
+        assert spans["if_end"]["args"]["error"] == "ValueError"
+
+    @pytest.mark.asyncio
+    async def test_download_manager_phases_record_nested_spans(self, tracing, tmp_path):
+        config = GenerationDownloadConfig(downloads_folder=str(tmp_path / "downloads"),
+                                          logs_folder=str(tmp_path / "logs"))
+        manager = GenerationDownloadManager(config)
+
+        assert not await manager._process_tracked_download("03 Sep 2025 16:12:04", "prompt", None)
+
+        spans = _spans(tracing)
+        assert spans["log"]["args"]["parent"] == "process_download"
+        assert spans["process_download"]["cat"] == "download"
+        assert tracing.phase_totals()["log"]["count"] == 1
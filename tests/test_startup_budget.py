@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test Startup Budget
+===================
+
+Fails when the CLI's cold-start import time goes over budget or when a
+heavy subsystem (generation downloads, landmark/extraction stack, debug
+tools, yaml, psutil) is imported eagerly again. Override the budget with
+AUTOMATON_STARTUP_BUDGET_MS on slow machines.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.startup_profile import DEFERRED_MODULES, StartupProfile, parse_importtime, profile_startup
+
+STARTUP_BUDGET_MS = float(os.environ.get("AUTOMATON_STARTUP_BUDGET_MS", "350"))
+
+
+@pytest.fixture(scope="module")
+def cli_profile():
+    # Best of three cold starts keeps disk-cache noise out of the budget check
+    profiles = [profile_startup() for _ in range(3)]
+    return min(profiles, key=lambda profile: profile.total_ms)
+
+
+class TestStartupBudget:
+
+    def test_cli_cold_start_within_budget(self, cli_profile):
+        assert cli_profile.loaded("core.engine")
+        assert cli_profile.total_ms < STARTUP_BUDGET_MS, cli_profile.format_report()
+
+    def test_heavy_subsystems_are_not_imported_at_startup(self, cli_profile):
+        assert cli_profile.eager_deferred_modules() == [], cli_profile.format_report()
+
+
+class TestImportTimeParsing:
+
+    def test_parse_nested_entries(self):
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     _json",
+            "import time:       300 |        420 |   json",
+            "import time:      1000 |       1500 | interfaces.cli",
+        ])
+        profile = StartupProfile("interfaces.cli", parse_importtime(output))
+
+        assert [entry.depth for entry in profile.entries] == [2, 1, 0]
+        assert profile.total_ms == pytest.approx(1.5)
+        assert profile.top(1)[0].module == "json"
+        assert not profile.loaded("yaml")
+        assert "yaml" in DEFERRED_MODULES
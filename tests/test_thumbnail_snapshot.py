@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test Batched Thumbnail Snapshot
+===============================
+
+Validates that the gallery thumbnail list is read with a single
+``page.evaluate`` round-trip and that element handles are only fetched
+for the thumbnail that is actually clicked.
+"""
+
+import pytest
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+# Add parent directory for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.generation_download_manager import (
+    GenerationDownloadManager,
+    GenerationDownloadConfig,
+    THUMBNAIL_LOOKUP_JS,
+    THUMBNAIL_SNAPSHOT_JS,
+)
+
+
+def _record(index, unique_id, visible=True):
+    return {
+        'index': index,
+        'unique_id': unique_id,
+        'date_text': None,
+        'img_hash': None,
+        'data_attributes': {},
+        'bbox': {'x': 0, 'y': index * 100, 'width': 80, 'height': 80 if visible else 0},
+        'visible': visible,
+    }
+
+
+class TestThumbnailSnapshot:
+    """Test the single round-trip gallery snapshot"""
+
+    def setup_method(self):
+        self.config = GenerationDownloadConfig(
+            downloads_folder="/tmp/test_downloads",
+            logs_folder="/tmp/test_logs",
+        )
+        self.manager = GenerationDownloadManager(self.config)
+
+    @pytest.mark.asyncio
+    async def test_thumbnail_list_uses_single_evaluate(self):
+        """The whole gallery is read with one evaluate and no element handles"""
+        page = AsyncMock()
+        page.evaluate.return_value = [
+            _record(0, "date:24 Aug 2025#img:aaaaaaaaaaaaaaaa"),
+            _record(1, "date:23 Aug 2025#img:bbbbbbbbbbbbbbbb", visible=False),
+            _record(2, None),
+        ]
+        self.manager.processed_thumbnails.add("date:24 Aug 2025#img:aaaaaaaaaaaaaaaa")
+
+        thumbnails = await self.manager.get_robust_thumbnail_list(page)
+
+        page.evaluate.assert_awaited_once_with(
+            THUMBNAIL_SNAPSHOT_JS,
+            f"{self.config.thumbnail_container_selector} {self.config.thumbnail_selector}",
+        )
+        page.query_selector_all.assert_not_called()
+        assert [t['position'] for t in thumbnails] == [0, 1]
+        assert all(t['element'] is None for t in thumbnails)
+        assert thumbnails[0]['processed'] is True
+        assert thumbnails[1]['visible'] is False
+
+    @pytest.mark.asyncio
+    async def test_element_resolved_lazily_for_clicked_thumbnail(self):
+        """Only the thumbnail being clicked is looked up, and only once"""
+        element = object()
+        handle = MagicMock()
+        handle.as_element.return_value = element
+        page = AsyncMock()
+        page.evaluate_handle.return_value = handle
+        thumbnail = {'element': None, 'unique_id': "dom:idx:7|txt:123"}
+
+        assert await self.manager.resolve_thumbnail_element(page, thumbnail) is element
+        assert await self.manager.resolve_thumbnail_element(page, thumbnail) is element
+
+        page.evaluate_handle.assert_awaited_once_with(
+            THUMBNAIL_LOOKUP_JS,
+            [f"{self.config.thumbnail_container_selector} {self.config.thumbnail_selector}", "dom:idx:7|txt:123"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_refresh_returns_none_when_thumbnail_gone(self):
+        """A missing thumbnail releases the null handle and returns None"""
+        handle = AsyncMock()
+        handle.as_element = MagicMock(return_value=None)
+        page = AsyncMock()
+        page.evaluate_handle.return_value = handle
+
+        assert await self.manager.refresh_element_reference(page, "pos:0_0") is None
+        handle.dispose.assert_awaited_once()